@@ -59,6 +59,11 @@ supported_ofctl = {
 # get flows stats of the switch filtered by the fields
 # POST /stats/flow/<dpid>
 #
+# get flows stats of the switch (optionally filtered by the fields),
+# sent in chunks as the stats reply parts arrive from the switch
+# GET /stats/flow/<dpid>/stream
+# POST /stats/flow/<dpid>/stream
+#
 # get aggregate flows stats of the switch
 # GET /stats/aggregateflow/<dpid>
 #
@@ -148,6 +153,19 @@ supported_ofctl = {
 # POST /stats/experimenter/<dpid>
 
 
+def _json_stream(dpid, parts):
+    # the same JSON as json.dumps({str(dpid): flows}) of the flows of
+    # all the parts, a part at a time
+    yield ('{"%s": [' % dpid).encode('utf-8')
+    sep = ''
+    for flows in parts:
+        if not flows:
+            continue
+        yield (sep + ', '.join(json.dumps(f) for f in flows)).encode('utf-8')
+        sep = ', '
+    yield b']}'
+
+
 class StatsController(ControllerBase):
     def __init__(self, req, link, data, **config):
         super(StatsController, self).__init__(req, link, data, **config)
@@ -218,6 +236,48 @@ class StatsController(ControllerBase):
         body = json.dumps(flows)
         return Response(content_type='application/json', body=body)
 
+    def get_flow_stats_stream(self, req, dpid, **_kwargs):
+
+        # req.text rather than req.body, which is bytes on Python 3
+        if req.text == '':
+            flow = {}
+
+        else:
+
+            try:
+                flow = ast.literal_eval(req.text)
+
+            except SyntaxError:
+                LOG.debug('invalid syntax %s', req.text)
+                return Response(status=400)
+
+        if type(dpid) == str and not dpid.isdigit():
+            LOG.debug('invalid dpid %s', dpid)
+            return Response(status=400)
+
+        dp = self.dpset.get(int(dpid))
+
+        if dp is None:
+            return Response(status=404)
+
+        _ofp_version = dp.ofproto.OFP_VERSION
+
+        _ofctl = supported_ofctl.get(_ofp_version, None)
+        if _ofctl is not None and hasattr(_ofctl, 'get_flow_stats_stream'):
+            parts = _ofctl.get_flow_stats_stream(dp, self.waiters, flow)
+
+        else:
+            LOG.debug('Unsupported OF protocol')
+            return Response(status=501)
+
+        # no content length; the body is sent with chunked encoding, a
+        # chunk per stats reply part.  the whole body is the same as
+        # the one of get_flow_stats.  if the client reads too slowly for
+        # the reply, StatsReplyOverflow is raised from the body and the
+        # server aborts it without the last chunk.
+        return Response(content_type='application/json', charset='utf-8',
+                        app_iter=_json_stream(dp.id, parts))
+
     def get_aggregate_flow_stats(self, req, dpid, **_kwargs):
 
         if req.body == '':
@@ -822,6 +882,12 @@ class RestStatsApi(app_manager.RyuApp):
                        controller=StatsController, action='get_flow_stats',
                        conditions=dict(method=['GET', 'POST']))
 
+        uri = path + '/flow/{dpid}/stream'
+        mapper.connect('stats', uri,
+                       controller=StatsController,
+                       action='get_flow_stats_stream',
+                       conditions=dict(method=['GET', 'POST']))
+
         uri = path + '/aggregateflow/{dpid}'
         mapper.connect('stats', uri,
                        controller=StatsController,
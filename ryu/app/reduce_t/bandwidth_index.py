@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import deque
+
+'''
+###reduce_t###
+--> bandwidth index for re-route
+1) BIH: per bandwidth threshold, the islands (connected components)
+   of the links whose bandwidth >= threshold
+2) a component id per node and threshold (disjoint sets, weighted
+   quick-find), so "u and v in the same island" is a dict lookup
+3) incremental: a link raised to >= threshold merges two islands, a
+   link dropped below threshold (or removed) splits at most one island
+4) shortest path (hop count) per island, cached by source and dropped
+   when the island changes
+'''
+
+
+class _Level(object):
+    '''
+    islands of one bandwidth threshold
+    '''
+
+    def __init__(self, threshold):
+        super(_Level, self).__init__()
+        self.threshold = threshold
+        self.comp = dict()  # {node:island_id,...}, only nodes with a link
+        self.members = dict()  # {island_id:set([node,...]),...}
+        self.trees = dict()  # {island_id:{src:{node:prev,...},...},...}
+        self._next_id = 0
+
+    def _new_island(self, nodes):
+        island = self._next_id
+        self._next_id += 1
+        self.members[island] = nodes
+        for node in nodes:
+            self.comp[node] = island
+        return island
+
+    def _drop_island(self, island):
+        self.trees.pop(island, None)
+        return self.members.pop(island)
+
+    def link_up(self, u, v):
+        cu = self.comp.get(u)
+        cv = self.comp.get(v)
+        if cu is None and cv is None:
+            self._new_island(set([u, v]))
+            return
+        if cu == cv:
+            # a shortcut in the island
+            self.trees.pop(cu, None)
+            return
+        if cu is None:
+            cu, cv, u, v = cv, cu, v, u
+        if cv is None:
+            self.members[cu].add(v)
+            self.comp[v] = cu
+            self.trees.pop(cu, None)
+            return
+        # relabel the smaller island
+        if len(self.members[cu]) < len(self.members[cv]):
+            cu, cv = cv, cu
+        nodes = self._drop_island(cv)
+        for node in nodes:
+            self.comp[node] = cu
+        self.members[cu] |= nodes
+        self.trees.pop(cu, None)
+
+    def link_down(self, u, v, adjacency):
+        island = self.comp.get(u)
+        if island is None:
+            return
+        self.trees.pop(island, None)
+        reached = self._reach(u, v, adjacency)
+        if v in reached:
+            return
+        # the island is split: u's side gets a new id, single nodes
+        # without a link left are not in any island
+        nodes = self.members[island]
+        nodes -= reached
+        if len(reached) > 1:
+            self._new_island(reached)
+        else:
+            del self.comp[u]
+        if len(nodes) < 2:
+            for node in nodes:
+                del self.comp[node]
+            del self.members[island]
+
+    def _reach(self, u, v, adjacency):
+        # nodes reachable from u over links >= threshold, stops at v
+        threshold = self.threshold
+        book = set([u])
+        queue = deque([u])
+        while queue:
+            cur = queue.popleft()
+            for i, bw in adjacency[cur].items():
+                if bw >= threshold and i not in book:
+                    if i == v:
+                        book.add(i)
+                        return book
+                    book.add(i)
+                    queue.append(i)
+        return book
+
+    def shortest_path(self, u, v, adjacency):
+        island = self.comp[u]
+        trees = self.trees.setdefault(island, dict())
+        prev = trees.get(u)
+        if prev is None:
+            prev = trees[u] = _bfs(u, adjacency, self.threshold)
+        return _path(prev, u, v)
+
+
+def _bfs(src, adjacency, threshold):
+    prev = {src: None}
+    queue = deque([src])
+    while queue:
+        cur = queue.popleft()
+        for i, bw in adjacency[cur].items():
+            if bw >= threshold and i not in prev:
+                prev[i] = cur
+                queue.append(i)
+    return prev
+
+
+def _path(prev, u, v):
+    if v not in prev:
+        return None
+    path = [v]
+    while v != u:
+        v = prev[v]
+        path.append(v)
+    path.reverse()
+    return path
+
+
+class BandwidthIndex(object):
+    '''
+    thresholds: bandwidth levels of the hierarchy, e.g. [7,5,2]
+    links: {(u,v):bw,...}, undirected
+    '''
+
+    def __init__(self, thresholds, links=None):
+        super(BandwidthIndex, self).__init__()
+        # from high-level to low-level
+        self.thresholds = sorted(set(thresholds), reverse=True)
+        self.levels = [_Level(bw) for bw in self.thresholds]
+        self.adjacency = dict()  # {u:{v:bw,...},...}
+        if links:
+            self.update(links)
+
+    def nodes(self):
+        return self.adjacency.keys()
+
+    def bandwidth(self, u, v):
+        return self.adjacency.get(u, {}).get(v)
+
+    def set_bandwidth(self, u, v, bw):
+        '''
+        adds the link or changes its bandwidth
+        '''
+        if u == v:
+            return
+        old = self.bandwidth(u, v)
+        if old == bw:
+            return
+        self.adjacency.setdefault(u, dict())[v] = bw
+        self.adjacency.setdefault(v, dict())[u] = bw
+        for level in self.levels:
+            was_up = old is not None and old >= level.threshold
+            is_up = bw >= level.threshold
+            if is_up and not was_up:
+                level.link_up(u, v)
+            elif was_up and not is_up:
+                level.link_down(u, v, self.adjacency)
+
+    def remove_link(self, u, v):
+        old = self.bandwidth(u, v)
+        if old is None:
+            return
+        del self.adjacency[u][v]
+        del self.adjacency[v][u]
+        for level in self.levels:
+            if old >= level.threshold:
+                level.link_down(u, v, self.adjacency)
+
+    def update(self, links):
+        '''
+        links: {(u,v):bw,...}, all the links of the network; only the
+        differences to the current state are applied
+        '''
+        seen = set()
+        for (u, v), bw in links.items():
+            seen.add((u, v))
+            seen.add((v, u))
+            self.set_bandwidth(u, v, bw)
+        removed = [(u, v) for u in self.adjacency for v in self.adjacency[u]
+                   if (u, v) not in seen and u < v]
+        for u, v in removed:
+            self.remove_link(u, v)
+
+    def island_id(self, level, node):
+        '''
+        id of the island of the node at the level (index into
+        thresholds), None if it has no link of that bandwidth
+        '''
+        return self.levels[level].comp.get(node)
+
+    def same_island(self, level, u, v):
+        comp = self.levels[level].comp
+        island = comp.get(u)
+        return island is not None and island == comp.get(v)
+
+    def islands(self, level):
+        '''
+        [set([node,...]),...] of the level
+        '''
+        return list(self.levels[level].members.values())
+
+    def find_level(self, u, v):
+        '''
+        highest level at which u and v are in the same island, or None
+        '''
+        for i, level in enumerate(self.levels):
+            island = level.comp.get(u)
+            if island is not None and island == level.comp.get(v):
+                return i
+        return None
+
+    def shortest_path(self, u, v):
+        '''
+        (level, route) with route the shortest path in the island of
+        the highest level u and v share, level is None and route is a
+        shortest path over all the links if there is none
+        '''
+        level = self.find_level(u, v)
+        if level is not None:
+            return level, self.levels[level].shortest_path(
+                u, v, self.adjacency)
+        if u not in self.adjacency:
+            return None, None
+        return None, _path(_bfs(u, self.adjacency, float('-inf')), u, v)
@@ -1,8 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import copy
-
 from ryu.base import app_manager
 from ryu.lib import hub
 from ryu.controller import ofp_event
@@ -46,21 +44,15 @@ class HLApp(app_manager.RyuApp):
 
     # context
     def _monitor(self):
+        version = 0
         while True:
             hub.sleep(self.DISCOVER_PERIOD)
-            self.network_monitor.pre_adjacency_matrix = copy.deepcopy(self.network_monitor.adjacency_matrix)
-            self.network_monitor.update_topology()
-            if self.network_monitor.pre_adjacency_matrix != self.network_monitor.adjacency_matrix:
-                self.logger.info('***********adjacency_matrix CHANGED***********')
-                self.routeCalculator.pre_path_table = copy.deepcopy(self.routeCalculator.path_table)
-                self.routeCalculator.path_table = self.routeCalculator.get_path_table(
-                                                    self.network_monitor.adjacency_matrix,
-                                                    self.network_monitor.dpids_to_access_port)
-                self.routeCalculator.pre_route_table = copy.deepcopy(self.routeCalculator.route_table)
-                self.routeCalculator.route_table = self.routeCalculator.get_route_table(
-                                                    self.network_monitor.adjacency_matrix,
-                                                    self.network_monitor.dpids_to_access_port)
-                if self.routeCalculator.pre_path_table != self.routeCalculator.path_table:
+            if self.network_monitor.version != version:
+                version = self.network_monitor.version
+                self.logger.info('***********topology CHANGED***********')
+                changed_pairs = self.routeCalculator.update(self.network_monitor.links,
+                                                            self.network_monitor.dpids_to_access_port)
+                if changed_pairs:
                     self.logger.info('------path_table CHANGED-------')
 
     # install table-miss flow entry for each switch
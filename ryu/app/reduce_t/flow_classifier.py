@@ -18,6 +18,10 @@ class FlowClassifier(object):
     def __init__(self):
         super(FlowClassifier, self).__init__()
         self.active_sample = dict()
+        # {(src_ip,dst_ip):id,...} and [(src_ip,dst_ip),...] of the current
+        # round, see pair_id() and new_round()
+        self.pair_index = dict()
+        self.pairs = list()
         self.data = [[2, 44938.7, 108, 3.0],[2, 1012.0, 92, 3.0],[2, 3168.0, 96, 1.0],[4, 1650.0, 192, 3.0],[2, 134462.0, 101, 1.0],
                      [3, 1518.0, 92, 3.0],[4, 554.4, 170, 6.0],[2, 44776.7, 98, 3.0],[4, 67165.0, 199, 3.0],[2, 137712.0, 108, 1.0],
                      [6, 134090.0, 265, 9.0],[2, 0, 98, 0],[1, 1324.0, 40, 2.0],[4, 44757.3, 176, 3.0],[5, 1353.0, 214, 10.0],
@@ -142,30 +146,85 @@ class FlowClassifier(object):
         {'nw_dst': u'10.0.0.2', 'byte_count': 54, 'duration_sec': 2,
         'packet_count': 1, 'idle_timeout': 10, 'nw_src': u'10.0.0.10'},
         '''
+        pairs, features = self.create_sample_array(self.flows_to_columns(dpid_to_flow))
+        return self.to_sample(pairs, features)
+
+    def to_sample(self, pairs, features):
+        '''
+        create_sample_array() --> {(src_ip,dst_ip):[flow count, max speed, packet count, duration],...}
+        flow count and packet count are ints as in create_sample()
+        '''
         active_sample = dict()
-        for dpid in dpid_to_flow:
-            for flow in dpid_to_flow[dpid]:
-                src_ip = flow["nw_src"]
-                dst_ip = flow["nw_dst"]
-                active_sample.setdefault((src_ip, dst_ip),[0,0,0,0])
-                # flow count
-                active_sample[(src_ip,dst_ip)][0] += 1
-                # max speed
-                duration_sec = float(flow["duration_sec"])
-                if duration_sec > 0.0:
-                    bw = int(flow["byte_count"])/duration_sec
-                    if bw > active_sample[(src_ip,dst_ip)][1]:
-                        active_sample[(src_ip,dst_ip)][1] = bw
-                # packet count
-                active_sample[(src_ip,dst_ip)][2] += int(flow["packet_count"])
-                # byte count
-                # active_sample[(src_ip,dst_ip)][2] += int(flow["byte_count"])
-                # duration
-                duration = float(flow["duration_sec"])
-                if duration > active_sample[(src_ip,dst_ip)][3]:
-                    active_sample[(src_ip,dst_ip)][3] = duration
+        for pair, (count, bw, packet_count, duration) in zip(pairs, features.tolist()):
+            active_sample[pair] = [int(count), bw, int(packet_count), duration]
         return active_sample
 
+    def new_round(self):
+        # forget the pairs of the last round, so that the per pair arrays
+        # are sized by the pairs with flows in this round only
+        self.pair_index = dict()
+        self.pairs = list()
+
+    def pair_id(self, src_ip, dst_ip):
+        # (src_ip,dst_ip) --> row of the per pair arrays of this round
+        pair = (src_ip, dst_ip)
+        i = self.pair_index.get(pair)
+        if i is None:
+            i = self.pair_index[pair] = len(self.pairs)
+            self.pairs.append(pair)
+        return i
+
+    def flows_to_columns(self, dpid_to_flow):
+        '''
+        {dpid:[flow,flow,...],...} --> {column:array}
+        columns: pair (pair_id()), byte_count, packet_count, duration_sec
+        '''
+        flows = [flow for dpid in dpid_to_flow for flow in dpid_to_flow[dpid]]
+        self.new_round()
+        pair_id = self.pair_id
+        return {
+            "pair": np.array([pair_id(flow["nw_src"], flow["nw_dst"]) for flow in flows],
+                             dtype=np.intp),
+            "byte_count": np.array([flow["byte_count"] for flow in flows], dtype=np.float64),
+            "packet_count": np.array([flow["packet_count"] for flow in flows], dtype=np.float64),
+            "duration_sec": np.array([flow["duration_sec"] for flow in flows], dtype=np.float64),
+        }
+
+    def create_sample_array(self, columns):
+        '''
+        same features as create_sample(), as a matrix
+        returns ([(src_ip,dst_ip),...], array of [flow count, max speed, packet count, duration])
+        '''
+        pair = columns["pair"]
+        byte_count = columns["byte_count"]
+        duration = columns["duration_sec"]
+        n = len(self.pairs)
+
+        features = np.zeros((n, 4))
+        # flow count
+        features[:, 0] = np.bincount(pair, minlength=n)
+        # max speed
+        bw = np.zeros(len(pair))
+        np.divide(byte_count, duration, out=bw, where=duration > 0.0)
+        np.maximum.at(features[:, 1], pair, bw)
+        # packet count
+        features[:, 2] = np.bincount(pair, weights=columns["packet_count"], minlength=n)
+        # duration
+        np.maximum.at(features[:, 3], pair, duration)
+
+        # only the pairs with flows, if the round was shared
+        rows = np.flatnonzero(features[:, 0])
+        return [self.pairs[i] for i in rows], features[rows]
+
+    def classify(self, classifier, features):
+        '''
+        apply a trained classifier (e.g. sklearn.svm.SVC) to all the
+        samples of create_sample_array() at once
+        '''
+        if len(features) == 0:
+            return np.zeros(0, dtype=int)
+        return classifier.predict(features)
+
     def get_data(self, data):
         data_array = np.asarray(data)
         return data_array
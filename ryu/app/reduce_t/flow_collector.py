@@ -1,15 +1,22 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
+from ryu.app.ofctl import api as ofctl_api
+from ryu.app.ofctl import exception as ofctl_exception
 from ryu.base import app_manager
+from ryu.lib import hub
 from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
 
 from command_sender import CommandSender
 
 '''
 ###reduce_t###
 --> flow collector
-1) call rest_api and parse json
+1) request stats from all the switches at once through ryu.app.ofctl
+2) call rest_api and parse json (old way)
 '''
 
 class FlowCollector(app_manager.RyuApp):
@@ -29,6 +36,110 @@ class FlowCollector(app_manager.RyuApp):
         #  dpid:[{},{},{]...],...}
         self.dpid_to_flow = dict()
 
+        # seconds to wait for the stats replies of a switch
+        self.REQUEST_TIMEOUT = 5
+
+    def collect_stats_flow(self, dpids):
+        '''
+        flow stats of the switches, requested concurrently
+        {dpid:[{"idle_timeout":...,"packet_count":...,"byte_count":...,},{},{},...],...}
+        '''
+        replies = self._collect(dpids,
+                                lambda dp: dp.ofproto_parser.OFPFlowStatsRequest(dp),
+                                ofproto_v1_3_parser.OFPFlowStatsReply)
+        dpid_to_flow = dict()
+        for dpid in replies:
+            dpid_to_flow[dpid] = self.parse_flow_stats(replies[dpid])
+        return dpid_to_flow
+
+    def collect_flow_columns(self, dpids, pair_id):
+        '''
+        flow stats of the switches as columns for FlowClassifier.create_sample_array()
+        pair_id: FlowClassifier.pair_id, after FlowClassifier.new_round()
+        '''
+        replies = self._collect(dpids,
+                                lambda dp: dp.ofproto_parser.OFPFlowStatsRequest(dp),
+                                ofproto_v1_3_parser.OFPFlowStatsReply)
+        pair = []
+        byte_count = []
+        packet_count = []
+        duration_sec = []
+        for dpid in replies:
+            for reply in replies[dpid]:
+                for stats in reply.body:
+                    match = stats.match
+                    if "tcp_src" in match or "udp_src" in match:
+                        pair.append(pair_id(match.get("ipv4_src"), match.get("ipv4_dst")))
+                        byte_count.append(stats.byte_count)
+                        packet_count.append(stats.packet_count)
+                        duration_sec.append(stats.duration_sec)
+        return {
+            "pair": np.array(pair, dtype=np.intp),
+            "byte_count": np.array(byte_count, dtype=np.float64),
+            "packet_count": np.array(packet_count, dtype=np.float64),
+            "duration_sec": np.array(duration_sec, dtype=np.float64),
+        }
+
+    def collect_aggr_flow(self, dpids):
+        '''
+        aggregate flow stats of the switches, requested concurrently
+        {dpid:OFPAggregateStats,...}
+        '''
+        replies = self._collect(dpids,
+                                self._aggregate_stats_request,
+                                ofproto_v1_3_parser.OFPAggregateStatsReply)
+        dpid_to_aggr = dict()
+        for dpid in replies:
+            for reply in replies[dpid]:
+                dpid_to_aggr[dpid] = reply.body
+        return dpid_to_aggr
+
+    def _aggregate_stats_request(self, datapath):
+        ofproto = datapath.ofproto
+        parser = datapath.ofproto_parser
+        return parser.OFPAggregateStatsRequest(datapath, 0, ofproto.OFPTT_ALL,
+                                               ofproto.OFPP_ANY, ofproto.OFPG_ANY,
+                                               0, 0, parser.OFPMatch())
+
+    def _collect(self, dpids, make_request, reply_cls):
+        # one thread per switch; a round takes about one RTT
+        replies = dict()
+        threads = [hub.spawn(self._request_stats, dpid, make_request, reply_cls, replies)
+                   for dpid in dpids]
+        hub.joinall(threads)
+        return replies
+
+    def _request_stats(self, dpid, make_request, reply_cls, replies):
+        datapath = ofctl_api.get_datapath(self, dpid)
+        if datapath is None:
+            return
+        try:
+            with hub.Timeout(self.REQUEST_TIMEOUT):
+                replies[dpid] = ofctl_api.send_msg(self, make_request(datapath),
+                                                   reply_cls=reply_cls,
+                                                   reply_multi=True)
+        except hub.Timeout:
+            self.logger.warning('stats request to %016x timed out', dpid)
+        except (ofctl_exception.OFError, ofctl_exception.InvalidDatapath) as e:
+            self.logger.warning('stats request to %016x failed: %s', dpid, e)
+
+    def parse_flow_stats(self, replies):
+        # same as parse_stats_flow(), from OFPFlowStatsReply messages
+        flow_list = list()
+        for reply in replies:
+            for stats in reply.body:
+                match = stats.match
+                if "tcp_src" in match or "udp_src" in match:
+                    flow = dict()
+                    flow["idle_timeout"] = stats.idle_timeout
+                    flow["packet_count"] = stats.packet_count
+                    flow["byte_count"] = stats.byte_count
+                    flow["duration_sec"] = stats.duration_sec
+                    flow["nw_src"] = match.get("ipv4_src")
+                    flow["nw_dst"] = match.get("ipv4_dst")
+                    flow_list.append(flow)
+        return flow_list
+
     def request_stats_switches(self):
         res = self.flowSender.get_stats_switches()
         return res.json() #list
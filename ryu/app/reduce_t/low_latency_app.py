@@ -1,8 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-import copy
-
 from ryu.base import app_manager
 from ryu.lib import hub
 from ryu.controller import ofp_event
@@ -71,52 +69,45 @@ class HLApp(app_manager.RyuApp):
         while True:
             hub.sleep(self.DISCOVER_PERIOD)
             total = 0
-            for dpid in self.network_monitor.dpids:
-                res = self.commandSender.get_aggr_flow(dpid).json()
-                count = res[str(dpid)][0]['flow_count']
-                count = int(count)
-                total += count
+            dpid_to_aggr = self.flow_collector.collect_aggr_flow(self.network_monitor.dpids)
+            for dpid in dpid_to_aggr:
+                total += dpid_to_aggr[dpid].flow_count
             file = open('/home/zouyiran/bs/myself/ryu/ryu/app/reduce_t/flow_count.txt','a')
             file.write('flow_count:'+str(total)+'\n')
             file.close()
 
     def _monitor(self):
+        version = 0
         while True:
             hub.sleep(self.DISCOVER_PERIOD)
-            self.network_monitor.pre_adjacency_matrix = copy.deepcopy(self.network_monitor.adjacency_matrix)
-            self.network_monitor.update_topology()
-            if self.network_monitor.pre_adjacency_matrix != self.network_monitor.adjacency_matrix:
-                self.logger.info('***********adjacency_matrix CHANGED***********')
-                self.routeCalculator.pre_path_table = copy.deepcopy(self.routeCalculator.path_table)
-                self.routeCalculator.path_table = self.routeCalculator.get_path_table(
-                                                    self.network_monitor.adjacency_matrix,
-                                                    self.network_monitor.dpids_to_access_port)
-                self.routeCalculator.pre_route_table = copy.deepcopy(self.routeCalculator.route_table)
-                self.routeCalculator.route_table = self.routeCalculator.get_route_table(
-                                                    self.network_monitor.adjacency_matrix,
-                                                    self.network_monitor.dpids_to_access_port)
-                if self.routeCalculator.pre_path_table != self.routeCalculator.path_table:
+            if self.network_monitor.version != version:
+                version = self.network_monitor.version
+                self.logger.info('***********topology CHANGED***********')
+                changed_pairs = self.routeCalculator.update(self.network_monitor.links,
+                                                            self.network_monitor.dpids_to_access_port)
+                if changed_pairs:
                     self.logger.info('------path_table CHANGED-------')
                     self.pathPreInstall.setup_mpls_path(self.routeCalculator.pre_path_table,
-                                                        self.routeCalculator.path_table, self.network_monitor)
+                                                        self.routeCalculator.path_table, self.network_monitor,
+                                                        changed_pairs)
 
     def _collector(self):
         while True:
             hub.sleep(self.COLLECTOR_PERIOD)
             access_dpids = self.network_monitor.access_dpids
             if len(access_dpids) != 0:
-                self.flow_collector.dpid_to_flow.clear()
                 self.flowClassifier.active_sample.clear()
-                for dpid in access_dpids:
-                    self.flow_collector.dpid_to_flow.setdefault(dpid, [])
-                    stats_flow = self.flow_collector.request_stats_flow(dpid)[str(dpid)]
-                    self.flow_collector.dpid_to_flow[dpid] = self.flow_collector.parse_stats_flow(stats_flow)
-            self.flowClassifier.active_sample = self.flowClassifier.create_sample(self.flow_collector.dpid_to_flow)
-            file = open('/home/zouyiran/bs/myself/ryu/ryu/app/reduce_t/flow_classify.txt','a')
-            file.write('\n'+'-------------------flow--classify-------------'+'\n')
+                self.flowClassifier.new_round()
+                columns = self.flow_collector.collect_flow_columns(access_dpids,
+                                                                   self.flowClassifier.pair_id)
+                pairs, features = self.flowClassifier.create_sample_array(columns)
+                self.flowClassifier.active_sample = self.flowClassifier.to_sample(pairs, features)
+            lines = ['', '-------------------flow--classify-------------']
             for i in self.flowClassifier.active_sample:
-                file.write(str(i)+'\n')
-                file.write(str(self.flowClassifier.active_sample[i])+'\n')
+                lines.append(str(i))
+                lines.append(str(self.flowClassifier.active_sample[i]))
+            file = open('/home/zouyiran/bs/myself/ryu/ryu/app/reduce_t/flow_classify.txt','a')
+            file.write('\n'.join(lines)+'\n')
             file.close()
 
     # install table-miss flow entry for each switch
@@ -141,7 +132,7 @@ class HLApp(app_manager.RyuApp):
         dpid = datapath.id
         in_port = msg.match['in_port']
 
-        pkt = packet.Packet(msg.data)
+        pkt = packet.LazyPacket(msg.data)
         eth = pkt.get_protocols(ethernet.ethernet)[0]
         if eth.ethertype == ether_types.ETH_TYPE_LLDP:
             return
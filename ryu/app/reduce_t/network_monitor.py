@@ -1,32 +1,45 @@
 # -*- coding: utf-8 -*-
 
+from collections import deque
+
 import networkx as nx
 
 from ryu.base import app_manager
 from ryu.controller import ofp_event
 from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
 from ryu.controller.handler import set_ev_cls
+from ryu.lib import hub
 from ryu.ofproto import ofproto_v1_3
+from ryu.topology import event
 from ryu.topology.api import get_all_switch, get_all_link
 
 '''
 ###reduce_t###
 --> network topology monitor
+kept up to date by ryu.topology events; every change bumps version and
+is recorded in a change log, see get_changes().
+update_topology() resynchronizes with ryu.topology periodically, in case
+some events were missed
 '''
 
 class NetworkMonitor(app_manager.RyuApp):
 
     OFP_VERSIONS = [ofproto_v1_3.OFP_VERSION]
 
+    # number of changes kept for get_changes()
+    CHANGE_LOG_SIZE = 4096
+    # seconds between update_topology() resyncs
+    RESYNC_PERIOD = 60
+
     def __init__(self, *args, **kwargs):
         super(NetworkMonitor, self).__init__(*args, **kwargs)
         self.name = 'NetworkMonitor'
 
         # {dpid:{port:mac,port:mac,...},dpid:{port:mac,port:mac,...},...} only switches'mac
         self.dpids_port_to_mac = dict()
-        # [dpid,dpid,...]
-        self.dpids = list()
-        self.access_dpids = list()
+        # set([dpid,dpid,...])
+        self.dpids = set()
+        self.access_dpids = set()
 
         # {dpid:dp, dpid:dp, dpid:dp,...}
         self.dpid_to_dp = dict()
@@ -36,20 +49,37 @@ class NetworkMonitor(app_manager.RyuApp):
 
         #{(src_dpid,dst_dpid):(src_port,dst_port),():(),...}
         self.links_dpid_to_port = dict()
-        # [(src_dpid,dst_dpid),(src_dpid,dst_dpid),...]
-        self.links = list()
+        # set([(src_dpid,dst_dpid),(src_dpid,dst_dpid),...])
+        self.links = set()
+        # {src_dpid:set([dst_dpid,dst_dpid,...]),...}
+        self.adjacency = dict()
+        # {dpid:{port:number of links on it},...}
+        self._interior_ports = dict()
 
         # {(dpid,port):host_mac,(dpid,port):host_mac,...} only hosts'mac
         self.dpids_port_to_host = dict()
         #[host_mac,host_mac,host_mac,...]
         self.hosts = list()
 
-        self.adjacency_matrix = dict()
-        self.pre_adjacency_matrix = dict()
+        # bumped on every change of dpids/links/access ports
+        self.version = 0
+        # [(version,op,key),...] op: 'switch_enter'/'switch_leave' (key: dpid),
+        # 'link_add'/'link_delete' (key: (src_dpid,dst_dpid)), 'access_port' (key: dpid)
+        self.change_log = deque(maxlen=self.CHANGE_LOG_SIZE)
 
         self.dpid_ip_to_port = dict() # {dpid:{host_ip:port,host_ip:port,...},...}
         self.access_table = dict() # {(dpid,port):ip,(dpid,port):ip,...}
 
+    def start(self):
+        super(NetworkMonitor, self).start()
+        self.threads.append(hub.spawn(self._resync))
+
+    def _resync(self):
+        while self.is_active:
+            hub.sleep(self.RESYNC_PERIOD)
+            if self.is_active:
+                self.update_topology()
+
     @set_ev_cls(ofp_event.EventOFPStateChange,[MAIN_DISPATCHER, DEAD_DISPATCHER])
     def state_change_handler(self, ev):
         datapath = ev.datapath
@@ -62,107 +92,173 @@ class NetworkMonitor(app_manager.RyuApp):
                 self.logger.info('un register datapath: %04x', datapath.id)
                 del self.dpid_to_dp[datapath.id]
 
+    @set_ev_cls(event.EventSwitchEnter)
+    def switch_enter_handler(self, ev):
+        switch = ev.switch
+        self._switch_enter(switch.dp.id, switch.ports)
+
+    @set_ev_cls(event.EventSwitchLeave)
+    def switch_leave_handler(self, ev):
+        self._switch_leave(ev.switch.dp.id)
+
+    @set_ev_cls(event.EventPortAdd)
+    def port_add_handler(self, ev):
+        port = ev.port
+        if port.dpid in self.dpids and not port.is_reserved():
+            self.dpids_port_to_mac[port.dpid][port.port_no] = port.hw_addr
+            self._update_access_port(port.dpid)
+
+    @set_ev_cls(event.EventPortDelete)
+    def port_delete_handler(self, ev):
+        port = ev.port
+        if port.dpid in self.dpids:
+            self.dpids_port_to_mac[port.dpid].pop(port.port_no, None)
+            self._update_access_port(port.dpid)
+
+    @set_ev_cls(event.EventLinkAdd)
+    def link_add_handler(self, ev):
+        link = ev.link
+        self._link_add(link.src.dpid, link.dst.dpid,
+                       (link.src.port_no, link.dst.port_no))
+
+    @set_ev_cls(event.EventLinkDelete)
+    def link_delete_handler(self, ev):
+        link = ev.link
+        self._link_delete(link.src.dpid, link.dst.dpid)
+
+    def get_changes(self, version):
+        # changes after version: [(op,key),...]
+        # None if they are not in the change log any more
+        if version == self.version:
+            return []
+        if not self.change_log or self.change_log[0][0] > version + 1:
+            return None
+        return [(op, key) for (v, op, key) in self.change_log if v > version]
+
+    def _log_change(self, op, key):
+        self.version += 1
+        self.change_log.append((self.version, op, key))
+
+    def _switch_enter(self, dpid, ports):
+        self.dpids_port_to_mac[dpid] = dict((port.port_no, port.hw_addr) for port in ports)
+        if dpid not in self.dpids:
+            self.dpids.add(dpid)
+            self._log_change('switch_enter', dpid)
+        self._update_access_port(dpid)
+
+    def _switch_leave(self, dpid):
+        if dpid not in self.dpids:
+            return
+        for src in list(self.adjacency.get(dpid, ())):
+            self._link_delete(dpid, src)
+        for (src, dst) in [l for l in self.links if l[1] == dpid]:
+            self._link_delete(src, dst)
+        self.dpids.discard(dpid)
+        self.access_dpids.discard(dpid)
+        self.dpids_port_to_mac.pop(dpid, None)
+        self.dpids_to_access_port.pop(dpid, None)
+        self._interior_ports.pop(dpid, None)
+        self._log_change('switch_leave', dpid)
+
+    def _link_add(self, src, dst, ports):
+        if self.links_dpid_to_port.get((src, dst)) == ports:
+            return
+        if (src, dst) in self.links:
+            self._link_delete(src, dst)
+        self.links_dpid_to_port[(src, dst)] = ports
+        self.links.add((src, dst))
+        self.adjacency.setdefault(src, set()).add(dst)
+        self._log_change('link_add', (src, dst))
+        for (dpid, port) in ((src, ports[0]), (dst, ports[1])):
+            refs = self._interior_ports.setdefault(dpid, {})
+            refs[port] = refs.get(port, 0) + 1
+            if refs[port] == 1:
+                self._update_access_port(dpid)
+
+    def _link_delete(self, src, dst):
+        ports = self.links_dpid_to_port.pop((src, dst), None)
+        if ports is None:
+            return
+        self.links.discard((src, dst))
+        self.adjacency[src].discard(dst)
+        if not self.adjacency[src]:
+            del self.adjacency[src]
+        self._log_change('link_delete', (src, dst))
+        for (dpid, port) in ((src, ports[0]), (dst, ports[1])):
+            refs = self._interior_ports.get(dpid, {})
+            if port in refs:
+                refs[port] -= 1
+                if refs[port] == 0:
+                    del refs[port]
+                    self._update_access_port(dpid)
+
+    def _update_access_port(self, dpid):
+        if dpid not in self.dpids:
+            return
+        interior_ports = self._interior_ports.get(dpid, {})
+        access_ports = [port for port in sorted(self.dpids_port_to_mac[dpid])
+                        if port not in interior_ports]
+        if self.dpids_to_access_port.get(dpid) == access_ports:
+            return
+        self.dpids_to_access_port[dpid] = access_ports
+        if access_ports:
+            self.access_dpids.add(dpid)
+        else:
+            self.access_dpids.discard(dpid)
+        self._log_change('access_port', dpid)
+
     def update_topology(self):
+        # resynchronize with ryu.topology, in case some events were missed
         switch_list = get_all_switch(self)
-        if len(switch_list) != 0:
-            self.dpids_port_to_mac = self._get_dpids_port_to_mac(switch_list)
-            self.dpids = self._get_dpids(switch_list) #[dpid,dpid,dpid,...]
+        switches = dict((switch.dp.id, switch) for switch in switch_list)
+        for dpid in self.dpids - set(switches):
+            self._switch_leave(dpid)
+        for dpid in switches:
+            ports = switches[dpid].ports
+            if (dpid not in self.dpids or
+                    self.dpids_port_to_mac[dpid] != dict((port.port_no, port.hw_addr) for port in ports)):
+                self._switch_enter(dpid, ports)
         link_dict = get_all_link(self)
-        if len(link_dict) != 0:
-            self.links_dpid_to_port = self._get_links_dpid_to_port(link_dict)
-            self.links = self._get_links(self.links_dpid_to_port) #[(src.dpid,dst.dpid),(src.dpid,dst.dpid),...]
-        if self.dpids_port_to_mac and self.links_dpid_to_port:
-            self.dpids_to_access_port = self._get_access_port(self.links_dpid_to_port, self.dpids_port_to_mac)
-            self.access_dpids = self.get_access_dpids(self.dpids_to_access_port)
-        if self.dpids and self.links:
-            self.adjacency_matrix = self._get_adjacency_matrix(self.dpids, self.links)
-
-    def _get_dpids_port_to_mac(self,switch_list):
-        table = dict()
-        for switch in switch_list:
-            dpid = switch.dp.id
-            table.setdefault(dpid,{})
-            ports = switch.ports
-            for port in ports:
-                table[dpid][port.port_no] =  port.hw_addr
-        return table
-
-    def _get_dpids(self,switch_list):
-        dpid_list = list()
-        for switch in switch_list:
-            dpid_list.append(switch.dp.id)
-        return dpid_list
-
-    def _get_links_dpid_to_port(self,link_dict):
-        table = dict()
-        for link in link_dict.keys():
-            src = link.src #ryu.topology.switches.Port
-            dst = link.dst
-            table[(src.dpid,dst.dpid)] = (src.port_no, dst.port_no)
-        return table
-
-    def _get_links(self,link_ports_table):
-        return link_ports_table.keys()
-
-    def _get_access_port(self,links_dpid_to_port, dpids_port_to_mac):
-        table = dict()
-        for dpid in dpids_port_to_mac.keys():
-            table.setdefault(dpid,[])
-            all_ports = self.dpids_port_to_mac[dpid].keys()
-            interior_ports = []
-            for dpid_pair in links_dpid_to_port.keys():
-                if dpid_pair[0] == dpid:
-                    port = links_dpid_to_port[dpid_pair][0]
-                    if port not in interior_ports:
-                        interior_ports.append(port)
-                elif dpid_pair[1] == dpid:
-                    port = links_dpid_to_port[dpid_pair][1]
-                    if port not in interior_ports:
-                        interior_ports.append(port)
-            for each_port in all_ports:
-                if each_port not in interior_ports:
-                    table[dpid].append(each_port)
-        return table # {dpid:[1],dpid:[1,2],dpid:[4],...}
-
-    def get_access_dpids(self, dpids_to_access_port):
-        access_dpids = list()
-        for dpid in dpids_to_access_port.keys():
-            if len(dpids_to_access_port[dpid]) != 0:
-                access_dpids.append(dpid)
-        return access_dpids
-
-    def _get_adjacency_matrix(self,dpids,links):
+        links = dict(((link.src.dpid, link.dst.dpid), (link.src.port_no, link.dst.port_no))
+                     for link in link_dict)
+        for pair in self.links - set(links):
+            self._link_delete(*pair)
+        for pair in links:
+            self._link_add(pair[0], pair[1], links[pair])
+
+    def get_adjacency_matrix(self):
+        # dense form, for debugging
         graph = dict()
-        for src in dpids:
+        for src in self.dpids:
             graph[src] = dict()
-            for dst in dpids:
+            for dst in self.dpids:
                 graph[src][dst] = float('inf')
                 if src == dst:
                     graph[src][dst] = 0
-                elif (src, dst) in links:
+                elif dst in self.adjacency.get(src, ()):
                     graph[src][dst] = 1
         return graph
 
     def get_tree(self):
         g = nx.Graph()
-        for i in self.adjacency_matrix:
-            for j in self.adjacency_matrix[i]:
-                if self.adjacency_matrix[i][j] == 1:
-                    g.add_edge(i, j)
+        for i in self.adjacency:
+            for j in self.adjacency[i]:
+                g.add_edge(i, j)
         tree = nx.minimum_spanning_tree(g)
         return tree
 
 #---------------------Print_to_debug------------------------
     def _show_matrix(self):
-        switch_num = len(self.adjacency_matrix)
+        adjacency_matrix = self.get_adjacency_matrix()
+        switch_num = len(adjacency_matrix)
         print "---------------------adjacency_matrix---------------------"
         print '%10s' % ("switch"),
         for i in range(1, switch_num + 1):
             print '%10d' % i,
         print ""
-        for i in self.adjacency_matrix.keys():
+        for i in adjacency_matrix.keys():
             print '%10d' % i,
-            for j in self.adjacency_matrix[i].values():
+            for j in adjacency_matrix[i].values():
                 print '%10.0f' % j,
             print ""
 
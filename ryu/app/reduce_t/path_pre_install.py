@@ -23,36 +23,31 @@ class PathPreInstall(object):
         self.LABEL_RECYCLE = set()
 
     # delete old mpls_path, add new mpls_path
-    def setup_mpls_path(self, pre_path_table, path_table, network_monitor):
+    # changed_pairs: dpid pairs whose path may differ, all pairs if None
+    def setup_mpls_path(self, pre_path_table, path_table, network_monitor, changed_pairs=None):
         print("...................pre-install flow..................")
-        if len(pre_path_table) == 0 and len(path_table) != 0: # initial
-            # file = open('/home/zouyiran/bs/myself/ryu/ryu/app/reduce_t/path_table.txt','a')
-            # file.write(str(path_table)+'\n')
-            # file.write('\n')
-            # file.close()
+        if not self.mpls_to_path: # initial, no mpls path is installed
             print("...................network initial..................")
             self.LABEL = 0
             self.LABEL_BE_USED.clear()
             self.LABEL_RECYCLE.clear()
-            for path_pair in path_table.keys():
-                path = path_table[path_pair]
-                if len(path) > 0:
-                    self.mpls_to_path[self.LABEL] = path
-                    self.LABEL_BE_USED.add(self.LABEL) # record its mpls label
-                    self.__add_flow(path,self.LABEL, network_monitor)
-                    self.LABEL += 1
-        elif len(pre_path_table) != 0 and len(path_table) == 0:
+        if len(pre_path_table) != 0 and len(path_table) == 0:
             print("...................network disappear..................")
             pass
 
         else: # network change
             print("...................network changed..................")
+            if changed_pairs is None:
+                changed_pairs = set(pre_path_table) | set(path_table)
             delete_path_table = dict()
-            for dpid_pair in pre_path_table:
-                if dpid_pair not in path_table:
-                    delete_path_table[dpid_pair] = pre_path_table[dpid_pair]
-                elif pre_path_table[dpid_pair] != path_table[dpid_pair]:
-                    delete_path_table[dpid_pair] = pre_path_table[dpid_pair]
+            add_path_table = dict()
+            for dpid_pair in changed_pairs:
+                pre_path = pre_path_table.get(dpid_pair, [])
+                path = path_table.get(dpid_pair, [])
+                if pre_path != path:
+                    delete_path_table[dpid_pair] = pre_path
+                    if dpid_pair in path_table:
+                        add_path_table[dpid_pair] = path
             for dpid_pair in delete_path_table:
                 path = delete_path_table[dpid_pair]
                 if len(path) > 0:
@@ -63,12 +58,6 @@ class PathPreInstall(object):
                             del self.mpls_to_path[label]
                             self.__delete_flow(path,label, network_monitor)
                             break
-            add_path_table = dict()
-            for dpid_pair in path_table:
-                if dpid_pair not in pre_path_table:
-                    add_path_table[dpid_pair] = path_table[dpid_pair]
-                elif pre_path_table[dpid_pair] != path_table[dpid_pair]:
-                     add_path_table[dpid_pair] = path_table[dpid_pair]
             for dpid_pair in add_path_table:
                 path = add_path_table[dpid_pair]
                 if len(path) > 0:
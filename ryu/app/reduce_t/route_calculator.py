@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
-import networkx as nx
+from __future__ import print_function
+
+from collections import deque
 
 '''
 ###reduce_t###
@@ -8,6 +10,8 @@ import networkx as nx
 singleton pattern
 1) mpls path calculation
 2) end to end route calculation
+both tables come from one BFS tree per edge switch; on a topology change
+only the trees touched by the added/removed links are rebuilt
 '''
 
 class RouteCalculator(object):
@@ -18,77 +22,124 @@ class RouteCalculator(object):
     def __init__(self):
         super(RouteCalculator, self).__init__()
         # {
-        # (dpid,dpid):[[dpid,dpid,dpid],[dpid,dpid,dpid,dpid],...],
-        # (dpid,dpid):[[dpid,dpid,dpid],[dpid,dpid,dpid,dpid],...],
+        # (dpid,dpid):[dpid,dpid,dpid],
+        # (dpid,dpid):[dpid,dpid,dpid,dpid],
         # ...}
         self.path_table = dict()
-        self.pre_path_table = dict()
         self.route_table = dict()
+        # entries of path_table/route_table before the last update(),
+        # only for the pairs it changed ([] if the pair was new)
+        self.pre_path_table = dict()
         self.pre_route_table = dict()
 
+        self._links = set() # {(src_dpid,dst_dpid),...}
+        self._adjacency = dict() # {dpid:set([dpid,dpid,...]),...}
+        self._edge_dpids = set()
+        # BFS tree per edge switch: {src_dpid:(dist, parent),...}
+        # dist: {dpid:hops}, parent: {dpid:previous dpid on the route}
+        self._trees = dict()
+
     @staticmethod
     def get_instance():
         if not RouteCalculator._instance:
             RouteCalculator._instance = RouteCalculator()
         return RouteCalculator._instance
 
-    def get_path_table(self, matrix, dpids_to_access_port):
-        if matrix:
-            dpids = matrix.keys()
-            g = nx.DiGraph()
-            g.add_nodes_from(dpids)
-            for i in dpids:
-                for j in dpids:
-                    if matrix[i][j] == 1:
-                        g.add_edge(i,j,weight=1)
-            edge_dpids = []
-            for each_dpid in dpids_to_access_port:
-                if len(dpids_to_access_port[each_dpid]) != 0:# only for edge_switches
-                    edge_dpids.append(each_dpid)
-            return self.__graph_to_path(g, edge_dpids)
-
-    def __graph_to_path(self, g, edge_dpids): # {(i,j):[i,k,l,j],(i,j):[],...}
-        path_table = dict()
-        for i in edge_dpids:
-            for j in edge_dpids:
-                if i != j:
-                    path = []
-                    try:
-                        temp = nx.shortest_path(g,i,j)
-                        if len(temp) > 4: # 2
-                            path = temp
-                    except nx.exception.NetworkXNoPath:
-                        pass
-                    path_table[(i,j)] = path
-        return path_table
-
-    def get_route_table(self, matrix, dpids_to_access_port):
-        if matrix:
-            dpids = matrix.keys()
-            g = nx.DiGraph()
-            g.add_nodes_from(dpids)
-            for i in dpids:
-                for j in dpids:
-                    if matrix[i][j] == 1:
-                        g.add_edge(i,j,weight=1)
-            edge_dpids = []
-            for each_dpid in dpids_to_access_port:
-                if len(dpids_to_access_port[each_dpid]) != 0:
-                    edge_dpids.append(each_dpid)
-            return self.__graph_to_route(g, edge_dpids)
-
-    def __graph_to_route(self, g, edge_dpids):
-        route_table = dict()
-        for i in edge_dpids:
-            for j in edge_dpids:
-                if i != j:
-                    route = []
-                    try:
-                        route = nx.shortest_path(g,i,j)
-                    except nx.exception.NetworkXNoPath:
-                        pass
-                    route_table[(i,j)] = route
-        return route_table
+    def update(self, links, dpids_to_access_port):
+        # links: [(src_dpid,dst_dpid),...]
+        # returns the set of (src_dpid,dst_dpid) whose route changed
+        self.pre_path_table = dict()
+        self.pre_route_table = dict()
+
+        links = set(links)
+        added = links - self._links
+        removed = self._links - links
+        for (src, dst) in removed:
+            self._adjacency[src].discard(dst)
+        for (src, dst) in added:
+            self._adjacency.setdefault(src, set()).add(dst)
+        self._links = links
+
+        edge_dpids = set()
+        for each_dpid in dpids_to_access_port:
+            if len(dpids_to_access_port[each_dpid]) != 0:# only for edge_switches
+                edge_dpids.add(each_dpid)
+        old_edge_dpids = self._edge_dpids
+        self._edge_dpids = edge_dpids
+
+        changed = set()
+        for src in old_edge_dpids - edge_dpids:
+            del self._trees[src]
+            for dst in old_edge_dpids:
+                self.__set_route(changed, (src, dst), None)
+                self.__set_route(changed, (dst, src), None)
+
+        new_dpids = edge_dpids - old_edge_dpids
+        for src in edge_dpids:
+            if self.__is_affected(src, added, removed):
+                self._trees[src] = self.__bfs(src)
+                dsts = edge_dpids
+            else:
+                dsts = new_dpids
+            for dst in dsts:
+                if dst != src:
+                    self.__set_route(changed, (src, dst), self.__route(src, dst))
+        return changed
+
+    def __is_affected(self, src, added, removed):
+        if src not in self._trees:
+            return True
+        dist, parent = self._trees[src]
+        for (u, v) in removed:
+            if parent.get(v) == u: # a link of the tree is gone
+                return True
+        for (u, v) in added:
+            if u in dist and (v not in dist or dist[u] + 1 < dist[v]): # shortcut
+                return True
+        return False
+
+    def __bfs(self, src):
+        dist = {src: 0}
+        parent = dict()
+        queue = deque([src])
+        while queue:
+            u = queue.popleft()
+            for v in sorted(self._adjacency.get(u, ())):
+                if v not in dist:
+                    dist[v] = dist[u] + 1
+                    parent[v] = u
+                    queue.append(v)
+        return dist, parent
+
+    def __route(self, src, dst):
+        dist, parent = self._trees[src]
+        if dst not in dist:
+            return []
+        route = [dst]
+        while dst != src:
+            dst = parent[dst]
+            route.append(dst)
+        route.reverse()
+        return route
+
+    def __set_route(self, changed, pair, route):
+        # route None deletes the pair
+        old_route = self.route_table.get(pair)
+        if route == old_route:
+            return
+        if pair not in self.pre_route_table:
+            self.pre_route_table[pair] = old_route or []
+            self.pre_path_table[pair] = self.path_table.get(pair, [])
+        if route is None:
+            self.route_table.pop(pair, None)
+            self.path_table.pop(pair, None)
+        else:
+            self.route_table[pair] = route
+            path = []
+            if len(route) > 4: # 2
+                path = route
+            self.path_table[pair] = path
+        changed.add(pair)
 
     def get_path(self, src_dpid, dst_dpid):
         path = None
@@ -104,9 +155,9 @@ class RouteCalculator(object):
 
 #---------------------Print_to_debug------------------------
     def show_path_table(self):
-        print "---------------------path_table---------------------"
+        print("---------------------path_table---------------------")
         for pair in self.path_table.keys():
             print("pair:",pair)
             for each in self.path_table[pair]:
-                print each,
-            print""
\ No newline at end of file
+                print(each, end=' ')
+            print("")
\ No newline at end of file
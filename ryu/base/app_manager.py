@@ -68,6 +68,49 @@ def unregister_app(app):
     SERVICE_BRICKS.pop(app.name)
 
 
+def _is_batch_handler(handler, ev_cls):
+    callers = getattr(handler, 'callers', {})
+    return ev_cls in callers and callers[ev_cls].batch
+
+
+class _EventQueue(object):
+    """
+    The event queue of a RyuApp, of (event, state) and (list of events,
+    state) given by send_event() and send_events().
+
+    The bound is on the number of events rather than of items, a list
+    counting as many as it has.  put() waits while the queue holds
+    maxsize events or more.
+    """
+
+    def __init__(self, maxsize):
+        super(_EventQueue, self).__init__()
+        self.maxsize = maxsize
+        self._queue = hub.Queue()
+        self._len = 0
+        self._room = hub.Event()
+
+    def put(self, item, count=1):
+        while self._len >= self.maxsize:
+            self._room.clear()
+            self._room.wait()
+        self._len += count
+        self._queue.put((item, count))
+
+    def get(self):
+        item, count = self._queue.get()
+        self._len -= count
+        if self._len < self.maxsize:
+            self._room.set()
+        return item
+
+    def empty(self):
+        return self._queue.empty()
+
+    def qsize(self):
+        return self._len
+
+
 def require_app(app_name, api_style=False):
     """
     Request the application to be automatically loaded.
@@ -155,8 +198,14 @@ class RyuApp(object):
         self.name = self.__class__.__name__
         self.event_handlers = {}        # ev_cls -> handlers:list
         self.observers = {}     # ev_cls -> observer-name -> states:set
+        # caches of get_handlers() and get_observers() results.
+        # cleared whenever handlers or observers are (un)registered.
+        self._handlers_table = {}   # (ev_cls, state) -> handlers:tuple
+        # (ev_cls, state) -> (handlers:tuple, batch handlers:tuple)
+        self._dispatch_table = {}
+        self._observers_table = {}  # (ev_cls, state) -> observer-names:tuple
         self.threads = []
-        self.events = hub.Queue(128)
+        self.events = _EventQueue(128)
         if hasattr(self.__class__, 'LOGGER_NAME'):
             self.logger = logging.getLogger(self.__class__.LOGGER_NAME)
         else:
@@ -184,25 +233,32 @@ class RyuApp(object):
         assert callable(handler)
         self.event_handlers.setdefault(ev_cls, [])
         self.event_handlers[ev_cls].append(handler)
+        self._handlers_table.clear()
+        self._dispatch_table.clear()
 
     def unregister_handler(self, ev_cls, handler):
         assert callable(handler)
         self.event_handlers[ev_cls].remove(handler)
         if not self.event_handlers[ev_cls]:
             del self.event_handlers[ev_cls]
+        self._handlers_table.clear()
+        self._dispatch_table.clear()
 
     def register_observer(self, ev_cls, name, states=None):
         states = states or set()
         ev_cls_observers = self.observers.setdefault(ev_cls, {})
         ev_cls_observers.setdefault(name, set()).update(states)
+        self._observers_table.clear()
 
     def unregister_observer(self, ev_cls, name):
         observers = self.observers.get(ev_cls, {})
         observers.pop(name)
+        self._observers_table.clear()
 
     def unregister_observer_all_event(self, name):
         for observers in self.observers.values():
             observers.pop(name, None)
+        self._observers_table.clear()
 
     def observe_event(self, ev_cls, states=None):
         brick = _lookup_service_brick_by_ev_cls(ev_cls)
@@ -224,30 +280,63 @@ class RyuApp(object):
                       in the specified state.
                       The default is None.
         """
-        ev_cls = ev.__class__
+        return self._get_handlers(ev.__class__, state)
+
+    def _get_handlers(self, ev_cls, state):
+        try:
+            return self._handlers_table[(ev_cls, state)]
+        except KeyError:
+            pass
+
         handlers = self.event_handlers.get(ev_cls, [])
-        if state is None:
-            return handlers
-
-        def test(h):
-            if not hasattr(h, 'callers') or ev_cls not in h.callers:
-                # dynamically registered handlers does not have
-                # h.callers element for the event.
-                return True
-            states = h.callers[ev_cls].dispatchers
-            if not states:
-                # empty states means all states
-                return True
-            return state in states
-
-        return filter(test, handlers)
+        if state is not None:
+            def test(h):
+                if not hasattr(h, 'callers') or ev_cls not in h.callers:
+                    # dynamically registered handlers does not have
+                    # h.callers element for the event.
+                    return True
+                states = h.callers[ev_cls].dispatchers
+                if not states:
+                    # empty states means all states
+                    return True
+                return state in states
+
+            handlers = filter(test, handlers)
+
+        handlers = tuple(handlers)
+        self._handlers_table[(ev_cls, state)] = handlers
+        return handlers
+
+    def _get_dispatch_handlers(self, ev_cls, state):
+        # split handlers into ones taking an event and ones taking
+        # a list of events.
+        try:
+            return self._dispatch_table[(ev_cls, state)]
+        except KeyError:
+            pass
+
+        handlers = self._get_handlers(ev_cls, state)
+        dispatch = (tuple(h for h in handlers
+                          if not _is_batch_handler(h, ev_cls)),
+                    tuple(h for h in handlers
+                          if _is_batch_handler(h, ev_cls)))
+        self._dispatch_table[(ev_cls, state)] = dispatch
+        return dispatch
 
     def get_observers(self, ev, state):
+        ev_cls = ev.__class__
+        try:
+            return self._observers_table[(ev_cls, state)]
+        except KeyError:
+            pass
+
         observers = []
-        for k, v in self.observers.get(ev.__class__, {}).items():
+        for k, v in self.observers.get(ev_cls, {}).items():
             if not state or not v or state in v:
                 observers.append(k)
 
+        observers = tuple(observers)
+        self._observers_table[(ev_cls, state)] = observers
         return observers
 
     def send_request(self, req):
@@ -271,13 +360,34 @@ class RyuApp(object):
             ev, state = self.events.get()
             if ev == self._event_stop:
                 continue
-            handlers = self.get_handlers(ev, state)
+            if isinstance(ev, list):
+                # a batch of events queued by _send_events
+                self._dispatch_events(ev, state)
+                continue
+            handlers, batch_handlers = self._get_dispatch_handlers(
+                ev.__class__, state)
             for handler in handlers:
                 handler(ev)
+            for handler in batch_handlers:
+                handler([ev])
+
+    def _dispatch_events(self, evs, state):
+        for ev_cls, group in itertools.groupby(evs, lambda ev: ev.__class__):
+            group = list(group)
+            handlers, batch_handlers = self._get_dispatch_handlers(ev_cls,
+                                                                   state)
+            for ev in group:
+                for handler in handlers:
+                    handler(ev)
+            for handler in batch_handlers:
+                handler(group)
 
     def _send_event(self, ev, state):
         self.events.put((ev, state))
 
+    def _send_events(self, evs, state):
+        self.events.put((evs, state), len(evs))
+
     def send_event(self, name, ev, state=None):
         """
         Send the specified event to the RyuApp instance specified by name.
@@ -293,6 +403,22 @@ class RyuApp(object):
             LOG.debug("EVENT LOST %s->%s %s",
                       self.name, name, ev.__class__.__name__)
 
+    def send_events(self, name, evs, state=None):
+        """
+        Send the specified list of events to the RyuApp instance specified
+        by name at once.
+        Handlers declared with batch=True receive the consecutive events of
+        the same class as one list.  Other handlers receive them one by one.
+        """
+
+        if name in SERVICE_BRICKS:
+            LOG.debug("EVENTS %s->%s %d events",
+                      self.name, name, len(evs))
+            SERVICE_BRICKS[name]._send_events(evs, state)
+        else:
+            LOG.debug("EVENTS LOST %s->%s %d events",
+                      self.name, name, len(evs))
+
     def  send_event_to_observers(self, ev, state=None):
         """
         Send the specified event to all observers of this RyuApp.
@@ -301,6 +427,20 @@ class RyuApp(object):
         for observer in self.get_observers(ev, state):
             self.send_event(observer, ev, state)
 
+    def send_events_to_observers(self, evs, state=None):
+        """
+        Send the specified list of events to all observers of this RyuApp.
+        Each observer receives the events it observes at once.
+        (Cf. send_events)
+        """
+
+        batches = {}
+        for ev in evs:
+            for observer in self.get_observers(ev, state):
+                batches.setdefault(observer, []).append(ev)
+        for observer, batch in batches.items():
+            self.send_events(observer, batch, state)
+
     def reply_to_request(self, req, rep):
         """
         Send a reply for a synchronous request sent by send_request.
@@ -41,6 +41,7 @@ from ryu import version
 from ryu.app import wsgi
 from ryu.base.app_manager import AppManager
 from ryu.controller import controller
+from ryu.controller import shard
 from ryu.topology import switches
 
 
@@ -54,6 +55,9 @@ CONF.register_cli_opts([
     cfg.BoolOpt('enable-debugger', default=False,
                 help='don\'t overwrite Python standard threading library'
                 '(use only for debugging)'),
+    cfg.IntOpt('workers', default=0,
+               help='number of worker processes among which switches are '
+                    'distributed (0 means a single process)'),
 ])
 
 
@@ -80,6 +84,17 @@ def main(args=None, prog=None):
         with open(CONF.pid_file, 'w') as pid_file:
             pid_file.write(str(os.getpid()))
 
+    if CONF.workers > 0:
+        if not shard.supported():
+            # connections are handed over with socket.sendmsg()
+            sys.exit('--workers requires Python 3.3 or later')
+        if CONF.ctl_privkey is not None:
+            # an established TLS session can't be passed to another process
+            sys.exit('--workers can not be used with SSL')
+        if not shard.fork_workers(CONF.workers):
+            # master process; all workers have exited.
+            return
+
     app_lists = CONF.app_lists + CONF.app
     # keep old behaivor, run ofp if no application is specified.
     if not app_lists:
@@ -90,8 +105,10 @@ def main(args=None, prog=None):
     contexts = app_mgr.create_contexts()
     services = []
     services.extend(app_mgr.instantiate_apps(**contexts))
+    services.extend(shard.start())
 
-    webapp = wsgi.start_service(app_mgr)
+    # only one of the workers serves the REST API.
+    webapp = shard.is_primary() and wsgi.start_service(app_mgr)
     if webapp:
         thr = hub.spawn(webapp)
         services.append(thr)
@@ -30,6 +30,8 @@ from ryu.lib.hub import StreamServer
 import traceback
 import random
 import ssl
+import struct
+import time
 from socket import IPPROTO_TCP, TCP_NODELAY
 import warnings
 
@@ -43,6 +45,7 @@ from ryu.ofproto import nx_match
 
 from ryu.controller import handler
 from ryu.controller import ofp_event
+from ryu.controller import shard
 
 from ryu.lib.dpid import dpid_to_str
 
@@ -58,9 +61,24 @@ CONF.register_cli_opts([
     cfg.StrOpt('ctl-privkey', default=None, help='controller private key'),
     cfg.StrOpt('ctl-cert', default=None, help='controller certificate'),
     cfg.StrOpt('ca-certs', default=None, help='CA certificates'),
-    cfg.FloatOpt('socket-timeout', default=5.0, help='Time, in seconds, to await completion of socket operations.')
+    cfg.FloatOpt('socket-timeout', default=5.0, help='Time, in seconds, to await completion of socket operations.'),
+    cfg.IntOpt('ofp-send-queue-size', default=16,
+               help='maximum number of messages queued for a switch'),
+    cfg.IntOpt('ofp-send-queue-bytes', default=0,
+               help='maximum number of bytes queued for a switch '
+                    '(0 means no limit)')
 ])
 
+# The length field of the OpenFlow header is 16 bits wide, so a single
+# message never exceeds this size.
+OFP_MAX_MSG_LEN = 0xffff
+
+_OFP_HEADER = struct.Struct(ofproto_common.OFP_HEADER_PACK_STR)
+
+# datapath_id follows the header in OFPT_FEATURES_REPLY of all versions.
+_OFP_FEATURES_REPLY_DPID = struct.Struct('!Q')
+_OFPT_FEATURES_REPLY = 6
+
 
 class OpenFlowController(object):
     def __init__(self):
@@ -72,6 +90,10 @@ class OpenFlowController(object):
         self.server_loop()
 
     def server_loop(self):
+        # in sharded mode, all workers listen on the same port.
+        shard.set_datapath_handler(datapath_connection_factory)
+        reuse_port = shard.enabled()
+
         if CONF.ctl_privkey is not None and CONF.ctl_cert is not None:
             if CONF.ca_certs is not None:
                 server = StreamServer((CONF.ofp_listen_host,
@@ -92,7 +114,8 @@ class OpenFlowController(object):
         else:
             server = StreamServer((CONF.ofp_listen_host,
                                    CONF.ofp_tcp_listen_port),
-                                  datapath_connection_factory)
+                                  datapath_connection_factory,
+                                  reuse_port=reuse_port)
 
         # LOG.debug('loop')
         server.serve_forever()
@@ -122,12 +145,23 @@ class Datapath(ofproto_protocol.ProtocolDesc):
 
         # The limit is arbitrary. We need to limit queue size to
         # prevent it from eating memory up
-        self.send_q = hub.Queue(16)
+        self.send_q = hub.Queue(CONF.ofp_send_queue_size)
+        self.send_q_bytes = 0
+        self._send_q_space = hub.Event()
+        self.send_stats = {
+            'bytes': 0,          # bytes written to the socket
+            'messages': 0,       # messages written to the socket
+            'batches': 0,        # socket writes
+            'blocked_time': 0.0,  # seconds senders waited for queue space
+        }
 
         self.xid = random.randint(0, self.ofproto.MAX_XID)
         self.id = None  # datapath_id is unknown yet
         self._ports = None
         self.flow_format = ofproto_v1_0.NXFF_OPENFLOW10
+        # data received by another worker before handing this
+        # connection over (sharded mode)
+        self._recv_pending = None
         self.ofp_brick = ryu.base.app_manager.lookup_service_brick('ofp_event')
         self.set_state(handler.HANDSHAKE_DISPATCHER)
 
@@ -160,52 +194,126 @@ class Datapath(ofproto_protocol.ProtocolDesc):
         ev.state = state
         self.ofp_brick.send_event_to_observers(ev, state)
 
+    def take_over(self, version, data):
+        """Continues a connection handed over by another worker.
+
+        The handshake has been done with the given version and data is
+        what has been received but not processed, starting with
+        OFPT_FEATURES_REPLY.
+        """
+        self.set_version(version)
+        self._recv_pending = data
+        self.set_state(handler.CONFIG_DISPATCHER)
+
+    def _is_foreign_datapath(self, buf, offset, msg_type):
+        # In sharded mode, the datapath id tells which worker should
+        # serve the connection.
+        if (not shard.enabled() or msg_type != _OFPT_FEATURES_REPLY or
+                self.state != handler.CONFIG_DISPATCHER):
+            return False
+        (dpid,) = _OFP_FEATURES_REPLY_DPID.unpack_from(
+            buf, offset + ofproto_common.OFP_HEADER_SIZE)
+        if shard.is_local_datapath(dpid):
+            shard.register_datapath()
+            return False
+        return True
+
+    def _hand_off(self, data):
+        (dpid,) = _OFP_FEATURES_REPLY_DPID.unpack_from(
+            data, ofproto_common.OFP_HEADER_SIZE)
+        # let _send_loop write out what is queued for the switch.
+        while self.send_q and self.send_q_bytes:
+            hub.sleep(0)
+        shard.hand_off(self.socket, self.address, dpid,
+                       self.ofproto.OFP_VERSION, data)
+        self.socket.close()
+
     # Low level socket handling layer
     @_deactivate
     def _recv_loop(self):
-        buf = bytearray()
-        required_len = ofproto_common.OFP_HEADER_SIZE
+        # Received data is read straight into a preallocated buffer and
+        # OpenFlow messages are framed by offsets into it, so the unparsed
+        # data is never re-sliced per message.  The buffer can hold two
+        # messages of the maximum size; once the write offset passes its
+        # middle, the (partial) message at the head is moved to the front.
+        buf = bytearray(2 * (OFP_MAX_MSG_LEN + 1))
+        view = memoryview(buf)
+        compact_limit = len(buf) - (OFP_MAX_MSG_LEN + 1)
+        begin = end = 0  # unparsed data is buf[begin:end]
+        header_size = ofproto_common.OFP_HEADER_SIZE
+        unpack_header = _OFP_HEADER.unpack_from
+
+        pending, self._recv_pending = self._recv_pending, None
+        if pending:
+            buf[:len(pending)] = pending
 
         count = 0
         while True:
-            ret = ""
-
-            try:
-                ret = self.socket.recv(required_len)
-            except:
-                # Hit socket timeout; decide what to do.
-                if self.close_requested:
-                    pass
-                else:
-                    continue
-
-            if (len(ret) == 0) or (self.close_requested):
+            if end > compact_limit:
+                remain = end - begin
+                buf[:remain] = view[begin:end].tobytes()
+                begin, end = 0, remain
+
+            ret = 0
+            if pending:
+                # already in the buffer
+                ret = len(pending)
+                pending = None
+            else:
+                try:
+                    ret = self.socket.recv_into(view[end:])
+                except:
+                    # Hit socket timeout; decide what to do.
+                    if self.close_requested:
+                        pass
+                    else:
+                        continue
+
+            if (ret == 0) or (self.close_requested):
                 self.socket.close()
                 break
 
-            buf += ret
-            while len(buf) >= required_len:
-                (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
-                required_len = msg_len
-                if len(buf) < required_len:
+            end += ret
+            # events for the messages in this chunk, delivered to the
+            # observers as one batch.
+            evs = []
+            while end - begin >= header_size:
+                (version, msg_type, msg_len, xid) = unpack_header(buf, begin)
+                if end - begin < msg_len:
                     break
 
+                if self._is_foreign_datapath(buf, begin, msg_type):
+                    if evs:
+                        self.ofp_brick.send_events_to_observers(evs,
+                                                                self.state)
+                    self._hand_off(view[begin:end].tobytes())
+                    return
+
+                # The parsed message keeps references to its raw data
+                # (e.g. msg.buf), so it gets its own copy of this message
+                # rather than a view which would be overwritten later.
                 msg = ofproto_parser.msg(
-                    self, version, msg_type, msg_len, xid, buf[:msg_len])
+                    self, version, msg_type, msg_len, xid,
+                    view[begin:begin + msg_len].tobytes())
                 # LOG.debug('queue msg %s cls %s', msg, msg.__class__)
                 if msg:
                     ev = ofp_event.ofp_msg_to_ev(msg)
-                    self.ofp_brick.send_event_to_observers(ev, self.state)
+                    evs.append(ev)
 
                     dispatchers = lambda x: x.callers[ev.__class__].dispatchers
                     handlers = [handler for handler in
                                 self.ofp_brick.get_handlers(ev) if
                                 self.state in dispatchers(handler)]
+                    if handlers:
+                        # The handlers may change the state or send events.
+                        # Deliver the pending events first to keep the order.
+                        self.ofp_brick.send_events_to_observers(evs,
+                                                                self.state)
+                        evs = []
                     for handler in handlers:
                         handler(ev)
 
-                buf = buf[required_len:]
-                required_len = ofproto_common.OFP_HEADER_SIZE
+                begin += msg_len
 
                 # We need to schedule other greenlets. Otherwise, ryu
                 # can't accept new switches or handle the existing
@@ -214,14 +322,40 @@ class Datapath(ofproto_protocol.ProtocolDesc):
                 count += 1
                 if count > 2048:
                     count = 0
+                    if evs:
+                        self.ofp_brick.send_events_to_observers(evs,
+                                                                self.state)
+                        evs = []
                     hub.sleep(0)
 
+            if evs:
+                self.ofp_brick.send_events_to_observers(evs, self.state)
+
+            if begin == end:
+                begin = end = 0
+
     @_deactivate
     def _send_loop(self):
         try:
             while self.send_active:
-                buf = self.send_q.get()
+                # Drain everything queued so far and write it at once.
+                bufs = [self.send_q.get()]
+                try:
+                    while True:
+                        bufs.append(self.send_q.get(block=False))
+                except hub.QueueEmpty:
+                    pass
+                if len(bufs) == 1:
+                    buf = bufs[0]
+                else:
+                    buf = bytearray().join(bufs)
+                self.send_q_bytes -= len(buf)
+                self._send_q_space.set()
+
                 self.socket.sendall(buf)
+                self.send_stats['bytes'] += len(buf)
+                self.send_stats['messages'] += len(bufs)
+                self.send_stats['batches'] += 1
         except IOError as ioe:
             LOG.debug("Socket error while sending data to switch at address %s: [%d] %s",
                       self.address, ioe.errno, ioe.strerror)
@@ -229,8 +363,10 @@ class Datapath(ofproto_protocol.ProtocolDesc):
             q = self.send_q
             # first, clear self.send_q to prevent new references.
             self.send_q = None
-            # there might be threads currently blocking in send_q.put().
+            # there might be threads currently blocking in send_q.put()
+            # or waiting for the queued bytes to decrease.
             # unblock them by draining the queue.
+            self._send_q_space.set()
             try:
                 while q.get(block=False):
                     pass
@@ -238,15 +374,34 @@ class Datapath(ofproto_protocol.ProtocolDesc):
                 pass
 
     def send(self, buf):
+        if not self.send_q:
+            return
+        max_bytes = CONF.ofp_send_queue_bytes
+        start = None
+        if self.send_q.full() or (max_bytes and
+                                  self.send_q_bytes >= max_bytes):
+            start = time.time()
+        # byte based backpressure; wait until _send_loop drains the queue.
+        while self.send_q and max_bytes and self.send_q_bytes >= max_bytes:
+            self._send_q_space.clear()
+            self._send_q_space.wait()
         if self.send_q:
+            self.send_q_bytes += len(buf)
+            # this blocks while the queue is full.
             self.send_q.put(buf)
+        if start is not None:
+            self.send_stats['blocked_time'] += time.time() - start
 
-    def set_xid(self, msg):
+    def next_xid(self):
         self.xid += 1
         self.xid &= self.ofproto.MAX_XID
-        msg.set_xid(self.xid)
         return self.xid
 
+    def set_xid(self, msg):
+        xid = self.next_xid()
+        msg.set_xid(xid)
+        return xid
+
     def send_msg(self, msg):
         assert isinstance(msg, self.ofproto_parser.MsgBase)
         if msg.xid is None:
@@ -258,9 +413,10 @@ class Datapath(ofproto_protocol.ProtocolDesc):
     def serve(self):
         send_thr = hub.spawn(self._send_loop)
 
-        # send hello message immediately
-        hello = self.ofproto_parser.OFPHello(self)
-        self.send_msg(hello)
+        if self.state == handler.HANDSHAKE_DISPATCHER:
+            # send hello message immediately
+            hello = self.ofproto_parser.OFPHello(self)
+            self.send_msg(hello)
 
         try:
             self._recv_loop()
@@ -339,9 +495,11 @@ class Datapath(ofproto_protocol.ProtocolDesc):
         return port_no > self.ofproto.OFPP_MAX
 
 
-def datapath_connection_factory(socket, address):
+def datapath_connection_factory(socket, address, takeover=None):
     LOG.debug('connected socket:%s address:%s', socket, address)
     with contextlib.closing(Datapath(socket, address)) as datapath:
+        if takeover is not None:
+            datapath.take_over(*takeover)
         try:
             datapath.serve()
         except:
@@ -355,3 +513,6 @@ def datapath_connection_factory(socket, address):
                 dpid_str = dpid_to_str(datapath.id)
             LOG.error("Error in the datapath %s from %s", dpid_str, address)
             raise
+        finally:
+            if datapath.id is not None:
+                shard.unregister_datapath()
@@ -169,6 +169,27 @@ class DPSet(app_manager.RyuApp):
         """
         return list(self.dps.items())
 
+    def get_send_stats(self, dp_id):
+        """
+        This method returns a dictionary of the send path counters of the
+        ryu.controller.controller.Datapath instance for the given
+        Datapath ID.
+        Raises KeyError if no such a datapath connected to this controller.
+        A return value looks like the following:
+
+            {'bytes': 1024, 'messages': 12, 'batches': 3,
+             'blocked_time': 0.0, 'queued_messages': 0, 'queued_bytes': 0}
+
+        'batches' is the number of socket writes, each of which carries
+        all the messages queued at that time.  'blocked_time' is the total
+        time, in seconds, senders waited for the send queue to have room.
+        """
+        dp = self.dps[dp_id]
+        stats = dict(dp.send_stats)
+        stats['queued_messages'] = dp.send_q.qsize() if dp.send_q else 0
+        stats['queued_bytes'] = dp.send_q_bytes
+        return stats
+
     def _port_added(self, datapath, port):
         self.port_state[datapath.id].add(port.port_no, port)
 
@@ -31,7 +31,7 @@ class _Caller(object):
     """Describe how to handle an event class.
     """
 
-    def __init__(self, dispatchers, ev_source):
+    def __init__(self, dispatchers, ev_source, batch=False):
         """Initialize _Caller.
 
         :param dispatchers: A list of states or a state, in which this
@@ -40,28 +40,39 @@ class _Caller(object):
         :param ev_source: The module which generates the event.
                           ev_cls.__module__ for set_ev_cls.
                           None for set_ev_handler.
+        :param batch: True if the handler takes a list of events
+                      instead of a single event.
         """
         self.dispatchers = dispatchers
         self.ev_source = ev_source
+        self.batch = batch
 
 
 # should be named something like 'observe_event'
-def set_ev_cls(ev_cls, dispatchers=None):
+def set_ev_cls(ev_cls, dispatchers=None, batch=False):
+    """
+    A decorator for Ryu application to declare an event handler.
+
+    If batch is True, the handler is called with a list of events of
+    ev_cls which were delivered together (e.g. the OpenFlow messages
+    received from a switch at once) instead of a single event.
+    """
     def _set_ev_cls_dec(handler):
         if 'callers' not in dir(handler):
             handler.callers = {}
         for e in _listify(ev_cls):
-            handler.callers[e] = _Caller(_listify(dispatchers), e.__module__)
+            handler.callers[e] = _Caller(_listify(dispatchers), e.__module__,
+                                         batch)
         return handler
     return _set_ev_cls_dec
 
 
-def set_ev_handler(ev_cls, dispatchers=None):
+def set_ev_handler(ev_cls, dispatchers=None, batch=False):
     def _set_ev_cls_dec(handler):
         if 'callers' not in dir(handler):
             handler.callers = {}
         for e in _listify(ev_cls):
-            handler.callers[e] = _Caller(_listify(dispatchers), None)
+            handler.callers[e] = _Caller(_listify(dispatchers), None, batch)
         return handler
     return _set_ev_cls_dec
 
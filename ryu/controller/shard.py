@@ -0,0 +1,370 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Sharded controller mode.
+
+ryu-manager --workers N forks N worker processes which run the same
+applications and listen on the same OpenFlow port (SO_REUSEPORT).
+Each datapath is owned by exactly one worker, chosen by a hash of its
+datapath id.  A worker which accepts a connection for a datapath owned
+by another worker hands the connection over to the owner once the
+datapath id is known (i.e. on OFPT_FEATURES_REPLY) by passing the file
+descriptor through the master process.
+
+The master process relays records among the workers over AF_UNIX
+SOCK_SEQPACKET channels:
+
+- ('event', brick name, event) sent by a worker with send_event() is
+  delivered to the observers of the same brick in the other workers.
+  e.g. the switches app forwards the topology events, from which the
+  other workers learn the switches they don't serve.
+- ('handoff', owner, (address, family, version, data)) with a file
+  descriptor is passed to the owner as ('adopt', (...)).
+- ('stats', stats) is logged by the master.
+"""
+
+import array
+import errno
+import importlib
+import logging
+import os
+import pickle
+import select
+import signal
+import socket
+import struct
+import zlib
+
+from ryu.base import app_manager
+from ryu.lib import hub
+
+
+LOG = logging.getLogger('ryu.controller.shard')
+
+# records are pickled objects; large enough for any topology event.
+_MAX_RECORD = 256 * 1024
+_FD_SIZE = array.array('i').itemsize
+
+# interval, in seconds, at which workers report their stats
+STATS_INTERVAL = 10
+
+_num_workers = 0     # 0 means sharding is disabled
+_worker_index = None
+_channel = None      # worker: channel to the master
+_datapath_handler = None
+_stats = {
+    'datapaths': 0,      # datapaths served by this worker
+    'handoffs_out': 0,   # connections handed over to other workers
+    'handoffs_in': 0,    # connections taken over from other workers
+    'events_out': 0,     # events sent to other workers
+    'events_in': 0,      # events received from other workers
+}
+
+
+def supported():
+    """True if the interpreter can pass the connections among workers,
+    i.e. has socket.sendmsg() (Python 3.3 or later).
+    """
+    return hasattr(socket.socket, 'sendmsg')
+
+
+def enabled():
+    return _num_workers > 0
+
+
+def worker_index():
+    return _worker_index
+
+
+def is_primary():
+    """True if this process runs the services which must not be
+    duplicated (e.g. the wsgi server).
+    """
+    return _worker_index in (None, 0)
+
+
+def owner(dpid, num_workers=None):
+    """Returns the index of the worker which owns the datapath."""
+    if num_workers is None:
+        num_workers = _num_workers
+    return (zlib.crc32(struct.pack('!Q', dpid)) & 0xffffffff) % num_workers
+
+
+def is_local_datapath(dpid):
+    return not enabled() or owner(dpid) == _worker_index
+
+
+def get_stats():
+    return dict(_stats)
+
+
+def register_datapath():
+    if enabled():
+        _stats['datapaths'] += 1
+
+
+def unregister_datapath():
+    if enabled():
+        _stats['datapaths'] -= 1
+
+
+def set_datapath_handler(handler):
+    """Sets the function called for a connection taken over from
+    another worker, as handler(socket, address, takeover=(version, data)).
+    """
+    global _datapath_handler
+    _datapath_handler = handler
+
+
+class RemoteDatapath(object):
+    # Stands in for a Datapath in events received from another worker.
+    def __init__(self, id_, ofproto):
+        super(RemoteDatapath, self).__init__()
+        self.id = id_
+        self.ofproto = ofproto
+
+    def __getstate__(self):
+        # ofproto modules can't be pickled; keep the name instead.
+        return {'id': self.id, 'ofproto': self.ofproto.__name__}
+
+    def __setstate__(self, state):
+        self.id = state['id']
+        self.ofproto = importlib.import_module(state['ofproto'])
+
+    def __str__(self):
+        return 'RemoteDatapath<id=%s>' % self.id
+
+
+#
+# channel: pickled records (optionally with a file descriptor) over
+# SOCK_SEQPACKET sockets.
+#
+def _channel_pair():
+    return socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+
+
+def _send(sock, record, fd=None):
+    data = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+    if len(data) > _MAX_RECORD:
+        raise ValueError('record too large: %d bytes' % len(data))
+    ancdata = []
+    if fd is not None:
+        ancdata = [(socket.SOL_SOCKET, socket.SCM_RIGHTS,
+                    array.array('i', [fd]).tobytes())]
+    while True:
+        try:
+            sock.sendmsg([data], ancdata)
+            return
+        except socket.error as e:
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise
+        select.select([], [sock], [])
+
+
+def _recv(sock):
+    """Returns (record, fd).  record is None if the peer has closed."""
+    while True:
+        try:
+            data, ancdata, _flags, _addr = sock.recvmsg(
+                _MAX_RECORD, socket.CMSG_SPACE(_FD_SIZE))
+            break
+        except socket.error as e:
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise
+        select.select([sock], [], [])
+
+    fd = None
+    for level, type_, cdata in ancdata:
+        if level == socket.SOL_SOCKET and type_ == socket.SCM_RIGHTS:
+            fds = array.array('i')
+            fds.frombytes(cdata[:len(cdata) - len(cdata) % _FD_SIZE])
+            fd = fds[0]
+    if not data:
+        return None, fd
+    return pickle.loads(data), fd
+
+
+#
+# master
+#
+def fork_workers(num_workers):
+    """Forks the worker processes.
+
+    Returns True in the workers.  The master relays the records among
+    the workers until all of them have exited and then returns False.
+    """
+    global _num_workers
+
+    assert num_workers > 0
+    _num_workers = num_workers
+    channels = []
+    pids = {}
+    for i in range(num_workers):
+        parent, child = _channel_pair()
+        pid = os.fork()
+        if pid == 0:
+            for c in channels:
+                c.close()
+            parent.close()
+            _init_worker(i, child)
+            return True
+        child.close()
+        channels.append(parent)
+        pids[pid] = i
+        LOG.info('worker %d started (pid %d)', i, pid)
+
+    threads = [hub.spawn(_relay, i, channels) for i in range(num_workers)]
+    try:
+        while pids:
+            pid, status = os.waitpid(-1, 0)
+            if pid in pids:
+                LOG.info('worker %d exited (status %d)', pids.pop(pid),
+                         status)
+    except KeyboardInterrupt:
+        for pid in pids:
+            os.kill(pid, signal.SIGTERM)
+    finally:
+        for thr in threads:
+            hub.kill(thr)
+        hub.joinall(threads)
+        for c in channels:
+            c.close()
+    return False
+
+
+def _relay(index, channels):
+    sock = channels[index]
+    while True:
+        record, fd = _recv(sock)
+        if record is None:
+            break
+        try:
+            kind = record[0]
+            if kind == 'event':
+                for i, c in enumerate(channels):
+                    if i != index:
+                        _send(c, record)
+            elif kind == 'handoff':
+                _kind, dst, args = record
+                _send(channels[dst], ('adopt', args), fd)
+            elif kind == 'stats':
+                _kind, stats = record
+                LOG.info('worker %d: %s', index,
+                         ' '.join('%s=%s' % (k, stats[k])
+                                  for k in sorted(stats)))
+        except socket.error as e:
+            LOG.error('worker %d: failed to relay %s: %s',
+                      index, record[0], e)
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+
+#
+# worker
+#
+def _init_worker(index, channel):
+    global _worker_index, _channel
+    _worker_index = index
+    _channel = channel
+
+
+def start():
+    """Starts the threads which exchange records with the master.
+    Returns them to be joined, or an empty list if sharding is disabled.
+    """
+    if not enabled():
+        return []
+    return [hub.spawn(_recv_loop), hub.spawn(_stats_loop)]
+
+
+def send_event(brick_name, ev):
+    """Delivers an event to the observers of the brick in the other
+    workers.  Does nothing if sharding is disabled.
+    """
+    if not enabled():
+        return
+    try:
+        _send(_channel, ('event', brick_name, ev))
+    except (socket.error, ValueError, pickle.PicklingError) as e:
+        LOG.error('failed to send %s to the other workers: %s',
+                  ev.__class__.__name__, e)
+        return
+    _stats['events_out'] += 1
+
+
+def hand_off(sock, address, dpid, version, data):
+    """Passes a connection to the worker which owns the datapath.
+
+    data is what has been received but not processed yet.
+    """
+    dst = owner(dpid)
+    LOG.debug('hand off datapath %016x to worker %d', dpid, dst)
+    _send(_channel, ('handoff', dst, (address, int(sock.family), version, data)),
+          sock.fileno())
+    _stats['handoffs_out'] += 1
+
+
+def _deliver_event(brick_name, ev):
+    brick = app_manager.lookup_service_brick(brick_name)
+    if brick is None:
+        return
+    # not brick.send_event_to_observers(), which may send it back to
+    # the other workers.
+    for observer in brick.get_observers(ev, None):
+        brick.send_event(observer, ev)
+
+
+def _adopt(fd, address, family, version, data):
+    if fd is None:
+        LOG.error('no file descriptor for connection from %s', address)
+        return
+    sock = socket.socket(family, socket.SOCK_STREAM, 0, fd)
+    if _datapath_handler is None:
+        LOG.error('no datapath handler; connection from %s dropped',
+                  address)
+        sock.close()
+        return
+    _stats['handoffs_in'] += 1
+    hub.spawn(_datapath_handler, sock, address,
+              takeover=(version, data))
+
+
+def _recv_loop():
+    while True:
+        record, fd = _recv(_channel)
+        if record is None:
+            LOG.error('channel to the master closed')
+            break
+        kind = record[0]
+        if kind == 'event':
+            _kind, brick_name, ev = record
+            _stats['events_in'] += 1
+            _deliver_event(brick_name, ev)
+        elif kind == 'adopt':
+            _kind, args = record
+            _adopt(fd, *args)
+        elif fd is not None:
+            os.close(fd)
+
+
+def _stats_loop():
+    while True:
+        hub.sleep(STATS_INTERVAL)
+        try:
+            _send(_channel, ('stats', get_stats()))
+        except socket.error:
+            break
@@ -14,6 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import binascii
+import socket
+
 import netaddr
 
 
@@ -30,11 +33,55 @@ class AddressConverter(object):
         return str(self._addr(self._strat.packed_to_int(bin),
                               **self._addr_kwargs))
 
-ipv4 = AddressConverter(netaddr.IPAddress, netaddr.strategy.ipv4, version=4)
+
+# what the parsers of _FormatConverter raise for the text not in their
+# format: socket.error from inet_pton(), binascii.Error (a ValueError) or,
+# on Python 2, TypeError from unhexlify(), and TypeError for a non-string
+_PARSE_ERRORS = (TypeError, ValueError, socket.error)
+
+
+class _FormatConverter(AddressConverter):
+    """AddressConverter which converts an address in the usual format
+    by itself instead of netaddr, the result of which is the same.
+    Other formats are left to netaddr."""
+
+    def __init__(self, addr, strat, fmt, parse, **kwargs):
+        super(_FormatConverter, self).__init__(addr, strat, **kwargs)
+        self._fmt = fmt
+        self._parse = parse
+        self._len = strat.width // 8
+
+    def text_to_bin(self, text):
+        try:
+            return self._parse(text)
+        except _PARSE_ERRORS:
+            pass
+        # netaddr raises the error if any
+        return super(_FormatConverter, self).text_to_bin(text)
+
+    def bin_to_text(self, bin):
+        if len(bin) != self._len:
+            return super(_FormatConverter, self).bin_to_text(bin)
+        return self._fmt % tuple(bytearray(bin))
+
+
+def _ipv4_text_to_bin(text):
+    # dotted decimal only
+    return socket.inet_pton(socket.AF_INET, text)
+
+
+def _mac_text_to_bin(text):
+    if len(text) != 17 or text[2::3] != ':::::':
+        raise ValueError(text)
+    return binascii.unhexlify(text.replace(':', ''))
+
+ipv4 = _FormatConverter(netaddr.IPAddress, netaddr.strategy.ipv4,
+                        '%d.%d.%d.%d', _ipv4_text_to_bin, version=4)
 ipv6 = AddressConverter(netaddr.IPAddress, netaddr.strategy.ipv6, version=6)
 
 
 class mac_mydialect(netaddr.mac_unix):
     word_fmt = '%.2x'
-mac = AddressConverter(netaddr.EUI, netaddr.strategy.eui48, version=48,
+mac = _FormatConverter(netaddr.EUI, netaddr.strategy.eui48,
+                       ':'.join(['%.2x'] * 6), _mac_text_to_bin, version=48,
                        dialect=mac_mydialect)
@@ -28,6 +28,8 @@ LOG = logging.getLogger('ryu.lib.hub')
 if HUB_TYPE == 'eventlet':
     import eventlet
     import eventlet.event
+    import eventlet.greenio
+    import eventlet.patcher
     import eventlet.queue
     import eventlet.semaphore
     import eventlet.timeout
@@ -40,6 +42,7 @@ if HUB_TYPE == 'eventlet':
 
     getcurrent = eventlet.getcurrent
     patch = eventlet.monkey_patch
+    is_patched = eventlet.patcher.is_monkey_patched
     sleep = eventlet.sleep
     listen = eventlet.listen
     connect = eventlet.connect
@@ -92,20 +95,33 @@ if HUB_TYPE == 'eventlet':
 
     Queue = eventlet.queue.Queue
     QueueEmpty = eventlet.queue.Empty
+    QueueFull = eventlet.queue.Full
     Semaphore = eventlet.semaphore.Semaphore
     BoundedSemaphore = eventlet.semaphore.BoundedSemaphore
 
+    def _listen_reuse_port(listen_info, family):
+        # eventlet.listen() doesn't set SO_REUSEPORT in older versions.
+        sock = eventlet.greenio.GreenSocket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind(listen_info)
+        sock.listen(50)
+        return sock
+
     class StreamServer(object):
         def __init__(self, listen_info, handle=None, backlog=None,
-                     spawn='default', **ssl_args):
+                     spawn='default', reuse_port=False, **ssl_args):
             assert backlog is None
             assert spawn == 'default'
 
             if ':' in listen_info[0]:
-                self.server = eventlet.listen(listen_info,
-                                              family=socket.AF_INET6)
+                family = socket.AF_INET6
+            else:
+                family = socket.AF_INET
+            if reuse_port:
+                self.server = _listen_reuse_port(listen_info, family)
             else:
-                self.server = eventlet.listen(listen_info)
+                self.server = eventlet.listen(listen_info, family=family)
             if ssl_args:
                 def wrap_and_handle(sock, addr):
                     ssl_args.setdefault('server_side', True)
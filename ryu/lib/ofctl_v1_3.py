@@ -27,6 +27,8 @@ from ryu.lib import hub
 LOG = logging.getLogger('ryu.lib.ofctl_v1_3')
 
 DEFAULT_TIMEOUT = 1.0
+# reply parts queued by send_stats_request_stream()
+STATS_STREAM_QUEUE_SIZE = 4
 
 
 def str_to_int(src):
@@ -439,6 +441,74 @@ def send_stats_request(dp, stats, waiters, msgs):
         del waiters_per_dp[stats.xid]
 
 
+class StatsReplyOverflow(Exception):
+    """Raised by send_stats_request_stream() after the parts queued before
+    the consumer stalled, as the rest of the reply has been dropped.
+    """
+    pass
+
+
+class _StatsReplyQueue(hub.Queue):
+    # takes the place of msgs of send_stats_request() in waiters.
+    # bounded, so that the event handler appending the reply parts waits
+    # for the consumer instead of queueing the whole table.  the parts are
+    # dropped once the consumer is closed or stalls for DEFAULT_TIMEOUT,
+    # the latter of which is an overflow.
+    def __init__(self, maxsize=STATS_STREAM_QUEUE_SIZE):
+        super(_StatsReplyQueue, self).__init__(maxsize)
+        self.closed = False
+        self.overflowed = False
+
+    def append(self, msg):
+        if self.closed:
+            return
+        try:
+            self.put(msg, timeout=DEFAULT_TIMEOUT)
+        except hub.QueueFull:
+            LOG.warning('stats reply consumer stalled, xid %d dropped',
+                        msg.xid)
+            self.closed = True
+            self.overflowed = True
+
+    def close(self):
+        # wakes up the handler blocked in append(), if any
+        self.closed = True
+        while not self.empty():
+            self.get_nowait()
+
+
+def send_stats_request_stream(dp, stats, waiters):
+    """
+    Same as send_stats_request() but yields the reply messages as they
+    arrive instead of collecting them, so that a reply part can be
+    released once it has been consumed.  At most STATS_STREAM_QUEUE_SIZE
+    parts are queued; the event handler delivering them waits for the
+    consumer beyond that, for DEFAULT_TIMEOUT at most, after which the
+    rest of the reply is dropped and StatsReplyOverflow is raised.
+    """
+    dp.set_xid(stats)
+    waiters_per_dp = waiters.setdefault(dp.id, {})
+    lock = hub.Event()
+    msgs = _StatsReplyQueue()
+    waiters_per_dp[stats.xid] = (lock, msgs)
+    dp.send_msg(stats)
+
+    try:
+        while not (lock.is_set() and msgs.empty()):
+            try:
+                msg = msgs.get(timeout=DEFAULT_TIMEOUT)
+            except hub.QueueEmpty:
+                break
+            yield msg
+        if msgs.overflowed:
+            raise StatsReplyOverflow('stats reply xid %d truncated' %
+                                     stats.xid)
+    finally:
+        msgs.close()
+        if not lock.is_set():
+            waiters_per_dp.pop(stats.xid, None)
+
+
 def get_desc_stats(dp, waiters):
     stats = dp.ofproto_parser.OFPDescStatsRequest(dp, 0)
     msgs = []
@@ -515,7 +585,7 @@ def get_queue_config(dp, port, waiters):
     return configs
 
 
-def get_flow_stats(dp, waiters, flow={}):
+def _flow_stats_request(dp, flow):
     table_id = int(flow.get('table_id', dp.ofproto.OFPTT_ALL))
     flags = int(flow.get('flags', 0))
     out_port = int(flow.get('out_port', dp.ofproto.OFPP_ANY))
@@ -524,38 +594,60 @@ def get_flow_stats(dp, waiters, flow={}):
     cookie_mask = int(flow.get('cookie_mask', 0))
     match = to_match(dp, flow.get('match', {}))
 
-    stats = dp.ofproto_parser.OFPFlowStatsRequest(
+    return dp.ofproto_parser.OFPFlowStatsRequest(
         dp, flags, table_id, out_port, out_group, cookie, cookie_mask,
         match)
 
+
+def _flow_stats_to_dict(msg):
+    flows = []
+    for stats in msg.body:
+        actions = actions_to_str(stats.instructions)
+        match = match_to_str(stats.match)
+
+        s = {'priority': stats.priority,
+             'cookie': stats.cookie,
+             'idle_timeout': stats.idle_timeout,
+             'hard_timeout': stats.hard_timeout,
+             'actions': actions,
+             'match': match,
+             'byte_count': stats.byte_count,
+             'duration_sec': stats.duration_sec,
+             'duration_nsec': stats.duration_nsec,
+             'packet_count': stats.packet_count,
+             'table_id': stats.table_id,
+             'length': stats.length,
+             'flags': stats.flags}
+        flows.append(s)
+    return flows
+
+
+def get_flow_stats(dp, waiters, flow={}):
+    stats = _flow_stats_request(dp, flow)
+
     msgs = []
     send_stats_request(dp, stats, waiters, msgs)
 
     flows = []
     for msg in msgs:
-        for stats in msg.body:
-            actions = actions_to_str(stats.instructions)
-            match = match_to_str(stats.match)
-
-            s = {'priority': stats.priority,
-                 'cookie': stats.cookie,
-                 'idle_timeout': stats.idle_timeout,
-                 'hard_timeout': stats.hard_timeout,
-                 'actions': actions,
-                 'match': match,
-                 'byte_count': stats.byte_count,
-                 'duration_sec': stats.duration_sec,
-                 'duration_nsec': stats.duration_nsec,
-                 'packet_count': stats.packet_count,
-                 'table_id': stats.table_id,
-                 'length': stats.length,
-                 'flags': stats.flags}
-            flows.append(s)
+        flows.extend(_flow_stats_to_dict(msg))
     flows = {str(dp.id): flows}
 
     return flows
 
 
+def get_flow_stats_stream(dp, waiters, flow={}):
+    """
+    Generator version of get_flow_stats().  Yields the flows of each
+    reply part, in the same format as get_flow_stats(), as the part
+    arrives; the whole flow table is never held in memory at once.
+    """
+    stats = _flow_stats_request(dp, flow)
+
+    for msg in send_stats_request_stream(dp, stats, waiters):
+        yield _flow_stats_to_dict(msg)
+
+
 def get_aggregate_flow_stats(dp, waiters, flow={}):
     table_id = int(flow.get('table_id', dp.ofproto.OFPTT_ALL))
     flags = int(flow.get('flags', 0))
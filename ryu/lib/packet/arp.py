@@ -87,6 +87,11 @@ class arp(packet_base.PacketBase):
                    addrconv.mac.bin_to_text(dst_mac),
                    addrconv.ipv4.bin_to_text(dst_ip)), None, buf[arp._MIN_LEN:]
 
+    @classmethod
+    def parser_header(cls, buf):
+        struct.unpack_from(cls._PACK_STR, buf)
+        return arp._MIN_LEN, None, None
+
     def serialize(self, payload, prev):
         return struct.pack(arp._PACK_STR, self.hwtype, self.proto,
                            self.hlen, self.plen, self.opcode,
@@ -95,6 +100,17 @@ class arp(packet_base.PacketBase):
                            addrconv.mac.text_to_bin(self.dst_mac),
                            addrconv.ipv4.text_to_bin(self.dst_ip))
 
+    def serialize_len(self):
+        return arp._MIN_LEN
+
+    def serialize_into(self, buf, offset, prev):
+        struct.pack_into(arp._PACK_STR, buf, offset, self.hwtype, self.proto,
+                         self.hlen, self.plen, self.opcode,
+                         addrconv.mac.text_to_bin(self.src_mac),
+                         addrconv.ipv4.text_to_bin(self.src_ip),
+                         addrconv.mac.text_to_bin(self.dst_mac),
+                         addrconv.ipv4.text_to_bin(self.dst_ip))
+
 
 def arp_ip(opcode, src_mac, src_ip, dst_mac, dst_ip):
     """A convenient wrapper for IPv4 ARP for Ethernet.
@@ -60,12 +60,26 @@ class ethernet(packet_base.PacketBase):
                 ethernet.get_packet_type(ethertype),
                 buf[ethernet._MIN_LEN:])
 
+    @classmethod
+    def parser_header(cls, buf):
+        (_dst, _src, ethertype) = struct.unpack_from(cls._PACK_STR, buf)
+        return ethernet._MIN_LEN, ethernet.get_packet_type(ethertype), None
+
     def serialize(self, payload, prev):
         return struct.pack(ethernet._PACK_STR,
                            addrconv.mac.text_to_bin(self.dst),
                            addrconv.mac.text_to_bin(self.src),
                            self.ethertype)
 
+    def serialize_len(self):
+        return ethernet._MIN_LEN
+
+    def serialize_into(self, buf, offset, prev):
+        struct.pack_into(ethernet._PACK_STR, buf, offset,
+                         addrconv.mac.text_to_bin(self.dst),
+                         addrconv.mac.text_to_bin(self.src),
+                         self.ethertype)
+
     @classmethod
     def get_packet_type(cls, type_):
         """Override method for the ethernet IEEE802.3 Length/Type
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import struct
+import six
 
 from . import packet_base
 from . import packet_utils
@@ -118,6 +119,34 @@ class icmp(packet_base.PacketBase):
 
         return hdr
 
+    def serialize_len(self):
+        # the length of the other messages is not known before encoding
+        if self.data is None:
+            return self._MIN_LEN + echo._MIN_LEN
+        if self.type in icmp._ICMP_TYPES:
+            if not isinstance(self.data, echo):
+                return None
+        elif not isinstance(self.data, (six.binary_type, bytearray)):
+            return None
+        return self._MIN_LEN + len(self.data)
+
+    def serialize_into(self, buf, offset, prev):
+        if self.data is None:
+            self.data = echo()
+        if isinstance(self.data, echo):
+            data = self.data.serialize()
+        else:
+            data = self.data
+        struct.pack_into(icmp._PACK_STR, buf, offset, self.type,
+                         self.code, self.csum)
+        start = offset + icmp._MIN_LEN
+        buf[start:start + len(data)] = data
+
+        if self.csum == 0:
+            self.csum = packet_utils.checksum(
+                memoryview(buf)[offset:start + len(data)])
+            struct.pack_into('!H', buf, offset + 2, self.csum)
+
     def __len__(self):
         return self._MIN_LEN + len(self.data)
 
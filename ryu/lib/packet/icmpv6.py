@@ -148,6 +148,34 @@ class icmpv6(packet_base.PacketBase):
 
         return hdr
 
+    def serialize_len(self):
+        # the length of the other messages is not known before encoding
+        if self.data is None:
+            return self._MIN_LEN
+        if self.type_ in icmpv6._ICMPV6_TYPES:
+            if not isinstance(self.data, echo):
+                return None
+        elif not isinstance(self.data, (six.binary_type, bytearray)):
+            return None
+        return self._MIN_LEN + len(self.data)
+
+    def serialize_into(self, buf, offset, prev):
+        struct.pack_into(icmpv6._PACK_STR, buf, offset, self.type_,
+                         self.code, self.csum)
+        length = self.serialize_len()
+        if self.data is not None:
+            if isinstance(self.data, echo):
+                data = self.data.serialize()
+            else:
+                data = self.data
+            start = offset + icmpv6._MIN_LEN
+            buf[start:start + len(data)] = data
+
+        if self.csum == 0:
+            self.csum = packet_utils.checksum_ip(prev, length,
+                                                 memoryview(buf)[offset:])
+            struct.pack_into('!H', buf, offset + 2, self.csum)
+
     def __len__(self):
         length = self._MIN_LEN
         if self.data is not None:
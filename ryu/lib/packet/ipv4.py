@@ -120,6 +120,15 @@ class ipv4(packet_base.PacketBase):
 
         return msg, ipv4.get_packet_type(proto), buf[length:total_length]
 
+    @classmethod
+    def parser_header(cls, buf):
+        (version, _tos, total_length, _identification, _flags, _ttl, proto,
+         _csum, _src, _dst) = struct.unpack_from(cls._PACK_STR, buf)
+        length = (version & 0xf) * 4
+        if length == 0:
+            return None
+        return length, ipv4.get_packet_type(proto), total_length
+
     def serialize(self, payload, prev):
         length = len(self)
         hdr = bytearray(length)
@@ -141,6 +150,33 @@ class ipv4(packet_base.PacketBase):
         struct.pack_into('!H', hdr, 10, self.csum)
         return hdr
 
+    def serialize_len(self):
+        length = len(self)
+        if length < ipv4._MIN_LEN:
+            return None
+        return length
+
+    def serialize_into(self, buf, offset, prev):
+        length = len(self)
+        version = self.version << 4 | self.header_length
+        flags = self.flags << 13 | self.offset
+        if self.total_length == 0:
+            self.total_length = len(buf) - offset
+        struct.pack_into(ipv4._PACK_STR, buf, offset, version, self.tos,
+                         self.total_length, self.identification, flags,
+                         self.ttl, self.proto, 0,
+                         addrconv.ipv4.text_to_bin(self.src),
+                         addrconv.ipv4.text_to_bin(self.dst))
+
+        if self.option:
+            assert (length - ipv4._MIN_LEN) >= len(self.option)
+            start = offset + ipv4._MIN_LEN
+            buf[start:start + len(self.option)] = self.option
+
+        self.csum = packet_utils.checksum(
+            memoryview(buf)[offset:offset + length])
+        struct.pack_into('!H', buf, offset + 10, self.csum)
+
 ipv4.register_packet_type(icmp.icmp, inet.IPPROTO_ICMP)
 ipv4.register_packet_type(igmp.igmp, inet.IPPROTO_IGMP)
 ipv4.register_packet_type(tcp.tcp, inet.IPPROTO_TCP)
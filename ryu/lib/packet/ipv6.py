@@ -136,6 +136,21 @@ class ipv6(packet_base.PacketBase):
             struct.pack_into('!H', hdr, 4, self.payload_length)
         return hdr
 
+    def serialize_len(self):
+        if self.ext_hdrs:
+            return None
+        return ipv6._MIN_LEN
+
+    def serialize_into(self, buf, offset, prev):
+        v_tc_flow = (self.version << 28 | self.traffic_class << 20 |
+                     self.flow_label)
+        if 0 == self.payload_length:
+            self.payload_length = len(buf) - offset - ipv6._MIN_LEN
+        struct.pack_into(ipv6._PACK_STR, buf, offset, v_tc_flow,
+                         self.payload_length, self.nxt, self.hop_limit,
+                         addrconv.ipv6.text_to_bin(self.src),
+                         addrconv.ipv6.text_to_bin(self.dst))
+
     def __len__(self):
         ext_hdrs_len = 0
         for ext_hdr in self.ext_hdrs:
@@ -67,3 +67,10 @@ class mpls(packet_base.PacketBase):
     def serialize(self, payload, prev):
         val = self.label << 12 | self.exp << 9 | self.bsb << 8 | self.ttl
         return struct.pack(mpls._PACK_STR, val)
+
+    def serialize_len(self):
+        return mpls._MIN_LEN
+
+    def serialize_into(self, buf, offset, prev):
+        val = self.label << 12 | self.exp << 9 | self.bsb << 8 | self.ttl
+        struct.pack_into(mpls._PACK_STR, buf, offset, val)
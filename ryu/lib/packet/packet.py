@@ -63,6 +63,39 @@ class Packet(object):
         This method is legal only when encoding a packet.
         """
 
+        protocols = self.protocols
+        lens = []
+        for p in protocols:
+            if isinstance(p, (six.binary_type, bytearray)):
+                lens.append(len(p))
+                continue
+            length = None
+            if isinstance(p, packet_base.PacketBase):
+                length = p.serialize_len()
+            if length is None:
+                self._serialize()
+                return
+            lens.append(length)
+
+        # the headers are encoded into a buffer of the whole packet
+        # from the innermost one
+        data = bytearray(sum(lens))
+        offset = len(data)
+        prev = None
+        for i in range(len(protocols) - 1, -1, -1):
+            p = protocols[i]
+            offset -= lens[i]
+            if isinstance(p, (six.binary_type, bytearray)):
+                data[offset:offset + lens[i]] = p
+            else:
+                if i:
+                    prev = protocols[i - 1]
+                else:
+                    prev = None
+                p.serialize_into(data, offset, prev)
+        self.data = data
+
+    def _serialize(self):
         self.data = bytearray()
         r = self.protocols[::-1]
         for i, p in enumerate(r):
@@ -139,6 +172,151 @@ class Packet(object):
     __repr__ = __str__  # note: str(list) uses __repr__ for elements
 
 
+# packet_base.PacketBase subclasses a protocol class is an instance of
+_BASES = {}
+
+
+def _bases(cls):
+    bases = _BASES.get(cls)
+    if bases is None:
+        bases = tuple(c for c in cls.__mro__
+                      if issubclass(c, packet_base.PacketBase))
+        _BASES[cls] = bases
+    return bases
+
+
+class LazyPacket(Packet):
+    """A packet decoder class which decodes protocol headers on demand.
+
+    A decoded LazyPacket gives the same protocols as Packet does.
+    While constructing, only the boundaries of the protocol headers are
+    found by packet_base.PacketBase.parser_header in one pass over
+    *data*, and each header is decoded by its parser() the first time
+    it is accessed.  get_protocol() and get_protocols() look up the
+    headers by class and decode only the ones returned.
+
+    A protocol which doesn't implement parser_header and the rest of
+    the packet behind it are decoded while constructing, as Packet does.
+
+    Accessing the protocols attribute or iterating decodes all the
+    headers, after which the packet can be modified as Packet.
+    """
+
+    def __init__(self, data, parse_cls=ethernet.ethernet):
+        # Packet.__init__ is not called, which decodes every header.
+        # A header not decoded yet is a tuple (class, start, end) of
+        # the buffer parser() takes in _protocols.
+        self.data = data
+        self._protocols = []
+        # {packet_base.PacketBase subclass: [index in _protocols]}
+        self._index = {}
+        self._parser(parse_cls)
+
+    def _append(self, proto, cls):
+        idx = len(self._protocols)
+        index = self._index
+        for c in _bases(cls):
+            if c in index:
+                index[c].append(idx)
+            else:
+                index[c] = [idx]
+        self._protocols.append(proto)
+
+    def _parser(self, cls):
+        data = self.data
+        view = memoryview(data)
+        start = 0
+        end = len(data)
+        while cls:
+            try:
+                header = cls.parser_header(view[start:end])
+            except struct.error:
+                break
+            if header is None:
+                # decode the rest as Packet does
+                rest_data = data[start:end]
+                while cls:
+                    try:
+                        proto, cls, rest_data = cls.parser(rest_data)
+                    except struct.error:
+                        break
+                    if proto:
+                        self._append(proto, proto.__class__)
+                if rest_data:
+                    self._protocols.append(rest_data)
+                return
+            (length, next_cls, total_length) = header
+            self._append((cls, start, end), cls)
+            # the same as the slice buf[length:total_length] parser() returns
+            size = end - start
+            if length > size:
+                length = size
+            if total_length is not None:
+                end = start + max(length, min(total_length, size))
+            start += length
+            cls = next_cls
+        if start < end:
+            self._protocols.append(data[start:end])
+
+    def _decode(self, idx):
+        proto = self._protocols[idx]
+        if proto.__class__ is tuple:
+            (cls, start, end) = proto
+            proto = cls.parser(self.data[start:end])[0]
+            self._protocols[idx] = proto
+        return proto
+
+    @property
+    def protocols(self):
+        if self._index is not None:
+            for idx in range(len(self._protocols)):
+                self._decode(idx)
+            # modified by the user from here on
+            self._index = None
+        return self._protocols
+
+    @protocols.setter
+    def protocols(self, protocols):
+        self._index = None
+        self._protocols = protocols
+
+    def get_protocols(self, protocol):
+        if self._index is None:
+            return super(LazyPacket, self).get_protocols(protocol)
+        if not isinstance(protocol, type):
+            protocol = protocol.__class__
+        assert issubclass(protocol, packet_base.PacketBase)
+        return [self._decode(idx) for idx in self._index.get(protocol, [])]
+
+    def get_protocol(self, protocol):
+        if self._index is None:
+            return super(LazyPacket, self).get_protocol(protocol)
+        if not isinstance(protocol, type):
+            protocol = protocol.__class__
+        idxs = self._index.get(protocol)
+        if idxs:
+            return self._decode(idxs[0])
+        return None
+
+    def __len__(self):
+        return len(self._protocols)
+
+    def __contains__(self, protocol):
+        if (self._index is None or not inspect.isclass(protocol) or
+                not issubclass(protocol, packet_base.PacketBase)):
+            return super(LazyPacket, self).__contains__(protocol)
+        # as Packet does, an instance of a subclass doesn't count
+        for idx in self._index.get(protocol, []):
+            proto = self._protocols[idx]
+            if proto.__class__ is tuple:
+                cls = proto[0]
+            else:
+                cls = proto.__class__
+            if cls is protocol:
+                return True
+        return False
+
+
 # XXX: Hack for preventing recursive import
 def _PacketBase__div__(self, trailer):
     pkt = Packet()
@@ -70,6 +70,32 @@ class PacketBase(stringify.StringifyMixin):
         """
         pass
 
+    @classmethod
+    def parser_header(cls, buf):
+        """Find the boundary of a protocol header without decoding it.
+
+        This method is used only by packet.LazyPacket.
+
+        Looks into the protocol header at offset 0 in bytearray *buf*
+        as far as parser() does to find the rest of the packet.
+        Returns the following three objects, or None if the protocol
+        doesn't support it and should be decoded by parser() instead.
+
+        * The length of the header.
+
+        * A packet_base.PacketBase subclass appropriate for the rest of
+          the packet, as parser() returns.
+
+        * The length of the header and its payload, or None when it
+          extends to the end of *buf*.
+
+        An implementation should raise struct.error where parser() does,
+        and the object parser() returns should be an instance of *cls*.
+        It should return None for a header of length 0 (e.g. a corrupted
+        one), which Packet drops as parser() returns a false object.
+        """
+        return None
+
     def serialize(self, payload, prev):
         """Encode a protocol header.
 
@@ -86,3 +112,26 @@ class PacketBase(stringify.StringifyMixin):
         For example, *prev* is ipv4 or ipv6 for tcp.serialize.
         """
         pass
+
+    def serialize_len(self):
+        """Returns the length of the protocol header serialize_into()
+        encodes, or None if the protocol doesn't support serialize_into().
+
+        This method is used only when encoding a packet.
+        """
+        return None
+
+    def serialize_into(self, buf, offset, prev):
+        """Encode a protocol header into a buffer.
+
+        This method is used only when encoding a packet, by
+        packet.Packet.serialize when every protocol header of the
+        packet supports it.
+
+        Encode a protocol header into bytearray *buf* at *offset*,
+        where serialize_len() bytes are zero-filled for it.  The payload,
+        which follows the header up to the end of *buf*, is already
+        encoded.  *prev* is the same as serialize().  The header is
+        updated (e.g. the checksum) as serialize() does.
+        """
+        raise NotImplementedError()
@@ -13,10 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import array
-import six
-import socket
+import binascii
 import struct
+
+import six
+
 from ryu.lib import addrconv
 
 
@@ -25,15 +26,76 @@ def carry_around_add(a, b):
     return (c & 0xffff) + (c >> 16)
 
 
-def checksum(data):
-    data = six.binary_type(data)    # input can be bytearray.
+if six.PY3:
+    def _bytes_to_int(data):
+        return int.from_bytes(data, 'big')
+else:
+    def _bytes_to_int(data):
+        return int(binascii.hexlify(data) or b'0', 16)
+
+
+def _checksum_sum(data):
+    # data as a big endian integer, whose 16 bit words are summed up by
+    # _checksum() at once as 2**16 is congruent to 1 modulo 0xffff.
+    # data can be a memoryview.
+    s = _bytes_to_int(data)
     if len(data) % 2:
-        data += b'\x00'
+        s <<= 8
+    return s
+
+
+def _checksum(s):
+    # the ones' complement sum of the 16 bit words, where a non-zero
+    # sum is 0xffff rather than 0 as the end around carry makes it.
+    c = s % 0xffff
+    if c == 0 and s:
+        c = 0xffff
+    return ~c & 0xffff
+
+
+def checksum(data):
+    # input can be bytearray or memoryview, which is not copied.
+    return _checksum(_checksum_sum(data))
 
-    s = sum(array.array('H', data))
-    s = (s & 0xffff) + (s >> 16)
-    s += (s >> 16)
-    return socket.ntohs(~s & 0xffff)
+
+def checksum_update(csum, old, new, offset=0):
+    """
+    update checksum incrementally, RFC1624
+
+    Returns the checksum *csum* of some data updated for the change of
+    bytes *old* in the data to *new* of the same length, which are at
+    *offset* in the data, without summing up the whole data again.
+    Only the parity of *offset* matters.
+
+    HC' = ~(~HC + ~m + m')  (RFC1624 3. Eqn. 3)
+    """
+    assert len(old) == len(new)
+    if offset % 2:
+        old = bytearray(1) + bytearray(old)
+        new = bytearray(1) + bytearray(new)
+    # ~m, where the 16 bit words of old are padded with zero
+    bits = (len(old) + 1) // 2 * 16
+    inv = _checksum_sum(old) ^ ((1 << bits) - 1)
+    return _checksum((~csum & 0xffff) + inv + _checksum_sum(new))
+
+
+def checksum_replace(buf, csum_offset, offset, new):
+    """
+    replace bytes in bytearray *buf* at *offset* with *new*, and update
+    the checksum at *csum_offset* in *buf* incrementally.
+
+    The checksummed data is assumed to start at an even offset in *buf*,
+    as an IP header in an ethernet frame does.  e.g. decrement TTL of an
+    ethernet/ipv4 frame::
+
+        checksum_replace(buf, 24, 22, [buf[22] - 1])
+    """
+    csum, = struct.unpack_from('!H', buf, csum_offset)
+    old = bytes(buf[offset:offset + len(new)])
+    buf[offset:offset + len(new)] = new
+    struct.pack_into('!H', buf, csum_offset,
+                     checksum_update(csum, old, buf[offset:offset + len(new)],
+                                     offset))
 
 
 # avoid circular import
@@ -96,8 +158,8 @@ def checksum_ip(ipvx, length, payload):
     else:
         raise ValueError('Unknown IP version %d' % ipvx.version)
 
-    buf = header + payload
-    return checksum(buf)
+    # the pseudo header is 16 bit aligned
+    return _checksum(_checksum_sum(header) + _checksum_sum(payload))
 
 _MODX = 4102
 
@@ -82,6 +82,15 @@ class tcp(packet_base.PacketBase):
 
         return msg, None, buf[length:]
 
+    @classmethod
+    def parser_header(cls, buf):
+        (_src_port, _dst_port, _seq, _ack, offset, _bits, _window_size,
+         _csum, _urgent) = struct.unpack_from(cls._PACK_STR, buf)
+        length = (offset >> 4) * 4
+        if length == 0:
+            return None
+        return length, None, None
+
     def serialize(self, payload, prev):
         offset = self.offset << 4
         h = bytearray(struct.pack(
@@ -110,3 +119,30 @@ class tcp(packet_base.PacketBase):
                                                  h + payload)
             struct.pack_into('!H', h, 16, self.csum)
         return six.binary_type(h)
+
+    def serialize_len(self):
+        length = tcp._MIN_LEN
+        if self.option:
+            length += len(self.option)
+            mod = len(self.option) % 4
+            if mod:
+                length += 4 - mod
+            if self.offset:
+                length = max(length, self.offset << 2)
+        return length
+
+    def serialize_into(self, buf, offset, prev):
+        if 0 == self.offset:
+            self.offset = self.serialize_len() >> 2
+        struct.pack_into(tcp._PACK_STR, buf, offset, self.src_port,
+                         self.dst_port, self.seq, self.ack, self.offset << 4,
+                         self.bits, self.window_size, self.csum, self.urgent)
+
+        if self.option:
+            start = offset + tcp._MIN_LEN
+            buf[start:start + len(self.option)] = self.option
+
+        if self.csum == 0:
+            self.csum = packet_utils.checksum_ip(prev, len(buf) - offset,
+                                                 memoryview(buf)[offset:])
+            struct.pack_into('!H', buf, offset + 16, self.csum)
@@ -62,6 +62,13 @@ class udp(packet_base.PacketBase):
         msg = cls(src_port, dst_port, total_length, csum)
         return msg, cls.get_packet_type(src_port, dst_port), buf[msg._MIN_LEN:total_length]
 
+    @classmethod
+    def parser_header(cls, buf):
+        (src_port, dst_port, total_length, _csum) = struct.unpack_from(
+            cls._PACK_STR, buf)
+        return (udp._MIN_LEN, cls.get_packet_type(src_port, dst_port),
+                total_length)
+
     def serialize(self, payload, prev):
         if self.total_length == 0:
             self.total_length = udp._MIN_LEN + len(payload)
@@ -73,3 +80,16 @@ class udp(packet_base.PacketBase):
             h = struct.pack(udp._PACK_STR, self.src_port, self.dst_port,
                             self.total_length, self.csum)
         return h
+
+    def serialize_len(self):
+        return udp._MIN_LEN
+
+    def serialize_into(self, buf, offset, prev):
+        if self.total_length == 0:
+            self.total_length = len(buf) - offset
+        struct.pack_into(udp._PACK_STR, buf, offset, self.src_port,
+                         self.dst_port, self.total_length, self.csum)
+        if self.csum == 0:
+            self.csum = packet_utils.checksum_ip(
+                prev, self.total_length, memoryview(buf)[offset:])
+            struct.pack_into('!H', buf, offset + 6, self.csum)
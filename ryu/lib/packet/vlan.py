@@ -50,10 +50,22 @@ class _vlan(packet_base.PacketBase):
         return (cls(pcp, cfi, vid, ethertype),
                 vlan.get_packet_type(ethertype), buf[vlan._MIN_LEN:])
 
+    @classmethod
+    def parser_header(cls, buf):
+        (_tci, ethertype) = struct.unpack_from(cls._PACK_STR, buf)
+        return vlan._MIN_LEN, vlan.get_packet_type(ethertype), None
+
     def serialize(self, payload, prev):
         tci = self.pcp << 13 | self.cfi << 12 | self.vid
         return struct.pack(vlan._PACK_STR, tci, self.ethertype)
 
+    def serialize_len(self):
+        return vlan._MIN_LEN
+
+    def serialize_into(self, buf, offset, prev):
+        tci = self.pcp << 13 | self.cfi << 12 | self.vid
+        struct.pack_into(vlan._PACK_STR, buf, offset, tci, self.ethertype)
+
 
 class vlan(_vlan):
     """VLAN (IEEE 802.1Q) header encoder/decoder class.
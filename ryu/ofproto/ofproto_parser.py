@@ -19,6 +19,7 @@ import six
 import base64
 import collections
 import logging
+import re
 import struct
 import functools
 
@@ -220,6 +221,103 @@ class MsgInMsgBase(MsgBase):
                                                   **additional_args)
 
 
+class MsgTemplate(object):
+    """
+    Serialized message with named patch slots
+
+    The message is serialized once.  instantiate() returns a copy of the
+    bytes with the values of the given slots packed into it, which can
+    be sent with Datapath.send() as it is.  A slot is an offset in the
+    bytes and a struct format or a function packing a value there.
+
+    Unless the xid slot is given, instantiate() assigns a new xid to each
+    copy as Datapath.send_msg() does, taken from Datapath.next_xid() of
+    the datapath of the message or, if it has none (e.g. ProtocolDesc),
+    from a counter of the template.
+    """
+
+    def __init__(self, msg):
+        super(MsgTemplate, self).__init__()
+        msg.serialize()
+        self.msg = msg
+        self.buf = six.binary_type(msg.buf)
+        self.slots = {}
+        self.add_struct_slots(ofproto_common.OFP_HEADER_PACK_STR, 0,
+                              [None, None, None, 'xid'])
+        self.xid = 0
+
+    def add_slot(self, name, offset, fmt):
+        if callable(fmt):
+            pack_into = fmt
+        else:
+            pack_into = struct.Struct(fmt).pack_into
+        self.slots[name] = (pack_into, offset)
+
+    def add_struct_slots(self, fmt, offset, names):
+        """
+        Adds a slot for each item of the struct format at offset,
+        except pad bytes and the items named None.
+        """
+        names = iter(names)
+        for (count, code) in re.findall(r'(\d*)([a-zA-Z?])', fmt):
+            fmt_ = '!' + count + code
+            if code != 'x':
+                name = next(names)
+                if name is not None:
+                    self.add_slot(name, offset, fmt_)
+            offset += struct.calcsize(fmt_)
+
+    def add_oxm_slots(self, ofproto, offset, length):
+        """
+        Adds a slot for the value of each OXM field at offset, which
+        takes the user value of the field as OFPMatch does.
+        """
+        for (name, field_offset) in ofproto.oxm_parse_index(self.buf, offset,
+                                                            length):
+            (_n, value, mask, field_len) = ofproto.oxm_parse(self.buf,
+                                                             field_offset)
+            value_offset = field_offset + field_len - len(value)
+            if mask is not None:
+                value_offset -= len(mask)
+            self.add_slot(name, value_offset,
+                          _oxm_slot(ofproto, name, len(value),
+                                    mask is not None))
+
+    def _next_xid(self):
+        datapath = self.msg.datapath
+        if hasattr(datapath, 'next_xid'):
+            return datapath.next_xid()
+        self.xid = (self.xid + 1) & datapath.ofproto.MAX_XID
+        return self.xid
+
+    def instantiate(self, **kwargs):
+        if 'xid' not in kwargs:
+            kwargs['xid'] = self._next_xid()
+        buf = bytearray(self.buf)
+        slots = self.slots
+        for (name, value) in kwargs.items():
+            (pack_into, offset) = slots[name]
+            pack_into(buf, offset, value)
+        return buf
+
+
+def _oxm_slot(ofproto, name, value_len, hasmask):
+    def pack_into(buf, offset, uv):
+        (_n, value, mask) = ofproto.oxm_from_user(name, uv)
+        if len(value) != value_len or (mask is not None and not hasmask):
+            raise ValueError('%s: %r does not fit the template' % (name, uv))
+        if mask is None and hasmask:
+            # exact match in a masked field
+            mask = b'\xff' * value_len
+        if mask is not None:
+            # the mask is applied as OFPMatch does
+            value = bytearray(x & y for (x, y)
+                              in zip(bytearray(value), bytearray(mask)))
+            buf[offset + value_len:offset + value_len * 2] = mask
+        buf[offset:offset + value_len] = value
+    return pack_into
+
+
 def namedtuple(typename, fields, **kwargs):
     class _namedtuple(StringifyMixin,
                       collections.namedtuple(typename, fields, **kwargs)):
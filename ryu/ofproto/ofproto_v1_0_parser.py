@@ -3162,6 +3162,69 @@ class OFPFlowMod(MsgBase):
                 offset += a.len
 
 
+class OFPFlowModTemplate(ofproto_parser.MsgTemplate):
+    """
+    Flow mod template
+
+    ``flow_mod``, an ``OFPFlowMod``, is serialized once and
+    ``instantiate(**slots)`` returns a copy of its bytes with the values
+    of the given slots patched, to be sent with ``Datapath.send()``.
+    This saves serializing the match and actions for each of many flow
+    mods which differ in a few values.
+
+    ================ ======================================================
+    Slot             Description
+    ================ ======================================================
+    xid              Transaction id, assigned by ``Datapath.next_xid()``
+                     to each instance unless given
+    wildcards, ...   Attribute of ``OFPMatch`` of the same name, from
+                     ``wildcards`` to ``tp_dst``, in the wire format
+                     (e.g. ``nw_src`` as int, ``dl_src`` as binary)
+    cookie, ...      Attribute of ``OFPFlowMod`` of the same name, from
+                     ``cookie`` to ``flags``
+    port             Output port of the first ``OFPActionOutput``
+    max_len          Max length of the first ``OFPActionOutput``
+    ================ ======================================================
+
+    Example::
+
+        def add_flows(self, datapath, hosts):
+            ofp = datapath.ofproto
+            ofp_parser = datapath.ofproto_parser
+
+            match = ofp_parser.OFPMatch(dl_type=0x0800, nw_dst=0)
+            actions = [ofp_parser.OFPActionOutput(ofp.OFPP_FLOOD)]
+            tmpl = ofp_parser.OFPFlowModTemplate(
+                ofp_parser.OFPFlowMod(datapath, match, 0, ofp.OFPFC_ADD,
+                                      actions=actions))
+            for nw_dst, port in hosts:
+                datapath.send(tmpl.instantiate(nw_dst=nw_dst, port=port))
+    """
+
+    def __init__(self, flow_mod):
+        assert isinstance(flow_mod, OFPFlowMod)
+        super(OFPFlowModTemplate, self).__init__(flow_mod)
+        offset = ofproto.OFP_HEADER_SIZE
+        self.add_struct_slots(ofproto.OFP_MATCH_PACK_STR, offset,
+                              ['wildcards', 'in_port', 'dl_src', 'dl_dst',
+                               'dl_vlan', 'dl_vlan_pcp', 'dl_type',
+                               'nw_tos', 'nw_proto', 'nw_src', 'nw_dst',
+                               'tp_src', 'tp_dst'])
+
+        offset += ofproto.OFP_MATCH_SIZE
+        self.add_struct_slots(ofproto.OFP_FLOW_MOD_PACK_STR0, offset,
+                              ['cookie', 'command', 'idle_timeout',
+                               'hard_timeout', 'priority', 'buffer_id',
+                               'out_port', 'flags'])
+
+        offset = ofproto.OFP_FLOW_MOD_SIZE
+        for a in flow_mod.actions or []:
+            if isinstance(a, OFPActionOutput) and 'port' not in self.slots:
+                self.add_struct_slots(ofproto.OFP_ACTION_OUTPUT_PACK_STR,
+                                      offset, [None, None, 'port', 'max_len'])
+            offset += a.len
+
+
 @_set_msg_type(ofproto.OFPT_PORT_MOD)
 class OFPPortMod(MsgBase):
     """
@@ -971,6 +971,79 @@ class OFPFlowMod(MsgBase):
             offset += inst.len
 
 
+class OFPFlowModTemplate(ofproto_parser.MsgTemplate):
+    """
+    Flow mod template
+
+    ``flow_mod``, an ``OFPFlowMod``, is serialized once and
+    ``instantiate(**slots)`` returns a copy of its bytes with the values
+    of the given slots patched, to be sent with ``Datapath.send()``.
+    This saves composing and serializing the match, instructions and
+    actions for each of many flow mods which differ in a few values.
+
+    ================ ======================================================
+    Slot             Description
+    ================ ======================================================
+    xid              Transaction id, assigned by ``Datapath.next_xid()``
+                     to each instance unless given
+    cookie, ...      Attribute of ``OFPFlowMod`` of the same name, from
+                     ``cookie`` to ``flags``
+    (match field)    Value of a field of the match, e.g. ``ipv4_dst``,
+                     in the form ``OFPMatch`` takes it
+    port             Output port of the first ``OFPActionOutput``
+    max_len          Max length of the first ``OFPActionOutput``
+    ================ ======================================================
+
+    Only the fields in the match of ``flow_mod`` can be patched and the
+    length of their values can not change, i.e. a masked value can be
+    given only to a field masked in the template.
+
+    Example::
+
+        def add_flows(self, datapath, hosts):
+            ofp = datapath.ofproto
+            ofp_parser = datapath.ofproto_parser
+
+            match = ofp_parser.OFPMatch(eth_type=0x0800, ipv4_dst='0.0.0.0')
+            actions = [ofp_parser.OFPActionOutput(ofp.OFPP_FLOOD)]
+            inst = [ofp_parser.OFPInstructionActions(ofp.OFPIT_APPLY_ACTIONS,
+                                                     actions)]
+            tmpl = ofp_parser.OFPFlowModTemplate(
+                ofp_parser.OFPFlowMod(datapath, priority=1, match=match,
+                                      instructions=inst))
+            for ipv4_dst, port in hosts:
+                datapath.send(tmpl.instantiate(ipv4_dst=ipv4_dst, port=port))
+    """
+
+    def __init__(self, flow_mod):
+        assert isinstance(flow_mod, OFPFlowMod)
+        super(OFPFlowModTemplate, self).__init__(flow_mod)
+        self.add_struct_slots(ofproto.OFP_FLOW_MOD_PACK_STR0,
+                              ofproto.OFP_HEADER_SIZE,
+                              ['cookie', 'cookie_mask', 'table_id', 'command',
+                               'idle_timeout', 'hard_timeout', 'priority',
+                               'buffer_id', 'out_port', 'out_group', 'flags'])
+
+        offset = (ofproto.OFP_FLOW_MOD_SIZE -
+                  ofproto.OFP_MATCH_SIZE)
+        match_len = flow_mod.match.length
+        # the fields follow the type and length of ofp_match
+        self.add_oxm_slots(ofproto, offset + 4, match_len - 4)
+        offset += utils.round_up(match_len, 8)
+
+        for inst in flow_mod.instructions:
+            if isinstance(inst, OFPInstructionActions):
+                action_offset = offset + ofproto.OFP_INSTRUCTION_ACTIONS_SIZE
+                for a in inst.actions:
+                    if isinstance(a, OFPActionOutput) and \
+                            'port' not in self.slots:
+                        self.add_struct_slots(
+                            ofproto.OFP_ACTION_OUTPUT_PACK_STR,
+                            action_offset, [None, None, 'port', 'max_len'])
+                    action_offset += a.len
+            offset += inst.len
+
+
 class OFPInstruction(StringifyMixin):
     _INSTRUCTION_TYPES = {}
 
@@ -3435,11 +3508,47 @@ class OFPMatch(StringifyMixin):
             self._fields2 = [ofproto.oxm_to_user(n, v, m) for (n, v, m)
                              in fields]
 
+    def __getattr__(self, name):
+        # A match returned by parser() keeps the OXM TLVs (_buf) and the
+        # offsets of the fields in them (_index), and decodes the
+        # fields when they are used for the first time.
+        if name == '_fields2':
+            value = [self._decode_field(offset)
+                     for (_k, offset) in self._index]
+        elif name == 'fields':
+            # XXXcompat
+            self.fields = []
+            self.parser_old(self, self._buf, 0, len(self._buf))
+            return self.fields
+        elif name == '_wc':
+            value = FlowWildcards()
+        elif name == '_flow':
+            value = Flow()
+        else:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def _decode_field(self, offset):
+        k, uv, _field_len = ofproto.oxm_parse_user(self._buf, offset)
+        return k, uv
+
+    def _is_lazy(self):
+        return '_fields2' not in self.__dict__ and '_index' in self.__dict__
+
     def __getitem__(self, key):
-        return dict(self._fields2)[key]
+        if not self._is_lazy():
+            return dict(self._fields2)[key]
+        # the last one wins, as in dict(self._fields2)
+        for (k, offset) in reversed(self._index):
+            if k == key:
+                return self._decode_field(offset)[1]
+        raise KeyError(key)
 
     def __contains__(self, key):
-        return key in dict(self._fields2)
+        if not self._is_lazy():
+            return key in dict(self._fields2)
+        return any(k == key for (k, _offset) in self._index)
 
     def iteritems(self):
         return iter(dict(self._fields2).items())
@@ -3448,7 +3557,10 @@ class OFPMatch(StringifyMixin):
         return self._fields2
 
     def get(self, key, default=None):
-        return dict(self._fields2).get(key, default)
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
     def stringify_attrs(self):
         yield "oxm_fields", dict(self._fields2)
@@ -3580,14 +3692,11 @@ class OFPMatch(StringifyMixin):
         if self._composed_with_old_api():
             return self.serialize_old(buf, offset)
 
-        fields = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self._fields2]
-
         hdr_pack_str = '!HH'
         field_offset = offset + struct.calcsize(hdr_pack_str)
-        for (n, value, mask) in fields:
-            field_offset += ofproto.oxm_serialize(n, value, mask, buf,
-                                                  field_offset)
+        for (k, uv) in self._fields2:
+            field_offset += ofproto.oxm_serialize_user(k, uv, buf,
+                                                       field_offset)
 
         length = field_offset - offset
         msg_pack_into(hdr_pack_str, buf, offset,
@@ -3810,7 +3919,7 @@ class OFPMatch(StringifyMixin):
         Returns an object which is generated from a buffer including the
         expression of the wire protocol of the flow match.
         """
-        match = OFPMatch()
+        match = cls.__new__(cls)
         type_, length = struct.unpack_from('!HH', buf, offset)
 
         match.type = type_
@@ -3820,17 +3929,9 @@ class OFPMatch(StringifyMixin):
         offset += 4
         length -= 4
 
-        # XXXcompat
-        cls.parser_old(match, buf, offset, length)
-
-        fields = []
-        while length > 0:
-            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
-            fields.append((k, uv))
-            offset += field_len
-            length -= field_len
-        match._fields2 = fields
+        # The fields are decoded on demand, see __getattr__().
+        match._buf = six.binary_type(buf[offset:offset + length])
+        match._index = ofproto.oxm_parse_index(match._buf, 0, length)
         return match
 
     @staticmethod
@@ -40,6 +40,7 @@ The following extensions are not implemented yet.
     - EXT-192-v Vacancy events Extension
 """
 
+import array
 import six
 import struct
 
@@ -837,11 +838,47 @@ class OFPMatch(StringifyMixin):
             self._fields2 = [ofproto.oxm_to_user(n, v, m) for (n, v, m)
                              in fields]
 
+    def __getattr__(self, name):
+        # A match returned by parser() keeps the OXM TLVs (_buf) and the
+        # offsets of the fields in them (_index), and decodes the
+        # fields when they are used for the first time.
+        if name == '_fields2':
+            value = [self._decode_field(offset)
+                     for (_k, offset) in self._index]
+        elif name == 'fields':
+            # XXXcompat
+            self.fields = []
+            self.parser_old(self, self._buf, 0, len(self._buf))
+            return self.fields
+        elif name == '_wc':
+            value = FlowWildcards()
+        elif name == '_flow':
+            value = Flow()
+        else:
+            raise AttributeError(name)
+        setattr(self, name, value)
+        return value
+
+    def _decode_field(self, offset):
+        k, uv, _field_len = ofproto.oxm_parse_user(self._buf, offset)
+        return k, uv
+
+    def _is_lazy(self):
+        return '_fields2' not in self.__dict__ and '_index' in self.__dict__
+
     def __getitem__(self, key):
-        return dict(self._fields2)[key]
+        if not self._is_lazy():
+            return dict(self._fields2)[key]
+        # the last one wins, as in dict(self._fields2)
+        for (k, offset) in reversed(self._index):
+            if k == key:
+                return self._decode_field(offset)[1]
+        raise KeyError(key)
 
     def __contains__(self, key):
-        return key in dict(self._fields2)
+        if not self._is_lazy():
+            return key in dict(self._fields2)
+        return any(k == key for (k, _offset) in self._index)
 
     def iteritems(self):
         return iter(dict(self._fields2).items())
@@ -850,7 +887,10 @@ class OFPMatch(StringifyMixin):
         return self._fields2
 
     def get(self, key, default=None):
-        return dict(self._fields2).get(key, default)
+        try:
+            return self[key]
+        except KeyError:
+            return default
 
     def stringify_attrs(self):
         yield "oxm_fields", dict(self._fields2)
@@ -986,14 +1026,11 @@ class OFPMatch(StringifyMixin):
         if self._composed_with_old_api():
             return self.serialize_old(buf, offset)
 
-        fields = [ofproto.oxm_from_user(k, uv) for (k, uv)
-                  in self._fields2]
-
         hdr_pack_str = '!HH'
         field_offset = offset + struct.calcsize(hdr_pack_str)
-        for (n, value, mask) in fields:
-            field_offset += ofproto.oxm_serialize(n, value, mask, buf,
-                                                  field_offset)
+        for (k, uv) in self._fields2:
+            field_offset += ofproto.oxm_serialize_user(k, uv, buf,
+                                                       field_offset)
 
         length = field_offset - offset
         msg_pack_into(hdr_pack_str, buf, offset,
@@ -1244,7 +1281,7 @@ class OFPMatch(StringifyMixin):
         Returns an object which is generated from a buffer including the
         expression of the wire protocol of the flow match.
         """
-        match = OFPMatch()
+        match = cls.__new__(cls)
         type_, length = struct.unpack_from('!HH', buf, offset)
 
         match.type = type_
@@ -1254,17 +1291,9 @@ class OFPMatch(StringifyMixin):
         offset += 4
         length -= 4
 
-        # XXXcompat
-        cls.parser_old(match, buf, offset, length)
-
-        fields = []
-        while length > 0:
-            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
-            k, uv = ofproto.oxm_to_user(n, value, mask)
-            fields.append((k, uv))
-            offset += field_len
-            length -= field_len
-        match._fields2 = fields
+        # The fields are decoded on demand, see __getattr__().
+        match._buf = six.binary_type(buf[offset:offset + length])
+        match._index = ofproto.oxm_parse_index(match._buf, 0, length)
         return match
 
     @staticmethod
@@ -2647,6 +2676,79 @@ class OFPFlowMod(MsgBase):
             offset += inst.len
 
 
+class OFPFlowModTemplate(ofproto_parser.MsgTemplate):
+    """
+    Flow mod template
+
+    ``flow_mod``, an ``OFPFlowMod``, is serialized once and
+    ``instantiate(**slots)`` returns a copy of its bytes with the values
+    of the given slots patched, to be sent with ``Datapath.send()``.
+    This saves composing and serializing the match, instructions and
+    actions for each of many flow mods which differ in a few values.
+
+    ================ ======================================================
+    Slot             Description
+    ================ ======================================================
+    xid              Transaction id, assigned by ``Datapath.next_xid()``
+                     to each instance unless given
+    cookie, ...      Attribute of ``OFPFlowMod`` of the same name, from
+                     ``cookie`` to ``flags``
+    (match field)    Value of a field of the match, e.g. ``ipv4_dst``,
+                     in the form ``OFPMatch`` takes it
+    port             Output port of the first ``OFPActionOutput``
+    max_len          Max length of the first ``OFPActionOutput``
+    ================ ======================================================
+
+    Only the fields in the match of ``flow_mod`` can be patched and the
+    length of their values can not change, i.e. a masked value can be
+    given only to a field masked in the template.
+
+    Example::
+
+        def add_flows(self, datapath, hosts):
+            ofp = datapath.ofproto
+            ofp_parser = datapath.ofproto_parser
+
+            match = ofp_parser.OFPMatch(eth_type=0x0800, ipv4_dst='0.0.0.0')
+            actions = [ofp_parser.OFPActionOutput(ofp.OFPP_FLOOD)]
+            inst = [ofp_parser.OFPInstructionActions(ofp.OFPIT_APPLY_ACTIONS,
+                                                     actions)]
+            tmpl = ofp_parser.OFPFlowModTemplate(
+                ofp_parser.OFPFlowMod(datapath, priority=1, match=match,
+                                      instructions=inst))
+            for ipv4_dst, port in hosts:
+                datapath.send(tmpl.instantiate(ipv4_dst=ipv4_dst, port=port))
+    """
+
+    def __init__(self, flow_mod):
+        assert isinstance(flow_mod, OFPFlowMod)
+        super(OFPFlowModTemplate, self).__init__(flow_mod)
+        self.add_struct_slots(ofproto.OFP_FLOW_MOD_PACK_STR0,
+                              ofproto.OFP_HEADER_SIZE,
+                              ['cookie', 'cookie_mask', 'table_id', 'command',
+                               'idle_timeout', 'hard_timeout', 'priority',
+                               'buffer_id', 'out_port', 'out_group', 'flags'])
+
+        offset = (ofproto.OFP_FLOW_MOD_SIZE -
+                  ofproto.OFP_MATCH_SIZE)
+        match_len = flow_mod.match.length
+        # the fields follow the type and length of ofp_match
+        self.add_oxm_slots(ofproto, offset + 4, match_len - 4)
+        offset += utils.round_up(match_len, 8)
+
+        for inst in flow_mod.instructions:
+            if isinstance(inst, OFPInstructionActions):
+                action_offset = offset + ofproto.OFP_INSTRUCTION_ACTIONS_SIZE
+                for a in inst.actions:
+                    if isinstance(a, OFPActionOutput) and \
+                            'port' not in self.slots:
+                        self.add_struct_slots(
+                            ofproto.OFP_ACTION_OUTPUT_PACK_STR,
+                            action_offset, [None, None, 'port', 'max_len'])
+                    action_offset += a.len
+            offset += inst.len
+
+
 class OFPInstruction(StringifyMixin):
     _INSTRUCTION_TYPES = {}
 
@@ -3728,11 +3830,64 @@ class OFPMultipartReply(MsgBase):
             return cls
         return _register_stats_type
 
+    # The body of a reply of the stats types with cls_body_lazy is
+    # parsed when it is used for the first time, see __getattr__(), so
+    # that columns() can decode it without creating the body objects.
+    cls_body_lazy = False
+
     def __init__(self, datapath, body=None, flags=None):
         super(OFPMultipartReply, self).__init__(datapath)
         self.body = body
         self.flags = flags
 
+    def __getattr__(self, name):
+        if name != 'body' or not self.cls_body_lazy or self.buf is None:
+            raise AttributeError(name)
+        self.body = self._parser_body(self.buf, self.msg_len)
+        return self.body
+
+    def stringify_attrs(self):
+        self.body
+        return super(OFPMultipartReply, self).stringify_attrs()
+
+    def columns(self, columns=None, **kwargs):
+        """
+        Decodes the body of the reply into columns, a dict of
+        ``array.array`` by the attribute names of the body entries,
+        without creating the body objects.  The arrays can be used as
+        NumPy arrays with ``numpy.frombuffer(column, column.typecode)``.
+        The 64 bits columns are lists instead on the platforms where
+        ``array`` has no 64 bits unsigned type, see ``_U64``.
+
+        Only for the stats types whose body class has
+        ``parser_columns()``, see ``OFPFlowStats`` and ``OFPPortStats``
+        for kwargs.  If ``columns`` is given, the body is appended to
+        it, e.g. to collect the replies of a multipart request::
+
+            columns = {}
+            for msg in msgs:
+                msg.columns(columns)
+        """
+        if columns is None:
+            columns = {}
+        self.cls_stats_body_cls.parser_columns(
+            self.buf, ofproto.OFP_MULTIPART_REPLY_SIZE, self.msg_len,
+            columns, **kwargs)
+        return columns
+
+    @classmethod
+    def _parser_body(cls, buf, msg_len):
+        offset = ofproto.OFP_MULTIPART_REPLY_SIZE
+        body = []
+        while offset < msg_len:
+            b = cls.cls_stats_body_cls.parser(buf, offset)
+            body.append(b)
+            offset += b.length if hasattr(b, 'length') else b.len
+
+        if cls.cls_body_single_struct:
+            return body[0]
+        return body
+
     @classmethod
     def parser_stats_body(cls, buf, msg_len, offset):
         body_cls = cls.cls_stats_body_cls
@@ -3765,20 +3920,80 @@ class OFPMultipartReply(MsgBase):
         msg.type = type_
         msg.flags = flags
 
-        offset = ofproto.OFP_MULTIPART_REPLY_SIZE
-        body = []
-        while offset < msg_len:
-            b = stats_type_cls.cls_stats_body_cls.parser(msg.buf, offset)
-            body.append(b)
-            offset += b.length if hasattr(b, 'length') else b.len
-
-        if stats_type_cls.cls_body_single_struct:
-            msg.body = body[0]
+        if stats_type_cls.cls_body_lazy:
+            del msg.body
         else:
-            msg.body = body
+            msg.body = stats_type_cls._parser_body(msg.buf, msg_len)
         return msg
 
 
+def _u64_typecode():
+    # 'Q' is only on Python 3.3 or later, 'L' is 64 bits on LP64
+    # platforms only
+    for typecode in ('Q', 'L'):
+        try:
+            if array.array(typecode).itemsize == 8:
+                return typecode
+        except ValueError:
+            pass
+    return None
+
+
+# the typecode of the 64 bits columns, None for a list
+_U64 = _u64_typecode()
+
+
+def _column(columns, name, typecode):
+    column = columns.get(name)
+    if column is None:
+        if typecode is None:
+            column = columns[name] = []
+        else:
+            column = columns[name] = array.array(typecode)
+    return column
+
+
+_OXM_HEADER = struct.Struct('!I')
+
+# {value size: (typecode, struct format, shifts)}
+_OXM_COLUMN_FORMATS = {
+    1: ('B', '!B', None),
+    2: ('H', '!H', None),
+    3: ('I', '!BH', 16),
+    4: ('I', '!I', None),
+    6: (_U64, '!HI', 32),
+    8: (_U64, '!Q', None),
+}
+
+
+def _oxm_column(name):
+    """
+    Returns (header >> 9, typecode, reader) of an OXM field for
+    parser_columns(); reader(buf, offset) returns the value at offset
+    as an int.
+    """
+    num = ofproto.oxm_from_user_header(name)
+    if isinstance(num, tuple):
+        raise ValueError('%s: experimenter fields are not supported' % name)
+    buf = bytearray()
+    ofproto.oxm_serialize_header(num, buf, 0)
+    (header, ) = _OXM_HEADER.unpack_from(six.binary_type(buf), 0)
+    size = header & 0xff
+    if size not in _OXM_COLUMN_FORMATS:
+        raise ValueError('%s: %d bytes fields are not supported' %
+                         (name, size))
+    (typecode, fmt, shift) = _OXM_COLUMN_FORMATS[size]
+    unpack_from = struct.Struct(fmt).unpack_from
+    if shift is None:
+        def reader(buf, offset):
+            return unpack_from(buf, offset)[0]
+    else:
+        def reader(buf, offset):
+            (high, low) = unpack_from(buf, offset)
+            return (high << shift) | low
+    return header >> 9, typecode, reader
+
+
 class OFPDescStats(ofproto_parser.namedtuple('OFPDescStats', (
         'mfr_desc', 'hw_desc', 'sw_desc', 'serial_num', 'dp_desc'))):
 
@@ -3910,6 +4125,64 @@ class OFPFlowStats(StringifyMixin):
         flow_stats.instructions = instructions
         return flow_stats
 
+    # the columns of OFP_FLOW_STATS_0_PACK_STR but length
+    _COLUMNS = [('table_id', 'B'), ('duration_sec', 'I'),
+                ('duration_nsec', 'I'), ('priority', 'H'),
+                ('idle_timeout', 'H'), ('hard_timeout', 'H'),
+                ('flags', 'H'), ('cookie', _U64), ('packet_count', _U64),
+                ('byte_count', _U64)]
+
+    @classmethod
+    def parser_columns(cls, buf, offset, end, columns, match_fields=()):
+        """
+        Appends the entries in buf[offset:end] to columns, one by
+        attribute but match and instructions.  The values of the OXM
+        fields named in match_fields (e.g. 'ipv4_src') are in columns of
+        the same name, as int without the mask, 0 if an entry doesn't
+        match on the field.  The columns named with '_present' appended
+        (e.g. 'ipv4_src_present') tell which entries match on the field,
+        1 if it does and 0 otherwise.
+        """
+        column_list = [_column(columns, name, typecode)
+                       for (name, typecode) in cls._COLUMNS]
+        fields = {}
+        for (i, name) in enumerate(match_fields):
+            (key, typecode, reader) = _oxm_column(name)
+            fields[key] = (i, reader)
+            column_list.append(_column(columns, name, typecode))
+        for name in match_fields:
+            column_list.append(_column(columns, name + '_present', 'B'))
+        num_fields = len(match_fields)
+        no_fields = (0, ) * (num_fields * 2)
+
+        unpack_from = struct.Struct(
+            ofproto.OFP_FLOW_STATS_0_PACK_STR).unpack_from
+        header_unpack_from = _OXM_HEADER.unpack_from
+        rows = []
+        while offset < end:
+            stats = unpack_from(buf, offset)
+            values = no_fields
+            if fields:
+                values = list(no_fields)
+                # OXM TLVs after the type and length of ofp_match
+                match_offset = offset + ofproto.OFP_FLOW_STATS_0_SIZE
+                (_type, match_len) = struct.unpack_from('!HH', buf,
+                                                        match_offset)
+                field_offset = match_offset + 4
+                match_end = match_offset + match_len
+                while field_offset < match_end:
+                    (header, ) = header_unpack_from(buf, field_offset)
+                    field = fields.get(header >> 9)
+                    if field is not None:
+                        values[field[0]] = field[1](buf, field_offset + 4)
+                        values[num_fields + field[0]] = 1
+                    field_offset += 4 + (header & 0xff)
+            rows.append(stats[1:] + tuple(values))
+            offset += stats[0]
+
+        for (column, values) in zip(column_list, zip(*rows)):
+            column.extend(values)
+
 
 class OFPFlowStatsRequestBase(OFPMultipartRequest):
     def __init__(self, datapath, flags, table_id, out_port, out_group,
@@ -4015,7 +4288,22 @@ class OFPFlowStatsReply(OFPMultipartReply):
                               stat.cookie, stat.packet_count, stat.byte_count,
                               stat.match, stat.instructions))
             self.logger.debug('FlowStats: %s', flows)
+
+    The body is parsed when it is used for the first time.  A handler
+    which needs only counters can use ``columns()`` instead::
+
+        @set_ev_cls(ofp_event.EventOFPFlowStatsReply, MAIN_DISPATCHER)
+        def flow_stats_reply_handler(self, ev):
+            columns = ev.msg.columns(match_fields=['ipv4_dst'])
+            for ipv4_dst, byte_count in zip(columns['ipv4_dst'],
+                                            columns['byte_count']):
+                self.logger.debug('%s: %d bytes',
+                                  addrconv.ipv4.bin_to_text(
+                                      struct.pack('!I', ipv4_dst)),
+                                  byte_count)
     """
+    cls_body_lazy = True
+
     def __init__(self, datapath, type_=None, **kwargs):
         super(OFPFlowStatsReply, self).__init__(datapath, **kwargs)
 
@@ -4194,6 +4482,29 @@ class OFPPortStats(ofproto_parser.namedtuple('OFPPortStats', (
         stats.length = ofproto.OFP_PORT_STATS_SIZE
         return stats
 
+    # the columns of OFP_PORT_STATS_PACK_STR
+    _COLUMNS = [('port_no', 'I')] + [
+        (name, _U64) for name in (
+            'rx_packets', 'tx_packets', 'rx_bytes', 'tx_bytes',
+            'rx_dropped', 'tx_dropped', 'rx_errors', 'tx_errors',
+            'rx_frame_err', 'rx_over_err', 'rx_crc_err', 'collisions')] + [
+        ('duration_sec', 'I'), ('duration_nsec', 'I')]
+
+    @classmethod
+    def parser_columns(cls, buf, offset, end, columns):
+        """
+        Appends the entries in buf[offset:end] to columns, one by
+        attribute.
+        """
+        column_list = [_column(columns, name, typecode)
+                       for (name, typecode) in cls._COLUMNS]
+        unpack_from = struct.Struct(
+            ofproto.OFP_PORT_STATS_PACK_STR).unpack_from
+        rows = [unpack_from(buf, o)
+                for o in range(offset, end, ofproto.OFP_PORT_STATS_SIZE)]
+        for (column, values) in zip(column_list, zip(*rows)):
+            column.extend(values)
+
 
 @_set_stats_type(ofproto.OFPMP_PORT_STATS, OFPPortStats)
 @_set_msg_type(ofproto.OFPT_MULTIPART_REQUEST)
@@ -4269,7 +4580,12 @@ class OFPPortStatsReply(OFPMultipartReply):
                               stat.rx_crc_err, stat.collisions,
                               stat.duration_sec, stat.duration_nsec))
             self.logger.debug('PortStats: %s', ports)
+
+    The body is parsed when it is used for the first time.  ``columns()``
+    decodes it into arrays instead, see ``OFPFlowStatsReply``.
     """
+    cls_body_lazy = True
+
     def __init__(self, datapath, type_=None, **kwargs):
         super(OFPPortStatsReply, self).__init__(datapath, **kwargs)
 
@@ -65,15 +65,19 @@
 # +-------------------------------+---------------+
 
 from ryu.ofproto.oxx_fields import (
-    _from_user,
+    _compile_codecs,
+    _from_user_compiled,
     _from_user_header,
-    _to_user,
+    _to_user_compiled,
     _to_user_header,
     _field_desc,
-    _normalize_user,
+    _normalize_user_compiled,
     _parse,
     _parse_header,
-    _serialize,
+    _parse_index,
+    _parse_user,
+    _serialize_compiled,
+    _serialize_user,
     _serialize_header)
 from ryu.ofproto import ofproto_common
 
@@ -177,24 +181,40 @@ def generate(modname):
     num_to_field = dict((f.num, f) for f in mod.oxm_types)
 
     # create functions by using oxx_fields module.
+    add_attr('_oxm_field_desc',  # oxx is not required
+             functools.partial(_field_desc, num_to_field))
+    # per field conversions, see oxx_fields._Codec
+    name_to_codec, num_to_codec = _compile_codecs(oxx, mod, mod.oxm_types)
     add_attr('oxm_from_user',
-             functools.partial(_from_user, oxx, name_to_field))
+             functools.partial(_from_user_compiled, oxx, name_to_field,
+                               name_to_codec))
     add_attr('oxm_from_user_header',
              functools.partial(_from_user_header, oxx, name_to_field))
     add_attr('oxm_to_user',
-             functools.partial(_to_user, oxx, num_to_field))
+             functools.partial(_to_user_compiled, oxx, num_to_field,
+                               num_to_codec))
     add_attr('oxm_to_user_header',
              functools.partial(_to_user_header, oxx, num_to_field))
-    add_attr('_oxm_field_desc',  # oxx is not required
-             functools.partial(_field_desc, num_to_field))
     add_attr('oxm_normalize_user',
-             functools.partial(_normalize_user, oxx, mod))
-    add_attr('oxm_parse',  # oxx is not required
-             functools.partial(_parse, mod))
+             functools.partial(_normalize_user_compiled, oxx, mod,
+                               name_to_codec))
+    # cache of the parsed field headers, see _parse_header_cached
+    header_cache = {}
+    add_attr('oxm_parse',
+             functools.partial(_parse, oxx, mod, num_to_codec, header_cache))
+    add_attr('oxm_parse_user',
+             functools.partial(_parse_user, oxx, mod, num_to_field,
+                               num_to_codec, header_cache))
+    add_attr('oxm_parse_index',
+             functools.partial(_parse_index, oxx, mod, num_to_codec,
+                               header_cache))
     add_attr('oxm_parse_header',  # oxx is not required
              functools.partial(_parse_header, mod))
     add_attr('oxm_serialize',
-             functools.partial(_serialize, oxx, mod))
+             functools.partial(_serialize_compiled, oxx, mod, num_to_codec))
+    add_attr('oxm_serialize_user',
+             functools.partial(_serialize_user, oxx, mod, name_to_field,
+                               name_to_codec))
     add_attr('oxm_serialize_header',
              functools.partial(_serialize_header, oxx, mod))
 
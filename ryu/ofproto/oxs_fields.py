@@ -55,14 +55,15 @@
 # type in the oxm_field field of the OXM header (EXT-380).
 
 from ryu.ofproto.oxx_fields import (
-    _from_user,
+    _compile_codecs,
+    _from_user_compiled,
     _from_user_header,
-    _to_user,
+    _to_user_compiled,
     _to_user_header,
     _field_desc,
     _parse,
     _parse_header,
-    _serialize,
+    _serialize_compiled,
     _serialize_header)
 
 
@@ -128,22 +129,28 @@ def generate(modname):
     num_to_field = dict((f.num, f) for f in mod.oxs_types)
 
     # create functions by using oxx_fields module.
+    add_attr('_oxs_field_desc',  # oxx is not required
+             functools.partial(_field_desc, num_to_field))
+    # per field conversions, see oxx_fields._Codec
+    name_to_codec, num_to_codec = _compile_codecs(oxx, mod, mod.oxs_types)
     add_attr('oxs_from_user',
-             functools.partial(_from_user, oxx, name_to_field))
+             functools.partial(_from_user_compiled, oxx, name_to_field,
+                               name_to_codec))
     add_attr('oxs_from_user_header',
              functools.partial(_from_user_header, oxx, name_to_field))
     add_attr('oxs_to_user',
-             functools.partial(_to_user, oxx, num_to_field))
+             functools.partial(_to_user_compiled, oxx, num_to_field,
+                               num_to_codec))
     add_attr('oxs_to_user_header',
              functools.partial(_to_user_header, oxx, num_to_field))
-    add_attr('_oxs_field_desc',  # oxx is not required
-             functools.partial(_field_desc, num_to_field))
-    add_attr('oxs_parse',  # oxx is not required
-             functools.partial(_parse, mod))
+    # cache of the parsed field headers, see _parse_header_cached
+    header_cache = {}
+    add_attr('oxs_parse',
+             functools.partial(_parse, oxx, mod, num_to_codec, header_cache))
     add_attr('oxs_parse_header',  # oxx is not required
              functools.partial(_parse_header, mod))
     add_attr('oxs_serialize',
-             functools.partial(_serialize, oxx, mod))
+             functools.partial(_serialize_compiled, oxx, mod, num_to_codec))
     add_attr('oxs_serialize_header',
              functools.partial(_serialize_header, oxx, mod))
 
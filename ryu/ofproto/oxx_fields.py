@@ -183,23 +183,95 @@ def _parse_header(mod, buf, offset):
     return oxx_type_num, field_len - value_len
 
 
-def _parse(mod, buf, offset):
-    (oxx_type_num, total_hdr_len, hasmask, value_len,
+_HEADER = struct.Struct('!I')
+
+
+def _parse_header_cached(oxx, mod, codecs, cache, buf, offset):
+    """Returns (num, name, total_hdr_len, value_struct, field_len, codec)
+    of the field at offset.
+
+    The result is cached per 32-bit header for the known fields.
+    value_struct unpacks the value (and the mask if any) at
+    offset + total_hdr_len.  codec is the _Codec of the field if the
+    value (and the mask) has the expected size, otherwise None.
+    """
+    (header, ) = _HEADER.unpack_from(buf, offset)
+    try:
+        return cache[header]
+    except KeyError:
+        pass
+    (num, total_hdr_len, hasmask, value_len,
      field_len) = _parse_header_impl(mod, buf, offset)
+    if hasmask:
+        value_struct = struct.Struct('!%ds%ds' % (value_len, value_len))
+    else:
+        value_struct = struct.Struct('!%ds' % value_len)
+    codec = codecs.get(num)
+    if codec is None:
+        try:
+            name = _to_user_header(oxx, {}, num)
+        except KeyError:
+            # unknown experimenter field; fails on decoding
+            name = None
+    else:
+        name = codec.name
+        if codec.size != value_len:
+            codec = None
+    info = (num, name, total_hdr_len, value_struct, field_len, codec)
+    # the header of an experimenter field doesn't identify it alone,
+    # and unknown ones are not cached to keep the cache bounded.
+    if header >> 16 != OFPXXC_EXPERIMENTER and num in codecs:
+        cache[header] = info
+    return info
+
+
+def _parse(oxx, mod, codecs, cache, buf, offset):
+    (oxx_type_num, name, total_hdr_len, value_struct, field_len,
+     codec) = _parse_header_cached(oxx, mod, codecs, cache, buf, offset)
     # Note: OXM/OXS payload length (oxx_len) includes Experimenter ID
     # (exp_hdr_len) for experimenter OXMs/OXSs.
-    value_offset = offset + total_hdr_len
-    value_pack_str = '!%ds' % value_len
-    assert struct.calcsize(value_pack_str) == value_len
-    (value, ) = struct.unpack_from(value_pack_str, buf, value_offset)
-    if hasmask:
-        (mask, ) = struct.unpack_from(value_pack_str, buf,
-                                      value_offset + value_len)
+    values = value_struct.unpack_from(buf, offset + total_hdr_len)
+    if len(values) == 2:
+        (value, mask) = values
     else:
+        (value, ) = values
         mask = None
     return oxx_type_num, value, mask, field_len
 
 
+def _parse_user(oxx, mod, num_to_field, codecs, cache, buf, offset):
+    """Returns (name, user_value, field_len) of the field at offset."""
+    (oxx_type_num, name, total_hdr_len, value_struct, field_len,
+     codec) = _parse_header_cached(oxx, mod, codecs, cache, buf, offset)
+    value_offset = offset + total_hdr_len
+    if codec is not None:
+        return (name, codec.unpack_user(buf, value_offset,
+                                        value_struct.size > codec.size),
+                field_len)
+    values = value_struct.unpack_from(buf, value_offset)
+    if len(values) == 2:
+        (value, mask) = values
+    else:
+        (value, ) = values
+        mask = None
+    name, user_value = _to_user(oxx, num_to_field, oxx_type_num, value, mask)
+    return name, user_value, field_len
+
+
+def _parse_index(oxx, mod, codecs, cache, buf, offset, length):
+    """Returns [(name, offset), ...] of the fields in the length bytes
+    at offset, without decoding their values.
+    """
+    index = []
+    while length > 0:
+        (num, name, total_hdr_len, value_struct, field_len,
+         codec) = _parse_header_cached(oxx, mod, codecs, cache, buf, offset)
+        index.append((name, offset))
+        offset += field_len
+        length -= field_len
+    return index
+
+
 def _make_exp_hdr(oxx, mod, n):
     exp_hdr = bytearray()
     try:
@@ -260,3 +332,211 @@ def _serialize(oxx, mod, n, value, mask, buf, offset):
                       (n << 9) | (0 << 8) | (exp_hdr_len + value_len),
                       bytes(exp_hdr), value)
     return struct.calcsize(pack_str)
+
+
+#
+# codecs compiled per field by _compile_codecs(), used instead of the
+# generic conversions above for the known fields.
+#
+_INT_FORMATS = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+class _Codec(object):
+    """Conversions of a field between the user representation and the
+    internal one/the wire format, with the header bytes and struct
+    formats computed once.
+    """
+
+    def __init__(self, oxx, mod, field):
+        self.oxx = oxx
+        self.name = field.name
+        self.num = field.num
+        self.type = t = field.type
+        self.size = size = t.size
+        # only OXMs have masks; a tuple is a value for the others
+        self.maskable = oxx == 'oxm'
+
+        n, exp_hdr = _make_exp_hdr(oxx, mod, field.num)
+        exp_hdr = bytes(exp_hdr)
+        self.header = (_HEADER.pack((n << 9) | (len(exp_hdr) + size)) +
+                       exp_hdr)
+        self.header_w = (_HEADER.pack((n << 9) | (1 << 8) |
+                                      (len(exp_hdr) + size * 2)) +
+                         exp_hdr)
+
+        fmt = None
+        if isinstance(t, type_desc.IntDescr):
+            fmt = _INT_FORMATS.get(size)
+        if fmt is not None:
+            # the value is packed directly, truncated to the size as
+            # IntDescr.from_user() does
+            self._int_max = (1 << (size * 8)) - 1
+            self._value_from_user = None
+            self._value_to_user = None
+        else:
+            fmt = '%ds' % size
+            self._int_max = None
+            # addrconv converts the addresses in the usual notation
+            # without netaddr
+            self._value_from_user = t.from_user
+            self._value_to_user = t.to_user
+        self._user = struct.Struct('!' + fmt)
+        self._user_w = struct.Struct('!' + fmt * 2)
+        self._wire = struct.Struct('!%ds%s' % (len(self.header), fmt))
+        self._wire_w = struct.Struct('!%ds%s%s' % (len(self.header_w),
+                                                  fmt, fmt))
+
+    def _split(self, user_value):
+        if self.maskable and isinstance(user_value, (tuple, list)):
+            return user_value
+        return user_value, None
+
+    def _to_packable(self, value):
+        if self._int_max is None:
+            return self._value_from_user(value)
+        return value & self._int_max
+
+    def _from_unpacked(self, value):
+        if self._int_max is None:
+            return self._value_to_user(value)
+        return value
+
+    def from_user(self, user_value):
+        (value, mask) = self._split(user_value)
+        if value is not None:
+            value = self._user.pack(self._to_packable(value))
+        if mask is not None:
+            mask = self._user.pack(self._to_packable(mask))
+        return self.num, value, mask
+
+    def to_user(self, value, mask):
+        if (not isinstance(value, (bytes, bytearray)) or
+                len(value) != self.size or
+                (mask is not None and len(mask) != self.size)):
+            return None
+        (value, ) = self._user.unpack(value)
+        value = self._from_unpacked(value)
+        if mask is None:
+            return self.name, value
+        (mask, ) = self._user.unpack(mask)
+        return self.name, (value, self._from_unpacked(mask))
+
+    def unpack_user(self, buf, offset, hasmask):
+        if hasmask:
+            (value, mask) = self._user_w.unpack_from(buf, offset)
+            return (self._from_unpacked(value), self._from_unpacked(mask))
+        (value, ) = self._user.unpack_from(buf, offset)
+        return self._from_unpacked(value)
+
+    def normalize_user(self, user_value):
+        """Returns user_value with the mask applied to the value, or
+        None if it isn't an integer field.
+        """
+        if self._int_max is None:
+            return None
+        (value, mask) = self._split(user_value)
+        if value is None:
+            return None
+        value &= self._int_max
+        if mask is None:
+            return value
+        mask &= self._int_max
+        return (value & mask, mask)
+
+    def pack_user(self, user_value):
+        """Returns the field in the wire format, or None if it has no
+        value.
+        """
+        (value, mask) = self._split(user_value)
+        if value is None:
+            return None
+        value = self._to_packable(value)
+        if mask is None:
+            return self._wire.pack(self.header, value)
+        return self._wire_w.pack(self.header_w, value,
+                                 self._to_packable(mask))
+
+    def pack(self, value, mask):
+        """Same as pack_user() for the internal representation, or None
+        if value or mask isn't of the size of the field.
+        """
+        if len(value) != self.size:
+            return None
+        if mask:
+            if len(mask) != self.size:
+                return None
+            return self.header_w + value + mask
+        return self.header + value
+
+
+def _compile_codecs(oxx, mod, fields):
+    """Returns {name: _Codec}, {num: _Codec} of the fields."""
+    name_to_codec = {}
+    num_to_codec = {}
+    for f in fields:
+        if getattr(f.type, 'size', None) is None:
+            continue
+        codec = _Codec(oxx, mod, f)
+        name_to_codec[f.name] = codec
+        num_to_codec[f.num] = codec
+    return name_to_codec, num_to_codec
+
+
+def _write(buf, offset, data):
+    # same as msg_pack_into() for already packed data
+    if len(buf) < offset:
+        buf += bytearray(offset - len(buf))
+    buf[offset:offset + len(data)] = data
+    return len(data)
+
+
+def _from_user_compiled(oxx, name_to_field, name_to_codec, name,
+                        user_value):
+    codec = name_to_codec.get(name)
+    if codec is None:
+        return _from_user(oxx, name_to_field, name, user_value)
+    return codec.from_user(user_value)
+
+
+def _to_user_compiled(oxx, num_to_field, num_to_codec, n, v, m):
+    codec = num_to_codec.get(n)
+    if codec is not None:
+        result = codec.to_user(v, m)
+        if result is not None:
+            return result
+    return _to_user(oxx, num_to_field, n, v, m)
+
+
+def _normalize_user_compiled(oxx, mod, name_to_codec, k, uv):
+    codec = name_to_codec.get(k)
+    if codec is not None:
+        try:
+            uv2 = codec.normalize_user(uv)
+        except (TypeError, ValueError):
+            # not an integer, or a bad (value, mask) pair, as
+            # _normalize_user() leaves them
+            return (k, uv)
+        if uv2 is not None:
+            return (k, uv2)
+    return _normalize_user(oxx, mod, k, uv)
+
+
+def _serialize_compiled(oxx, mod, num_to_codec, n, value, mask, buf,
+                        offset):
+    codec = num_to_codec.get(n)
+    if codec is not None:
+        data = codec.pack(value, mask)
+        if data is not None:
+            return _write(buf, offset, data)
+    return _serialize(oxx, mod, n, value, mask, buf, offset)
+
+
+def _serialize_user(oxx, mod, name_to_field, name_to_codec, name,
+                    user_value, buf, offset):
+    """oxx_serialize(*oxx_from_user(name, user_value), buf, offset)"""
+    codec = name_to_codec.get(name)
+    if codec is not None:
+        data = codec.pack_user(user_value)
+        if data is not None:
+            return _write(buf, offset, data)
+    (n, value, mask) = _from_user(oxx, name_to_field, name, user_value)
+    return _serialize(oxx, mod, n, value, mask, buf, offset)
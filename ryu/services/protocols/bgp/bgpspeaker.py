@@ -37,9 +37,11 @@ from ryu.services.protocols.bgp.rtconf.common \
 from ryu.services.protocols.bgp.rtconf.common \
     import DEFAULT_BGP_CONN_RETRY_TIME
 from ryu.services.protocols.bgp.rtconf.common import DEFAULT_LABEL_RANGE
+from ryu.services.protocols.bgp.rtconf.common import DEFAULT_UPDATE_DECODERS
 from ryu.services.protocols.bgp.rtconf.common import REFRESH_MAX_EOR_TIME
 from ryu.services.protocols.bgp.rtconf.common import REFRESH_STALEPATH_TIME
 from ryu.services.protocols.bgp.rtconf.common import LABEL_RANGE
+from ryu.services.protocols.bgp.rtconf.common import UPDATE_DECODERS
 from ryu.services.protocols.bgp.rtconf import neighbors
 from ryu.services.protocols.bgp.rtconf import vrfs
 from ryu.services.protocols.bgp.rtconf.base import CAP_MBGP_IPV4
@@ -113,7 +115,8 @@ class BGPSpeaker(object):
                  peer_down_handler=None,
                  peer_up_handler=None,
                  ssh_console=False,
-                 label_range=DEFAULT_LABEL_RANGE):
+                 label_range=DEFAULT_LABEL_RANGE,
+                 update_decoders=DEFAULT_UPDATE_DECODERS):
         """Create a new BGPSpeaker object with as_number and router_id to
         listen on bgp_server_port.
 
@@ -147,6 +150,16 @@ class BGPSpeaker(object):
         ``peer_up_handler``, if specified, is called when BGP peering
         session goes up.
 
+        ``update_decoders`` specifies the number of worker processes
+        which decode the received UPDATE messages. 0, the default, decodes
+        them in the main process. The workers decode more prefixes per
+        second, but add the wait for a batch of messages to the latency
+        of each (757 ms instead of 121 ms on average in
+        ryu.tests.benchmark.bgp_update_decode), so they are for the
+        speakers which receive full tables from several peers. The
+        workers need the monkey patching of hub.patch(), which
+        ryu-manager does.
+
         """
         super(BGPSpeaker, self).__init__()
 
@@ -157,6 +170,7 @@ class BGPSpeaker(object):
         settings[REFRESH_STALEPATH_TIME] = refresh_stalepath_time
         settings[REFRESH_MAX_EOR_TIME] = refresh_max_eor_time
         settings[LABEL_RANGE] = label_range
+        settings[UPDATE_DECODERS] = update_decoders
         self._core_start(settings)
         self._init_signal_listeners()
         self._best_path_change_handler = best_path_change_handler
@@ -512,6 +526,32 @@ class BGPSpeaker(object):
         show['format'] = format
         return call('operator.show', **show)
 
+    def rib_lookup(self, prefix, family='ipv4', match='longest',
+                   format='json'):
+        """ This method returns the BGP routes of a prefix in a json
+        format.
+
+        ``prefix`` specifies the prefix, like 10.0.0.0/24, or an address
+        without the prefix length.  For vpnv4 and vpnv6, it is prefixed
+        with the route distinguisher, like 65000:100:10.0.0.0/24.
+
+        ``family`` specifies the address family of the RIB, which is
+        ipv4, ipv6, vpnv4 or vpnv6.
+
+        ``match`` specifies how the routes are looked up.
+
+          exact : routes of the prefix
+
+          longest : routes of the longest prefix which matches the prefix
+
+          subtree : routes of the prefixes which the prefix covers
+
+        """
+        show = {}
+        show['params'] = ['rib', family, prefix, match]
+        show['format'] = format
+        return call('operator.show', **show)
+
     def neighbor_get(self, routetype, address, format='json'):
         """ This method returns the BGP adj-RIB-in information in a json
         format.
@@ -27,6 +27,7 @@ from ryu.lib.packet.bgp import BGPUpdate
 from ryu.lib.packet.bgp import BGPPathAttributeNextHop
 from ryu.lib.packet.bgp import BGPPathAttributeMpReachNLRI
 from ryu.lib.packet.bgp import BGPPathAttributeMpUnreachNLRI
+from ryu.lib.packet.bgp import BGP_ATTR_TYPE_MP_REACH_NLRI
 
 LOG = logging.getLogger('bgpspeaker.bmp')
 
@@ -175,6 +176,11 @@ class BMPClient(Activity):
             if isinstance(path, Ipv4Path):
                 return BGPUpdate(nlri=[path.nlri],
                                  path_attributes=new_pathattr)
+            # the MP_REACH_NLRI of the path has no NLRIs
+            for i, attr in enumerate(new_pathattr):
+                if attr.type == BGP_ATTR_TYPE_MP_REACH_NLRI:
+                    new_pathattr[i] = BGPPathAttributeMpReachNLRI(
+                        attr.afi, attr.safi, attr.next_hop, [path.nlri])
 
         return BGPUpdate(path_attributes=new_pathattr)
 
@@ -39,6 +39,7 @@ from ryu.services.protocols.bgp.model import FlexinetOutgoingRoute
 from ryu.services.protocols.bgp.protocol import Factory
 from ryu.services.protocols.bgp.signals.emit import BgpSignalBus
 from ryu.services.protocols.bgp.speaker import BgpProtocol
+from ryu.services.protocols.bgp.update_decoder import UpdateDecoder
 from ryu.services.protocols.bgp.utils.rtfilter import RouteTargetManager
 from ryu.services.protocols.bgp.rtconf.neighbors import CONNECT_MODE_ACTIVE
 from ryu.services.protocols.bgp.utils import stats
@@ -127,6 +128,9 @@ class CoreService(Factory, Activity):
         # BgpProcessor instance (initialized during start)
         self._bgp_processor = None
 
+        # UpdateDecoder instance (initialized during start, if configured)
+        self._update_decoder = None
+
         # BMP clients key: (host, port) value: BMPClient instance
         self.bmpclients = {}
 
@@ -214,6 +218,12 @@ class CoreService(Factory, Activity):
 
     def _run(self, *args, **kwargs):
         from ryu.services.protocols.bgp.processor import BgpProcessor
+        # Start the UPDATE decoder workers first, so that they don't hold
+        # any of the sockets.
+        if self._common_config.update_decoders:
+            self._update_decoder = UpdateDecoder(
+                self._common_config.update_decoders)
+
         # Initialize bgp processor.
         self._bgp_processor = BgpProcessor(self)
         # Start BgpProcessor in a separate thread.
@@ -237,6 +247,12 @@ class CoreService(Factory, Activity):
             self.listen_sockets = {}
         processor_thread.wait()
 
+    def stop(self):
+        super(CoreService, self).stop()
+        if self._update_decoder is not None:
+            self._update_decoder.stop()
+            self._update_decoder = None
+
     # ========================================================================
     # RTC address family related utilities
     # ========================================================================
@@ -418,7 +434,8 @@ class CoreService(Factory, Activity):
         bgp_protocol = self.protocol(
             socket,
             self._signal_bus,
-            is_reactive_conn=is_reactive_conn
+            is_reactive_conn=is_reactive_conn,
+            update_decoder=self._update_decoder
         )
         return bgp_protocol
 
@@ -21,15 +21,17 @@
 import abc
 from abc import ABCMeta
 from abc import abstractmethod
-from copy import copy
 import logging
 import netaddr
+import struct
+import weakref
 
 from ryu.lib.packet.bgp import RF_IPv4_UC
 from ryu.lib.packet.bgp import RouteTargetMembershipNLRI
 from ryu.lib.packet.bgp import BGP_ATTR_TYPE_EXTENDED_COMMUNITIES
 from ryu.lib.packet.bgp import BGPPathAttributeLocalPref
 from ryu.lib.packet.bgp import BGP_ATTR_TYPE_AS_PATH
+from ryu.lib.packet.bgp import BGPUpdate
 
 from ryu.services.protocols.bgp.base import OrderedDict
 from ryu.services.protocols.bgp.constants import VPN_TABLE
@@ -37,6 +39,8 @@ from ryu.services.protocols.bgp.constants import VRF_TABLE
 from ryu.services.protocols.bgp.model import OutgoingRoute
 from ryu.services.protocols.bgp.processor import BPR_ONLY_PATH
 from ryu.services.protocols.bgp.processor import BPR_UNKNOWN
+from ryu.services.protocols.bgp.utils.internable import Internable
+from ryu.services.protocols.bgp.utils.radix import RadixTree
 
 
 LOG = logging.getLogger('bgpspeaker.info_base.base')
@@ -51,9 +55,15 @@ class Table(object):
     """
     __metaclass__ = abc.ABCMeta
     ROUTE_FAMILY = RF_IPv4_UC
+    # Bit length of the packed prefixes of the keys which _table_key()
+    # returns, if the destinations are kept in a radix tree by them.
+    KEY_BITS = None
 
     def __init__(self, scope_id, core_service, signal_bus):
-        self._destinations = dict()
+        if self.KEY_BITS:
+            self._destinations = RadixTree(self.KEY_BITS)
+        else:
+            self._destinations = dict()
         # Scope in which this table exists.
         # If this table represents the VRF, then this could be a VPN ID.
         # For global/VPN tables this should be None
@@ -166,7 +176,7 @@ class Table(object):
         self._validate_nlri(nlri)
         dest = self._get_dest(nlri)
         if dest:
-            self._destinations.pop(dest)
+            self._destinations.pop(self._table_key(nlri))
         return dest
 
     def delete_dest(self, dest):
@@ -201,6 +211,37 @@ class Table(object):
         dest = self._destinations.get(table_key)
         return dest
 
+    def _radix_tree(self):
+        if not isinstance(self._destinations, RadixTree):
+            raise ValueError('No prefix lookup in table %s' % self)
+        return self._destinations
+
+    def get_dest_by_nlri(self, nlri):
+        """Returns the destination of *nlri*, or None."""
+        self._validate_nlri(nlri)
+        return self._get_dest(nlri)
+
+    def get_longest_match_dest(self, nlri):
+        """Returns the destination of the longest prefix which matches
+        *nlri*, or None.
+        """
+        self._validate_nlri(nlri)
+        return self._radix_tree().longest_match(self._table_key(nlri))
+
+    def iter_dests_under(self, nlri):
+        """Iterates the destinations of the prefixes which *nlri* covers,
+        including *nlri* itself, shorter prefixes first.
+        """
+        self._validate_nlri(nlri)
+        for _, dest in self._radix_tree().itersubtree(self._table_key(nlri)):
+            yield dest
+
+    @property
+    def destinations(self):
+        """The destinations by the formatted string of their NLRI."""
+        return dict((dest.nlri.formatted_nlri_str, dest)
+                    for dest in self.itervalues())
+
     def is_for_vrf(self):
         """Returns true if this table instance represents a VRF.
         """
@@ -304,7 +345,8 @@ class Destination(object):
         # Pointer to best-path. One from the the known paths.
         self._best_path = None
 
-        # Reason current best path was chosen as best path.
+        # Reason current best path was chosen as best path, None until it is
+        # computed on demand.
         self._best_path_reason = None
 
         # List of withdrawn paths.
@@ -338,6 +380,8 @@ class Destination(object):
 
     @property
     def best_path_reason(self):
+        if self._best_path_reason is None and self._best_path is not None:
+            self._best_path_reason = self._compute_best_path_reason()
         return self._best_path_reason
 
     @property
@@ -488,10 +532,11 @@ class Destination(object):
         self._remove_old_paths()
 
         # Collect all new paths into known paths.
-        self._known_path_list.extend(self._new_path_list)
+        new_paths = self._new_path_list
+        self._known_path_list.extend(new_paths)
 
         # Clear new paths as we copied them.
-        del(self._new_path_list[:])
+        self._new_path_list = []
 
         # If we do not have any paths to this destination, then we do not have
         # new best path.
@@ -499,7 +544,7 @@ class Destination(object):
             return None, BPR_UNKNOWN
 
         # Compute new best path
-        current_best_path, reason = self._compute_best_known_path()
+        current_best_path, reason = self._compute_best_known_path(new_paths)
         return current_best_path, reason
 
     def _remove_withdrawals(self):
@@ -582,32 +627,54 @@ class Destination(object):
                 LOG.debug('Implicit withdrawal of old path, since we have'
                           ' learned new path from same source: %s', old_path)
 
-    def _compute_best_known_path(self):
+    def _best_path_key(self, path):
+        core_service = self._core_service
+        return path.get_best_path_key(core_service.asn,
+                                      core_service.router_id)
+
+    def _compute_best_known_path(self, new_paths=None):
         """Computes the best path among known paths.
 
-        Returns current best path among `known_paths`.
+        Returns current best path among `known_paths`, the first of them with
+        the greatest key, as `compute_best_path` would select comparing
+        them in turn.  If the current best path is still known, only it and
+        *new_paths*, which were added to known paths, are compared.  The
+        reason is computed on demand.
         """
         if not self._known_path_list:
             from ryu.services.protocols.bgp.processor import BgpProcessorError
             raise BgpProcessorError(desc='Need at-least one known path to'
                                     ' compute best path')
 
-        # We pick the first path as current best path. This helps in breaking
-        # tie between two new paths learned in one cycle for which best-path
-        # calculation steps lead to tie.
-        current_best_path = self._known_path_list[0]
-        best_path_reason = BPR_ONLY_PATH
-        for next_path in self._known_path_list[1:]:
-            from ryu.services.protocols.bgp.processor import compute_best_path
-            # Compare next path with current best path.
-            new_best_path, reason = \
-                compute_best_path(self._core_service.asn, current_best_path,
-                                  next_path)
-            best_path_reason = reason
-            if new_best_path is not None:
-                current_best_path = new_best_path
-
-        return current_best_path, best_path_reason
+        if len(self._known_path_list) == 1:
+            return self._known_path_list[0], BPR_ONLY_PATH
+
+        # The first path wins a tie, which breaks the tie between two new
+        # paths learned in one cycle for which best-path calculation steps
+        # lead to tie.  The current best path precedes the new paths.
+        best_path = self._best_path
+        if (new_paths is not None and best_path is not None and
+                any(path is best_path for path in self._known_path_list)):
+            paths = [best_path]
+            paths.extend(new_paths)
+        else:
+            paths = self._known_path_list
+        return max(paths, key=self._best_path_key), None
+
+    def _compute_best_path_reason(self):
+        """Computes the reason the best path is selected over the best of
+        the other known paths.
+        """
+        from ryu.services.protocols.bgp.processor import \
+            compute_best_path_key_reason
+        best_path = self._best_path
+        others = [path for path in self._known_path_list
+                  if path is not best_path]
+        if not others:
+            return BPR_ONLY_PATH
+        second_path = max(others, key=self._best_path_key)
+        return compute_best_path_key_reason(self._best_path_key(best_path),
+                                            self._best_path_key(second_path))
 
     def withdraw_unintresting_paths(self, interested_rts):
         """Withdraws paths that are no longer interesting.
@@ -662,6 +729,129 @@ class Destination(object):
         return result
 
 
+class PathAttrSet(Internable):
+    """Immutable map of path attribute type to path attribute.
+
+    A path holds the interned copy of its attributes, so that the paths
+    with the same attributes, as the prefixes of an UPDATE or the routes
+    of a full table from several peers, share one set.  The attributes
+    of the interned sets are interned as well, so that the sets with some
+    attributes in common, as a NEXT_HOP or a COMMUNITIES, share them.
+    The wire form of the attributes is computed once, at creation, and is
+    both the hash and the identity of the set.  The attributes in it must
+    not be modified.
+    """
+
+    # The interned attributes by their wire form, and the wire form of
+    # them, which is reused by serialize_pattr() for the attributes sent
+    # as they are.
+    _pattr_by_wire = weakref.WeakValueDictionary()
+    _pattr_wire = weakref.WeakKeyDictionary()
+
+    __slots__ = ('_pattrs', '_pattr_wires', '_wire', '_hash', '_interned',
+                 '__weakref__')
+
+    def __init__(self, pattrs=None):
+        # (type, attribute) in order, as a set holds a few attributes
+        self._pattrs = tuple(pattrs.items()) if pattrs else ()
+        self._pattr_wires = tuple(bytes(attr.serialize())
+                                  for _, attr in self._pattrs)
+        self._wire = b''.join(self._pattr_wires)
+        self._hash = hash(self._wire)
+
+    @classmethod
+    def from_wire(cls, wire):
+        """Returns the interned set of the attributes of wire form *wire*.
+
+        The attributes are parsed only if no interned set has them.
+        """
+        probe = cls.__new__(cls)
+        probe._pattrs = ()
+        probe._pattr_wires = None
+        probe._wire = wire
+        probe._hash = hash(wire)
+        interned = probe.find_interned()
+        if interned is not None:
+            return interned
+
+        buf = struct.pack('!HH', 0, len(wire)) + wire
+        pattrs = OrderedDict()
+        for attr in BGPUpdate.parser(buf)['path_attributes']:
+            pattrs[attr.type] = attr
+        return cls(pattrs).intern()
+
+    @classmethod
+    def serialize_pattr(cls, attr):
+        """Returns the wire form of *attr*, from the interned sets if any.
+        """
+        wire = cls._pattr_wire.get(attr)
+        if wire is None:
+            wire = bytes(attr.serialize())
+        return wire
+
+    def intern(self):
+        interned = super(PathAttrSet, self).intern()
+        if interned is self and self._pattr_wires is not None:
+            pattrs = []
+            for (pattr_type, attr), wire in zip(self._pattrs,
+                                                self._pattr_wires):
+                attr = PathAttrSet._pattr_by_wire.setdefault(wire, attr)
+                PathAttrSet._pattr_wire[attr] = wire
+                pattrs.append((pattr_type, attr))
+            self._pattrs = tuple(pattrs)
+            # kept by _pattr_wire from now on
+            self._pattr_wires = None
+        return interned
+
+    @property
+    def wire(self):
+        """The attributes serialized as in an UPDATE message."""
+        return self._wire
+
+    def get(self, pattr_type, default=None):
+        for t, attr in self._pattrs:
+            if t == pattr_type:
+                return attr
+        return default
+
+    def keys(self):
+        return [t for t, _ in self._pattrs]
+
+    def values(self):
+        return [attr for _, attr in self._pattrs]
+
+    def items(self):
+        return list(self._pattrs)
+
+    def __getitem__(self, pattr_type):
+        attr = self.get(pattr_type)
+        if attr is None:
+            raise KeyError(pattr_type)
+        return attr
+
+    def __contains__(self, pattr_type):
+        return self.get(pattr_type) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self._pattrs)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return (isinstance(other, PathAttrSet) and
+                self._hash == other._hash and self._wire == other._wire)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return repr(OrderedDict(self._pattrs))
+
+
 class Path(object):
     """Represents a way of reaching an IP destination.
 
@@ -671,7 +861,8 @@ class Path(object):
     __metaclass__ = ABCMeta
     __slots__ = ('_source', '_path_attr_map', '_nlri', '_source_version_num',
                  '_exported_from', '_nexthop', 'next_path', 'prev_path',
-                 '_is_withdraw', 'med_set_by_target_neighbor')
+                 '_is_withdraw', 'med_set_by_target_neighbor',
+                 '_best_path_key')
     ROUTE_FAMILY = RF_IPv4_UC
 
     def __init__(self, source, nlri, src_ver_num, pattrs=None, nexthop=None,
@@ -685,7 +876,8 @@ class Path(object):
             - `nlri`: (Vpnv4) Nlri instance for Vpnv4 route family.
             - `src_ver_num`: (int) version number of *source* when this path
             was learned.
-            - `pattrs`: (OrderedDict) various path attributes for this path.
+            - `pattrs`: (OrderedDict or PathAttrSet) various path
+            attributes for this path, which are interned.
             - `nexthop`: (str) nexthop advertised for this path.
             - `is_withdraw`: (bool) True if this represents a withdrawal.
         """
@@ -714,11 +906,11 @@ class Path(object):
         # The entity (peer) that gave us this path.
         self._source = source
 
-        # Path attribute of this path.
-        if pattrs:
-            self._path_attr_map = copy(pattrs)
-        else:
-            self._path_attr_map = OrderedDict()
+        # Path attribute of this path, shared with the other paths with the
+        # same attributes.
+        if not isinstance(pattrs, PathAttrSet):
+            pattrs = PathAttrSet(pattrs)
+        self._path_attr_map = pattrs.intern()
 
         # NLRI that this path represents.
         self._nlri = nlri
@@ -731,6 +923,9 @@ class Path(object):
 
         self._nexthop = nexthop
 
+        # Key for best path selection, computed when first compared.
+        self._best_path_key = None
+
         # Automatically generated.
         #
         # self.next_path
@@ -761,7 +956,12 @@ class Path(object):
 
     @property
     def pathattr_map(self):
-        return copy(self._path_attr_map)
+        return OrderedDict(self._path_attr_map.items())
+
+    @property
+    def pathattr_set(self):
+        """The interned PathAttrSet of this path, which is shared."""
+        return self._path_attr_map
 
     @property
     def nexthop(self):
@@ -774,10 +974,26 @@ class Path(object):
         """
         return self._path_attr_map.get(pattr_type, default)
 
+    def get_best_path_key(self, local_asn, local_bgp_id):
+        """Returns the key of this path for best path selection.
+
+        The key is computed once, and again only if the local ASN or BGP
+        identifier changed.
+        @see processor.compute_best_path_key
+        """
+        cached = self._best_path_key
+        if cached is None or cached[0] != (local_asn, local_bgp_id):
+            from ryu.services.protocols.bgp.processor import \
+                compute_best_path_key
+            cached = ((local_asn, local_bgp_id),
+                      compute_best_path_key(local_asn, local_bgp_id, self))
+            self._best_path_key = cached
+        return cached[1]
+
     def clone(self, for_withdrawal=False):
         pathattrs = None
         if not for_withdrawal:
-            pathattrs = self.pathattr_map
+            pathattrs = self.pathattr_set
         clone = self.__class__(
             self.source,
             self.nlri,
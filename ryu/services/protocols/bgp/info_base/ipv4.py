@@ -18,6 +18,7 @@
 
 import logging
 
+from ryu.lib import addrconv
 from ryu.lib.packet.bgp import IPAddrPrefix
 from ryu.lib.packet.bgp import RF_IPv4_UC
 
@@ -55,15 +56,16 @@ class Ipv4Table(Table):
     """
     ROUTE_FAMILY = RF_IPv4_UC
     VPN_DEST_CLASS = IPv4Dest
+    KEY_BITS = 32
 
     def __init__(self, core_service, signal_bus):
         super(Ipv4Table, self).__init__(None, core_service, signal_bus)
 
     def _table_key(self, nlri):
         """Return a key that will uniquely identify this NLRI inside
-        this table.
+        this table, the prefix packed and its length.
         """
-        return nlri.prefix
+        return addrconv.ipv4.text_to_bin(nlri.addr), nlri.length
 
     def _create_dest(self, nlri):
         return self.VPN_DEST_CLASS(self, nlri)
@@ -18,6 +18,7 @@
 
 import logging
 
+from ryu.lib import addrconv
 from ryu.lib.packet.bgp import IPAddrPrefix
 from ryu.lib.packet.bgp import RF_IPv6_UC
 
@@ -55,15 +56,16 @@ class Ipv6Table(Table):
     """
     ROUTE_FAMILY = RF_IPv6_UC
     VPN_DEST_CLASS = IPv6Dest
+    KEY_BITS = 128
 
     def __init__(self, core_service, signal_bus):
         super(Ipv6Table, self).__init__(None, core_service, signal_bus)
 
     def _table_key(self, nlri):
         """Return a key that will uniquely identify this NLRI inside
-        this table.
+        this table, the prefix packed and its length.
         """
-        return nlri.prefix
+        return addrconv.ipv6.text_to_bin(nlri.addr), nlri.length
 
     def _create_dest(self, nlri):
         return self.VPN_DEST_CLASS(self, nlri)
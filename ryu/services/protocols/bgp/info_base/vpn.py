@@ -42,9 +42,12 @@ class VpnTable(Table):
 
     def _table_key(self, vpn_nlri):
         """Return a key that will uniquely identify this vpnvX NLRI inside
-        this table.
+        this table, the route distinguisher and the prefix packed and their
+        length.
         """
-        return vpn_nlri.route_dist + ':' + vpn_nlri.prefix
+        labels, rd, addr = vpn_nlri.addr
+        return (bytes(vpn_nlri._prefix_to_bin((rd, addr))),
+                vpn_nlri.length - 24 * len(labels))
 
     def _create_dest(self, nlri):
         return self.VPN_DEST_CLASS(self, nlri)
@@ -66,7 +69,7 @@ class VpnPath(Path):
 
         pathattrs = None
         if not is_withdraw:
-            pathattrs = self.pathattr_map
+            pathattrs = self.pathattr_set
 
         vrf_path = self.VRF_PATH_CLASS(
             self.VRF_PATH_CLASS.create_puid(
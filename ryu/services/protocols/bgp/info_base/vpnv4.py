@@ -45,6 +45,7 @@ class Vpnv4Table(VpnTable):
     """
     ROUTE_FAMILY = RF_IPv4_VPN
     VPN_DEST_CLASS = Vpnv4Dest
+    KEY_BITS = 96
 
 
 class Vpnv4Path(VpnPath):
@@ -45,6 +45,7 @@ class Vpnv6Table(VpnTable):
     """
     ROUTE_FAMILY = RF_IPv6_VPN
     VPN_DEST_CLASS = Vpnv6Dest
+    KEY_BITS = 192
 
 
 class Vpnv6Path(VpnPath):
@@ -82,12 +82,6 @@ class VrfTable(Table):
     def vrf_conf(self):
         return self._vrf_conf
 
-    def _table_key(self, nlri):
-        """Return a key that will uniquely identify this NLRI inside
-        this table.
-        """
-        return str(nlri)
-
     def _create_dest(self, nlri):
         return self.VRF_DEST_CLASS(self, nlri)
 
@@ -158,7 +152,7 @@ class VrfTable(Table):
             source,
             vrf_nlri,
             vpn_path.source_version_num,
-            pattrs=vpn_path.pathattr_map,
+            pattrs=vpn_path.pathattr_set,
             nexthop=vpn_path.nexthop,
             is_withdraw=vpn_path.is_withdraw,
             label_list=vpn_path.nlri.label_list
@@ -473,7 +467,7 @@ class VrfPath(Path):
     def clone(self, for_withdrawal=False):
         pathattrs = None
         if not for_withdrawal:
-            pathattrs = self.pathattr_map
+            pathattrs = self.pathattr_set
 
         clone = self.__class__(
             self.puid,
@@ -496,7 +490,7 @@ class VrfPath(Path):
 
         pathattrs = None
         if not for_withdrawal:
-            pathattrs = self.pathattr_map
+            pathattrs = self.pathattr_set
         vpnv_path = self.VPN_PATH_CLASS(
             self.source, vpn_nlri,
             self.source_version_num,
@@ -517,7 +511,7 @@ class VrfPath(Path):
             return False
         if not self.nexthop == b_path.nexthop:
             return False
-        if not self.pathattr_map == b_path.pathattr_map:
+        if not self.pathattr_set == b_path.pathattr_set:
             return False
 
         return True
@@ -21,6 +21,7 @@
 
 import logging
 
+from ryu.lib import addrconv
 from ryu.lib.packet.bgp import RF_IPv4_UC
 from ryu.lib.packet.bgp import RF_IPv4_VPN
 from ryu.lib.packet.bgp import IPAddrPrefix
@@ -53,6 +54,13 @@ class Vrf4Table(VrfTable):
     NLRI_CLASS = IPAddrPrefix
     VRF_PATH_CLASS = Vrf4Path
     VRF_DEST_CLASS = Vrf4Dest
+    KEY_BITS = 32
+
+    def _table_key(self, nlri):
+        """Return a key that will uniquely identify this NLRI inside
+        this table, the prefix packed and its length.
+        """
+        return addrconv.ipv4.text_to_bin(nlri.addr), nlri.length
 
 
 class Vrf4NlriImportMap(VrfNlriImportMap):
@@ -21,6 +21,7 @@
 
 import logging
 
+from ryu.lib import addrconv
 from ryu.lib.packet.bgp import RF_IPv6_UC
 from ryu.lib.packet.bgp import RF_IPv6_VPN
 from ryu.lib.packet.bgp import IP6AddrPrefix
@@ -54,6 +55,13 @@ class Vrf6Table(VrfTable):
     NLRI_CLASS = IP6AddrPrefix
     VRF_PATH_CLASS = Vrf6Path
     VRF_DEST_CLASS = Vrf6Dest
+    KEY_BITS = 128
+
+    def _table_key(self, nlri):
+        """Return a key that will uniquely identify this NLRI inside
+        this table, the prefix packed and its length.
+        """
+        return addrconv.ipv6.text_to_bin(nlri.addr), nlri.length
 
 
 class Vrf6NlriImportMap(VrfNlriImportMap):
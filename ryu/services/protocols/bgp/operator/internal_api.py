@@ -14,6 +14,10 @@ from ryu.lib.packet.bgp import BGP_ATTR_TYPE_LOCAL_PREF
 from ryu.lib.packet.bgp import BGP_ATTR_ORIGIN_IGP
 from ryu.lib.packet.bgp import BGP_ATTR_ORIGIN_EGP
 from ryu.lib.packet.bgp import BGP_ATTR_ORIGIN_INCOMPLETE
+from ryu.lib.packet.bgp import IPAddrPrefix
+from ryu.lib.packet.bgp import IP6AddrPrefix
+from ryu.lib.packet.bgp import LabelledVPNIPAddrPrefix
+from ryu.lib.packet.bgp import LabelledVPNIP6AddrPrefix
 
 from ryu.services.protocols.bgp.base import add_bgp_error_metadata
 from ryu.services.protocols.bgp.base import BGPSException
@@ -23,6 +27,24 @@ from ryu.services.protocols.bgp.core_manager import CORE_MANAGER
 
 LOG = logging.getLogger('bgpspeaker.operator.internal_api')
 
+RIB_FAMILIES = {
+    'ipv4': RF_IPv4_UC,
+    'ipv6': RF_IPv6_UC,
+    'vpnv4': RF_IPv4_VPN,
+    'vpnv6': RF_IPv6_VPN,
+    'rtfilter': RF_RTC_UC
+}
+
+# NLRI classes of the families whose routes are looked up by prefix
+_LOOKUP_NLRI_CLASSES = {
+    'ipv4': IPAddrPrefix,
+    'ipv6': IP6AddrPrefix,
+    'vpnv4': LabelledVPNIPAddrPrefix,
+    'vpnv6': LabelledVPNIP6AddrPrefix
+}
+
+RIB_MATCHES = ('exact', 'longest', 'subtree')
+
 INTERNAL_API_ERROR = 100
 INTERNAL_API_SUB_ERROR = 101
 
@@ -76,26 +98,74 @@ class InternalApi(object):
     def _get_vrf_tables(self):
         return CORE_MANAGER.get_core_service().table_manager.get_vrf_tables()
 
-    def get_single_rib_routes(self, addr_family):
-        rfs = {
-            'ipv4': RF_IPv4_UC,
-            'ipv6': RF_IPv6_UC,
-            'vpnv4': RF_IPv4_VPN,
-            'vpnv6': RF_IPv6_VPN,
-            'rtfilter': RF_RTC_UC
-        }
-        if addr_family not in rfs:
+    def _get_rib_table(self, addr_family):
+        if addr_family not in RIB_FAMILIES:
             raise WrongParamError('Unknown or unsupported family')
 
-        rf = rfs.get(addr_family)
+        rf = RIB_FAMILIES.get(addr_family)
         table_manager = self.get_core_service().table_manager
-        gtable = table_manager.get_global_table_by_route_family(rf)
+        return table_manager.get_global_table_by_route_family(rf)
+
+    def get_single_rib_routes(self, addr_family):
+        gtable = self._get_rib_table(addr_family)
         if gtable is not None:
-            return [self._dst_to_dict(dst)
-                    for dst in sorted(gtable.values())]
+            # in the order of the prefixes
+            return [self._dst_to_dict(dst) for dst in gtable.values()]
         else:
             return []
 
+    @staticmethod
+    def _prefix_to_nlri(addr_family, prefix):
+        # prefix is <route distinguisher>:<prefix> for VPN, and without
+        # the prefix length for a host.
+        nlri_cls = _LOOKUP_NLRI_CLASSES.get(addr_family)
+        if nlri_cls is None:
+            raise WrongParamError('No lookup by prefix for family %s' %
+                                  addr_family)
+        try:
+            kwargs = {}
+            if addr_family in ('vpnv4', 'vpnv6'):
+                admin, assigned, prefix = prefix.split(':', 2)
+                kwargs['route_dist'] = '%s:%s' % (admin, assigned)
+                # a label as the routes have
+                kwargs['labels'] = [0]
+            addr, _, length = prefix.partition('/')
+            if addr_family in ('ipv4', 'vpnv4'):
+                max_length = 32
+            else:
+                max_length = 128
+            length = int(length) if length else max_length
+            if not 0 <= length <= max_length:
+                raise ValueError('invalid prefix length %d' % length)
+            nlri = nlri_cls(length, addr, **kwargs)
+            # the prefix is packed here to find a wrong address
+            nlri.serialize()
+        except Exception as e:
+            raise WrongParamError('Invalid prefix %s: %s' % (prefix, e))
+        return nlri
+
+    def get_rib_routes_by_prefix(self, addr_family, prefix, match='exact'):
+        """Returns the routes of *prefix* in the RIB of *addr_family*.
+
+        *match* is 'exact' for *prefix* itself, 'longest' for the longest
+        prefix which matches it, and 'subtree' for the prefixes which it
+        covers.
+        """
+        if match not in RIB_MATCHES:
+            raise WrongParamError('Unknown match %s' % match)
+        nlri = self._prefix_to_nlri(addr_family, prefix)
+        gtable = self._get_rib_table(addr_family)
+        if gtable is None:
+            return []
+
+        if match == 'exact':
+            dsts = [gtable.get_dest_by_nlri(nlri)]
+        elif match == 'longest':
+            dsts = [gtable.get_longest_match_dest(nlri)]
+        else:
+            dsts = gtable.iter_dests_under(nlri)
+        return [self._dst_to_dict(dst) for dst in dsts if dst is not None]
+
     def _dst_to_dict(self, dst):
         ret = {'paths': [],
                'prefix': dst.nlri.formatted_nlri_str}
@@ -37,6 +37,10 @@ from ryu.services.protocols.bgp.rtconf.neighbors import NeighborConfListener
 from ryu.services.protocols.bgp.rtconf.neighbors import CONNECT_MODE_PASSIVE
 from ryu.services.protocols.bgp.signals.emit import BgpSignalBus
 from ryu.services.protocols.bgp.speaker import BgpProtocol
+from ryu.services.protocols.bgp.speaker import BGP_MAX_MSG_LEN
+from ryu.services.protocols.bgp.update_decoder import check_update_msg
+from ryu.services.protocols.bgp.update_decoder import DecodedUpdate
+from ryu.services.protocols.bgp.update_decoder import get_pathattr_set
 from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Path
 from ryu.services.protocols.bgp.info_base.vpnv4 import Vpnv4Path
 from ryu.services.protocols.bgp.info_base.vpnv6 import Vpnv6Path
@@ -116,6 +120,7 @@ PeerCounterNames = namedtuple(
     ('RECV_PREFIXES',
      'RECV_UPDATES',
      'SENT_UPDATES',
+     'SENT_PREFIXES',
      'RECV_NOTIFICATION',
      'SENT_NOTIFICATION',
      'SENT_REFRESH',
@@ -125,6 +130,7 @@ PeerCounterNames = namedtuple(
     'recv_prefixes',
     'recv_updates',
     'sent_updates',
+    'sent_prefixes',
     'recv_notification',
     'sent_notification',
     'sent_refresh',
@@ -145,10 +151,13 @@ class PeerState(object):
         self._bgp_state = const.BGP_FSM_IDLE
         self._established_time = 0
         self._last_bgp_error = None
+        # Time taken to send all the routes queued at once last time.
+        self.out_convergence_time = 0
         self.counters = {
             'recv_prefixes': 0,
             'recv_updates': 0,
             'sent_updates': 0,
+            'sent_prefixes': 0,
             'recv_notification': 0,
             'sent_notification': 0,
             'sent_refresh': 0,
@@ -257,11 +266,16 @@ class PeerState(object):
         """
         uptime = time.time() - self._established_time \
             if self._established_time != 0 else -1
+        sent_updates = self.get_count(PeerCounterNames.SENT_UPDATES)
+        prefixes_per_update = 0
+        if sent_updates:
+            prefixes_per_update = float(self.get_count(
+                PeerCounterNames.SENT_PREFIXES)) / sent_updates
         return {
             stats.UPDATE_MSG_IN: self.get_count(PeerCounterNames.RECV_UPDATES),
-            stats.UPDATE_MSG_OUT: self.get_count(
-                PeerCounterNames.SENT_UPDATES
-            ),
+            stats.UPDATE_MSG_OUT: sent_updates,
+            stats.PREFIXES_PER_UPDATE_OUT: prefixes_per_update,
+            stats.OUT_CONVERGENCE_TIME: self.out_convergence_time,
             stats.TOTAL_MSG_IN: self.total_msg_recv,
             stats.TOTAL_MSG_OUT: self.total_msg_sent,
             stats.FMS_EST_TRANS: self.get_count(
@@ -284,6 +298,10 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
 
     RTC_EOR_TIMER_NAME = 'RTC_EOR_Timer'
 
+    # Max. number of queued routes sent at once, whose NLRIs are packed
+    # into UPDATE messages.
+    OUTGOING_ROUTE_BATCH_SIZE = 1000
+
     def __init__(self, common_conf, neigh_conf,
                  core_service, signal_bus, peer_manager):
         peer_activity_name = 'Peer: %s' % neigh_conf.ip_address
@@ -674,11 +692,11 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
                               self._enqueue_eor_msg, rr_msg)
             LOG.debug('Enhanced RR max. EOR timer set.')
 
-    def _send_outgoing_route(self, outgoing_route):
-        """Constructs `Update` message from given `outgoing_route` and sends
-        it to peer.
+    def _prepare_outgoing_route(self, outgoing_route):
+        """Constructs `Update` message from given `outgoing_route`.
 
-        Also, checks if any policies prevent sending this message.
+        Also, checks if any policies prevent sending this message, in which
+        case None is returned.
         Populates Adj-RIB-out with corresponding `SentRoute`.
         """
 
@@ -690,13 +708,10 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
         self._adj_rib_out[nlri_str] = sent_route
         self._signal_bus.adj_rib_out_changed(self, sent_route)
 
-        # TODO(PH): optimized by sending several prefixes per update.
-        # Construct and send update message.
+        # Construct update message.
+        update_msg = None
         if not block:
             update_msg = self._construct_update(outgoing_route)
-            self._protocol.send(update_msg)
-            # Collect update statistics.
-            self.state.incr(PeerCounterNames.SENT_UPDATES)
         else:
             LOG.debug('prefix : %s is not sent by filter : %s', path.nlri, blocked_cause)
 
@@ -708,7 +723,49 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
             tm = self._core_service.table_manager
             tm.remember_sent_route(sent_route)
 
+        return update_msg
+
+    def _send_outgoing_routes(self, outgoing_routes):
+        """Constructs `Update` messages from given `outgoing_routes` and
+        sends them to peer.
+
+        The NLRIs of the routes whose path attributes are the same are
+        packed into as few messages as possible.  Of the routes to the same
+        prefix, only the last one to be sent is sent.
+        """
+        update_msgs = OrderedDict()
+        for outgoing_route in outgoing_routes:
+            update_msg = self._prepare_outgoing_route(outgoing_route)
+            if update_msg is not None:
+                path = outgoing_route.path
+                key = (path.route_family, path.nlri.formatted_nlri_str)
+                update_msgs.pop(key, None)
+                update_msgs[key] = update_msg
+
+        for update_msg, num_nlri in bgp_utils.pack_updates(
+                update_msgs.values(), BGP_MAX_MSG_LEN):
+            self._protocol.send(update_msg)
+            # Collect update statistics.
+            self.state.incr(PeerCounterNames.SENT_UPDATES)
+            self.state.incr(PeerCounterNames.SENT_PREFIXES, num_nlri)
+
+    def _take_outgoing_routes(self, outgoing_routes):
+        """Takes the `OutgoingRoute`s at the head of the outgoing message
+        list into `outgoing_routes`, up to OUTGOING_ROUTE_BATCH_SIZE.
+        """
+        while len(outgoing_routes) < self.OUTGOING_ROUTE_BATCH_SIZE:
+            outgoing_msg = self.outgoing_msg_list.pop_first()
+            if outgoing_msg is None:
+                break
+            if not isinstance(outgoing_msg, OutgoingRoute):
+                # Sent after the routes taken.
+                self.outgoing_msg_list.prepend(outgoing_msg)
+                break
+            outgoing_routes.append(outgoing_msg)
+
     def _process_outgoing_msg_list(self):
+        # Time at which routes have been queued since the list was empty.
+        outgoing_since = None
         while True:
             outgoing_msg = None
 
@@ -718,9 +775,15 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
 
             # If we do not have any outgoing route, we wait.
             if outgoing_msg is None:
+                if outgoing_since is not None:
+                    self.state.out_convergence_time = \
+                        time.time() - outgoing_since
+                    outgoing_since = None
                 self.outgoing_msg_event.clear()
                 self.outgoing_msg_event.wait()
                 continue
+            if outgoing_since is None:
+                outgoing_since = time.time()
 
             # Check currently supported out-going msgs.
             assert isinstance(
@@ -733,7 +796,9 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
             if isinstance(outgoing_msg, BGPRouteRefresh):
                 self._send_outgoing_route_refresh_msg(outgoing_msg)
             elif isinstance(outgoing_msg, OutgoingRoute):
-                self._send_outgoing_route(outgoing_msg)
+                outgoing_routes = [outgoing_msg]
+                self._take_outgoing_routes(outgoing_routes)
+                self._send_outgoing_routes(outgoing_routes)
 
             # EOR are enqueued as plain Update messages.
             elif isinstance(outgoing_msg, BGPUpdate):
@@ -838,6 +903,11 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
         elif self.is_route_server_client:
             nlri_list = [path.nlri]
             for pathattr in path.pathattr_map.values():
+                # the MP_REACH_NLRI of the path has no NLRIs
+                if pathattr.type == BGP_ATTR_TYPE_MP_REACH_NLRI:
+                    pathattr = BGPPathAttributeMpReachNLRI(
+                        pathattr.afi, pathattr.safi, pathattr.next_hop,
+                        nlri_list)
                 new_pathattr.append(pathattr)
         else:
             # Supported and un-supported/unknown attributes.
@@ -969,8 +1039,9 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
             )
             if path_extcomm_attr:
                 # SOO list can be configured per VRF and/or per Neighbor.
-                # NeighborConf has this setting we add this to existing list.
-                communities = path_extcomm_attr.communities
+                # NeighborConf has this setting we add this to existing list,
+                # which is copied as the path attributes are shared.
+                communities = list(path_extcomm_attr.communities)
                 if self._neigh_conf.soo_list:
                     # construct extended community
                     soo_list = self._neigh_conf.soo_list
@@ -1237,29 +1308,6 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
             if not self.is_mpbgp_cap_valid(RF_IPv4_UC):
                 LOG.error('Got UPDATE message with un-available'
                           ' afi/safi %s', RF_IPv4_UC)
-            nlri_list = update_msg.nlri
-            if len(nlri_list) > 0:
-                # Check for missing well-known mandatory attributes.
-                aspath = update_msg.get_path_attr(BGP_ATTR_TYPE_AS_PATH)
-                if not aspath:
-                    raise bgp.MissingWellKnown(
-                        BGP_ATTR_TYPE_AS_PATH)
-
-                if (self.check_first_as and self.is_ebgp_peer() and
-                        not aspath.has_matching_leftmost(self.remote_as)):
-                    LOG.error('First AS check fails. Raise appropriate'
-                              ' exception.')
-                    raise bgp.MalformedAsPath()
-
-                origin = update_msg.get_path_attr(BGP_ATTR_TYPE_ORIGIN)
-                if not origin:
-                    raise bgp.MissingWellKnown(BGP_ATTR_TYPE_ORIGIN)
-
-                nexthop = update_msg.get_path_attr(BGP_ATTR_TYPE_NEXT_HOP)
-                if not nexthop:
-                    raise bgp.MissingWellKnown(BGP_ATTR_TYPE_NEXT_HOP)
-
-            return True
 
         # Check if received MP_UNREACH path attribute is of available afi/safi
         if mp_unreach_attr:
@@ -1269,40 +1317,26 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
                           ' afi/safi) %s', mp_unreach_attr.route_family)
                 # raise bgp.OptAttrError()
 
+        # Check if received MP_REACH path attribute is of available
+        # afi/safi
         if mp_reach_attr:
-            # Check if received MP_REACH path attribute is of available
-            # afi/safi
             if not self.is_mpbgp_cap_valid(mp_reach_attr.route_family):
                 LOG.error('Got UPDATE message with un-available afi/safi for'
                           ' MP_UNREACH path attribute (non-negotiated'
                           ' afi/safi) %s', mp_reach_attr.route_family)
                 # raise bgp.OptAttrError()
 
-            # Check for missing well-known mandatory attributes.
-            aspath = update_msg.get_path_attr(BGP_ATTR_TYPE_AS_PATH)
-            if not aspath:
-                raise bgp.MissingWellKnown(BGP_ATTR_TYPE_AS_PATH)
-
-            if (self.check_first_as and self.is_ebgp_peer() and
-                    not aspath.has_matching_leftmost(self.remote_as)):
-                LOG.error('First AS check fails. Raise appropriate exception.')
-                raise bgp.MalformedAsPath()
-
-            origin = update_msg.get_path_attr(BGP_ATTR_TYPE_ORIGIN)
-            if not origin:
-                raise bgp.MissingWellKnown(BGP_ATTR_TYPE_ORIGIN)
-
-            # Validate Next hop.
-            # TODO(PH): Currently ignore other cases.
-            if (not mp_reach_attr.next_hop or
-                    (mp_reach_attr.next_hop == self.host_bind_ip)):
-                LOG.error('Nexthop of received UPDATE msg. (%s) same as local'
-                          ' interface address %s.',
-                          mp_reach_attr.next_hop,
-                          self.host_bind_ip)
-                return False
+        if isinstance(update_msg, DecodedUpdate) and update_msg.checked:
+            # The update decoder did the rest of the checks.
+            return True
+        return check_update_msg(update_msg, *self.get_update_check_args())
 
-        return True
+    def get_update_check_args(self):
+        """Returns the arguments of check_update_msg() for the UPDATE
+        messages from this peer.
+        """
+        return (self.remote_as, self.check_first_as and self.is_ebgp_peer(),
+                self.host_bind_ip)
 
     def _handle_update_msg(self, update_msg):
         """Extracts and processes new paths or withdrawals in given
@@ -1382,13 +1416,15 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
             LOG.debug('Update message did not have any new MP_REACH_NLRIs.')
             return
 
-        # Create path instances for each NLRI from the update message.
+        # Create path instances for each NLRI from the update message,
+        # which share the attributes.
+        pattrs = get_pathattr_set(update_msg)
         for msg_nlri in msg_nlri_list:
             LOG.debug('NLRI: %s', msg_nlri)
             new_path = bgp_utils.create_path(
                 self,
                 msg_nlri,
-                pattrs=umsg_pattrs,
+                pattrs=pattrs,
                 nexthop=next_hop
             )
             LOG.debug('Extracted paths from Update msg.: %s', new_path)
@@ -1536,12 +1572,14 @@ class Peer(Source, Sink, NeighborConfListener, Activity):
             LOG.debug('Update message did not have any new MP_REACH_NLRIs.')
             return
 
-        # Create path instances for each NLRI from the update message.
+        # Create path instances for each NLRI from the update message,
+        # which share the attributes.
+        pattrs = get_pathattr_set(update_msg)
         for msg_nlri in msg_nlri_list:
             new_path = bgp_utils.create_path(
                 self,
                 msg_nlri,
-                pattrs=umsg_pattrs,
+                pattrs=pattrs,
                 nexthop=next_hop
             )
             LOG.debug('Extracted paths from Update msg.: %s', new_path)
@@ -170,6 +170,18 @@ BPR_ASN = 'ASN'
 BPR_IGP_COST = 'IGP Cost'
 BPR_ROUTER_ID = 'Router ID'
 
+# Local preference of the paths without LOCAL_PREF, the same as is sent to
+# iBGP peers for them.
+DEFAULT_LOCAL_PREF = 100
+
+# Reasons of the steps which the items of the best path keys decide.
+_BEST_PATH_KEY_REASONS = (BPR_LOCAL_PREF, BPR_LOCAL_ORIGIN, BPR_ASPATH,
+                          BPR_ORIGIN, BPR_MED, BPR_ASN, BPR_ROUTER_ID)
+
+# The router ID item of the key of a path whose peer has no session, less
+# than the negated router IDs.
+_NO_ROUTER_ID = -(1 << 32)
+
 
 def _compare_by_version(path1, path2):
     """Returns the current/latest learned path.
@@ -257,6 +269,91 @@ def compute_best_path(local_asn, path1, path2):
     return (best_path, best_path_reason)
 
 
+def compute_best_path_key(local_asn, local_bgp_id, path):
+    """Returns the key of given path for best path selection.
+
+    Of two paths, `compute_best_path` selects the one with the greater key,
+    and none if their keys are equal, so that the best path among known
+    paths is the first one with the greatest key.  The key is a tuple of:
+        - local preference, DEFAULT_LOCAL_PREF if the path has none
+        - 1 if the path is locally originated, else 0
+        - negated AS-path length
+        - origin preference
+        - negated MED
+        - 1 if the path is from an eBGP peer, else 0
+        - negated BGP router ID of the source of iBGP paths, and 0 for eBGP
+          paths which are not tie broken by router ID
+
+    Paths whose source is not a peer have `local_bgp_id` as router ID, and
+    paths whose peer has no session, and so no OPEN message, have the
+    least preferred one.
+    """
+    from ryu.services.protocols.bgp.utils.bgp import from_inet_ptoi
+
+    as_path = path.get_pattr(BGP_ATTR_TYPE_AS_PATH)
+    origin = path.get_pattr(BGP_ATTR_TYPE_ORIGIN)
+    assert as_path is not None and origin is not None
+
+    source = path.source
+    asn = getattr(source, 'remote_as', local_asn)
+    if asn != local_asn:
+        router_id = 0
+    elif hasattr(source, 'protocol'):
+        open_msg = getattr(source.protocol, 'recv_open_msg', None)
+        if open_msg is None:
+            router_id = _NO_ROUTER_ID
+        else:
+            router_id = -from_inet_ptoi(open_msg.bgp_identifier)
+    else:
+        router_id = -from_inet_ptoi(local_bgp_id)
+
+    return (_get_local_pref(path),
+            int(source is None),
+            -as_path.get_as_path_len(),
+            _get_origin_pref(origin),
+            -_get_path_med(path),
+            int(asn != local_asn),
+            router_id)
+
+
+def compute_best_path_key_reason(key1, key2):
+    """Returns the reason a path with *key1* is selected over one with
+    *key2*, the step at which their keys differ.
+    """
+    for reason, item1, item2 in zip(_BEST_PATH_KEY_REASONS, key1, key2):
+        if item1 != item2:
+            return reason
+    return BPR_UNKNOWN
+
+
+def _get_local_pref(path):
+    lp = path.get_pattr(BGP_ATTR_TYPE_LOCAL_PREF)
+    if not lp:
+        return DEFAULT_LOCAL_PREF
+    return lp.value
+
+
+def _get_origin_pref(origin):
+    if origin.value == BGP_ATTR_ORIGIN_IGP:
+        return 3
+    elif origin.value == BGP_ATTR_ORIGIN_EGP:
+        return 2
+    elif origin.value == BGP_ATTR_ORIGIN_INCOMPLETE:
+        return 1
+    else:
+        LOG.error('Invalid origin value encountered %s.', origin)
+        return 0
+
+
+def _get_path_med(path):
+    # A route that arrives with no MED value is treated as if it had a MED
+    # of 0.
+    med = path.get_pattr(BGP_ATTR_TYPE_MULTI_EXIT_DISC)
+    if not med:
+        return 0
+    return med.value
+
+
 def _cmp_by_reachable_nh(path1, path2):
     """Compares given paths and selects best path based on reachable next-hop.
 
@@ -285,20 +382,15 @@ def _cmp_by_local_pref(path1, path2):
 
     Unlike the weight attribute, which is only relevant to the local
     router, local preference is an attribute that routers exchange in the
-    same AS. Highest local-pref is preferred. If we cannot decide,
-    we return None.
+    same AS. Highest local-pref is preferred, and paths without it have
+    the default local-pref. If we cannot decide, we return None.
     """
     # TODO(PH): Revisit this when BGPS has concept of policy to be applied to
     # in-bound NLRIs.
-    # Default local-pref values is 100
-    lp1 = path1.get_pattr(BGP_ATTR_TYPE_LOCAL_PREF)
-    lp2 = path2.get_pattr(BGP_ATTR_TYPE_LOCAL_PREF)
-    if not (lp1 and lp2):
-        return None
+    lp1 = _get_local_pref(path1)
+    lp2 = _get_local_pref(path2)
 
     # Highest local-preference value is preferred.
-    lp1 = lp1.value
-    lp2 = lp2.value
     if lp1 > lp2:
         return path1
     elif lp2 > lp1:
@@ -357,17 +449,6 @@ def _cmp_by_origin(path1, path2):
     IGP is preferred over EGP; EGP is preferred over Incomplete.
     If both paths have same origin, we return None.
     """
-    def get_origin_pref(origin):
-        if origin.value == BGP_ATTR_ORIGIN_IGP:
-            return 3
-        elif origin.value == BGP_ATTR_ORIGIN_EGP:
-            return 2
-        elif origin.value == BGP_ATTR_ORIGIN_INCOMPLETE:
-            return 1
-        else:
-            LOG.error('Invalid origin value encountered %s.', origin)
-            return 0
-
     origin1 = path1.get_pattr(BGP_ATTR_TYPE_ORIGIN)
     origin2 = path2.get_pattr(BGP_ATTR_TYPE_ORIGIN)
     assert origin1 is not None and origin2 is not None
@@ -377,8 +458,8 @@ def _cmp_by_origin(path1, path2):
         return None
 
     # Translate origin values to preference.
-    origin1 = get_origin_pref(origin1)
-    origin2 = get_origin_pref(origin2)
+    origin1 = _get_origin_pref(origin1)
+    origin2 = _get_origin_pref(origin2)
     # Return preferred path.
     if origin1 == origin2:
         return None
@@ -395,14 +476,8 @@ def _cmp_by_med(path1, path2):
     had a MED of 0, the most preferred value.
     RFC says lower MED is preferred over higher MED value.
     """
-    def get_path_med(path):
-        med = path.get_pattr(BGP_ATTR_TYPE_MULTI_EXIT_DISC)
-        if not med:
-            return 0
-        return med.value
-
-    med1 = get_path_med(path1)
-    med2 = get_path_med(path2)
+    med1 = _get_path_med(path1)
+    med2 = _get_path_med(path2)
 
     if med1 == med2:
         return None
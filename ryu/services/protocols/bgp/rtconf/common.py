@@ -68,6 +68,10 @@ BGP_SERVER_PORT = 'bgp_server_port'
 TCP_CONN_TIMEOUT = 'tcp_conn_timeout'
 MAX_PATH_EXT_RTFILTER_ALL = 'maximum_paths_external_rtfilter_all'
 
+# Number of worker processes which decode the received UPDATE messages, or
+# 0 to decode them in the main process.
+UPDATE_DECODERS = 'update_decoders'
+
 
 # Valid default values of some settings.
 DEFAULT_LABEL_RANGE = (100, 100000)
@@ -78,6 +82,8 @@ DEFAULT_TCP_CONN_TIMEOUT = 30
 DEFAULT_BGP_CONN_RETRY_TIME = 30
 DEFAULT_MED = 0
 DEFAULT_MAX_PATH_EXT_RTFILTER_ALL = True
+# decoded in the main process, as the update decoder workers add latency
+DEFAULT_UPDATE_DECODERS = 0
 
 
 @validate(name=LOCAL_AS)
@@ -190,6 +196,17 @@ def validate_max_path_ext_rtfilter_all(max_path_ext_rtfilter_all):
     return max_path_ext_rtfilter_all
 
 
+@validate(name=UPDATE_DECODERS)
+def validate_update_decoders(update_decoders):
+    if not isinstance(update_decoders, numbers.Integral):
+        raise ConfigTypeError(desc=('Invalid update decoders configuration '
+                                    'value %s' % update_decoders))
+    if update_decoders < 0:
+        raise ConfigValueError(desc=('Invalid update decoders configuration '
+                                     'value %s' % update_decoders))
+    return update_decoders
+
+
 class CommonConf(BaseConf):
     """Encapsulates configurations applicable to all peer sessions.
 
@@ -207,7 +224,8 @@ class CommonConf(BaseConf):
                                    LABEL_RANGE, BGP_SERVER_PORT,
                                    TCP_CONN_TIMEOUT,
                                    BGP_CONN_RETRY_TIME,
-                                   MAX_PATH_EXT_RTFILTER_ALL])
+                                   MAX_PATH_EXT_RTFILTER_ALL,
+                                   UPDATE_DECODERS])
 
     def __init__(self, **kwargs):
         super(CommonConf, self).__init__(**kwargs)
@@ -229,6 +247,8 @@ class CommonConf(BaseConf):
         self._settings[MAX_PATH_EXT_RTFILTER_ALL] = compute_optional_conf(
             MAX_PATH_EXT_RTFILTER_ALL, DEFAULT_MAX_PATH_EXT_RTFILTER_ALL,
             **kwargs)
+        self._settings[UPDATE_DECODERS] = compute_optional_conf(
+            UPDATE_DECODERS, DEFAULT_UPDATE_DECODERS, **kwargs)
 
     # =========================================================================
     # Required attributes
@@ -274,6 +294,10 @@ class CommonConf(BaseConf):
     def max_path_ext_rtfilter_all(self):
         return self._settings[MAX_PATH_EXT_RTFILTER_ALL]
 
+    @property
+    def update_decoders(self):
+        return self._settings[UPDATE_DECODERS]
+
     @classmethod
     def get_opt_settings(self):
         self_confs = super(CommonConf, self).get_opt_settings()
@@ -61,6 +61,9 @@ LOG = logging.getLogger('bgpspeaker.speaker')
 BGP_MIN_MSG_LEN = 19
 BGP_MAX_MSG_LEN = 4096
 
+# Max. number of bytes read from the socket at a time.
+RECV_SIZE = 64 * 1024
+
 # Keep-alive singleton.
 _KEEP_ALIVE = BGPKeepAlive()
 
@@ -93,7 +96,8 @@ class BgpProtocol(Protocol, Activity):
     MESSAGE_MARKER = (b'\xff\xff\xff\xff\xff\xff\xff\xff'
                       b'\xff\xff\xff\xff\xff\xff\xff\xff')
 
-    def __init__(self, socket, signal_bus, is_reactive_conn=False):
+    def __init__(self, socket, signal_bus, is_reactive_conn=False,
+                 update_decoder=None):
         # Validate input.
         if socket is None:
             raise ValueError('Invalid arguments passed.')
@@ -105,7 +109,8 @@ class BgpProtocol(Protocol, Activity):
         Activity.__init__(self, name=activity_name)
         # Intialize instance variables.
         self._peer = None
-        self._recv_buff = ''
+        self._recv_buff = b''
+        self._update_decoder = update_decoder
         self._socket = socket
         self._socket.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
         self._sendlock = semaphore.Semaphore()
@@ -305,54 +310,71 @@ class BgpProtocol(Protocol, Activity):
         """
         # Append buffer with received bytes.
         self._recv_buff += next_bytes
+        buff = self._recv_buff
 
-        while True:
-            # If current buffer size is less then minimum bgp message size, we
-            # return as we do not have a complete bgp message to work with.
-            if len(self._recv_buff) < BGP_MIN_MSG_LEN:
-                return
-
-            # Parse message header into elements.
-            auth, length, ptype = BgpProtocol.parse_msg_header(
-                self._recv_buff[:BGP_MIN_MSG_LEN])
-
-            # Check if we have valid bgp message marker.
-            # We should get default marker since we are not supporting any
-            # authentication.
-            if (auth != BgpProtocol.MESSAGE_MARKER):
-                LOG.error('Invalid message marker received: %s', auth)
-                raise bgp.NotSync()
-
-            # Check if we have valid bgp message length.
-            check = lambda: length < BGP_MIN_MSG_LEN\
-                or length > BGP_MAX_MSG_LEN
-
-            # RFC says: The minimum length of the OPEN message is 29
-            # octets (including the message header).
-            check2 = lambda: ptype == BGP_MSG_OPEN\
-                and length < BGPOpen._MIN_LEN
-
-            # RFC says: A KEEPALIVE message consists of only the
-            # message header and has a length of 19 octets.
-            check3 = lambda: ptype == BGP_MSG_KEEPALIVE\
-                and length != BGPKeepAlive._MIN_LEN
-
-            # RFC says: The minimum length of the UPDATE message is 23
-            # octets.
-            check4 = lambda: ptype == BGP_MSG_UPDATE\
-                and length < BGPUpdate._MIN_LEN
-
-            if check() or check2() or check3() or check4():
-                raise bgp.BadLen(ptype, length)
-
-            # If we have partial message we wait for rest of the message.
-            if len(self._recv_buff) < length:
-                return
-            msg, rest = BGPMessage.parser(self._recv_buff)
-            self._recv_buff = rest
+        # Collect the complete messages in the buffer, which are handled
+        # before the error of a bad message header, if any, is raised.
+        msgs = []
+        error = None
+        offset = 0
+        try:
+            # If current buffer size is less then minimum bgp message size,
+            # we do not have a complete bgp message to work with.
+            while len(buff) - offset >= BGP_MIN_MSG_LEN:
+                # Parse message header into elements.
+                auth, length, ptype = BgpProtocol.parse_msg_header(
+                    buff[offset:offset + BGP_MIN_MSG_LEN])
+
+                # Check if we have valid bgp message marker.
+                # We should get default marker since we are not supporting
+                # any authentication.
+                if (auth != BgpProtocol.MESSAGE_MARKER):
+                    LOG.error('Invalid message marker received: %s', auth)
+                    raise bgp.NotSync()
+
+                # Check if we have valid bgp message length.
+                check = lambda: length < BGP_MIN_MSG_LEN\
+                    or length > BGP_MAX_MSG_LEN
+
+                # RFC says: The minimum length of the OPEN message is 29
+                # octets (including the message header).
+                check2 = lambda: ptype == BGP_MSG_OPEN\
+                    and length < BGPOpen._MIN_LEN
+
+                # RFC says: A KEEPALIVE message consists of only the
+                # message header and has a length of 19 octets.
+                check3 = lambda: ptype == BGP_MSG_KEEPALIVE\
+                    and length != BGPKeepAlive._MIN_LEN
+
+                # RFC says: The minimum length of the UPDATE message is 23
+                # octets.
+                check4 = lambda: ptype == BGP_MSG_UPDATE\
+                    and length < BGPUpdate._MIN_LEN
+
+                if check() or check2() or check3() or check4():
+                    raise bgp.BadLen(ptype, length)
+
+                # If we have partial message we wait for rest of the message.
+                if len(buff) - offset < length:
+                    break
+                msgs.append((ptype, buff[offset:offset + length]))
+                offset += length
+        except bgp.BgpExc as exc:
+            error = exc
+        self._recv_buff = buff[offset:]
+
+        # If we have a valid bgp message we call message handler.
+        if self._update_decoder is None:
+            for _ptype, data in msgs:
+                msg, _rest = BGPMessage.parser(data)
+                self._handle_msg(msg)
+        else:
+            for msg in self._update_decoder.decode(
+                    msgs, self._peer.get_update_check_args()):
+                self._handle_msg(msg)
 
-            # If we have a valid bgp message we call message handler.
-            self._handle_msg(msg)
+        if error is not None:
+            raise error
 
     def send_notification(self, code, subcode):
         """Utility to send notification message.
@@ -534,11 +556,10 @@ class BgpProtocol(Protocol, Activity):
         """Sits in tight loop collecting data received from peer and
         processing it.
         """
-        required_len = BGP_MIN_MSG_LEN
         conn_lost_reason = "Connection lost as protocol is no longer active"
         try:
             while True:
-                next_bytes = self._socket.recv(required_len)
+                next_bytes = self._socket.recv(RECV_SIZE)
                 if len(next_bytes) == 0:
                     conn_lost_reason = 'Peer closed connection'
                     break
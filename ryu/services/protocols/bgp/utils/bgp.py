@@ -18,6 +18,7 @@
 """
 import logging
 import socket
+import struct
 
 from ryu.lib.packet.bgp import BGPUpdate
 from ryu.lib.packet.bgp import RF_IPv4_UC
@@ -27,14 +28,19 @@ from ryu.lib.packet.bgp import RF_IPv6_VPN
 from ryu.lib.packet.bgp import RF_RTC_UC
 from ryu.lib.packet.bgp import RouteTargetMembershipNLRI
 from ryu.lib.packet.bgp import BGP_ATTR_TYPE_MULTI_EXIT_DISC
+from ryu.lib.packet.bgp import BGP_ATTR_TYPE_MP_REACH_NLRI
+from ryu.lib.packet.bgp import BGP_ATTR_TYPE_MP_UNREACH_NLRI
 from ryu.lib.packet.bgp import BGPPathAttributeMultiExitDisc
+from ryu.lib.packet.bgp import BGPPathAttributeMpReachNLRI
 from ryu.lib.packet.bgp import BGPPathAttributeMpUnreachNLRI
 from ryu.lib.packet.bgp import BGPPathAttributeUnknown
+from ryu.services.protocols.bgp.info_base.base import PathAttrSet
 from ryu.services.protocols.bgp.info_base.rtc import RtcPath
 from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Path
 from ryu.services.protocols.bgp.info_base.ipv6 import Ipv6Path
 from ryu.services.protocols.bgp.info_base.vpnv4 import Vpnv4Path
 from ryu.services.protocols.bgp.info_base.vpnv6 import Vpnv6Path
+from ryu.services.protocols.bgp.base import OrderedDict
 
 
 LOG = logging.getLogger('utils.bgp')
@@ -84,7 +90,7 @@ def clone_rtcpath_update_rt_as(path, new_rt_as):
     old_nlri = path.nlri
     new_rt_nlri = RouteTargetMembershipNLRI(new_rt_as, old_nlri.route_target)
     return RtcPath(path.source, new_rt_nlri, path.source_version_num,
-                   pattrs=path.pathattr_map, nexthop=path.nexthop,
+                   pattrs=path.pathattr_set, nexthop=path.nexthop,
                    is_withdraw=path.is_withdraw)
 
 
@@ -94,7 +100,7 @@ def from_inet_ptoi(bgp_id):
     four_byte_id = None
     try:
         packed_byte = socket.inet_pton(socket.AF_INET, bgp_id)
-        four_byte_id = int(packed_byte.encode('hex'), 16)
+        four_byte_id = struct.unpack('!I', packed_byte)[0]
     except ValueError:
         LOG.debug('Invalid bgp id given for conversion to integer value %s',
                   bgp_id)
@@ -117,6 +123,112 @@ def get_unknow_opttrans_attr(path):
     return unknown_opt_tran_attrs
 
 
+def _update_nlri_count(update):
+    count = len(update.withdrawn_routes) + len(update.nlri)
+    mp_reach = update.get_path_attr(BGP_ATTR_TYPE_MP_REACH_NLRI)
+    if mp_reach:
+        count += len(mp_reach.nlri)
+    mp_unreach = update.get_path_attr(BGP_ATTR_TYPE_MP_UNREACH_NLRI)
+    if mp_unreach:
+        count += len(mp_unreach.withdrawn_routes)
+    return count
+
+
+def _serialize_attrs(attrs):
+    # the attributes of the paths sent as they are have been serialized
+    return b''.join(PathAttrSet.serialize_pattr(attr) for attr in attrs)
+
+
+def _update_pack_key(update):
+    """Returns the key of the Update messages which can be packed with
+    `update`, and the NLRI of `update`.  The key is None if `update` does
+    not carry a single NLRI.
+    """
+    attrs = update.path_attributes
+    mp_reach = update.get_path_attr(BGP_ATTR_TYPE_MP_REACH_NLRI)
+    mp_unreach = update.get_path_attr(BGP_ATTR_TYPE_MP_UNREACH_NLRI)
+    if update.withdrawn_routes:
+        if len(update.withdrawn_routes) == 1 and not attrs and \
+                not update.nlri:
+            return ('withdrawn',), update.withdrawn_routes[0]
+    elif update.nlri:
+        if len(update.nlri) == 1 and not mp_reach and not mp_unreach:
+            return ('nlri', _serialize_attrs(attrs)), update.nlri[0]
+    elif mp_reach:
+        if len(mp_reach.nlri) == 1 and not mp_unreach:
+            others = [attr for attr in attrs if attr is not mp_reach]
+            return (('mp_reach', mp_reach.afi, mp_reach.safi,
+                     mp_reach.next_hop, _serialize_attrs(others)),
+                    mp_reach.nlri[0])
+    elif mp_unreach:
+        if len(mp_unreach.withdrawn_routes) == 1 and len(attrs) == 1:
+            return (('mp_unreach', mp_unreach.afi, mp_unreach.safi),
+                    mp_unreach.withdrawn_routes[0])
+    return None, None
+
+
+def _packed_update(key, update, nlri_list):
+    kind = key[0]
+    if kind == 'withdrawn':
+        return BGPUpdate(withdrawn_routes=nlri_list)
+    elif kind == 'nlri':
+        return BGPUpdate(path_attributes=update.path_attributes,
+                         nlri=nlri_list)
+    elif kind == 'mp_reach':
+        mp_reach = update.get_path_attr(BGP_ATTR_TYPE_MP_REACH_NLRI)
+        packed_attr = BGPPathAttributeMpReachNLRI(
+            mp_reach.afi, mp_reach.safi, mp_reach.next_hop, nlri_list)
+        return BGPUpdate(path_attributes=[
+            packed_attr if attr is mp_reach else attr
+            for attr in update.path_attributes])
+    else:
+        mp_unreach = update.get_path_attr(BGP_ATTR_TYPE_MP_UNREACH_NLRI)
+        packed_attr = BGPPathAttributeMpUnreachNLRI(
+            mp_unreach.afi, mp_unreach.safi, nlri_list)
+        return BGPUpdate(path_attributes=[packed_attr])
+
+
+def pack_updates(updates, max_len):
+    """Packs the NLRIs of `updates` into as few Update messages of up to
+    `max_len` bytes as possible.
+
+    The NLRIs of the updates which have the same path attributes, and the
+    same next hop for MP_REACH_NLRI, are put together.  An update which
+    does not carry a single NLRI is sent as it is.
+    Returns a list of (Update message, number of NLRIs in it).
+    """
+    packed = []
+    groups = OrderedDict()   # key -> (first update, [NLRI])
+    for update in updates:
+        key, nlri = _update_pack_key(update)
+        if key is None:
+            packed.append((update, _update_nlri_count(update)))
+        elif key in groups:
+            groups[key][1].append(nlri)
+        else:
+            groups[key] = (update, [nlri])
+
+    for key, (update, nlri_list) in groups.items():
+        if len(nlri_list) == 1:
+            packed.append((update, 1))
+            continue
+        # and a byte for the extended length of MP_(UN)REACH_NLRI
+        base_len = len(_packed_update(key, update, []).serialize()) + 1
+        msg_len = base_len
+        chunk = []
+        for nlri in nlri_list:
+            nlri_len = len(nlri.serialize())
+            if chunk and msg_len + nlri_len > max_len:
+                packed.append((_packed_update(key, update, chunk),
+                               len(chunk)))
+                msg_len = base_len
+                chunk = []
+            chunk.append(nlri)
+            msg_len += nlri_len
+        packed.append((_packed_update(key, update, chunk), len(chunk)))
+    return packed
+
+
 def create_end_of_rib_update():
     """Construct end-of-rib (EOR) Update instance."""
     mpunreach_attr = BGPPathAttributeMpUnreachNLRI(RF_IPv4_VPN.afi,
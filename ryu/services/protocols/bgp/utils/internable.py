@@ -39,6 +39,9 @@ class Internable(object):
     Instances of sub-classes must be usable as dictionary keys for
     Internable to work.
     """
+    # Sub-classes may have __slots__, which then need '_interned' and
+    # '__weakref__'.
+    __slots__ = ()
 
     class Stats(object):
 
@@ -67,12 +70,26 @@ class Internable(object):
     def intern_stats(kls):
         return kls._internable_stats
 
+    def find_interned(self):
+        """Returns the canonical copy of itself, or None if there is none.
+        """
+        if hasattr(self, '_interned'):
+            return self
+
+        kls = self.__class__
+        if not hasattr(kls, dict_name):
+            return None
+
+        ref = kls._internable_dict.get(self)
+        return ref() if ref is not None else None
+
     def intern(self):
         """Returns either itself or a canonical copy of itself."""
 
         # If this is an interned object, return it
         if hasattr(self, '_interned'):
-            return self._internable_stats.incr('self')
+            self._internable_stats.incr('self')
+            return self
 
         #
         # Got to find or create an interned object identical to this
@@ -83,8 +100,9 @@ class Internable(object):
         if not hasattr(kls, dict_name):
             kls._internable_init()
 
-        obj = kls._internable_dict.get(self)
-        if (obj):
+        ref = kls._internable_dict.get(self)
+        obj = ref() if ref is not None else None
+        if obj is not None:
             # Found an interned copy.
             kls._internable_stats.incr('found')
             return obj
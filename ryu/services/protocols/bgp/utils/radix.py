@@ -0,0 +1,308 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+ Compressed binary radix tree keyed by prefixes.
+"""
+import binascii
+
+import six
+
+
+if six.PY3:
+    def _bytes_to_int(data):
+        return int.from_bytes(data, 'big')
+
+    def _int_to_bytes(value, length):
+        return value.to_bytes(length, 'big')
+else:
+    def _bytes_to_int(data):
+        return int(binascii.hexlify(data), 16)
+
+    def _int_to_bytes(value, length):
+        return binascii.unhexlify('%0*x' % (length * 2, value))
+
+
+if hasattr(int, 'bit_length'):
+    def _bit_length(value):
+        return value.bit_length()
+else:
+    # Python 2.6
+    def _bit_length(value):
+        return len(bin(value).lstrip('0b'))
+
+
+# value of the nodes which only branch
+_EMPTY = object()
+
+
+class _Node(object):
+    # bits is the prefix of length bits as an integer
+    __slots__ = ('bits', 'length', 'value', 'left', 'right')
+
+    def __init__(self, bits, length, value):
+        self.bits = bits
+        self.length = length
+        self.value = value
+        self.left = None
+        self.right = None
+
+
+class RadixTree(object):
+    """Map of prefixes to values, as a compressed binary radix tree.
+
+    A key is a tuple of a packed prefix, whose length is the width of
+    the tree, and a prefix length in bits, like (b'\\x0a\\x00\\x00\\x00', 8)
+    for 10.0.0.0/8.  The bits after the prefix length are ignored.
+    Besides the dict methods, the tree finds the longest prefix which
+    matches a key, and the prefixes under a key.  The values and the items
+    are iterated in the order of the prefixes, shorter ones first.
+
+    Each prefix has a node, and the prefixes which branch off have one
+    more, so that a longest prefix match visits a node per branch, at
+    most the width.  The nodes of the prefixes are indexed by them too, so
+    that an exact lookup doesn't walk the tree.  The index has a dict per
+    prefix length, keyed by the bits of the nodes, so that it doesn't
+    keep a key of its own per prefix.
+    """
+
+    def __init__(self, width):
+        # width in bits
+        assert 0 < width < 256
+        self._width = width
+        self._root = None
+        # nodes with a value by their bits, per prefix length
+        self._nodes = [{} for _length in range(width + 1)]
+        self._len = 0
+
+    @property
+    def width(self):
+        return self._width
+
+    def _bits(self, key):
+        packed, length = key
+        if len(packed) * 8 != self._width or not 0 <= length <= self._width:
+            raise KeyError(key)
+        return _bytes_to_int(packed) >> (self._width - length), length
+
+    def _key(self, node):
+        return (_int_to_bytes(node.bits << (self._width - node.length),
+                              self._width // 8), node.length)
+
+    @staticmethod
+    def _attach(parent, child):
+        if (child.bits >> (child.length - parent.length - 1)) & 1:
+            parent.right = child
+        else:
+            parent.left = child
+
+    def _replace(self, parent, node):
+        if parent is None:
+            self._root = node
+        else:
+            self._attach(parent, node)
+
+    def _find(self, bits, length):
+        # returns the node of the key and its parent and grandparent, with
+        # the walk inlined as in the other lookups
+        grandparent = parent = None
+        node = self._root
+        while node is not None:
+            shift = length - node.length
+            if shift < 0 or bits >> shift != node.bits:
+                break
+            if not shift:
+                return node, parent, grandparent
+            grandparent, parent = parent, node
+            if bits >> (shift - 1) & 1:
+                node = node.right
+            else:
+                node = node.left
+        return None, parent, grandparent
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        return self.get(key, _EMPTY) is not _EMPTY
+
+    def __getitem__(self, key):
+        value = self.get(key, _EMPTY)
+        if value is _EMPTY:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        bits, length = self._bits(key)
+        node = self._nodes[length].get(bits)
+        if node is None:
+            return default
+        return node.value
+
+    def __setitem__(self, key, value):
+        bits, length = self._bits(key)
+        nodes = self._nodes[length]
+        node = nodes.get(bits)
+        if node is not None:
+            node.value = value
+            return
+
+        parent = None
+        node = self._root
+        while node is not None:
+            # the length of the common prefix of the key and node
+            common = min(length, node.length)
+            common -= _bit_length((bits >> (length - common)) ^
+                                  (node.bits >> (node.length - common)))
+            if common < node.length:
+                break
+            if common == length:
+                # a node which only branched
+                node.value = value
+                nodes[node.bits] = node
+                self._len += 1
+                return
+            parent = node
+            if bits >> (length - common - 1) & 1:
+                node = node.right
+            else:
+                node = node.left
+
+        new = _Node(bits, length, value)
+        nodes[bits] = new
+        self._len += 1
+        if node is not None:
+            if common < length:
+                # a node for the prefix common to the key and node
+                branch = _Node(bits >> (length - common), common, _EMPTY)
+                self._attach(branch, new)
+                new = branch
+            self._attach(new, node)
+        self._replace(parent, new)
+
+    def __delitem__(self, key):
+        bits, length = self._bits(key)
+        if self._nodes[length].pop(bits, None) is None:
+            raise KeyError(key)
+        self._len -= 1
+        node, parent, grandparent = self._find(bits, length)
+        node.value = _EMPTY
+        if node.left is not None and node.right is not None:
+            return
+        child = node.left or node.right
+        if child is not None:
+            self._replace(parent, child)
+            return
+        # remove the leaf, and its parent which only branched to it
+        if parent is None:
+            self._root = None
+            return
+        if parent.left is node:
+            parent.left = None
+            child = parent.right
+        else:
+            parent.right = None
+            child = parent.left
+        if parent.value is _EMPTY:
+            self._replace(grandparent, child)
+
+    def pop(self, key, *default):
+        value = self.get(key, _EMPTY)
+        if value is _EMPTY:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        del self[key]
+        return value
+
+    def clear(self):
+        self._root = None
+        for nodes in self._nodes:
+            nodes.clear()
+        self._len = 0
+
+    def longest_match(self, key, default=None):
+        """Returns the value of the longest prefix which matches *key*.
+        """
+        bits, length = self._bits(key)
+        value = default
+        node = self._root
+        while node is not None:
+            shift = length - node.length
+            if shift < 0 or bits >> shift != node.bits:
+                break
+            if node.value is not _EMPTY:
+                value = node.value
+            if not shift:
+                break
+            if bits >> (shift - 1) & 1:
+                node = node.right
+            else:
+                node = node.left
+        return value
+
+    def _iternodes(self, node):
+        stack = [node] if node is not None else []
+        while stack:
+            node = stack.pop()
+            if node.right is not None:
+                stack.append(node.right)
+            if node.left is not None:
+                stack.append(node.left)
+            if node.value is not _EMPTY:
+                yield node
+
+    def _subtree_root(self, key):
+        bits, length = self._bits(key)
+        node = self._root
+        while node is not None and node.length < length:
+            shift = length - node.length
+            if bits >> shift != node.bits:
+                return None
+            if bits >> (shift - 1) & 1:
+                node = node.right
+            else:
+                node = node.left
+        if node is None or node.bits >> (node.length - length) != bits:
+            return None
+        return node
+
+    def itersubtree(self, key):
+        """Iterates (key, value) of the prefixes which *key* covers,
+        including *key* itself.
+        """
+        for node in self._iternodes(self._subtree_root(key)):
+            yield self._key(node), node.value
+
+    def itervalues(self):
+        for node in self._iternodes(self._root):
+            yield node.value
+
+    def iteritems(self):
+        for node in self._iternodes(self._root):
+            yield self._key(node), node.value
+
+    def __iter__(self):
+        for node in self._iternodes(self._root):
+            yield self._key(node)
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return list(self.itervalues())
+
+    def items(self):
+        return list(self.iteritems())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for event delivery among Ryu applications.
+
+A source application sends events with RyuApp.send_event_to_observers to
+a number of observer applications, each of which dispatches them to its
+handlers in its event loop.  The number of events per second delivered
+to all observers is reported.
+
+Usage::
+
+    python -m ryu.tests.benchmark.app_events [--events N] [--observers N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller.handler import set_ev_cls
+from ryu.controller.handler import CONFIG_DISPATCHER, MAIN_DISPATCHER
+from ryu.lib import hub
+
+
+class EventBench(event.EventBase):
+    pass
+
+
+class EventBenchOther(event.EventBase):
+    pass
+
+
+class _Source(app_manager.RyuApp):
+    pass
+
+
+class _Observer(app_manager.RyuApp):
+    def __init__(self, *args, **kwargs):
+        super(_Observer, self).__init__(*args, **kwargs)
+        self.count = 0
+        self.done = hub.Event()
+        self.expected = 0
+
+    @set_ev_cls(EventBench, MAIN_DISPATCHER)
+    def bench_handler(self, ev):
+        self.count += 1
+        if self.count == self.expected:
+            self.done.set()
+
+    # handlers which are not interested in the benchmark events/state.
+    @set_ev_cls(EventBench, CONFIG_DISPATCHER)
+    def config_handler(self, ev):
+        pass
+
+    @set_ev_cls(EventBenchOther, MAIN_DISPATCHER)
+    def other_handler(self, ev):
+        pass
+
+
+def run(num_events, num_observers):
+    source = _Source()
+    source.name = 'bench_source'
+    app_manager.register_app(source)
+    observers = []
+    for i in range(num_observers):
+        app = _Observer()
+        app.name = 'bench_observer%d' % i
+        app.expected = num_events
+        app_manager.register_app(app)
+        source.register_observer(EventBench, app.name, [MAIN_DISPATCHER])
+        source.register_observer(EventBenchOther, app.name)
+        app.start()
+        observers.append(app)
+
+    try:
+        ev = EventBench()
+        start = time.time()
+        for _i in range(num_events):
+            source.send_event_to_observers(ev, MAIN_DISPATCHER)
+        for app in observers:
+            app.done.wait()
+        return time.time() - start
+    finally:
+        for app in observers:
+            app.stop()
+            app_manager.unregister_app(app)
+        app_manager.unregister_app(source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--events', type=int, default=100000,
+                        help='number of events sent by the source')
+    parser.add_argument('--observers', type=int, default=2,
+                        help='number of observer applications')
+    args = parser.parse_args()
+
+    elapsed = run(args.events, args.observers)
+    print('%d events to %d observers: %.0f events/sec (%.3f sec)' %
+          (args.events, args.observers, args.events / elapsed, elapsed))
+
+
+if __name__ == '__main__':
+    main()
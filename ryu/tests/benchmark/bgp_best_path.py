@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Micro benchmark for the best path selection of BGP destinations.
+
+A number of IPv4 destinations have a path from each of 8 peers, half of
+them iBGP peers, with attributes drawn from a few values so that many
+steps of the selection are needed, and churn as the peers replace or
+withdraw their paths and advertise them again.  The best path of each
+destination is selected as Destination used to select it, comparing the
+known paths in turn with compute_best_path ("pairwise"), and by the
+cached keys of the paths ("keyed"), which compares only the current best
+path and the new paths unless it is withdrawn.  The destinations
+processed per second are shown.  The best paths are checked to be the
+same, and the reasons to be those of compute_best_path.
+
+Usage::
+
+    python -m ryu.tests.benchmark.bgp_best_path [--prefixes N]
+        [--peers N] [--updates N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import time
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.base import OrderedDict
+from ryu.services.protocols.bgp.info_base.base import Destination
+from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Path
+from ryu.services.protocols.bgp.processor import BPR_ONLY_PATH
+from ryu.services.protocols.bgp.processor import compute_best_path
+
+
+_LOCAL_AS = 65000
+_ROUTER_ID = '10.0.0.1'
+
+
+class _OpenMsg(object):
+    def __init__(self, bgp_identifier):
+        self.bgp_identifier = bgp_identifier
+
+
+class _Protocol(object):
+    def __init__(self, router_id):
+        self.recv_open_msg = _OpenMsg(router_id)
+        self.sent_open_msg = _OpenMsg(_ROUTER_ID)
+
+
+class _Peer(object):
+    version_num = 1
+
+    def __init__(self, remote_as, router_id):
+        self.remote_as = remote_as
+        self.protocol = _Protocol(router_id)
+
+
+class _CoreService(object):
+    asn = _LOCAL_AS
+    router_id = _ROUTER_ID
+
+
+class _Table(object):
+    route_family = bgp.RF_IPv4_UC
+    core_service = _CoreService()
+
+    def delete_dest(self, dest):
+        pass
+
+
+class _Dest(Destination):
+    ROUTE_FAMILY = bgp.RF_IPv4_UC
+
+    def _best_path_lost(self):
+        self._best_path = None
+
+    def _new_best_path(self, new_best_path):
+        self._best_path = new_best_path
+
+
+class _PairwiseDest(_Dest):
+    # selects the best path as Destination did
+    def _compute_best_known_path(self, new_paths=None):
+        current_best_path = self._known_path_list[0]
+        best_path_reason = BPR_ONLY_PATH
+        for next_path in self._known_path_list[1:]:
+            new_best_path, reason = \
+                compute_best_path(self._core_service.asn, current_best_path,
+                                  next_path)
+            best_path_reason = reason
+            if new_best_path is not None:
+                current_best_path = new_best_path
+        return current_best_path, best_path_reason
+
+
+def _path(rnd, peer, nlri):
+    pattrs = OrderedDict()
+    pattrs[bgp.BGP_ATTR_TYPE_ORIGIN] = bgp.BGPPathAttributeOrigin(
+        rnd.choice((0, 0, 0, 1, 2)))
+    pattrs[bgp.BGP_ATTR_TYPE_AS_PATH] = bgp.BGPPathAttributeAsPath(
+        [[peer.remote_as] + [64512 + rnd.randint(0, 9)
+                             for _i in range(rnd.randint(0, 2))]])
+    pattrs[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC] = \
+        bgp.BGPPathAttributeMultiExitDisc(rnd.randint(0, 2))
+    if peer.remote_as == _LOCAL_AS:
+        pattrs[bgp.BGP_ATTR_TYPE_LOCAL_PREF] = \
+            bgp.BGPPathAttributeLocalPref(rnd.choice((100, 100, 200)))
+    return Ipv4Path(peer, nlri, 1, pattrs=pattrs, nexthop='192.0.2.1')
+
+
+def make_updates(num_prefixes, num_peers, num_updates, rnd):
+    # a path from every peer to each prefix, and then random updates, as
+    # (prefix index, path)
+    peers = []
+    for i in range(num_peers):
+        remote_as = _LOCAL_AS if i % 2 else 65001 + i
+        peers.append(_Peer(remote_as, '10.0.%d.%d' % (i // 2 % 2, 2 + i)))
+    nlris = [bgp.IPAddrPrefix(24, '%d.%d.%d.0' % (1 + (i >> 16) % 223,
+                                                 i >> 8 & 0xff, i & 0xff))
+             for i in range(num_prefixes)]
+    updates = [(i, _path(rnd, peer, nlri))
+               for i, nlri in enumerate(nlris) for peer in peers]
+    advertised = set((i, peer) for i in range(num_prefixes)
+                     for peer in peers)
+    for _i in range(num_updates):
+        i = rnd.randrange(num_prefixes)
+        peer = rnd.choice(peers)
+        if (i, peer) in advertised and rnd.random() < 0.3:
+            advertised.remove((i, peer))
+            updates.append((i, Ipv4Path(peer, nlris[i], 1,
+                                        is_withdraw=True)))
+        else:
+            advertised.add((i, peer))
+            updates.append((i, _path(rnd, peer, nlris[i])))
+    return nlris, updates
+
+
+def run(dest_cls, nlris, updates):
+    table = _Table()
+    dests = [dest_cls(table, nlri) for nlri in nlris]
+    start = time.time()
+    best_paths = []
+    for i, path in updates:
+        dest = dests[i]
+        if path.is_withdraw:
+            dest.add_withdraw(path)
+        else:
+            dest.add_new_path(path)
+        dest.process()
+        best_paths.append(dest.best_path)
+    return len(updates) / (time.time() - start), dests, best_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--prefixes', type=int, default=10000,
+                        help='number of destinations')
+    parser.add_argument('--peers', type=int, default=8,
+                        help='number of peers')
+    parser.add_argument('--updates', type=int, default=200000,
+                        help='number of updates after the initial paths')
+    args = parser.parse_args()
+
+    nlris, updates = make_updates(args.prefixes, args.peers, args.updates,
+                                  random.Random(1))
+    print('%d destinations, %d peers, %d updates' %
+          (args.prefixes, args.peers, len(updates)))
+    results = []
+    for name, dest_cls in (('pairwise', _PairwiseDest), ('keyed', _Dest)):
+        rate, dests, best_paths = run(dest_cls, nlris, updates)
+        print('%-8s %10.0f destinations/sec' % (name, rate))
+        results.append(best_paths)
+    assert all(legacy is path for legacy, path in zip(*results))
+
+    for dest in dests:
+        best_path = dest.best_path
+        others = [path for path in dest.known_path_list
+                  if path is not best_path]
+        if best_path is None or not others:
+            continue
+        second_path = others[0]
+        for path in others[1:]:
+            second_path = compute_best_path(_LOCAL_AS, second_path,
+                                            path)[0] or second_path
+        best, reason = compute_best_path(_LOCAL_AS, best_path, second_path)
+        assert best in (best_path, None)
+        assert dest.best_path_reason == reason
+
+
+if __name__ == '__main__':
+    main()
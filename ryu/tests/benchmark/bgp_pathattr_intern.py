@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the memory of BGP paths with interned attributes.
+
+A number of IPv4 prefixes are received from each of 4 peers in UPDATE
+messages of a few prefixes, whose path attributes are new objects for
+each message as the parser makes them, and are drawn from a pool of
+attribute sets as a full table has many prefixes with the same
+attributes.  The paths are kept as Path used to keep them, each with a
+copy of the attributes of its UPDATE ("copy"), and with the interned
+PathAttrSet of the UPDATE ("intern").  The memory allocated for the
+paths, the number of distinct attribute sets and the time taken are
+shown.  The attributes of the paths are checked to be the same.
+
+The default is 1M prefixes in all, --prefixes 1000000 loads a full table
+from each peer.
+
+Usage::
+
+    python -m ryu.tests.benchmark.bgp_pathattr_intern [--prefixes N]
+        [--peers N] [--attrs N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import copy
+import gc
+import time
+import tracemalloc
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.base import OrderedDict
+from ryu.services.protocols.bgp.info_base.base import PathAttrSet
+from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Path
+
+
+_PREFIXES_PER_UPDATE = 4
+
+
+class _Peer(object):
+    version_num = 1
+
+
+class _CopyPath(Ipv4Path):
+    # Path as it was, with its own copy of the attributes
+    def __init__(self, source, nlri, src_ver_num, pattrs=None, nexthop=None,
+                 is_withdraw=False, med_set_by_target_neighbor=False):
+        self.med_set_by_target_neighbor = med_set_by_target_neighbor
+        self._source = source
+        self._path_attr_map = copy.copy(pattrs)
+        self._nlri = nlri
+        self._is_withdraw = is_withdraw
+        self._source_version_num = src_ver_num
+        self._nexthop = nexthop
+        self._exported_from = None
+
+
+def _pattrs(peer, i):
+    # the attributes of an UPDATE, as the parser makes them
+    pattrs = OrderedDict()
+    pattrs[bgp.BGP_ATTR_TYPE_ORIGIN] = bgp.BGPPathAttributeOrigin(0)
+    pattrs[bgp.BGP_ATTR_TYPE_AS_PATH] = bgp.BGPPathAttributeAsPath(
+        [[65001 + peer, 64512 + i % 1000, 4200000000 + i]],
+        as_pack_str='!I')
+    pattrs[bgp.BGP_ATTR_TYPE_NEXT_HOP] = bgp.BGPPathAttributeNextHop(
+        '192.0.2.%d' % (peer + 1))
+    pattrs[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC] = \
+        bgp.BGPPathAttributeMultiExitDisc(i % 10)
+    pattrs[bgp.BGP_ATTR_TYPE_COMMUNITIES] = bgp.BGPPathAttributeCommunities(
+        [65000 << 16 | 100, 0x10000 + i % 100])
+    return pattrs
+
+
+def _prefix(i):
+    return bgp.IPAddrPrefix(24, '%d.%d.%d.0' % (1 + (i >> 16) % 223,
+                                                i >> 8 & 0xff, i & 0xff))
+
+
+def load(path_cls, num_prefixes, num_peers, num_attrs, intern):
+    prefixes = [_prefix(i) for i in range(num_prefixes)]
+    source = _Peer()
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    paths = []
+    for peer in range(num_peers):
+        nexthop = '192.0.2.%d' % (peer + 1)
+        for i in range(0, num_prefixes, _PREFIXES_PER_UPDATE):
+            pattrs = _pattrs(peer, i // _PREFIXES_PER_UPDATE % num_attrs)
+            if intern:
+                pattrs = PathAttrSet(pattrs).intern()
+            for nlri in prefixes[i:i + _PREFIXES_PER_UPDATE]:
+                paths.append(path_cls(source, nlri, 1, pattrs=pattrs,
+                                      nexthop=nexthop))
+    elapsed = time.time() - start
+    gc.collect()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size, paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--prefixes', type=int, default=250000,
+                        help='number of prefixes from each peer')
+    parser.add_argument('--peers', type=int, default=4,
+                        help='number of peers')
+    parser.add_argument('--attrs', type=int, default=10000,
+                        help='number of attribute sets of each peer')
+    args = parser.parse_args()
+
+    print('%d prefixes from %d peers, %d attribute sets per peer' %
+          (args.prefixes, args.peers, args.attrs))
+    results = []
+    for name, path_cls, intern in (('copy', _CopyPath, False),
+                                   ('intern', Ipv4Path, True)):
+        elapsed, size, paths = load(path_cls, args.prefixes, args.peers,
+                                    args.attrs, intern)
+        maps = dict((id(p._path_attr_map), p._path_attr_map) for p in paths)
+        num_attrs = len(set(id(attr) for pattrs in maps.values()
+                            for attr in pattrs.values()))
+        print('%-6s %8.1f MB %6.0f bytes/path %8d maps %8d attributes '
+              '%8.0f paths/sec' %
+              (name, size / 1e6, float(size) / len(paths), len(maps),
+               num_attrs, len(paths) / elapsed))
+        results.append(paths)
+        del paths
+    for legacy, path in zip(*results):
+        assert legacy.nlri.prefix == path.nlri.prefix
+        assert PathAttrSet(legacy.pathattr_map) == path.pathattr_set
+
+
+if __name__ == '__main__':
+    main()
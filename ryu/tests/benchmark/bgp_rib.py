@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the storage of BGP destinations by prefix.
+
+A number of IPv4 prefixes, most of which are /24 as in a full table, are
+kept in a dict by their formatted string as Table used to keep them
+("dict"), and in a RadixTree by their packed form as Ipv4Table keeps
+them ("radix").  The memory allocated for the storage per prefix and the
+exact lookups of the prefixes per second, with their keys made from the
+NLRIs, are shown.  The longest prefix matches of random addresses per
+second are shown too, which the dict finds by trying each prefix length
+from the longest.  The results are checked to be the same.
+
+Usage::
+
+    python -m ryu.tests.benchmark.bgp_rib [--prefixes N] [--lookups N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from ryu.lib import addrconv
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.utils.radix import RadixTree
+
+
+def make_prefixes(num_prefixes, rnd):
+    prefixes = {}
+    while len(prefixes) < num_prefixes:
+        length = rnd.choice((8, 16, 19, 20, 22, 23) + (24,) * 14)
+        addr = rnd.getrandbits(length) << (32 - length)
+        prefixes[(addr, length)] = bgp.IPAddrPrefix(
+            length, addrconv.ipv4.bin_to_text(
+                bytes(bytearray((addr >> 24, addr >> 16 & 0xff,
+                                 addr >> 8 & 0xff, addr & 0xff)))))
+    return list(prefixes.values())
+
+
+def _dict_key(nlri):
+    return nlri.prefix
+
+
+def _radix_key(nlri):
+    return addrconv.ipv4.text_to_bin(nlri.addr), nlri.length
+
+
+def _dict_longest_match(table, addr):
+    for length in range(32, -1, -1):
+        nlri = bgp.IPAddrPrefix(length, addr)
+        nlri.serialize()  # clear the bits after the length
+        value = table.get(nlri.prefix)
+        if value is not None:
+            return value
+    return None
+
+
+def _radix_longest_match(table, addr):
+    return table.longest_match((addrconv.ipv4.text_to_bin(addr), 32))
+
+
+def run(name, table, key, longest_match, nlris, addrs):
+    gc.collect()
+    tracemalloc.start()
+    for nlri in nlris:
+        table[key(nlri)] = nlri
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.time()
+    found = [table.get(key(nlri)) for nlri in nlris]
+    exact = len(nlris) / (time.time() - start)
+    assert found == nlris
+
+    start = time.time()
+    matches = [longest_match(table, addr) for addr in addrs]
+    longest = len(addrs) / (time.time() - start)
+
+    print('%-5s %6.0f bytes/prefix %10.0f exact/sec %10.0f longest/sec' %
+          (name, float(size) / len(nlris), exact, longest))
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--prefixes', type=int, default=1000000,
+                        help='number of prefixes')
+    parser.add_argument('--lookups', type=int, default=100000,
+                        help='number of longest prefix matches')
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    nlris = make_prefixes(args.prefixes, rnd)
+    addrs = [addrconv.ipv4.bin_to_text(
+        bytes(bytearray(rnd.getrandbits(8) for _i in range(4))))
+        for _i in range(args.lookups)]
+
+    print('%d prefixes, %d longest prefix matches' %
+          (args.prefixes, args.lookups))
+    results = []
+    for name, table, key, longest_match in (
+            ('dict', {}, _dict_key, _dict_longest_match),
+            ('radix', RadixTree(32), _radix_key, _radix_longest_match)):
+        results.append(run(name, table, key, longest_match, nlris, addrs))
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Micro benchmark for the decoding of received BGP UPDATE messages.
+
+Each of a number of peers sends a stream of UPDATE messages of a few
+IPv4 prefixes, with attributes drawn from a few values as in a full
+table, which is received in chunks of the size BgpProtocol reads.  The
+messages are framed by BgpProtocol, and then parsed and checked as the
+peer does, in the main process ("inline") or by the worker processes of
+an UpdateDecoder ("pipeline"), which the peers use concurrently.  The
+prefixes received per second are shown, with the latency of a chunk of
+each peer, from its reception until its messages are handled.  The
+messages are checked to be decoded the same.
+
+Usage::
+
+    python -m ryu.tests.benchmark.bgp_update_decode [--peers N]
+        [--updates N] [--prefixes N] [--workers N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import time
+
+from ryu.lib import hub
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.speaker import BgpProtocol
+from ryu.services.protocols.bgp.speaker import RECV_SIZE
+from ryu.services.protocols.bgp.update_decoder import check_update_msg
+from ryu.services.protocols.bgp.update_decoder import DecodedUpdate
+from ryu.services.protocols.bgp.update_decoder import get_pathattr_set
+from ryu.services.protocols.bgp.update_decoder import UpdateDecoder
+
+
+class _Peer(object):
+    def __init__(self, remote_as):
+        self.remote_as = remote_as
+
+    def get_update_check_args(self):
+        return (self.remote_as, True, '192.0.2.254')
+
+
+class _Protocol(BgpProtocol):
+    # frames the stream of a peer, and handles the messages as the peer
+    # does up to the creation of the paths
+    def __init__(self, peer, update_decoder):
+        self._peer = peer
+        self._recv_buff = b''
+        self._update_decoder = update_decoder
+        self.received = []
+
+    def _handle_msg(self, msg):
+        if not (isinstance(msg, DecodedUpdate) and msg.checked):
+            check_update_msg(msg, *self._peer.get_update_check_args())
+        self.received.append((
+            [(r.length, r.addr) for r in msg.withdrawn_routes],
+            get_pathattr_set(msg),
+            [(n.length, n.addr) for n in msg.nlri]))
+
+
+def _update(rnd, peer, prefixes, withdrawn):
+    pattrs = [
+        bgp.BGPPathAttributeOrigin(rnd.choice((0, 0, 0, 1, 2))),
+        bgp.BGPPathAttributeAsPath(
+            [[peer.remote_as] + [64512 + rnd.randint(0, 9)
+                                 for _i in range(rnd.randint(0, 3))]]),
+        bgp.BGPPathAttributeNextHop('192.0.2.%d' % rnd.randint(1, 4)),
+        bgp.BGPPathAttributeMultiExitDisc(rnd.randint(0, 2)),
+    ]
+    if rnd.random() < 0.5:
+        pattrs.append(bgp.BGPPathAttributeCommunities(
+            communities=[peer.remote_as << 16 | rnd.randint(1, 5)]))
+    return bgp.BGPUpdate(
+        withdrawn_routes=[bgp.BGPWithdrawnRoute(24, p) for p in withdrawn],
+        path_attributes=pattrs,
+        nlri=[bgp.BGPNLRI(24, p) for p in prefixes]).serialize()
+
+
+def make_stream(rnd, peer, num_updates, num_prefixes):
+    # UPDATE messages of num_prefixes prefixes, which withdraw some of the
+    # prefixes of the previous ones, in chunks of RECV_SIZE
+    data = bytearray()
+    advertised = []
+    for i in range(num_updates):
+        prefixes = ['%d.%d.%d.0' % (1 + (j >> 16) % 223, j >> 8 & 0xff,
+                                    j & 0xff)
+                    for j in range(i * num_prefixes, (i + 1) * num_prefixes)]
+        withdrawn = rnd.sample(advertised, min(len(advertised), 2))
+        data += _update(rnd, peer, prefixes, withdrawn)
+        advertised = prefixes
+    data = bytes(data)
+    return [data[i:i + RECV_SIZE] for i in range(0, len(data), RECV_SIZE)]
+
+
+def _receive(protocol, chunks, latencies):
+    for chunk in chunks:
+        start = time.time()
+        protocol.data_received(chunk)
+        latencies.append(time.time() - start)
+        # as after the next recv() from the socket
+        hub.sleep(0)
+
+
+def run(peers, streams, update_decoder):
+    protocols = [_Protocol(peer, update_decoder) for peer in peers]
+    latencies = [[] for _peer in peers]
+    start = time.time()
+    hub.joinall([hub.spawn(_receive, protocol, chunks, peer_latencies)
+                 for protocol, chunks, peer_latencies
+                 in zip(protocols, streams, latencies)])
+    elapsed = time.time() - start
+    num_prefixes = sum(len(withdrawn) + len(nlri)
+                       for protocol in protocols
+                       for withdrawn, _pattrs, nlri in protocol.received)
+    return num_prefixes / elapsed, latencies, protocols
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--peers', type=int, default=8,
+                        help='number of peers')
+    parser.add_argument('--updates', type=int, default=2000,
+                        help='number of UPDATE messages of each peer')
+    parser.add_argument('--prefixes', type=int, default=20,
+                        help='number of prefixes of an UPDATE message')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='number of decoder processes')
+    args = parser.parse_args()
+
+    hub.patch()
+    rnd = random.Random(1)
+    peers = [_Peer(65001 + i) for i in range(args.peers)]
+    streams = [make_stream(rnd, peer, args.updates, args.prefixes)
+               for peer in peers]
+    print('%d peers, %d UPDATEs of %d prefixes each, %d workers' %
+          (args.peers, args.updates, args.prefixes, args.workers))
+
+    results = []
+    update_decoder = UpdateDecoder(args.workers)
+    try:
+        for name, decoder in (('inline', None),
+                              ('pipeline', update_decoder)):
+            rate, latencies, protocols = run(peers, streams, decoder)
+            mean = (sum(sum(lat) for lat in latencies) /
+                    sum(len(lat) for lat in latencies))
+            worst = max(sum(lat) / len(lat) for lat in latencies)
+            print('%-8s %10.0f prefixes/sec, chunk latency %7.2f ms mean'
+                  ' (%7.2f ms worst peer), %7.2f ms max' %
+                  (name, rate, mean * 1000, worst * 1000,
+                   max(max(lat) for lat in latencies) * 1000))
+            results.append([protocol.received for protocol in protocols])
+    finally:
+        update_decoder.stop()
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
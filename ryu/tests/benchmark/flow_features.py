@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the flow feature extraction of reduce_t FlowClassifier.
+
+Synthetic flow stats, as collected by reduce_t FlowCollector from the
+access switches, are aggregated into per (src, dst) features.  The
+nested loop used before the columnar rework is kept here as "legacy"
+for comparison, and the results of both are checked to be the same.
+"columns" is the conversion of the flow dicts into columns, which
+FlowCollector.collect_flow_columns() does while parsing the replies,
+and "aggregate" the grouped reductions over them.
+If scikit-learn is available, an SVC trained on FlowClassifier.data is
+also applied to all the samples at once.
+
+Usage::
+
+    python -m ryu.tests.benchmark.flow_features [--flows N] [--pairs N]
+                                                [--dpids N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import time
+
+from ryu.app.reduce_t.flow_classifier import FlowClassifier
+
+
+def _legacy_create_sample(dpid_to_flow):
+    # Aggregation as done before the columnar rework.
+    active_sample = dict()
+    for dpid in dpid_to_flow:
+        for flow in dpid_to_flow[dpid]:
+            src_ip = flow["nw_src"]
+            dst_ip = flow["nw_dst"]
+            active_sample.setdefault((src_ip, dst_ip), [0, 0, 0, 0])
+            active_sample[(src_ip, dst_ip)][0] += 1
+            duration_sec = float(flow["duration_sec"])
+            if duration_sec > 0.0:
+                bw = int(flow["byte_count"]) / duration_sec
+                if bw > active_sample[(src_ip, dst_ip)][1]:
+                    active_sample[(src_ip, dst_ip)][1] = bw
+            active_sample[(src_ip, dst_ip)][2] += int(flow["packet_count"])
+            duration = float(flow["duration_sec"])
+            if duration > active_sample[(src_ip, dst_ip)][3]:
+                active_sample[(src_ip, dst_ip)][3] = duration
+    return active_sample
+
+
+def make_flows(num_flows, num_pairs, num_dpids, seed=0):
+    rand = random.Random(seed)
+    pairs = [('10.0.%d.%d' % divmod(rand.randrange(65536), 256),
+              '10.1.%d.%d' % divmod(rand.randrange(65536), 256))
+             for _i in range(num_pairs)]
+    dpid_to_flow = dict((dpid, []) for dpid in range(1, num_dpids + 1))
+    for _i in range(num_flows):
+        src, dst = rand.choice(pairs)
+        packets = rand.randint(1, 10000)
+        dpid_to_flow[rand.randint(1, num_dpids)].append({
+            'idle_timeout': 10,
+            'packet_count': packets,
+            'byte_count': packets * rand.randint(64, 1500),
+            'duration_sec': rand.randint(0, 600),
+            'nw_src': src,
+            'nw_dst': dst,
+        })
+    return dpid_to_flow
+
+
+def _timeit(func, *args):
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+
+def _classifier(classifier):
+    try:
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.pipeline import make_pipeline
+        from sklearn.svm import SVC
+    except ImportError:
+        return None
+    model = make_pipeline(StandardScaler(), SVC())
+    model.fit(classifier.get_data(classifier.data),
+              classifier.get_target(classifier.target))
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--flows', type=int, default=100000,
+                        help='number of flow stats entries')
+    parser.add_argument('--pairs', type=int, default=5000,
+                        help='number of (src, dst) pairs')
+    parser.add_argument('--dpids', type=int, default=20,
+                        help='number of access switches')
+    args = parser.parse_args()
+
+    dpid_to_flow = make_flows(args.flows, args.pairs, args.dpids)
+    classifier = FlowClassifier()
+    print('%d flows, %d switches' % (args.flows, args.dpids))
+
+    legacy, elapsed = _timeit(_legacy_create_sample, dpid_to_flow)
+    print('%-14s %8.3f sec' % ('legacy', elapsed))
+    current, elapsed = _timeit(classifier.create_sample, dpid_to_flow)
+    print('%-14s %8.3f sec' % ('create_sample', elapsed))
+    columns, elapsed = _timeit(classifier.flows_to_columns, dpid_to_flow)
+    print('%-14s %8.3f sec' % ('columns', elapsed))
+    (pairs, features), elapsed = _timeit(classifier.create_sample_array,
+                                         columns)
+    print('%-14s %8.3f sec (%d pairs)' % ('aggregate', elapsed, len(pairs)))
+
+    assert sorted(legacy) == sorted(current)
+    for pair in legacy:
+        for old, new in zip(legacy[pair], current[pair]):
+            assert abs(old - new) <= 1e-9 * max(1.0, abs(old)), pair
+
+    model = _classifier(classifier)
+    if model is None:
+        print('scikit-learn is not available; classification skipped')
+        return
+    labels, elapsed = _timeit(classifier.classify, model, features)
+    print('%-14s %8.3f sec (%d of %d pairs active)' %
+          ('classify', elapsed, int(labels.sum()), len(labels)))
+
+
+if __name__ == '__main__':
+    main()
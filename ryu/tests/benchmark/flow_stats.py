@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the columnar decoding of OpenFlow 1.3 flow stats.
+
+A multipart flow stats reply of N entries (TCP 5-tuple matches and an
+output action, split into messages of at most 64KB) is parsed as the
+controller does and the byte count and ipv4_dst of every entry are
+read, from the OFPFlowStats objects of the body ("objects") and from
+OFPFlowStatsReply.columns() ("columns", ipv4_dst as int).  The results
+of both are checked to be the same.
+
+Usage::
+
+    python -m ryu.tests.benchmark.flow_stats [--count N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import struct
+import time
+
+from ryu.lib import addrconv
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_3 as ofproto
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+def _flow_stats(i):
+    ofpp = ofproto_v1_3_parser
+    match = ofpp.OFPMatch(
+        eth_type=0x0800, ip_proto=6,
+        ipv4_src='10.0.%d.%d' % (i >> 8 & 0xff, i & 0xff),
+        ipv4_dst='10.1.%d.%d' % (i >> 8 & 0xff, i & 0xff),
+        tcp_src=1024 + i % 60000, tcp_dst=80)
+    inst = [ofpp.OFPInstructionActions(ofproto.OFPIT_APPLY_ACTIONS,
+                                       [ofpp.OFPActionOutput(i % 48 + 1)])]
+    buf = bytearray()
+    offset = ofproto.OFP_FLOW_STATS_0_SIZE
+    buf += bytearray(offset)
+    offset += match.serialize(buf, offset)
+    for x in inst:
+        x.serialize(buf, offset)
+        offset += x.len
+    struct.pack_into(ofproto.OFP_FLOW_STATS_0_PACK_STR, buf, 0,
+                     len(buf), 0, i, 0, 10, 30, 0, 0, 0, i, i * 1500)
+    return buf
+
+
+def build_reply(count):
+    """Returns the messages of a multipart flow stats reply."""
+    msgs = []
+    body = bytearray()
+    for i in range(count):
+        entry = _flow_stats(i)
+        if (ofproto.OFP_MULTIPART_REPLY_SIZE + len(body) + len(entry) >
+                0xffff):
+            msgs.append(body)
+            body = bytearray()
+        body += entry
+    msgs.append(body)
+
+    bufs = []
+    for (i, body) in enumerate(msgs):
+        flags = ofproto.OFPMPF_REPLY_MORE if i < len(msgs) - 1 else 0
+        hdr = bytearray(ofproto.OFP_MULTIPART_REPLY_SIZE)
+        struct.pack_into(ofproto.OFP_HEADER_PACK_STR, hdr, 0,
+                         ofproto.OFP_VERSION, ofproto.OFPT_MULTIPART_REPLY,
+                         len(hdr) + len(body), 1)
+        struct.pack_into(ofproto.OFP_MULTIPART_REPLY_PACK_STR, hdr,
+                         ofproto.OFP_HEADER_SIZE, ofproto.OFPMP_FLOW, flags)
+        bufs.append(bytes(hdr + body))
+    return bufs
+
+
+def _parse(dp, buf):
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+    return ofproto_parser.msg(dp, version, msg_type, msg_len, xid, buf)
+
+
+def run_objects(dp, bufs):
+    byte_count = []
+    ipv4_dst = []
+    for buf in bufs:
+        for stats in _parse(dp, buf).body:
+            byte_count.append(stats.byte_count)
+            ipv4_dst.append(stats.match['ipv4_dst'])
+    return byte_count, ipv4_dst
+
+
+def run_columns(dp, bufs):
+    columns = {}
+    for buf in bufs:
+        _parse(dp, buf).columns(columns, match_fields=['ipv4_dst'])
+    return columns['byte_count'], columns['ipv4_dst']
+
+
+def _ipv4_to_int(ipv4):
+    return struct.unpack('!I', addrconv.ipv4.text_to_bin(ipv4))[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=100000,
+                        help='number of flow stats entries')
+    args = parser.parse_args()
+
+    dp = ofproto_protocol.ProtocolDesc(version=ofproto.OFP_VERSION)
+    bufs = build_reply(args.count)
+    print('%d entries in %d messages' % (args.count, len(bufs)))
+    results = []
+    for name, run in (('objects', run_objects), ('columns', run_columns)):
+        start = time.time()
+        result = run(dp, bufs)
+        elapsed = time.time() - start
+        print('%-8s %8.3f sec %10.0f entries/sec' %
+              (name, elapsed, args.count / elapsed))
+        results.append(result)
+    (byte_count, ipv4_dst) = results[0]
+    assert byte_count == list(results[1][0])
+    assert [_ipv4_to_int(a) for a in ipv4_dst] == list(results[1][1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the link timeout check of topology.Switches.
+
+A number of links are added to switches.LinkState, a few of which have
+not been updated by LLDP packets and time out at each tick.  The
+timed out links are found by scanning all of the links as link_loop()
+used to do ("scan"), and by LinkState.pop_expired() ("timers").  The
+results are checked to be the same, and the occupancy of the timers is
+shown.  The heap entries left by the updates are removed at the first
+tick, which is not measured.
+
+Usage::
+
+    python -m ryu.tests.benchmark.link_timeout [--links N] [--expired N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import switches
+
+
+_TIMEOUT = 10.
+
+
+def _port(dpid, port_no):
+    ofpport = ofproto_v1_3_parser.OFPPort(
+        port_no=port_no, hw_addr='00:00:00:00:00:01', config=0, state=0,
+        curr=0, advertised=0, supported=0, peer=0, curr_speed=0,
+        max_speed=0, name=b'eth')
+    return switches.Port(dpid, ofproto_v1_3, ofpport)
+
+
+def _links(num_links):
+    links = switches.LinkState(_TIMEOUT)
+    for i in range(num_links):
+        links.update_link(_port(i + 1, 1), _port(i + 2, 2))
+    return links
+
+
+def _ticks(links, num_expired):
+    # the times at which num_expired links time out, the rest of which
+    # are updated as LLDP packets arrive
+    now = time.time() + _TIMEOUT + 1
+    expired = list(links)[:num_expired]
+    for link in list(links)[num_expired:]:
+        links.rev_link_set_timestamp(link, now)
+    return now, expired
+
+
+def run_scan(links, now):
+    return [link for (link, timestamp) in links.items()
+            if timestamp + _TIMEOUT < now]
+
+
+def run_timers(links, now):
+    return links.pop_expired(now)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--links', type=int, default=10000,
+                        help='number of links')
+    parser.add_argument('--expired', type=int, default=10,
+                        help='number of links timed out')
+    parser.add_argument('--repeat', type=int, default=100,
+                        help='number of ticks')
+    args = parser.parse_args()
+
+    results = []
+    line = ['%d links, %d timed out' % (args.links, args.expired)]
+    for name, run in (('scan', run_scan), ('timers', run_timers)):
+        links = _links(args.links)
+        now, expired = _ticks(links, args.expired)
+        for link in run(links, now):
+            links.check_later(link, 0)
+        elapsed = 0
+        for _i in range(args.repeat):
+            start = time.time()
+            result = run(links, now)
+            elapsed += time.time() - start
+            # checked again at the next tick, as link_loop() does
+            for link in result:
+                links.check_later(link, 0)
+        line.append('%-6s %8.1f usec/tick' %
+                    (name, elapsed / args.repeat * 1000000))
+        results.append(sorted(str(link) for link in result))
+        assert len(result) == len(expired)
+    assert results[0] == results[1]
+    print('  '.join(line))
+    print('timers: %s' % links.timers.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the OFPMatch parser of OpenFlow 1.2 to 1.5.
+
+Captured PACKET_IN messages (ryu/tests/packet_data) are parsed and
+msg.match['in_port'] is read, as a typical PACKET_IN handler does, and
+the number of messages per second is reported for each version.  The
+match parser used before the fields were decoded on demand (all the
+fields decoded, twice for OpenFlow 1.2 and 1.3) is kept here as
+"legacy" for comparison.
+
+Usage::
+
+    python -m ryu.tests.benchmark.ofp_match [--count N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import struct
+import time
+
+from ryu.ofproto import ofproto_parser
+from ryu.ofproto import ofproto_protocol
+
+
+_PACKET_DATA_DIR = os.path.join(os.path.dirname(__file__),
+                                '..', 'packet_data')
+_PACKETS = [
+    'of12/3-4-ofp_packet_in.packet',
+    'of13/4-4-ofp_packet_in.packet',
+    'of14/5-4-ofp_packet_in.packet',
+    'of15/libofproto-OFP15-packet_in.packet',
+]
+
+
+def _legacy_parser(ofpp):
+    # OFPMatch.parser as it was before the fields were decoded on demand.
+    ofproto = ofpp.ofproto
+
+    def parser(cls, buf, offset):
+        match = ofpp.OFPMatch()
+        type_, length = struct.unpack_from('!HH', buf, offset)
+
+        match.type = type_
+        match.length = length
+
+        # ofp_match adjustment
+        offset += 4
+        length -= 4
+
+        # XXXcompat
+        if hasattr(cls, 'parser_old'):
+            cls.parser_old(match, buf, offset, length)
+
+        fields = []
+        while length > 0:
+            n, value, mask, field_len = ofproto.oxm_parse(buf, offset)
+            k, uv = ofproto.oxm_to_user(n, value, mask)
+            fields.append((k, uv))
+            offset += field_len
+            length -= field_len
+        match._fields2 = fields
+        return match
+
+    return classmethod(parser)
+
+
+def run(buf, count):
+    (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+    dp = ofproto_protocol.ProtocolDesc(version=version)
+    msg_parser = ofproto_parser.msg
+    start = time.time()
+    for _i in range(count):
+        msg = msg_parser(dp, version, msg_type, msg_len, xid, buf)
+        msg.match['in_port']
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=100000,
+                        help='number of PACKET_IN messages parsed')
+    args = parser.parse_args()
+
+    for f in _PACKETS:
+        with open(os.path.join(_PACKET_DATA_DIR, f), 'rb') as fp:
+            buf = fp.read()
+        (version, _t, _l, _x) = ofproto_parser.header(buf)
+        dp = ofproto_protocol.ProtocolDesc(version=version)
+        ofpp = dp.ofproto_parser
+        msg = ofproto_parser.msg(dp, version, _t, _l, _x, buf)
+        print('%s: %d match fields' % (f, len(msg.match.items())))
+
+        current = ofpp.OFPMatch.__dict__['parser']
+        ofpp.OFPMatch.parser = _legacy_parser(ofpp)
+        try:
+            elapsed = run(buf, args.count)
+        finally:
+            ofpp.OFPMatch.parser = current
+        print('  %-8s %10.0f msgs/sec' % ('legacy', args.count / elapsed))
+        elapsed = run(buf, args.count)
+        print('  %-8s %10.0f msgs/sec' % ('current', args.count / elapsed))
+
+
+if __name__ == '__main__':
+    main()
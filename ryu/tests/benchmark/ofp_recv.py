@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the receive path of ryu.controller.controller.Datapath.
+
+Captured OpenFlow messages (ryu/tests/packet_data) are concatenated into
+a stream which is written to a loopback TCP connection and received by
+Datapath._recv_loop, and the number of messages framed and parsed per
+second is reported.  The framing used before the receive buffer rework
+is kept here as "legacy" for comparison.
+
+Usage::
+
+    python -m ryu.tests.benchmark.ofp_recv [--repeat N] [--chunk BYTES]
+                                           [packet files...]
+"""
+
+from __future__ import print_function
+
+import argparse
+import glob
+import os
+import socket
+import threading
+import time
+
+from ryu.base import app_manager
+from ryu.controller import controller
+from ryu.controller import handler
+from ryu.controller import ofp_event
+from ryu.ofproto import ofproto_common
+from ryu.ofproto import ofproto_parser
+
+
+_PACKET_DATA_DIR = os.path.join(os.path.dirname(__file__),
+                                '..', 'packet_data')
+_DEFAULT_PACKETS = [
+    'of13/4-4-ofp_packet_in.packet',
+    'of13/4-14-ofp_echo_reply.packet',
+]
+
+
+class _NullBrick(object):
+    def send_event_to_observers(self, ev, state=None):
+        pass
+
+    def send_events_to_observers(self, evs, state=None):
+        pass
+
+    def get_handlers(self, ev, state=None):
+        return []
+
+
+def _tcp_pair():
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(1)
+    wsock = socket.create_connection(listener.getsockname())
+    rsock, _addr = listener.accept()
+    listener.close()
+    return rsock, wsock
+
+
+def _replay(sock, data, chunk):
+    # Write the stream in chunks of the given size, as a switch would.
+    view = memoryview(data)
+    for offset in range(0, len(data), chunk):
+        sock.sendall(view[offset:offset + chunk])
+    sock.close()
+
+
+def _legacy_recv_loop(dp):
+    # Framing as done before the receive buffer rework.
+    buf = bytearray()
+    required_len = ofproto_common.OFP_HEADER_SIZE
+    while True:
+        ret = dp.socket.recv(required_len)
+        if len(ret) == 0:
+            break
+        buf += ret
+        while len(buf) >= required_len:
+            (version, msg_type, msg_len, xid) = ofproto_parser.header(buf)
+            required_len = msg_len
+            if len(buf) < required_len:
+                break
+            msg = ofproto_parser.msg(dp, version, msg_type, msg_len, xid,
+                                     buf[:msg_len])
+            if msg:
+                ev = ofp_event.ofp_msg_to_ev(msg)
+                dp.ofp_brick.send_event_to_observers(ev, dp.state)
+                dispatchers = lambda x: x.callers[ev.__class__].dispatchers
+                handlers = [handler for handler in
+                            dp.ofp_brick.get_handlers(ev) if
+                            dp.state in dispatchers(handler)]
+                for handler in handlers:
+                    handler(ev)
+            buf = buf[required_len:]
+            required_len = ofproto_common.OFP_HEADER_SIZE
+
+
+def _current_recv_loop(dp):
+    dp._recv_loop()
+
+
+def _load_stream(files, repeat):
+    data = bytearray()
+    count = 0
+    for f in files:
+        with open(f, 'rb') as fp:
+            buf = fp.read()
+        # A file may contain several concatenated messages.
+        offset = 0
+        while offset < len(buf):
+            (_v, _t, msg_len, _x) = ofproto_parser.header(buf[offset:])
+            offset += msg_len
+            count += 1
+        data += buf
+    return data * repeat, count * repeat
+
+
+def run(recv_loop, data, chunk):
+    app_manager.SERVICE_BRICKS['ofp_event'] = _NullBrick()
+    rsock, wsock = _tcp_pair()
+    writer = threading.Thread(target=_replay, args=(wsock, data, chunk))
+    try:
+        dp = controller.Datapath(rsock, None)
+        dp.state = handler.MAIN_DISPATCHER
+        start = time.time()
+        writer.start()
+        recv_loop(dp)
+        return time.time() - start
+    finally:
+        writer.join()
+        rsock.close()
+        del app_manager.SERVICE_BRICKS['ofp_event']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=2000,
+                        help='number of times the captured stream is replayed')
+    parser.add_argument('--chunk', type=int, default=65536,
+                        help='number of bytes written to the socket at once')
+    parser.add_argument('files', nargs='*',
+                        help='captured OpenFlow messages to replay')
+    args = parser.parse_args()
+
+    files = args.files or [os.path.join(_PACKET_DATA_DIR, f)
+                           for f in _DEFAULT_PACKETS]
+    files = [f for pattern in files for f in sorted(glob.glob(pattern))]
+    data, count = _load_stream(files, args.repeat)
+    print('%d messages, %d bytes, write chunk %d bytes' %
+          (count, len(data), args.chunk))
+
+    for name, recv_loop in (('legacy', _legacy_recv_loop),
+                            ('current', _current_recv_loop)):
+        elapsed = run(recv_loop, data, args.chunk)
+        print('%-8s %10.0f msgs/sec (%.3f sec)' %
+              (name, count / elapsed, elapsed))
+
+
+if __name__ == '__main__':
+    main()
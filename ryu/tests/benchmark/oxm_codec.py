@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the OXM conversions of ryu.ofproto.oxx_fields.
+
+An OpenFlow 1.3 OFPMatch of a TCP 5-tuple and the input port is
+composed and serialized, and parsed with all the fields decoded.  The
+generic conversions used before the per field codecs (field lookup and
+type_desc dispatch for each field) are installed as "legacy" for
+comparison, and the results of both are checked to be the same.
+
+Usage::
+
+    python -m ryu.tests.benchmark.oxm_codec [--count N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import functools
+import struct
+import time
+
+from ryu.ofproto import ofproto_v1_3 as ofproto
+from ryu.ofproto import ofproto_v1_3_parser as ofproto_parser
+from ryu.ofproto import oxx_fields
+
+
+_MATCH = {
+    'in_port': 1,
+    'eth_type': 0x0800,
+    'ip_proto': 6,
+    'ipv4_src': '192.0.2.1',
+    'ipv4_dst': '198.51.100.2',
+    'tcp_src': 49152,
+    'tcp_dst': 80,
+}
+
+_CONVERSIONS = ['oxm_from_user', 'oxm_to_user', 'oxm_normalize_user',
+                'oxm_serialize_user', 'oxm_parse_user', 'oxm_parse_index']
+
+
+def _legacy_parse(buf, offset):
+    (num, total_hdr_len, hasmask, value_len,
+     field_len) = oxx_fields._parse_header_impl(ofproto, buf, offset)
+    value_pack_str = '!%ds' % value_len
+    (value, ) = struct.unpack_from(value_pack_str, buf,
+                                   offset + total_hdr_len)
+    mask = None
+    if hasmask:
+        (mask, ) = struct.unpack_from(value_pack_str, buf,
+                                      offset + total_hdr_len + value_len)
+    return num, value, mask, field_len
+
+
+def _legacy_conversions():
+    # the conversions as generated by oxm_fields.generate() before the
+    # per field codecs.
+    oxx = 'oxm'
+    name_to_field = dict((f.name, f) for f in ofproto.oxm_types)
+    num_to_field = dict((f.num, f) for f in ofproto.oxm_types)
+    from_user = functools.partial(oxx_fields._from_user, oxx, name_to_field)
+    to_user = functools.partial(oxx_fields._to_user, oxx, num_to_field)
+
+    def serialize_user(k, uv, buf, offset):
+        (n, value, mask) = from_user(k, uv)
+        return oxx_fields._serialize(oxx, ofproto, n, value, mask, buf,
+                                     offset)
+
+    def parse_user(buf, offset):
+        (n, value, mask, field_len) = _legacy_parse(buf, offset)
+        (k, uv) = to_user(n, value, mask)
+        return k, uv, field_len
+
+    def parse_index(buf, offset, length):
+        index = []
+        while length > 0:
+            (n, value, mask, field_len) = _legacy_parse(buf, offset)
+            index.append((oxx_fields._to_user_header(oxx, num_to_field, n),
+                          offset))
+            offset += field_len
+            length -= field_len
+        return index
+
+    return {
+        'oxm_from_user': from_user,
+        'oxm_to_user': to_user,
+        'oxm_normalize_user': functools.partial(oxx_fields._normalize_user,
+                                                oxx, ofproto),
+        'oxm_serialize_user': serialize_user,
+        'oxm_parse_user': parse_user,
+        'oxm_parse_index': parse_index,
+    }
+
+
+def _serialize(count):
+    for _i in range(count):
+        buf = bytearray()
+        ofproto_parser.OFPMatch(**_MATCH).serialize(buf, 0)
+    return bytes(buf)
+
+
+def _parse(buf, count):
+    for _i in range(count):
+        items = ofproto_parser.OFPMatch.parser(buf, 0).items()
+    return items
+
+
+def run(count):
+    start = time.time()
+    buf = _serialize(count)
+    serialize_elapsed = time.time() - start
+    start = time.time()
+    items = _parse(buf, count)
+    parse_elapsed = time.time() - start
+    return buf, items, serialize_elapsed, parse_elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=50000,
+                        help='number of matches serialized and parsed')
+    args = parser.parse_args()
+
+    print('%d matches of %d fields' % (args.count, len(_MATCH)))
+    current = dict((k, getattr(ofproto, k)) for k in _CONVERSIONS)
+    results = []
+    for name, conversions in (('legacy', _legacy_conversions()),
+                              ('current', current)):
+        for k, v in conversions.items():
+            setattr(ofproto, k, v)
+        try:
+            buf, items, serialize_elapsed, parse_elapsed = run(args.count)
+        finally:
+            for k, v in current.items():
+                setattr(ofproto, k, v)
+        print('%-8s serialize %8.0f matches/sec, parse %8.0f matches/sec' %
+              (name, args.count / serialize_elapsed,
+               args.count / parse_elapsed))
+        results.append((buf, items))
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
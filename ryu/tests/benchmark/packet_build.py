@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for packet.Packet.serialize.
+
+Frames of ethernet/mpls/ipv4/tcp with a payload, as reduce_t __add_mpls
+pushes an MPLS label on a received packet, are built with the legacy
+serializer which prepends the headers one by one ("prepend") and with
+Packet.serialize which encodes them into a single buffer ("buffer").
+The TCP and IPv4 checksums are computed on each build.  The frames of
+both are checked to be the same.
+
+Usage::
+
+    python -m ryu.tests.benchmark.packet_build [--count N] [--size N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import mpls
+from ryu.lib.packet import packet
+from ryu.lib.packet import tcp
+
+
+def _packet(i, payload):
+    pkt = packet.Packet()
+    pkt.add_protocol(ethernet.ethernet(ethertype=ether_types.ETH_TYPE_MPLS))
+    pkt.add_protocol(mpls.mpls(label=i % 1000 + 16))
+    pkt.add_protocol(ipv4.ipv4(proto=in_proto.IPPROTO_TCP,
+                               src='10.0.%d.%d' % (i >> 8 & 0xff, i & 0xff)))
+    pkt.add_protocol(tcp.tcp(src_port=1024 + i % 60000, dst_port=80))
+    pkt.add_protocol(payload)
+    return pkt
+
+
+def run_prepend(count, payload):
+    datas = []
+    for i in range(count):
+        pkt = _packet(i, payload)
+        pkt._serialize()
+        datas.append(pkt.data)
+    return datas
+
+
+def run_buffer(count, payload):
+    datas = []
+    for i in range(count):
+        pkt = _packet(i, payload)
+        pkt.serialize()
+        datas.append(pkt.data)
+    return datas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=20000,
+                        help='number of frames built')
+    parser.add_argument('--size', type=int, default=1400,
+                        help='size of the TCP payload')
+    args = parser.parse_args()
+
+    payload = bytes(bytearray(i & 0xff for i in range(args.size)))
+    print('%d frames of %d bytes payload' % (args.count, args.size))
+    results = []
+    for name, run in (('prepend', run_prepend), ('buffer', run_buffer)):
+        start = time.time()
+        datas = run(args.count, payload)
+        elapsed = time.time() - start
+        print('%-8s %10.0f frames/sec' % (name, args.count / elapsed))
+        results.append([bytes(d) for d in datas])
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for packet.LazyPacket.
+
+The data of PACKET_INs (ethernet/ipv4/tcp and ethernet/ipv4/udp with
+payloads of 64 bytes, and ethernet/arp) is classified as reduce_t
+low_latency_app packet_in_handler does, looking up ethernet, arp, ipv4,
+icmp, tcp and udp, with packet.Packet ("eager") and packet.LazyPacket
+("lazy").  The results of both are checked to be the same.
+
+Usage::
+
+    python -m ryu.tests.benchmark.packet_in [--count N] [--repeat N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from ryu.lib.packet import arp
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import icmp
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
+from ryu.lib.packet import tcp
+from ryu.lib.packet import udp
+
+
+def _build(*protocols):
+    pkt = packet.Packet()
+    for p in protocols:
+        pkt.add_protocol(p)
+    pkt.serialize()
+    return bytes(pkt.data)
+
+
+def _packets(count):
+    for i in range(count):
+        src = '10.0.%d.%d' % (i >> 8 & 0xff, i & 0xff)
+        if i % 10 == 9:
+            yield _build(
+                ethernet.ethernet(ethertype=ether_types.ETH_TYPE_ARP),
+                arp.arp(src_ip=src))
+            continue
+        if i % 2:
+            l4 = tcp.tcp(src_port=1024 + i % 60000, dst_port=80)
+            proto = in_proto.IPPROTO_TCP
+        else:
+            l4 = udp.udp(src_port=1024 + i % 60000, dst_port=5000)
+            proto = in_proto.IPPROTO_UDP
+        yield _build(ethernet.ethernet(ethertype=ether_types.ETH_TYPE_IP),
+                     ipv4.ipv4(proto=proto, src=src, dst='10.1.0.1'),
+                     l4, b'\x00' * 64)
+
+
+def _classify(pkt):
+    eth = pkt.get_protocols(ethernet.ethernet)[0]
+    if eth.ethertype == ether_types.ETH_TYPE_LLDP:
+        return None
+    arp_pkt = pkt.get_protocol(arp.arp)
+    if arp_pkt:
+        return (arp_pkt.src_ip,)
+    ipv4_pkt = pkt.get_protocol(ipv4.ipv4)
+    if ipv4_pkt:
+        l4 = (pkt.get_protocol(icmp.icmp) or pkt.get_protocol(tcp.tcp) or
+              pkt.get_protocol(udp.udp))
+        return (eth.src, ipv4_pkt.src, ipv4_pkt.dst, l4.src_port)
+    return None
+
+
+def run_eager(datas):
+    return [_classify(packet.Packet(data)) for data in datas]
+
+
+def run_lazy(datas):
+    return [_classify(packet.LazyPacket(data)) for data in datas]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=50000,
+                        help='number of PACKET_INs')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of rounds, the best of which is shown')
+    args = parser.parse_args()
+
+    datas = list(_packets(args.count))
+    print('%d packets' % args.count)
+    results = []
+    for name, run in (('eager', run_eager), ('lazy', run_lazy)):
+        elapsed = None
+        for _i in range(args.repeat):
+            start = time.time()
+            result = run(datas)
+            t = time.time() - start
+            if elapsed is None or t < elapsed:
+                elapsed = t
+        print('%-8s %10.0f packets/sec' % (name, args.count / elapsed))
+        results.append(result)
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
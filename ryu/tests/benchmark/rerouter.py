@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro benchmark for the bandwidth island hierarchy of reduce_t ReRouter.
+
+A random (Erdos-Renyi) topology with random link bandwidths is indexed
+by bandwidth_index.BandwidthIndex, then re-routes are looked up for
+random pairs of edge switches and link bandwidths are changed one at a time.  The island
+building and lookup used before the index (list based BFS per island,
+linear scan of the islands, a rebuild on every change) are kept here as
+"legacy" for comparison, and the islands and route lengths of both are
+checked to be the same.
+
+Usage::
+
+    python -m ryu.tests.benchmark.rerouter [--nodes N] [--prob P]
+                                           [--edges N] [--routes N]
+                                           [--changes N]
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import time
+from collections import deque
+
+from ryu.app.reduce_t.bandwidth_index import BandwidthIndex
+
+
+_THRESHOLDS = [7, 5, 2]
+_BANDWIDTHS = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+
+
+def topo_er(nodes, prob, rand):
+    links = dict()
+    for u in range(nodes):
+        for v in range(u + 1, nodes):
+            if rand.random() < prob:
+                links[(u, v)] = rand.choice(_BANDWIDTHS)
+    return links
+
+
+def _adjacency(nodes, links):
+    adj = dict((n, dict()) for n in range(nodes))
+    for (u, v), bw in links.items():
+        adj[u][v] = bw
+        adj[v][u] = bw
+    return adj
+
+
+# Island building and lookup as done before the bandwidth index,
+# on a dict of dicts instead of a networkx graph.
+def _legacy_get_BI(adj, bw, node):
+    queue = [node]
+    book = [node]
+    edges = 0
+    head = 0
+    while head < len(queue):
+        cur = queue[head]
+        for i, weight in adj[cur].items():
+            if i not in book and weight >= bw:
+                queue.append(i)
+                book.append(i)
+                edges += 1
+        head += 1
+    return book, edges
+
+
+def _legacy_build_BIH(adj, bw_list):
+    bih = []
+    for bw in bw_list:
+        big = []
+        for i in adj:
+            if any(i in bi for bi in big):
+                continue
+            bi, edges = _legacy_get_BI(adj, bw, i)
+            big.append(bi)
+        bih.append([bi for bi in big if len(bi) > 1])
+    return bih
+
+
+def _legacy_shortest_path(adj, bw, nodes, u, v):
+    prev = {u: None}
+    queue = deque([u])
+    while queue:
+        cur = queue.popleft()
+        if cur == v:
+            break
+        for i, weight in adj[cur].items():
+            if weight >= bw and i in nodes and i not in prev:
+                prev[i] = cur
+                queue.append(i)
+    if v not in prev:
+        return None
+    path = [v]
+    while v != u:
+        v = prev[v]
+        path.append(v)
+    return path[::-1]
+
+
+def _legacy_re_route(adj, bih, bw_list, u, v):
+    for level, big in enumerate(bih):
+        for bi in big:
+            if u in bi and v in bi:
+                return level, _legacy_shortest_path(adj, bw_list[level],
+                                                    set(bi), u, v)
+    return None, _legacy_shortest_path(adj, float('-inf'), adj, u, v)
+
+
+def _timeit(func, *args):
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+
+def _check(index, bih):
+    for level, big in enumerate(bih):
+        assert (sorted(sorted(bi) for bi in big) ==
+                sorted(sorted(bi) for bi in index.islands(level))), level
+
+
+def _route_all(route, pairs):
+    return [route(u, v) for u, v in pairs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--nodes', type=int, default=1000,
+                        help='number of switches')
+    parser.add_argument('--prob', type=float, default=0.01,
+                        help='probability of a link between two switches')
+    parser.add_argument('--edges', type=int, default=20,
+                        help='number of edge switches the routes start at')
+    parser.add_argument('--routes', type=int, default=1000,
+                        help='number of re-routes looked up')
+    parser.add_argument('--changes', type=int, default=20,
+                        help='number of link bandwidth changes')
+    args = parser.parse_args()
+
+    rand = random.Random(0)
+    links = topo_er(args.nodes, args.prob, rand)
+    adj = _adjacency(args.nodes, links)
+    print('%d nodes, %d links, thresholds %s' %
+          (args.nodes, len(links), _THRESHOLDS))
+
+    bih, elapsed = _timeit(_legacy_build_BIH, adj, _THRESHOLDS)
+    print('%-16s %8.3f sec' % ('legacy build', elapsed))
+    index, elapsed = _timeit(BandwidthIndex, _THRESHOLDS, links)
+    print('%-16s %8.3f sec' % ('index build', elapsed))
+    _check(index, bih)
+
+    edges = rand.sample(range(args.nodes), args.edges)
+    pairs = [(rand.choice(edges), rand.randrange(args.nodes))
+             for _i in range(args.routes)]
+    legacy, elapsed = _timeit(
+        _route_all, lambda u, v: _legacy_re_route(adj, bih, _THRESHOLDS,
+                                                  u, v), pairs)
+    print('%-16s %8.3f sec (%d routes)' % ('legacy route', elapsed,
+                                           len(pairs)))
+    current, elapsed = _timeit(_route_all, index.shortest_path, pairs)
+    print('%-16s %8.3f sec (%d routes)' % ('index route', elapsed,
+                                           len(pairs)))
+    for (old_level, old), (new_level, new) in zip(legacy, current):
+        assert old_level == new_level
+        assert (old is None) == (new is None)
+        assert old is None or len(old) == len(new)
+
+    changes = [(rand.choice(list(links)), rand.choice(_BANDWIDTHS))
+               for _i in range(args.changes)]
+
+    def _legacy_changes():
+        for (u, v), bw in changes:
+            adj[u][v] = adj[v][u] = bw
+            bih[:] = _legacy_build_BIH(adj, _THRESHOLDS)
+
+    def _index_changes():
+        for (u, v), bw in changes:
+            index.set_bandwidth(u, v, bw)
+
+    _none, elapsed = _timeit(_legacy_changes)
+    print('%-16s %8.3f sec (%d changes)' % ('legacy update', elapsed,
+                                            len(changes)))
+    _none, elapsed = _timeit(_index_changes)
+    print('%-16s %8.3f sec (%d changes)' % ('index update', elapsed,
+                                            len(changes)))
+    _check(index, bih)
+
+
+if __name__ == '__main__':
+    main()
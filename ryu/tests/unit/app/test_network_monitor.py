@@ -0,0 +1,114 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.plugins.skip import SkipTest
+from nose.tools import eq_
+
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import event
+from ryu.topology import switches
+
+try:
+    from ryu.app.reduce_t import network_monitor
+except (ImportError, SyntaxError):
+    # reduce_t needs networkx, and Python 2
+    network_monitor = None
+
+
+class _Datapath(object):
+    ofproto = ofproto_v1_3
+
+    def __init__(self, dpid):
+        self.id = dpid
+
+
+def _ofpport(port_no):
+    return ofproto_v1_3_parser.OFPPort(
+        port_no=port_no, hw_addr='00:00:00:00:00:%02x' % port_no,
+        config=0, state=0, curr=0, advertised=0, supported=0, peer=0,
+        curr_speed=0, max_speed=0, name=b'eth%d' % port_no)
+
+
+def _switch(dpid, port_nos):
+    switch = switches.Switch(_Datapath(dpid))
+    for port_no in port_nos:
+        switch.add_port(_ofpport(port_no))
+    return switch
+
+
+def _link(src, src_port_no, dst, dst_port_no):
+    return switches.Link(
+        switches.Port(src, ofproto_v1_3, _ofpport(src_port_no)),
+        switches.Port(dst, ofproto_v1_3, _ofpport(dst_port_no)))
+
+
+class TestNetworkMonitor(unittest.TestCase):
+    """ Test case for reduce_t NetworkMonitor.get_changes
+    """
+
+    def setUp(self):
+        if network_monitor is None:
+            raise SkipTest('reduce_t is not importable')
+        self.monitor = network_monitor.NetworkMonitor()
+        for dpid in (1, 2):
+            self.monitor.switch_enter_handler(
+                event.EventSwitchEnter(_switch(dpid, [1, 2])))
+
+    def test_switch_enter(self):
+        eq_([('switch_enter', 1), ('access_port', 1),
+             ('switch_enter', 2), ('access_port', 2)],
+            self.monitor.get_changes(0))
+        eq_({1: [1, 2], 2: [1, 2]}, self.monitor.dpids_to_access_port)
+
+    def test_link(self):
+        version = self.monitor.version
+        self.monitor.link_add_handler(event.EventLinkAdd(_link(1, 1, 2, 1)))
+        eq_([('link_add', (1, 2)), ('access_port', 1), ('access_port', 2)],
+            self.monitor.get_changes(version))
+        eq_([], self.monitor.get_changes(self.monitor.version))
+
+        # the same link again changes nothing
+        version = self.monitor.version
+        self.monitor.link_add_handler(event.EventLinkAdd(_link(1, 1, 2, 1)))
+        eq_(version, self.monitor.version)
+
+        self.monitor.link_delete_handler(
+            event.EventLinkDelete(_link(1, 1, 2, 1)))
+        eq_([('link_delete', (1, 2)), ('access_port', 1),
+             ('access_port', 2)],
+            self.monitor.get_changes(version))
+        eq_({1: [1, 2], 2: [1, 2]}, self.monitor.dpids_to_access_port)
+
+    def test_switch_leave(self):
+        self.monitor.link_add_handler(event.EventLinkAdd(_link(1, 1, 2, 1)))
+        version = self.monitor.version
+        self.monitor.switch_leave_handler(
+            event.EventSwitchLeave(_switch(2, [1, 2])))
+        eq_([('link_delete', (1, 2)), ('access_port', 1),
+             ('access_port', 2), ('switch_leave', 2)],
+            self.monitor.get_changes(version))
+        eq_(set([1]), self.monitor.dpids)
+
+    def test_change_log_overflow(self):
+        self.monitor.change_log = network_monitor.deque(
+            self.monitor.change_log, maxlen=2)
+        version = self.monitor.version
+        eq_([('switch_enter', 2), ('access_port', 2)],
+            self.monitor.get_changes(version - 2))
+        # the older changes are not in the log any more
+        eq_(None, self.monitor.get_changes(version - 3))
+        eq_(None, self.monitor.get_changes(0))
@@ -0,0 +1,148 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+import json
+import unittest
+from nose.tools import eq_
+from nose.tools import raises
+from webob import Request
+
+from ryu.app import ofctl_rest
+from ryu.app.wsgi import WSGIApplication
+from ryu.controller import dpset
+from ryu.controller import ofp_event
+from ryu.lib import hub
+from ryu.lib import ofctl_v1_3
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_0
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+
+
+class _Datapath(ofproto_protocol.ProtocolDesc):
+    # replies to a flow stats request with the parts through
+    # RestStatsApi.stats_reply_handler, from another thread as the
+    # switch does
+    def __init__(self, version, dpid, parts):
+        super(_Datapath, self).__init__(version)
+        self.id = dpid
+        self.parts = parts
+        self.xid = 0
+        self.app = None
+
+    def set_xid(self, msg):
+        self.xid += 1
+        msg.set_xid(self.xid)
+
+    def send_msg(self, msg):
+        hub.spawn(self._reply, msg.xid)
+
+    def _reply(self, xid):
+        ofp = self.ofproto
+        ofpp = self.ofproto_parser
+        for i, part in enumerate(self.parts):
+            reply = ofpp.OFPFlowStatsReply(self, body=part)
+            reply.xid = xid
+            reply.flags = 0
+            if i < len(self.parts) - 1:
+                reply.flags = ofp.OFPMPF_REPLY_MORE
+            self.app.stats_reply_handler(
+                ofp_event.EventOFPFlowStatsReply(reply))
+
+
+class Test_ofctl_rest(unittest.TestCase):
+    """ Test case for ofctl_rest
+    """
+
+    def setUp(self):
+        self.wsgi = WSGIApplication()
+        self.dpset = dpset.DPSet()
+        self.app = ofctl_rest.RestStatsApi(dpset=self.dpset, wsgi=self.wsgi)
+
+    def _add_datapath(self, version, dpid, parts=()):
+        dp = _Datapath(version, dpid, parts)
+        dp.app = self.app
+        self.dpset.dps[dpid] = dp
+        return dp
+
+    def _flow_stats(self, priority):
+        ofp = ofproto_v1_3
+        ofpp = ofproto_v1_3_parser
+        inst = [ofpp.OFPInstructionActions(
+            ofp.OFPIT_APPLY_ACTIONS, [ofpp.OFPActionOutput(1)])]
+        return ofpp.OFPFlowStats(
+            table_id=0, duration_sec=1, duration_nsec=2,
+            priority=priority, idle_timeout=0, hard_timeout=0, flags=0,
+            cookie=0, packet_count=3, byte_count=4,
+            match=ofpp.OFPMatch(in_port=priority), instructions=inst,
+            length=0)
+
+    def _get(self, path):
+        return Request.blank(path).get_response(self.wsgi)
+
+    def test_get_flow_stats_stream(self):
+        parts = [[self._flow_stats(1), self._flow_stats(2)], [],
+                 [self._flow_stats(3)]]
+        parts += [[self._flow_stats(i)] for i in range(4, 20)]
+        self._add_datapath(ofproto_v1_3.OFP_VERSION, 1, parts)
+
+        res = self._get('/stats/flow/1/stream')
+        eq_(200, res.status_int)
+        eq_('application/json', res.content_type)
+        body = json.loads(res.body.decode('utf-8'))
+        eq_(list(range(1, 20)),
+            [f['match']['in_port'] for f in body['1']])
+        eq_({}, self.app.waiters[1])
+
+    def test_get_flow_stats_stream_match(self):
+        self._add_datapath(ofproto_v1_3.OFP_VERSION, 1,
+                           [[self._flow_stats(1)]])
+        req = Request.blank('/stats/flow/1/stream',
+                            POST=b'{"match": {"in_port": 1}}')
+        res = req.get_response(self.wsgi)
+        eq_(200, res.status_int)
+        eq_([1], [f['match']['in_port']
+                  for f in json.loads(res.body.decode('utf-8'))['1']])
+
+    def test_get_flow_stats_stream_empty(self):
+        self._add_datapath(ofproto_v1_3.OFP_VERSION, 1, [[]])
+        res = self._get('/stats/flow/1/stream')
+        eq_({'1': []}, json.loads(res.body.decode('utf-8')))
+
+    def test_get_flow_stats_stream_unsupported(self):
+        # the stream is for OpenFlow 1.3 only
+        self._add_datapath(ofproto_v1_0.OFP_VERSION, 1)
+        eq_(501, self._get('/stats/flow/1/stream').status_int)
+
+    def test_get_flow_stats_stream_not_found(self):
+        eq_(404, self._get('/stats/flow/1/stream').status_int)
+        eq_(400, self._get('/stats/flow/x/stream').status_int)
+
+    @raises(ofctl_v1_3.StatsReplyOverflow)
+    def test_get_flow_stats_stream_slow_consumer(self):
+        parts = [[self._flow_stats(i)] for i in range(1, 20)]
+        self._add_datapath(ofproto_v1_3.OFP_VERSION, 1, parts)
+        with mock.patch.object(ofctl_v1_3, 'DEFAULT_TIMEOUT', 0.05):
+            res = self._get('/stats/flow/1/stream')
+            eq_(200, res.status_int)
+            # the parts queued before the consumer stalled are still
+            # sent, the error is raised in place of the rest
+            for _chunk in res.app_iter:
+                hub.sleep(0.2)
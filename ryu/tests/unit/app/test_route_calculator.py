@@ -0,0 +1,75 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+
+from ryu.app.reduce_t.route_calculator import RouteCalculator
+
+
+def _links(*pairs):
+    links = set()
+    for (src, dst) in pairs:
+        links.add((src, dst))
+        links.add((dst, src))
+    return links
+
+
+class TestRouteCalculator(unittest.TestCase):
+    """ Test case for reduce_t RouteCalculator.update
+    """
+
+    def setUp(self):
+        # 1 - 2 - 3 - 4 - 5 - 6, hosts on 1 and 6
+        self.links = _links((1, 2), (2, 3), (3, 4), (4, 5), (5, 6))
+        self.access_ports = {1: [1], 2: [], 3: [], 4: [], 5: [], 6: [1]}
+        self.calc = RouteCalculator()
+        self.changed = self.calc.update(self.links, self.access_ports)
+
+    def test_initial(self):
+        eq_(set([(1, 6), (6, 1)]), self.changed)
+        eq_([1, 2, 3, 4, 5, 6], self.calc.path_table[(1, 6)])
+        eq_([6, 5, 4, 3, 2, 1], self.calc.route_table[(6, 1)])
+        eq_([], self.calc.pre_path_table[(1, 6)])
+
+    def test_link_add(self):
+        # a shortcut 2 - 5
+        changed = self.calc.update(self.links | _links((2, 5)),
+                                   self.access_ports)
+        eq_(set([(1, 6), (6, 1)]), changed)
+        eq_([1, 2, 5, 6], self.calc.route_table[(1, 6)])
+        # too short for an mpls path
+        eq_([], self.calc.path_table[(1, 6)])
+        eq_([1, 2, 3, 4, 5, 6], self.calc.pre_path_table[(1, 6)])
+
+    def test_link_add_unaffected(self):
+        changed = self.calc.update(self.links | _links((3, 7)),
+                                   self.access_ports)
+        eq_(set(), changed)
+        eq_({}, self.calc.pre_path_table)
+
+    def test_link_delete(self):
+        changed = self.calc.update(self.links - _links((3, 4)),
+                                   self.access_ports)
+        eq_(set([(1, 6), (6, 1)]), changed)
+        eq_([], self.calc.route_table[(1, 6)])
+        eq_([], self.calc.path_table[(1, 6)])
+        eq_([6, 5, 4, 3, 2, 1], self.calc.pre_path_table[(6, 1)])
+
+        # and back
+        changed = self.calc.update(self.links, self.access_ports)
+        eq_(set([(1, 6), (6, 1)]), changed)
+        eq_([1, 2, 3, 4, 5, 6], self.calc.path_table[(1, 6)])
+        eq_([], self.calc.pre_path_table[(1, 6)])
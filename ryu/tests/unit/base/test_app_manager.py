@@ -0,0 +1,193 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import logging
+
+from nose.tools import eq_
+
+from ryu.base import app_manager
+from ryu.controller import event
+from ryu.controller.handler import (
+    set_ev_cls,
+    CONFIG_DISPATCHER,
+    MAIN_DISPATCHER,
+)
+from ryu.lib import hub
+
+
+LOG = logging.getLogger('test_app_manager')
+
+
+class _Event(event.EventBase):
+    pass
+
+
+class _OtherEvent(event.EventBase):
+    pass
+
+
+class _App(app_manager.RyuApp):
+    @set_ev_cls(_Event, MAIN_DISPATCHER)
+    def main_handler(self, ev):
+        pass
+
+    @set_ev_cls(_Event)
+    def any_handler(self, ev):
+        pass
+
+
+class _BatchApp(app_manager.RyuApp):
+    def __init__(self, *args, **kwargs):
+        super(_BatchApp, self).__init__(*args, **kwargs)
+        self.received = []
+
+    @set_ev_cls(_Event, MAIN_DISPATCHER)
+    def single_handler(self, ev):
+        self.received.append(('single', ev))
+
+    @set_ev_cls([_Event, _OtherEvent], MAIN_DISPATCHER, batch=True)
+    def batch_handler(self, evs):
+        self.received.append(('batch', evs))
+
+
+class Test_RyuApp(unittest.TestCase):
+    """ Test case for app_manager.RyuApp
+    """
+
+    def setUp(self):
+        self.app = _App()
+        self.app.register_handler(_Event, self.app.main_handler)
+        self.app.register_handler(_Event, self.app.any_handler)
+        self.ev = _Event()
+
+    def test_get_handlers(self):
+        eq_((self.app.main_handler, self.app.any_handler),
+            self.app.get_handlers(self.ev))
+        eq_((self.app.main_handler, self.app.any_handler),
+            self.app.get_handlers(self.ev, MAIN_DISPATCHER))
+        eq_((self.app.any_handler, ),
+            self.app.get_handlers(self.ev, CONFIG_DISPATCHER))
+
+    def test_get_handlers_register(self):
+        eq_((self.app.any_handler, ),
+            self.app.get_handlers(self.ev, CONFIG_DISPATCHER))
+
+        def _handler(ev):
+            pass
+
+        self.app.register_handler(_Event, _handler)
+        eq_((self.app.any_handler, _handler),
+            self.app.get_handlers(self.ev, CONFIG_DISPATCHER))
+
+        self.app.unregister_handler(_Event, self.app.any_handler)
+        eq_((_handler, ),
+            self.app.get_handlers(self.ev, CONFIG_DISPATCHER))
+
+    def test_get_observers(self):
+        self.app.register_observer(_Event, 'main_app', [MAIN_DISPATCHER])
+        self.app.register_observer(_Event, 'any_app')
+        eq_(set(['main_app', 'any_app']),
+            set(self.app.get_observers(self.ev, MAIN_DISPATCHER)))
+        eq_(('any_app', ),
+            self.app.get_observers(self.ev, CONFIG_DISPATCHER))
+
+        self.app.register_observer(_Event, 'config_app', [CONFIG_DISPATCHER])
+        eq_(set(['any_app', 'config_app']),
+            set(self.app.get_observers(self.ev, CONFIG_DISPATCHER)))
+
+        self.app.unregister_observer(_Event, 'any_app')
+        eq_(('config_app', ),
+            self.app.get_observers(self.ev, CONFIG_DISPATCHER))
+
+        self.app.unregister_observer_all_event('config_app')
+        eq_((), self.app.get_observers(self.ev, CONFIG_DISPATCHER))
+
+
+class Test_RyuApp_batch(unittest.TestCase):
+    """ Test case for batch event delivery of app_manager.RyuApp
+    """
+
+    def setUp(self):
+        self.app = _BatchApp()
+        self.app.register_handler(_Event, self.app.single_handler)
+        self.app.register_handler(_Event, self.app.batch_handler)
+        self.app.register_handler(_OtherEvent, self.app.batch_handler)
+
+    def _run_event_loop(self):
+        self.app.is_active = False
+        self.app._event_loop()
+
+    def test_single_event(self):
+        ev = _Event()
+        self.app._send_event(ev, MAIN_DISPATCHER)
+        self._run_event_loop()
+        eq_([('single', ev), ('batch', [ev])], self.app.received)
+
+    def test_batch(self):
+        ev1 = _Event()
+        ev2 = _Event()
+        ev3 = _OtherEvent()
+        ev4 = _Event()
+        self.app._send_events([ev1, ev2, ev3, ev4], MAIN_DISPATCHER)
+        self._run_event_loop()
+        eq_([('single', ev1), ('single', ev2), ('batch', [ev1, ev2]),
+             ('batch', [ev3]),
+             ('single', ev4), ('batch', [ev4])],
+            self.app.received)
+
+    def test_bound(self):
+        # a batch counts as many events as it has against the bound
+        self.app.events = app_manager._EventQueue(4)
+        sent = []
+
+        def _send():
+            for i in range(3):
+                self.app._send_events([_Event(), _Event(), _Event()],
+                                      MAIN_DISPATCHER)
+                sent.append(i)
+
+        thread = hub.spawn(_send)
+        hub.sleep(0)
+        eq_([0, 1], sent)
+        eq_(6, self.app.events.qsize())
+        self.app.events.get()
+        hub.joinall([thread])
+        eq_([0, 1, 2], sent)
+        eq_(6, self.app.events.qsize())
+
+    def test_batch_state(self):
+        self.app._send_events([_Event(), _OtherEvent()], CONFIG_DISPATCHER)
+        self._run_event_loop()
+        eq_([], self.app.received)
+
+    def test_send_events_to_observers(self):
+        self.app.register_observer(_Event, 'app1')
+        self.app.register_observer(_OtherEvent, 'app1')
+        self.app.register_observer(_Event, 'app2', [CONFIG_DISPATCHER])
+        self.app.register_observer(_OtherEvent, 'app2')
+        ev1 = _Event()
+        ev2 = _OtherEvent()
+        ev3 = _Event()
+
+        sent = {}
+
+        def _send_events(name, evs, state=None):
+            eq_(MAIN_DISPATCHER, state)
+            sent[name] = evs
+
+        self.app.send_events = _send_events
+        self.app.send_events_to_observers([ev1, ev2, ev3], MAIN_DISPATCHER)
+        eq_({'app1': [ev1, ev2, ev3], 'app2': [ev2]}, sent)
@@ -31,6 +31,7 @@ import random
 from ryu.base import app_manager  # To suppress cyclic import
 from ryu.controller import controller
 from ryu.controller import handler
+from ryu.controller import shard
 from ryu.ofproto import ofproto_v1_3_parser
 from ryu.ofproto import ofproto_v1_2_parser
 from ryu.ofproto import ofproto_v1_0_parser
@@ -80,17 +81,36 @@ class Test_Datapath(unittest.TestCase):
     def test_ports_accessibility_v10(self):
         self._test_ports_accessibility(ofproto_v1_0_parser, 0)
 
-    @mock.patch("ryu.base.app_manager", spec=app_manager)
-    def test_recv_loop(self, app_manager_mock):
-        # Prepare test data
-        test_messages = [
-            "4-6-ofp_features_reply.packet",
-            "4-14-ofp_echo_reply.packet",
-            "4-14-ofp_echo_reply.packet",
-            "4-4-ofp_packet_in.packet",
-            "4-14-ofp_echo_reply.packet",
-            "4-14-ofp_echo_reply.packet",
-        ]
+    def test_send_loop_coalesce(self):
+        with mock.patch('ryu.controller.controller.Datapath.set_state'):
+            sock_mock = mock.Mock()
+            addr_mock = mock.Mock()
+            dp = controller.Datapath(sock_mock, addr_mock)
+
+            bufs = [b'\x04\x00\x00\x08\x00\x00\x00\x01',
+                    bytearray(b'\x04\x02\x00\x08\x00\x00\x00\x02'),
+                    b'\x04\x14\x00\x08\x00\x00\x00\x03']
+            for buf in bufs:
+                dp.send(buf)
+            self.assertEqual(24, dp.send_q_bytes)
+
+            # Stop after the first write.
+            def _sendall(buf):
+                dp.send_active = False
+            sock_mock.sendall.side_effect = _sendall
+
+            dp._send_loop()
+
+            sock_mock.sendall.assert_called_once_with(
+                bytearray().join(bufs))
+            self.assertEqual(0, dp.send_q_bytes)
+            self.assertEqual(24, dp.send_stats['bytes'])
+            self.assertEqual(3, dp.send_stats['messages'])
+            self.assertEqual(1, dp.send_stats['batches'])
+            self.assertEqual(0.0, dp.send_stats['blocked_time'])
+
+    def _test_recv_loop(self, app_manager_mock, test_messages,
+                        max_recv_size=None):
         this_dir = os.path.dirname(sys.modules[__name__].__file__)
         packet_data_dir = os.path.join(this_dir, '../../packet_data/of13')
         json_dir = os.path.join(this_dir, '../ofproto/json/of13')
@@ -109,19 +129,28 @@ class Test_Datapath(unittest.TestCase):
         class SocketMock(mock.MagicMock):
             buf = bytearray()
             random = None
+            max_size = None
 
             def recv(self, bufsize):
+                if self.max_size is not None:
+                    bufsize = min(bufsize, self.max_size)
                 size = self.random.randint(1, bufsize)
                 out = self.buf[:size]
                 self.buf = self.buf[size:]
                 return out
 
+            def recv_into(self, buf):
+                out = self.recv(len(buf))
+                buf[:len(out)] = out
+                return len(out)
+
         # Prepare mock
         ofp_brick_mock = mock.MagicMock(spec=app_manager.RyuApp)
         app_manager_mock.lookup_service_brick.return_value = ofp_brick_mock
         sock_mock = SocketMock()
         sock_mock.buf = packet_buf
         sock_mock.random = random.Random('Ryu SDN Framework')
+        sock_mock.max_size = max_recv_size
         addr_mock = mock.MagicMock()
 
         # Prepare test target
@@ -134,12 +163,108 @@ class Test_Datapath(unittest.TestCase):
 
         # Assert calls
         output_json = list()
-        for call in ofp_brick_mock.send_event_to_observers.call_args_list:
+        for call in ofp_brick_mock.send_events_to_observers.call_args_list:
             args, kwargs = call
-            ev, state = args
-            if not hasattr(ev, 'msg'):
-                continue
-            output_json.append(ev.msg.to_jsondict())
+            evs, state = args
+            for ev in evs:
+                output_json.append(ev.msg.to_jsondict())
             self.assertEqual(state, handler.MAIN_DISPATCHER)
             self.assertEqual(kwargs, {})
         self.assertEqual(expected_json, output_json)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_recv_loop(self, app_manager_mock):
+        # Prepare test data
+        test_messages = [
+            "4-6-ofp_features_reply.packet",
+            "4-14-ofp_echo_reply.packet",
+            "4-14-ofp_echo_reply.packet",
+            "4-4-ofp_packet_in.packet",
+            "4-14-ofp_echo_reply.packet",
+            "4-14-ofp_echo_reply.packet",
+        ]
+        self._test_recv_loop(app_manager_mock, test_messages)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_recv_loop_small_reads(self, app_manager_mock):
+        # Split messages at arbitrary points, including inside headers.
+        test_messages = [
+            "4-4-ofp_packet_in.packet",
+            "4-14-ofp_echo_reply.packet",
+            "4-12-ofp_flow_stats_reply.packet",
+        ] * 4
+        self._test_recv_loop(app_manager_mock, test_messages,
+                             max_recv_size=7)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_recv_loop_long_stream(self, app_manager_mock):
+        # The stream is longer than the receive buffer, so partial
+        # messages are moved to the front of the buffer several times.
+        test_messages = [
+            "4-4-ofp_packet_in.packet",
+            "4-12-ofp_flow_stats_reply.packet",
+            "4-14-ofp_echo_reply.packet",
+        ] * 300
+        self._test_recv_loop(app_manager_mock, test_messages,
+                             max_recv_size=1500)
+
+    def _test_shard(self, app_manager_mock, local, take_over=False):
+        this_dir = os.path.dirname(sys.modules[__name__].__file__)
+        packet_data_dir = os.path.join(this_dir, '../../packet_data/of13')
+        packet_buf = b''
+        for msg in ["4-6-ofp_features_reply.packet",
+                    "4-14-ofp_echo_reply.packet"]:
+            packet_buf += open(os.path.join(packet_data_dir, msg),
+                               'rb').read()
+        dpid = ofproto_v1_3_parser.OFPSwitchFeatures.parser(
+            None, 4, 6, 32, 0, packet_buf).datapath_id
+        index = shard.owner(dpid, 2)
+        if not local:
+            index = 1 - index
+
+        ofp_brick_mock = mock.MagicMock(spec=app_manager.RyuApp)
+        app_manager_mock.lookup_service_brick.return_value = ofp_brick_mock
+        sock_mock = mock.MagicMock()
+        if take_over:
+            sock_mock.recv_into.return_value = 0
+        else:
+            def _recv_into(buf):
+                buf[:len(packet_buf)] = packet_buf
+                sock_mock.recv_into.side_effect = None
+                sock_mock.recv_into.return_value = 0
+                return len(packet_buf)
+            sock_mock.recv_into.side_effect = _recv_into
+
+        dp = controller.Datapath(sock_mock, mock.MagicMock())
+        if take_over:
+            dp.take_over(ofproto_v1_3_parser.ofproto.OFP_VERSION, packet_buf)
+        else:
+            dp.set_version(ofproto_v1_3_parser.ofproto.OFP_VERSION)
+            dp.set_state(handler.CONFIG_DISPATCHER)
+        ofp_brick_mock.reset_mock()
+
+        with mock.patch.multiple(shard, _num_workers=2, _worker_index=index,
+                                 hand_off=mock.DEFAULT) as shard_mock:
+            dp._recv_loop()
+        return dpid, packet_buf, shard_mock['hand_off'], ofp_brick_mock
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_recv_loop_hand_off(self, app_manager_mock):
+        dpid, packet_buf, hand_off, ofp_brick_mock = self._test_shard(
+            app_manager_mock, local=False)
+        hand_off.assert_called_once_with(
+            mock.ANY, mock.ANY, dpid,
+            ofproto_v1_3_parser.ofproto.OFP_VERSION, packet_buf)
+        self.assertFalse(ofp_brick_mock.send_events_to_observers.called)
+
+    @mock.patch("ryu.base.app_manager", spec=app_manager)
+    def test_recv_loop_take_over(self, app_manager_mock):
+        dpid, packet_buf, hand_off, ofp_brick_mock = self._test_shard(
+            app_manager_mock, local=True, take_over=True)
+        self.assertFalse(hand_off.called)
+        evs = [ev for call in
+               ofp_brick_mock.send_events_to_observers.call_args_list
+               for ev in call[0][0]]
+        self.assertEqual(['EventOFPSwitchFeatures', 'EventOFPEchoReply'],
+                         [ev.__class__.__name__ for ev in evs])
+        self.assertEqual(dpid, evs[0].msg.datapath_id)
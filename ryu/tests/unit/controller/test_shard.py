@@ -0,0 +1,167 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+import collections
+import pickle
+import socket
+import unittest
+import logging
+
+from nose.tools import eq_, ok_
+
+from ryu.base import app_manager
+from ryu.controller import shard
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import event
+from ryu.topology import switches
+
+
+LOG = logging.getLogger('test_shard')
+
+
+def _ofpport(port_no):
+    return ofproto_v1_3_parser.OFPPort(
+        port_no=port_no, hw_addr='00:00:00:00:00:%02x' % port_no,
+        config=0, state=0, curr=0, advertised=0, supported=0, peer=0,
+        curr_speed=0, max_speed=0, name=b'eth%d' % port_no)
+
+
+class _Datapath(object):
+    ofproto = ofproto_v1_3
+
+    def __init__(self, dpid):
+        self.id = dpid
+
+
+def _switches_app():
+    # RyuApp.__init__() looks up RyuApp in app_manager, which is another
+    # class than the base of Switches once app_manager is reloaded, as
+    # test_manager does
+    ryu_app = [kls for kls in switches.Switches.__mro__
+               if kls.__name__ == 'RyuApp'][0]
+    with mock.patch.object(app_manager, 'RyuApp', ryu_app):
+        return switches.Switches()
+
+
+class Test_shard(unittest.TestCase):
+    """ Test case for ryu.controller.shard
+    """
+
+    def test_owner(self):
+        owners = collections.Counter(shard.owner(dpid, 4)
+                                     for dpid in range(1, 201))
+        eq_(set([0, 1, 2, 3]), set(owners))
+        for count in owners.values():
+            ok_(30 <= count <= 70, owners)
+        eq_(shard.owner(0x123456789, 4), shard.owner(0x123456789, 4))
+
+    def test_is_local_datapath_disabled(self):
+        ok_(not shard.enabled())
+        ok_(shard.is_primary())
+        ok_(shard.is_local_datapath(1))
+
+    def test_supported(self):
+        eq_(hasattr(socket.socket, 'sendmsg'), shard.supported())
+        with mock.patch.object(socket, 'socket', object):
+            ok_(not shard.supported())
+
+    def test_channel(self):
+        a, b = shard._channel_pair()
+        try:
+            shard._send(a, ('event', 'switches', [1, 2]))
+            eq_((('event', 'switches', [1, 2]), None), shard._recv(b))
+
+            a.close()
+            eq_((None, None), shard._recv(b))
+        finally:
+            a.close()
+            b.close()
+
+    def test_channel_fd(self):
+        a, b = shard._channel_pair()
+        s1, s2 = socket.socketpair()
+        try:
+            shard._send(a, ('adopt', ()), s1.fileno())
+            s1.close()
+            record, fd = shard._recv(b)
+            eq_(('adopt', ()), record)
+            ok_(fd is not None)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM, 0, fd)
+            sock.sendall(b'hello')
+            eq_(b'hello', s2.recv(5))
+            sock.close()
+        finally:
+            for s in (a, b, s1, s2):
+                s.close()
+
+    def test_pickle_switch(self):
+        switch = switches.Switch(_Datapath(1))
+        switch.add_port(_ofpport(1))
+
+        ev = pickle.loads(pickle.dumps(event.EventSwitchEnter(switch)))
+        eq_(1, ev.switch.dp.id)
+        eq_(ofproto_v1_3, ev.switch.dp.ofproto)
+        eq_(switch.ports, ev.switch.ports)
+        ok_(ev.switch.ports[0].is_live())
+        ok_(not ev.switch.ports[0].is_reserved())
+
+    def _switch_request(self, app, dpid=None):
+        with mock.patch.object(app, 'reply_to_request') as reply:
+            app.switch_request_handler(event.EventSwitchRequest(dpid))
+        _req, rep = reply.call_args[0]
+        return sorted(switch.dp.id for switch in rep.switches)
+
+    def test_remote_switches(self):
+        # dpid 1 is served by this worker, and the others by the other
+        local = 1
+        remote = [dpid for dpid in range(2, 100)
+                  if shard.owner(dpid, 2) != shard.owner(local, 2)][:2]
+
+        app = _switches_app()
+        dp = _Datapath(local)
+        dp.ports = {1: _ofpport(1)}
+        app._register(dp)
+
+        with mock.patch.object(shard, '_num_workers', 2), \
+                mock.patch.object(shard, '_worker_index',
+                                  shard.owner(local, 2)):
+            # as forwarded by the other worker
+            for dpid in [local] + remote:
+                switch = switches.Switch(_Datapath(dpid))
+                switch.add_port(_ofpport(1))
+                ev = pickle.loads(pickle.dumps(event.EventSwitchEnter(switch)))
+                app.remote_switch_enter_handler(ev)
+            eq_(remote, sorted(app.remote_switches))
+            eq_([local] + remote, self._switch_request(app))
+            eq_([remote[0]], self._switch_request(app, remote[0]))
+
+            port = switches.Port(remote[0], ofproto_v1_3, _ofpport(2))
+            app.remote_port_handler(event.EventPortAdd(port))
+            eq_([1, 2], [p.port_no
+                         for p in app.remote_switches[remote[0]].ports])
+            app.remote_port_handler(event.EventPortDelete(port))
+            eq_([1], [p.port_no
+                      for p in app.remote_switches[remote[0]].ports])
+
+            app.remote_switch_leave_handler(
+                event.EventSwitchLeave(app.remote_switches[remote[1]]))
+            eq_([local, remote[0]], self._switch_request(app))
+            eq_([], self._switch_request(app, remote[1]))
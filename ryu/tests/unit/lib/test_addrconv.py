@@ -15,7 +15,9 @@
 # limitations under the License.
 
 import unittest
-from nose.tools import eq_
+from nose.tools import eq_, raises
+
+import netaddr
 
 from ryu.lib import addrconv
 
@@ -54,3 +56,29 @@ class Test_addrconv(unittest.TestCase):
     def test_mac(self):
         self._test_conv(addrconv.mac, 'f2:0b:a4:01:0a:23',
                         b'\xf2\x0b\xa4\x01\x0a\x23')
+
+    def test_mac_other_formats(self):
+        # left to netaddr
+        eq_(b'\xf2\x0b\xa4\x01\x0a\x23',
+            addrconv.mac.text_to_bin('F2-0B-A4-01-0A-23'))
+        eq_(b'\xf2\x0b\xa4\x01\x0a\x23',
+            addrconv.mac.text_to_bin('f20b.a401.0a23'))
+
+    @raises(netaddr.AddrFormatError)
+    def test_ipv4_invalid(self):
+        addrconv.ipv4.text_to_bin('192.0.2.256')
+
+    @raises(netaddr.AddrFormatError)
+    def test_mac_invalid(self):
+        addrconv.mac.text_to_bin('f2:0b:a4:01:0a:zz')
+
+    @raises(RuntimeError)
+    def test_format_converter_error(self):
+        # only the errors of the text not in the format fall back to
+        # netaddr
+        def _parse(text):
+            raise RuntimeError(text)
+        conv = addrconv._FormatConverter(
+            netaddr.IPAddress, netaddr.strategy.ipv4, '%d.%d.%d.%d', _parse,
+            version=4)
+        conv.text_to_bin('192.0.2.1')
@@ -15,10 +15,12 @@
 
 # vim: tabstop=4 shiftwidth=4 softtabstop=4
 
+import itertools
 import unittest
 import logging
 from nose.tools import *
 
+from ryu.lib import hub
 from ryu.lib import ofctl_v1_3
 from ryu.ofproto import ofproto_v1_3, ofproto_v1_3_parser
 from ryu.ofproto import ofproto_protocol
@@ -52,3 +54,120 @@ class Test_ofctl_v1_3(unittest.TestCase):
         act = insts.actions[0]
         ok_(isinstance(act, OFPActionPopMpls))
         eq_(act.ethertype, 0x0800)
+
+    def _stream_datapath(self, parts, waiters):
+        ofp = ofproto_v1_3
+        ofpp = ofproto_v1_3_parser
+
+        class _Datapath(ofproto_protocol.ProtocolDesc):
+            # replies with the parts from another thread as the switch
+            # does; the last one doesn't have OFPMPF_REPLY_MORE
+            id = 1
+
+            def __init__(self, parts, waiters):
+                super(_Datapath, self).__init__(ofp.OFP_VERSION)
+                self.parts = parts
+                self.waiters = waiters
+                self.sent = 0
+                self.thread = None
+
+            def set_xid(self, msg):
+                msg.set_xid(0)
+
+            def send_msg(self, msg):
+                self.sent = 0
+                self.thread = hub.spawn(self._reply, msg.xid)
+
+            def _reply(self, xid):
+                lock, msgs = self.waiters[self.id][xid]
+                for i, part in enumerate(self.parts):
+                    reply = ofpp.OFPFlowStatsReply(self, body=part)
+                    reply.xid = xid
+                    reply.flags = 0
+                    if i < len(self.parts) - 1:
+                        reply.flags = ofp.OFPMPF_REPLY_MORE
+                    msgs.append(reply)
+                    self.sent += 1
+                del self.waiters[self.id][xid]
+                lock.set()
+
+        return _Datapath(parts, waiters)
+
+    def _flow_stats(self, priority):
+        ofp = ofproto_v1_3
+        ofpp = ofproto_v1_3_parser
+        inst = [ofpp.OFPInstructionActions(
+            ofp.OFPIT_APPLY_ACTIONS, [ofpp.OFPActionOutput(1)])]
+        return ofpp.OFPFlowStats(
+            table_id=0, duration_sec=1, duration_nsec=2,
+            priority=priority, idle_timeout=0, hard_timeout=0, flags=0,
+            cookie=0, packet_count=3, byte_count=4,
+            match=ofpp.OFPMatch(in_port=priority), instructions=inst,
+            length=0)
+
+    def test_get_flow_stats_stream(self):
+        flow_stats = self._flow_stats
+        parts = [[flow_stats(1), flow_stats(2)], [], [flow_stats(3)]]
+        waiters = {}
+        dp = self._stream_datapath(parts, waiters)
+        flows = ofctl_v1_3.get_flow_stats(dp, waiters)
+
+        stream = ofctl_v1_3.get_flow_stats_stream(dp, waiters)
+        eq_([2, 0, 1], [len(f) for f in stream])
+        eq_({}, waiters[dp.id])
+        eq_(flows['1'],
+            sum(ofctl_v1_3.get_flow_stats_stream(dp, waiters), []))
+        eq_([1, 2, 3],
+            [f['match']['in_port'] for f in flows['1']])
+
+    def test_get_flow_stats_stream_bounded(self):
+        size = ofctl_v1_3.STATS_STREAM_QUEUE_SIZE
+        parts = [[self._flow_stats(i)] for i in range(size * 3)]
+        waiters = {}
+        dp = self._stream_datapath(parts, waiters)
+
+        received = 0
+        for flows in ofctl_v1_3.get_flow_stats_stream(dp, waiters):
+            received += 1
+            # the replier waits for the consumer; one part may be in
+            # its hands besides the queued ones
+            ok_(dp.sent - received <= size + 1)
+            hub.sleep(0)
+        eq_(len(parts), received)
+
+    def test_get_flow_stats_stream_close(self):
+        size = ofctl_v1_3.STATS_STREAM_QUEUE_SIZE
+        parts = [[self._flow_stats(i)] for i in range(size * 3)]
+        waiters = {}
+        dp = self._stream_datapath(parts, waiters)
+
+        stream = ofctl_v1_3.get_flow_stats_stream(dp, waiters)
+        next(stream)
+        hub.sleep(0)
+        stream.close()
+        # the replier isn't left blocked by the consumer gone
+        with hub.Timeout(ofctl_v1_3.DEFAULT_TIMEOUT / 2):
+            hub.joinall([dp.thread])
+        eq_(len(parts), dp.sent)
+        eq_({}, waiters[dp.id])
+
+    def test_get_flow_stats_stream_overflow(self):
+        size = ofctl_v1_3.STATS_STREAM_QUEUE_SIZE
+        parts = [[self._flow_stats(i)] for i in range(size * 3)]
+        waiters = {}
+        dp = self._stream_datapath(parts, waiters)
+
+        timeout = ofctl_v1_3.DEFAULT_TIMEOUT
+        ofctl_v1_3.DEFAULT_TIMEOUT = 0.05
+        try:
+            stream = ofctl_v1_3.get_flow_stats_stream(dp, waiters)
+            next(stream)
+            # stalls for longer than the replier waits
+            hub.joinall([dp.thread])
+            # the parts queued are still received, then the overflow
+            eq_(size, len(list(itertools.islice(stream, size))))
+            assert_raises(ofctl_v1_3.StatsReplyOverflow, next, stream)
+        finally:
+            ofctl_v1_3.DEFAULT_TIMEOUT = timeout
+        eq_(len(parts), dp.sent)
+        eq_({}, waiters[dp.id])
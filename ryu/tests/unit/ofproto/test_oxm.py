@@ -33,6 +33,18 @@ class Test_OXM(unittest.TestCase):
         (f, uv) = ofp.oxm_to_user(n, v, m)
         self.assertEqual(user, (f, uv))
 
+    def _test_encode_user(self, user, on_wire):
+        (f, uv) = user
+        buf = bytearray()
+        l = ofp.oxm_serialize_user(f, uv, buf, 0)
+        self.assertEqual(len(on_wire), l)
+        self.assertEqual(on_wire, buf)
+
+    def _test_decode_user(self, user, on_wire):
+        (f, uv, l) = ofp.oxm_parse_user(on_wire, 0)
+        self.assertEqual(len(on_wire), l)
+        self.assertEqual(user, (f, uv))
+
     def _test_encode_header(self, user, on_wire):
         f = user
         n = ofp.oxm_from_user_header(f)
@@ -49,6 +61,8 @@ class Test_OXM(unittest.TestCase):
     def _test(self, user, on_wire, header_bytes):
         self._test_encode(user, on_wire)
         self._test_decode(user, on_wire)
+        self._test_encode_user(user, on_wire)
+        self._test_decode_user(user, on_wire)
         if isinstance(user[1], tuple):  # has mask?
             return
         user_header = user[0]
@@ -186,3 +200,47 @@ class Test_OXM(unittest.TestCase):
             b'fugafuga'
         )
         self._test(user, on_wire, 4)
+
+    def test_basic_int_mask(self):
+        user = ('vlan_vid', (0x1234, 0x0ff0))
+        on_wire = (
+            b'\x80\x00\x0d\x04'
+            b'\x12\x34\x0f\xf0'
+        )
+        self._test(user, on_wire, 4)
+
+    def test_normalize_user(self):
+        self.assertEqual(('vlan_vid', (0x0230, 0x0ff0)),
+                         ofp.oxm_normalize_user('vlan_vid',
+                                                (0x1234, 0x0ff0)))
+        self.assertEqual(('vlan_pcp', 0x01),
+                         ofp.oxm_normalize_user('vlan_pcp', 0x101))
+        self.assertEqual(('ipv4_src', ('192.0.0.0', '255.255.0.0')),
+                         ofp.oxm_normalize_user('ipv4_src',
+                                                ('192.0.2.1',
+                                                 '255.255.0.0')))
+        self.assertEqual(('unknown', 1),
+                         ofp.oxm_normalize_user('unknown', 1))
+        # left as they are, as the generic conversions do
+        self.assertEqual(('vlan_vid', 'x'),
+                         ofp.oxm_normalize_user('vlan_vid', 'x'))
+        self.assertEqual(('vlan_vid', (1, 2, 3)),
+                         ofp.oxm_normalize_user('vlan_vid', (1, 2, 3)))
+
+    def test_addr_notations(self):
+        # the usual notation is converted by addrconv without netaddr,
+        # the others by netaddr, alike
+        for (f, usual, other) in [('ipv4_src', '192.0.2.1', u'192.0.2.1'),
+                                  ('eth_src', 'f2:0b:a4:01:0a:23',
+                                   'F2-0B-A4-01-0A-23')]:
+            self.assertEqual(ofp.oxm_from_user(f, usual),
+                             ofp.oxm_from_user(f, other))
+            (n, v, m) = ofp.oxm_from_user(f, other)
+            self.assertEqual((f, usual), ofp.oxm_to_user(n, v, m))
+
+    def test_int_truncate(self):
+        # same as type_desc.IntDescr.from_user()
+        (n, v, m) = ofp.oxm_from_user('vlan_pcp', 0x101)
+        self.assertEqual(b'\x01', v)
+        (n, v, m) = ofp.oxm_from_user('tcp_src', -1)
+        self.assertEqual(b'\xff\xff', v)
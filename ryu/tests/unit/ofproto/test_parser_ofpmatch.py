@@ -77,6 +77,56 @@ class Test_Parser_OFPMatch(unittest.TestCase):
             eq_(d[k], v)
 
 
+class Test_Parser_OFPMatch_lazy(unittest.TestCase):
+    """ Test case for the on demand decoding of a parsed OFPMatch
+    """
+
+    _ofpps = [ofproto_v1_2_parser, ofproto_v1_3_parser,
+              ofproto_v1_4_parser, ofproto_v1_5_parser]
+
+    def _parse(self, ofpp, **kwargs):
+        match = ofpp.OFPMatch(**kwargs)
+        buf = bytearray()
+        match.serialize(buf, 0)
+        return match, buf, ofpp.OFPMatch.parser(six.binary_type(buf), 0)
+
+    def test_getitem(self):
+        for ofpp in self._ofpps:
+            match, _buf, match2 = self._parse(
+                ofpp, in_port=1, eth_type=0x0800, ipv4_src='192.0.2.1')
+            eq_(1, match2['in_port'])
+            ok_('ipv4_src' in match2)
+            ok_('ipv4_dst' not in match2)
+            eq_(None, match2.get('ipv4_dst'))
+            self.assertRaises(KeyError, lambda: match2['ipv4_dst'])
+            # nothing has been decoded but the fields asked for
+            ok_('_fields2' not in match2.__dict__)
+
+            eq_(match.items(), match2.items())
+            ok_('_fields2' in match2.__dict__)
+            eq_('192.0.2.1', match2['ipv4_src'])
+
+    def test_serialize(self):
+        for ofpp in self._ofpps:
+            match, buf, match2 = self._parse(
+                ofpp, in_port=1, eth_dst=('00:00:00:00:00:01',
+                                          'ff:ff:ff:00:00:00'))
+            buf2 = bytearray()
+            match2.serialize(buf2, 0)
+            eq_(buf, buf2)
+            eq_(match.to_jsondict()['OFPMatch']['oxm_fields'],
+                match2.to_jsondict()['OFPMatch']['oxm_fields'])
+
+    def test_fields_compat(self):
+        for ofpp in [ofproto_v1_2_parser, ofproto_v1_3_parser]:
+            _match, _buf, match2 = self._parse(ofpp, in_port=1, vlan_pcp=3)
+            eq_([(ofpp.ofproto.OXM_OF_IN_PORT, 1),
+                 (ofpp.ofproto.OXM_OF_VLAN_PCP, 3)],
+                [(f.header, f.value) for f in match2.fields])
+            match2.append_field(ofpp.ofproto.OXM_OF_IN_PHY_PORT, 2)
+            eq_(3, len(match2.fields))
+
+
 def _add_tests():
     import functools
     import itertools
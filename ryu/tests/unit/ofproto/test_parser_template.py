@@ -0,0 +1,128 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.lib import addrconv
+from ryu.ofproto import ofproto_protocol
+from ryu.ofproto import ofproto_v1_0
+from ryu.ofproto import ofproto_v1_2
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_4
+from ryu.ofproto import ofproto_v1_5
+
+
+class Test_Parser_OFPFlowModTemplate(unittest.TestCase):
+    """ Test case for OFPFlowModTemplate
+    """
+
+    _versions = [ofproto_v1_2.OFP_VERSION, ofproto_v1_3.OFP_VERSION,
+                 ofproto_v1_4.OFP_VERSION, ofproto_v1_5.OFP_VERSION]
+
+    def _flow_mod(self, dp, ipv4_dst, eth_dst, port, **kwargs):
+        ofp = dp.ofproto
+        ofpp = dp.ofproto_parser
+        match = ofpp.OFPMatch(in_port=1, eth_type=0x0800, eth_dst=eth_dst,
+                              ipv4_dst=ipv4_dst)
+        actions = [ofpp.OFPActionSetField(ipv4_src='192.0.2.1'),
+                   ofpp.OFPActionOutput(port),
+                   ofpp.OFPActionOutput(ofp.OFPP_CONTROLLER)]
+        inst = [ofpp.OFPInstructionGotoTable(1),
+                ofpp.OFPInstructionActions(ofp.OFPIT_APPLY_ACTIONS,
+                                           actions)]
+        return ofpp.OFPFlowMod(dp, match=match, instructions=inst, **kwargs)
+
+    def _serialize(self, msg, xid):
+        msg.set_xid(xid)
+        msg.serialize()
+        return bytes(msg.buf)
+
+    def test_instantiate(self):
+        eth_dst = ('00:00:00:00:00:01', 'ff:ff:ff:ff:00:00')
+        for version in self._versions:
+            dp = ofproto_protocol.ProtocolDesc(version=version)
+            tmpl = dp.ofproto_parser.OFPFlowModTemplate(
+                self._flow_mod(dp, '10.0.0.1', eth_dst, 1))
+            eq_(self._serialize(self._flow_mod(dp, '10.0.0.1', eth_dst, 1),
+                                0),
+                tmpl.buf)
+
+            # the mask is applied to the value
+            eth_dst2 = ('00:00:00:01:00:02', 'ff:ff:ff:ff:ff:00')
+            msg = self._flow_mod(dp, '10.0.0.2', eth_dst2, 3, cookie=5,
+                                 idle_timeout=10, priority=100)
+            eq_(self._serialize(msg, 7),
+                bytes(tmpl.instantiate(xid=7, ipv4_dst='10.0.0.2',
+                                       eth_dst=eth_dst2, port=3,
+                                       cookie=5, idle_timeout=10,
+                                       priority=100)))
+
+            # the template is not changed by the instances
+            eq_(tmpl.buf, bytes(tmpl.instantiate(xid=0)))
+            ok_(tmpl.buf != bytes(tmpl.instantiate(xid=0, port=3)))
+
+    def test_xid(self):
+        for version in self._versions:
+            dp = ofproto_protocol.ProtocolDesc(version=version)
+            tmpl = dp.ofproto_parser.OFPFlowModTemplate(
+                self._flow_mod(dp, '10.0.0.1', '00:00:00:00:00:01', 1))
+            # a new xid for each instance unless given
+            for xid in (1, 2):
+                eq_(self._serialize(
+                    self._flow_mod(dp, '10.0.0.2', '00:00:00:00:00:01', 1),
+                    xid),
+                    bytes(tmpl.instantiate(ipv4_dst='10.0.0.2')))
+            eq_(tmpl.buf, bytes(tmpl.instantiate(xid=0)))
+
+    def test_exact_in_masked(self):
+        eth_dst = ('00:00:00:00:00:01', 'ff:ff:ff:ff:00:00')
+        for version in self._versions:
+            dp = ofproto_protocol.ProtocolDesc(version=version)
+            tmpl = dp.ofproto_parser.OFPFlowModTemplate(
+                self._flow_mod(dp, '10.0.0.1', eth_dst, 1))
+            # the mask of the template is not left for an exact value
+            eth_dst2 = ('00:00:00:01:00:02', 'ff:ff:ff:ff:ff:ff')
+            eq_(self._serialize(self._flow_mod(dp, '10.0.0.1', eth_dst2, 1),
+                                1),
+                bytes(tmpl.instantiate(xid=1, eth_dst=eth_dst2[0])))
+
+    def test_not_fit(self):
+        for version in self._versions:
+            dp = ofproto_protocol.ProtocolDesc(version=version)
+            tmpl = dp.ofproto_parser.OFPFlowModTemplate(
+                self._flow_mod(dp, '10.0.0.1', '00:00:00:00:00:01', 1))
+            self.assertRaises(ValueError, tmpl.instantiate,
+                              ipv4_dst=('10.0.0.0', '255.0.0.0'))
+            self.assertRaises(KeyError, tmpl.instantiate, ipv4_src='10.0.0.1')
+
+    def test_v10(self):
+        dp = ofproto_protocol.ProtocolDesc(version=ofproto_v1_0.OFP_VERSION)
+        ofp = dp.ofproto
+        ofpp = dp.ofproto_parser
+
+        def flow_mod(dl_dst, nw_dst, port):
+            match = ofpp.OFPMatch(dl_type=0x0800,
+                                  dl_dst=addrconv.mac.text_to_bin(dl_dst),
+                                  nw_dst=nw_dst)
+            actions = [ofpp.OFPActionOutput(port)]
+            return ofpp.OFPFlowMod(dp, match, 0, ofp.OFPFC_ADD,
+                                   actions=actions)
+
+        tmpl = ofpp.OFPFlowModTemplate(flow_mod('00:00:00:00:00:01', 1, 1))
+        dl_dst = addrconv.mac.text_to_bin('00:00:00:00:00:02')
+        eq_(self._serialize(flow_mod('00:00:00:00:00:02', 2, 3), 9),
+            bytes(tmpl.instantiate(xid=9, dl_dst=dl_dst, nw_dst=2, port=3)))
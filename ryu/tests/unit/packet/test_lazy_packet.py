@@ -0,0 +1,129 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.lib.packet import arp
+from ryu.lib.packet import dhcp
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import icmp
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import ipv6
+from ryu.lib.packet import packet
+from ryu.lib.packet import packet_base
+from ryu.lib.packet import tcp
+from ryu.lib.packet import udp
+from ryu.lib.packet import vlan
+
+
+class TestLazyPacket(unittest.TestCase):
+    """ Test case for packet.LazyPacket
+    """
+
+    _classes = [ethernet.ethernet, vlan._vlan, vlan.vlan, vlan.svlan,
+                arp.arp, ipv4.ipv4, ipv6.ipv6, icmp.icmp, tcp.tcp, udp.udp,
+                dhcp.dhcp, packet_base.PacketBase]
+
+    def _build(self, *protocols):
+        pkt = packet.Packet()
+        for p in protocols:
+            pkt.add_protocol(p)
+        pkt.serialize()
+        return bytes(pkt.data)
+
+    def _packets(self):
+        eth = ethernet.ethernet(ethertype=ether_types.ETH_TYPE_IP)
+        tcp_ = tcp.tcp(src_port=50001, dst_port=80, offset=6,
+                       option=b'\x02\x04\x05\xb4')
+        yield self._build(eth, ipv4.ipv4(proto=in_proto.IPPROTO_TCP), tcp_,
+                          b'payload')
+        # ipv4 options and ethernet padding behind the ipv4 packet
+        ip = ipv4.ipv4(header_length=6, proto=in_proto.IPPROTO_TCP,
+                       option=b'\x01\x01\x01\x00')
+        yield self._build(eth, ip, tcp.tcp()) + b'\x00' * 10
+        yield self._build(
+            ethernet.ethernet(ethertype=ether_types.ETH_TYPE_8021AD),
+            vlan.svlan(vid=10, ethertype=ether_types.ETH_TYPE_8021Q),
+            vlan.vlan(vid=20), ipv4.ipv4(proto=in_proto.IPPROTO_UDP),
+            udp.udp(src_port=1000, dst_port=2000), b'\x01' * 30)
+        # dhcp has no parser_header
+        yield self._build(eth, ipv4.ipv4(proto=in_proto.IPPROTO_UDP),
+                          udp.udp(src_port=68, dst_port=67),
+                          dhcp.dhcp(op=dhcp.DHCP_BOOT_REQUEST,
+                                    chaddr='aa:aa:aa:aa:aa:aa',
+                                    options=dhcp.options()))
+        yield self._build(eth, ipv4.ipv4(proto=in_proto.IPPROTO_ICMP),
+                          icmp.icmp(data=icmp.echo(data=b'ping')))
+        yield self._build(
+            ethernet.ethernet(ethertype=ether_types.ETH_TYPE_ARP), arp.arp())
+        yield self._build(
+            ethernet.ethernet(ethertype=ether_types.ETH_TYPE_IPV6),
+            ipv6.ipv6(nxt=in_proto.IPPROTO_TCP), tcp.tcp())
+
+    def _check(self, data):
+        pkt = packet.Packet(data)
+        lazy = packet.LazyPacket(data)
+        eq_(len(pkt), len(lazy))
+        for cls in self._classes:
+            eq_(str(pkt.get_protocols(cls)), str(lazy.get_protocols(cls)))
+            eq_(str(pkt.get_protocol(cls)), str(lazy.get_protocol(cls)))
+            eq_(cls in pkt, cls in lazy)
+        eq_(str(pkt.protocols), str(lazy.protocols))
+
+    def test_packets(self):
+        for data in self._packets():
+            self._check(data)
+            # truncated
+            for length in (10, 14, 20, 34, 40, 50):
+                self._check(data[:length])
+
+    def test_zero_length_header(self):
+        # Packet drops a header of length 0, which parser() returns
+        data = bytearray(next(self._packets()))
+        tcp_offset = ethernet.ethernet._MIN_LEN + ipv4.ipv4._MIN_LEN + 12
+        data[tcp_offset] = 0x00
+        self._check(bytes(data))
+        eq_(None, packet.LazyPacket(bytes(data)).get_protocol(tcp.tcp))
+        # ipv4 header length 0
+        data[ethernet.ethernet._MIN_LEN] = 0x40
+        self._check(bytes(data))
+
+    def test_lazy(self):
+        data = next(self._packets())
+        pkt = packet.LazyPacket(data)
+        ipv4_ = pkt.get_protocol(ipv4.ipv4)
+        eq_(ipv4.ipv4, ipv4_.__class__)
+        ok_(pkt.get_protocol(ipv4_) is ipv4_)
+        # not decoded
+        ok_(not isinstance(pkt._protocols[0], ethernet.ethernet))
+        ok_(not isinstance(pkt._protocols[2], tcp.tcp))
+        eq_(None, pkt.get_protocol(udp.udp))
+
+    def test_modify(self):
+        data = next(self._packets())
+        pkt = packet.LazyPacket(data)
+        eth = pkt.get_protocol(ethernet.ethernet)
+        del pkt[-1]
+        pkt.add_protocol(b'another payload')
+        eq_(4, len(pkt))
+        ok_(pkt[0] is eth)
+        eq_(b'another payload', pkt[-1])
+        pkt.protocols = [eth]
+        eq_([], pkt.get_protocols(tcp.tcp))
+        ok_(ethernet.ethernet in pkt)
@@ -0,0 +1,93 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.lib.packet import arp
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import icmp
+from ryu.lib.packet import icmpv6
+from ryu.lib.packet import in_proto
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import ipv6
+from ryu.lib.packet import lldp
+from ryu.lib.packet import mpls
+from ryu.lib.packet import packet
+from ryu.lib.packet import packet_utils
+from ryu.lib.packet import tcp
+from ryu.lib.packet import udp
+from ryu.lib.packet import vlan
+
+
+class TestPacketSerialize(unittest.TestCase):
+    """ Test case for Packet.serialize into a single buffer
+    """
+
+    def _protocols(self):
+        eth_ip = ethernet.ethernet(ethertype=ether_types.ETH_TYPE_IP)
+        yield [eth_ip, ipv4.ipv4(proto=in_proto.IPPROTO_TCP),
+               tcp.tcp(src_port=50001, dst_port=80,
+                       option=b'\x02\x04\x05\xb4\x01'),
+               b'payload']
+        yield [ethernet.ethernet(ethertype=ether_types.ETH_TYPE_8021Q),
+               vlan.vlan(vid=10, ethertype=ether_types.ETH_TYPE_MPLS),
+               mpls.mpls(label=100),
+               ipv4.ipv4(header_length=6, proto=in_proto.IPPROTO_UDP,
+                         option=b'\x01\x01\x01\x00'),
+               udp.udp(src_port=1000, dst_port=2000), b'\x01' * 31]
+        yield [eth_ip, ipv4.ipv4(proto=in_proto.IPPROTO_ICMP),
+               icmp.icmp(data=icmp.echo(1, 2, b'ping'))]
+        yield [ethernet.ethernet(ethertype=ether_types.ETH_TYPE_IPV6),
+               ipv6.ipv6(nxt=in_proto.IPPROTO_ICMPV6),
+               icmpv6.icmpv6(type_=icmpv6.ICMPV6_ECHO_REQUEST,
+                             data=icmpv6.echo(1, 2, b'ping'))]
+        yield [ethernet.ethernet(ethertype=ether_types.ETH_TYPE_ARP),
+               arp.arp()]
+        # lldp doesn't support serialize_into
+        tlvs = [lldp.ChassisID(subtype=lldp.ChassisID.SUB_LOCALLY_ASSIGNED,
+                               chassis_id=b'dpid:1'),
+                lldp.PortID(subtype=lldp.PortID.SUB_PORT_COMPONENT,
+                            port_id=b'1'),
+                lldp.TTL(ttl=120), lldp.End()]
+        yield [ethernet.ethernet(ethertype=ether_types.ETH_TYPE_LLDP),
+               lldp.lldp(tlvs)]
+
+    def test_serialize(self):
+        for protocols in self._protocols():
+            pkt = packet.Packet(protocols=copy.deepcopy(protocols))
+            pkt.serialize()
+            expected = packet.Packet(protocols=copy.deepcopy(protocols))
+            expected._serialize()
+            eq_(bytes(expected.data), bytes(pkt.data))
+            # the headers are updated as the legacy serializer does
+            eq_(str(expected.protocols), str(pkt.protocols))
+
+    def test_single_buffer(self):
+        protocols = next(self._protocols())
+        pkt = packet.Packet(protocols=protocols)
+        pkt.serialize()
+        ok_(isinstance(pkt.data, bytearray))
+        eq_(len(pkt.data), sum(p.serialize_len() for p in protocols[:-1]) +
+            len(protocols[-1]))
+
+    def test_checksum_memoryview(self):
+        for data in (b'\x45\x00\x00\x1c', b'\x01\x02\x03'):
+            buf = bytearray(b'\xff' + data)
+            eq_(packet_utils.checksum(data),
+                packet_utils.checksum(memoryview(buf)[1:]))
@@ -0,0 +1,87 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import struct
+import unittest
+from nose.tools import eq_
+
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import packet
+from ryu.lib.packet import packet_utils
+
+
+def _checksum(data):
+    # the checksum computed as RFC1071 describes
+    data = bytes(data)
+    if len(data) % 2:
+        data += b'\x00'
+    s = sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    while s >> 16:
+        s = (s & 0xffff) + (s >> 16)
+    return ~s & 0xffff
+
+
+class TestPacketUtils(unittest.TestCase):
+    """ Test case for packet_utils checksum
+    """
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def _data(self, length):
+        return bytearray(self.random.randint(0, 0xff) for _ in range(length))
+
+    def test_checksum(self):
+        for length in list(range(0, 20)) + [64, 1500, 9000, 9001]:
+            data = self._data(length)
+            eq_(_checksum(data), packet_utils.checksum(data))
+            eq_(_checksum(data), packet_utils.checksum(memoryview(data)))
+        for data in (b'\x00\x00', b'\xff\xff', b'\xff\xfe\x00\x01'):
+            eq_(_checksum(data), packet_utils.checksum(data))
+
+    def test_checksum_update(self):
+        for _i in range(1000):
+            data = self._data(self.random.randint(2, 64))
+            csum = packet_utils.checksum(data)
+            offset = self.random.randint(0, len(data) - 1)
+            length = self.random.randint(1, len(data) - offset)
+            old = data[offset:offset + length]
+            new = self._data(length)
+            data[offset:offset + length] = new
+            eq_(packet_utils.checksum(data),
+                packet_utils.checksum_update(csum, old, new, offset))
+
+    def test_checksum_update_rfc1624(self):
+        # RFC1624 4. Example, where 0x0000 is computed rather than 0xffff
+        eq_(0x0000, packet_utils.checksum_update(0xdd2f, b'\x55\x55',
+                                                 b'\x32\x85'))
+
+    def test_checksum_replace(self):
+        pkt = packet.Packet()
+        pkt.add_protocol(ethernet.ethernet())
+        pkt.add_protocol(ipv4.ipv4(ttl=64, src='192.0.2.1'))
+        pkt.serialize()
+        buf = bytearray(pkt.data)
+        # decrement TTL, and rewrite the source address
+        packet_utils.checksum_replace(buf, 24, 22, [buf[22] - 1])
+        packet_utils.checksum_replace(buf, 24, 26, b'\xc6\x33\x64\x01')
+
+        expected = packet.Packet()
+        expected.add_protocol(ethernet.ethernet())
+        expected.add_protocol(ipv4.ipv4(ttl=63, src='198.51.100.1'))
+        expected.serialize()
+        eq_(bytes(expected.data), bytes(buf))
@@ -0,0 +1,147 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.base import OrderedDict
+from ryu.services.protocols.bgp.info_base.base import PathAttrSet
+from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Path
+
+
+class _Peer(object):
+    version_num = 1
+
+
+# the attributes of other tests may be interned, so that those here are
+# of their own
+def _pattrs(as_path=(64496, ), med=None, nexthop='198.51.100.1'):
+    pattrs = OrderedDict()
+    pattrs[bgp.BGP_ATTR_TYPE_ORIGIN] = bgp.BGPPathAttributeOrigin(0)
+    pattrs[bgp.BGP_ATTR_TYPE_AS_PATH] = bgp.BGPPathAttributeAsPath(
+        [list(as_path)])
+    pattrs[bgp.BGP_ATTR_TYPE_NEXT_HOP] = bgp.BGPPathAttributeNextHop(nexthop)
+    if med is not None:
+        pattrs[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC] = \
+            bgp.BGPPathAttributeMultiExitDisc(med)
+    return pattrs
+
+
+class Test_PathAttrSet(unittest.TestCase):
+    """ Test case for info_base.base.PathAttrSet
+    """
+
+    def test_map(self):
+        pattrs = _pattrs(med=10)
+        s = PathAttrSet(pattrs)
+        eq_(list(pattrs.keys()), s.keys())
+        eq_(list(pattrs.keys()), list(s))
+        eq_(list(pattrs.values()), s.values())
+        eq_(list(pattrs.items()), s.items())
+        eq_(4, len(s))
+        ok_(s[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC] is
+            pattrs[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC])
+        ok_(bgp.BGP_ATTR_TYPE_ORIGIN in s)
+        ok_(bgp.BGP_ATTR_TYPE_LOCAL_PREF not in s)
+        eq_(None, s.get(bgp.BGP_ATTR_TYPE_LOCAL_PREF))
+        eq_(0, len(PathAttrSet()))
+
+    @raises(KeyError)
+    def test_map_missing(self):
+        PathAttrSet(_pattrs())[bgp.BGP_ATTR_TYPE_LOCAL_PREF]
+
+    def test_wire(self):
+        pattrs = _pattrs(med=10)
+        update = bgp.BGPUpdate(path_attributes=list(pattrs.values()))
+        # the path attributes of an UPDATE message without the lengths
+        # of the withdrawn routes and of the attributes before them
+        eq_(bytes(update.serialize()[bgp.BGPMessage._HDR_LEN + 4:]),
+            PathAttrSet(pattrs).wire)
+
+    def test_eq(self):
+        a = PathAttrSet(_pattrs(med=10))
+        b = PathAttrSet(_pattrs(med=10))
+        ok_(a is not b)
+        eq_(a, b)
+        ok_(not a != b)
+        eq_(hash(a), hash(b))
+
+        ok_(a != PathAttrSet(_pattrs(med=20)))
+        ok_(a != PathAttrSet(_pattrs()))
+        ok_(a != PathAttrSet(_pattrs(as_path=(64497, ), med=10)))
+        # not a mapping of the same items
+        ok_(a != _pattrs(med=10))
+
+    def test_eq_order(self):
+        # the attributes in another order are another set, as in
+        # another UPDATE message
+        pattrs = _pattrs()
+        reverse = OrderedDict(reversed(list(pattrs.items())))
+        ok_(PathAttrSet(pattrs) != PathAttrSet(reverse))
+
+    def test_intern(self):
+        a = PathAttrSet(_pattrs(med=10))
+        ok_(a.intern() is a)
+        ok_(a.intern() is a)
+        b = PathAttrSet(_pattrs(med=10))
+        ok_(b.intern() is a)
+        c = PathAttrSet(_pattrs(med=20)).intern()
+        ok_(c is not a)
+
+        # the interned sets share the attributes they have in common
+        for pattr_type in (bgp.BGP_ATTR_TYPE_ORIGIN, bgp.BGP_ATTR_TYPE_AS_PATH,
+                           bgp.BGP_ATTR_TYPE_NEXT_HOP):
+            ok_(a[pattr_type] is c[pattr_type])
+        ok_(a[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC] is not
+            c[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC])
+
+    def test_serialize_pattr(self):
+        s = PathAttrSet(_pattrs(med=10)).intern()
+        for attr in s.values():
+            eq_(bytes(attr.serialize()), PathAttrSet.serialize_pattr(attr))
+        attr = bgp.BGPPathAttributeLocalPref(100)
+        eq_(bytes(attr.serialize()), PathAttrSet.serialize_pattr(attr))
+
+    def test_from_wire(self):
+        a = PathAttrSet(_pattrs(med=30)).intern()
+        # the interned set, without parsing the attributes
+        ok_(PathAttrSet.from_wire(a.wire) is a)
+
+        b = PathAttrSet(_pattrs(med=40))
+        c = PathAttrSet.from_wire(b.wire)
+        eq_(b, c)
+        ok_(c is not b)
+        ok_(c.intern() is c)
+        eq_(40, c[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC].value)
+        ok_(PathAttrSet.from_wire(b.wire) is c)
+
+    def test_path(self):
+        pattrs = _pattrs(med=50)
+        nlri = bgp.IPAddrPrefix(24, '10.0.0.0')
+        a = Ipv4Path(_Peer(), nlri, 1, pattrs=pattrs, nexthop='198.51.100.1')
+        b = Ipv4Path(_Peer(), nlri, 1, pattrs=_pattrs(med=50),
+                     nexthop='198.51.100.1')
+        # the paths with the same attributes share the interned set
+        ok_(a.pathattr_set is b.pathattr_set)
+        ok_(a.pathattr_set.intern() is a.pathattr_set)
+        eq_(50, a.get_pattr(bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC).value)
+        # a copy which the caller may modify
+        copy = a.pathattr_map
+        eq_(PathAttrSet(pattrs), PathAttrSet(copy))
+        del copy[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC]
+        ok_(bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC in a.pathattr_set)
@@ -0,0 +1,180 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Table
+from ryu.services.protocols.bgp.info_base.ipv6 import Ipv6Table
+from ryu.services.protocols.bgp.info_base.rtc import RtcTable
+from ryu.services.protocols.bgp.info_base.vpnv4 import Vpnv4Table
+from ryu.services.protocols.bgp.info_base.vpnv6 import Vpnv6Table
+from ryu.services.protocols.bgp.info_base.vrf4 import Vrf4Table
+from ryu.services.protocols.bgp.info_base.vrf6 import Vrf6Table
+
+
+class _VrfConf(object):
+    route_dist = '65000:100'
+    import_maps = []
+
+
+class _CoreService(object):
+    importmap_manager = None
+
+
+def _vpnv4(prefix, route_dist='65000:100', labels=(100, )):
+    addr, length = prefix.split('/')
+    return bgp.LabelledVPNIPAddrPrefix(int(length), addr, list(labels),
+                                       route_dist=route_dist)
+
+
+def _vpnv6(prefix, route_dist='65000:100', labels=(100, )):
+    addr, length = prefix.split('/')
+    return bgp.LabelledVPNIP6AddrPrefix(int(length), addr, list(labels),
+                                        route_dist=route_dist)
+
+
+def _ipv4(prefix):
+    addr, length = prefix.split('/')
+    return bgp.IPAddrPrefix(int(length), addr)
+
+
+def _ipv6(prefix):
+    addr, length = prefix.split('/')
+    return bgp.IP6AddrPrefix(int(length), addr)
+
+
+# the route distinguisher 65000:100 packed
+_RD = b'\x00\x00\xfd\xe8\x00\x00\x00\x64'
+
+
+class Test_Table(unittest.TestCase):
+    """ Test case for the prefix lookups of info_base.base.Table
+    """
+
+    def _check(self, table, nlri, prefixes, longest, subtree):
+        # prefixes of the destinations in the order of their keys
+        for prefix in prefixes:
+            table._get_or_create_dest(nlri(prefix))
+        eq_([nlri(p).formatted_nlri_str for p in prefixes],
+            [d.nlri.formatted_nlri_str for d in table.values()])
+        for prefix in prefixes:
+            dest = table.get_dest_by_nlri(nlri(prefix))
+            eq_(nlri(prefix).formatted_nlri_str, dest.nlri.formatted_nlri_str)
+
+        for prefix, expected in longest:
+            dest = table.get_longest_match_dest(nlri(prefix))
+            if expected is None:
+                eq_(None, dest)
+            else:
+                eq_(nlri(expected).formatted_nlri_str,
+                    dest.nlri.formatted_nlri_str)
+
+        for prefix, expected in subtree:
+            eq_([nlri(p).formatted_nlri_str for p in expected],
+                [d.nlri.formatted_nlri_str
+                 for d in table.iter_dests_under(nlri(prefix))])
+
+        # the destinations by their formatted NLRI
+        eq_(sorted(nlri(p).formatted_nlri_str for p in prefixes),
+            sorted(table.destinations))
+
+        # deleted by the key of the NLRI
+        for prefix in prefixes:
+            ok_(table.delete_dest_by_nlri(nlri(prefix)) is not None)
+            eq_(None, table.get_dest_by_nlri(nlri(prefix)))
+        eq_([], list(table.values()))
+
+    def test_ipv4(self):
+        table = Ipv4Table(None, None)
+        eq_((b'\x0a\x01\x00\x00', 16), table._table_key(_ipv4('10.1.0.0/16')))
+        eq_((b'\x00\x00\x00\x00', 0), table._table_key(_ipv4('0.0.0.0/0')))
+        self._check(
+            table, _ipv4,
+            ['0.0.0.0/0', '10.0.0.0/8', '10.1.0.0/16', '10.1.1.0/24',
+             '192.168.0.0/16'],
+            [('10.1.1.1/32', '10.1.1.0/24'), ('10.2.0.1/32', '10.0.0.0/8'),
+             ('11.0.0.1/32', '0.0.0.0/0')],
+            [('10.0.0.0/8', ['10.0.0.0/8', '10.1.0.0/16', '10.1.1.0/24']),
+             ('10.1.0.0/24', []), ('192.168.0.0/16', ['192.168.0.0/16'])])
+
+    def test_ipv6(self):
+        table = Ipv6Table(None, None)
+        eq_((b'\x20\x01\x0d\xb8' + b'\x00' * 12, 32),
+            table._table_key(_ipv6('2001:db8::/32')))
+        self._check(
+            table, _ipv6,
+            ['2001:db8::/32', '2001:db8:0:1::/64', '2001:db9::/32'],
+            [('2001:db8:0:1::1/128', '2001:db8:0:1::/64'),
+             ('2001:db8:0:2::1/128', '2001:db8::/32'),
+             ('2001:dba::1/128', None)],
+            [('2001:db8::/31',
+              ['2001:db8::/32', '2001:db8:0:1::/64', '2001:db9::/32']),
+             ('2001:db8::/32', ['2001:db8::/32', '2001:db8:0:1::/64'])])
+
+    def test_vpnv4(self):
+        table = Vpnv4Table(None, None)
+        # the labels are not in the key
+        eq_((_RD + b'\x0a\x01\x00\x00', 80),
+            table._table_key(_vpnv4('10.1.0.0/16')))
+        eq_(table._table_key(_vpnv4('10.1.0.0/16')),
+            table._table_key(_vpnv4('10.1.0.0/16', labels=(200, 300))))
+
+        # the prefixes of another route distinguisher don't match
+        table._get_or_create_dest(_vpnv4('10.0.0.0/8', route_dist='65000:1'))
+        eq_(None, table.get_dest_by_nlri(_vpnv4('10.0.0.0/8')))
+        eq_(None, table.get_longest_match_dest(_vpnv4('10.0.0.1/32')))
+        table.delete_dest_by_nlri(_vpnv4('10.0.0.0/8', route_dist='65000:1'))
+
+        self._check(
+            table, _vpnv4,
+            ['10.0.0.0/8', '10.1.0.0/16', '192.168.0.0/16'],
+            [('10.1.0.1/32', '10.1.0.0/16'), ('10.2.0.1/32', '10.0.0.0/8'),
+             ('11.0.0.1/32', None)],
+            [('10.0.0.0/8', ['10.0.0.0/8', '10.1.0.0/16'])])
+
+    def test_vpnv6(self):
+        table = Vpnv6Table(None, None)
+        eq_((_RD + b'\x20\x01\x0d\xb8' + b'\x00' * 12, 96),
+            table._table_key(_vpnv6('2001:db8::/32')))
+        self._check(
+            table, _vpnv6,
+            ['2001:db8::/32', '2001:db8:0:1::/64'],
+            [('2001:db8:0:1::1/128', '2001:db8:0:1::/64'),
+             ('2001:db9::1/128', None)],
+            [('2001:db8::/32', ['2001:db8::/32', '2001:db8:0:1::/64'])])
+
+    def test_vrf(self):
+        table = Vrf4Table(_VrfConf(), _CoreService(), None)
+        eq_((b'\x0a\x01\x00\x00', 16), table._table_key(_ipv4('10.1.0.0/16')))
+        self._check(
+            table, _ipv4,
+            ['10.0.0.0/8', '10.1.0.0/16'],
+            [('10.1.0.1/32', '10.1.0.0/16'), ('11.0.0.1/32', None)],
+            [('10.0.0.0/8', ['10.0.0.0/8', '10.1.0.0/16'])])
+
+        table = Vrf6Table(_VrfConf(), _CoreService(), None)
+        eq_((b'\x20\x01\x0d\xb8' + b'\x00' * 12, 32),
+            table._table_key(_ipv6('2001:db8::/32')))
+
+    @raises(ValueError)
+    def test_no_radix_tree(self):
+        # the RT membership table keeps a dict
+        table = RtcTable(None, None)
+        table.get_longest_match_dest(
+            bgp.RouteTargetMembershipNLRI(65000, '65000:100'))
@@ -0,0 +1,116 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+from nose.tools import raises
+
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp import bgpspeaker
+from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Table
+from ryu.services.protocols.bgp.info_base.vpnv4 import Vpnv4Table
+from ryu.services.protocols.bgp.operator import internal_api
+from ryu.services.protocols.bgp.operator.internal_api import InternalApi
+from ryu.services.protocols.bgp.operator.internal_api import WrongParamError
+
+
+class Test_rib_lookup(unittest.TestCase):
+    """ Test case for BGPSpeaker.rib_lookup
+    """
+
+    @mock.patch.object(bgpspeaker.BGPSpeaker, '_init_signal_listeners')
+    @mock.patch.object(bgpspeaker.BGPSpeaker, '_core_start')
+    @mock.patch.object(bgpspeaker, 'call')
+    def test_rib_lookup(self, call, _core_start, _init_signal_listeners):
+        speaker = bgpspeaker.BGPSpeaker(65000, '192.0.2.1')
+        speaker.rib_lookup('10.0.0.1')
+        call.assert_called_with(
+            'operator.show', params=['rib', 'ipv4', '10.0.0.1', 'longest'],
+            format='json')
+        speaker.rib_lookup('65000:100:10.0.0.0/8', family='vpnv4',
+                           match='subtree', format='cli')
+        call.assert_called_with(
+            'operator.show',
+            params=['rib', 'vpnv4', '65000:100:10.0.0.0/8', 'subtree'],
+            format='cli')
+
+
+class Test_get_rib_routes_by_prefix(unittest.TestCase):
+    """ Test case for InternalApi.get_rib_routes_by_prefix
+    """
+
+    def setUp(self):
+        self.tables = {bgp.RF_IPv4_UC: Ipv4Table(None, None),
+                       bgp.RF_IPv4_VPN: Vpnv4Table(None, None)}
+        for prefix in ('10.0.0.0/8', '10.1.0.0/16', '192.168.0.0/16'):
+            addr, length = prefix.split('/')
+            self.tables[bgp.RF_IPv4_UC]._get_or_create_dest(
+                bgp.IPAddrPrefix(int(length), addr))
+            self.tables[bgp.RF_IPv4_VPN]._get_or_create_dest(
+                bgp.LabelledVPNIPAddrPrefix(int(length), addr, [100],
+                                            route_dist='65000:100'))
+
+        patcher = mock.patch.object(internal_api, 'CORE_MANAGER')
+        core_manager = patcher.start()
+        self.addCleanup(patcher.stop)
+        table_manager = core_manager.get_core_service().table_manager
+        table_manager.get_global_table_by_route_family.side_effect = \
+            self.tables.get
+        self.api = InternalApi()
+
+    def _prefixes(self, *args):
+        return [route['prefix']
+                for route in self.api.get_rib_routes_by_prefix(*args)]
+
+    def test_ipv4(self):
+        eq_(['10.1.0.0/16'], self._prefixes('ipv4', '10.1.0.0/16'))
+        eq_([], self._prefixes('ipv4', '10.1.0.0/17', 'exact'))
+        # an address without the prefix length
+        eq_(['10.1.0.0/16'], self._prefixes('ipv4', '10.1.2.3', 'longest'))
+        eq_(['10.0.0.0/8'], self._prefixes('ipv4', '10.2.0.0/16', 'longest'))
+        eq_([], self._prefixes('ipv4', '11.0.0.1', 'longest'))
+        eq_(['10.0.0.0/8', '10.1.0.0/16'],
+            self._prefixes('ipv4', '10.0.0.0/8', 'subtree'))
+        eq_(['10.0.0.0/8', '10.1.0.0/16', '192.168.0.0/16'],
+            self._prefixes('ipv4', '0.0.0.0/0', 'subtree'))
+
+    def test_vpnv4(self):
+        eq_(['65000:100:10.1.0.0/16'],
+            self._prefixes('vpnv4', '65000:100:10.1.0.0/16'))
+        eq_(['65000:100:10.1.0.0/16'],
+            self._prefixes('vpnv4', '65000:100:10.1.2.3', 'longest'))
+        eq_([], self._prefixes('vpnv4', '65000:200:10.1.2.3', 'longest'))
+        eq_(['65000:100:10.0.0.0/8', '65000:100:10.1.0.0/16'],
+            self._prefixes('vpnv4', '65000:100:10.0.0.0/8', 'subtree'))
+
+    def test_no_table(self):
+        eq_([], self._prefixes('ipv6', '2001:db8::/32', 'longest'))
+
+    @raises(WrongParamError)
+    def test_wrong_prefix(self):
+        self._prefixes('ipv4', '10.0.0.0/33')
+
+    @raises(WrongParamError)
+    def test_wrong_match(self):
+        self._prefixes('ipv4', '10.0.0.0/8', 'shortest')
+
+    @raises(WrongParamError)
+    def test_wrong_family(self):
+        self._prefixes('rtfilter', '10.0.0.0/8')
@@ -0,0 +1,180 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.plugins.skip import SkipTest
+from nose.tools import eq_
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.base import Sink
+from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Path
+from ryu.services.protocols.bgp.info_base.ipv6 import Ipv6Path
+from ryu.services.protocols.bgp.model import OutgoingRoute
+from ryu.services.protocols.bgp.signals.emit import BgpSignalBus
+from ryu.services.protocols.bgp.utils import bgp as bgp_utils
+
+try:
+    from ryu.services.protocols.bgp import peer
+except ImportError:
+    # peer imports modules of the package relatively, as Python 2 does
+    peer = None
+
+
+class _Protocol(object):
+    def __init__(self):
+        self.sent = []
+
+    def send(self, msg):
+        self.sent.append(msg)
+
+
+def _path(prefix, withdraw=False, as_path=(64496, )):
+    addr, length = prefix.split('/')
+    pattrs = {}
+    if not withdraw:
+        pattrs[bgp.BGP_ATTR_TYPE_ORIGIN] = bgp.BGPPathAttributeOrigin(0)
+        pattrs[bgp.BGP_ATTR_TYPE_AS_PATH] = bgp.BGPPathAttributeAsPath(
+            [list(as_path)])
+    if ':' in addr:
+        return Ipv6Path(None, bgp.IP6AddrPrefix(int(length), addr), 1,
+                        pattrs=pattrs, nexthop='2001:db8::1',
+                        is_withdraw=withdraw)
+    return Ipv4Path(None, bgp.IPAddrPrefix(int(length), addr), 1,
+                    pattrs=pattrs, nexthop='198.51.100.1',
+                    is_withdraw=withdraw)
+
+
+def _construct_update(outgoing_route):
+    # the UPDATE of a route alone, as Peer._construct_update() builds it
+    path = outgoing_route.path
+    if path.route_family == bgp.RF_IPv4_UC:
+        if path.is_withdraw:
+            return bgp.BGPUpdate(withdrawn_routes=[path.nlri])
+        pattrs = list(path.pathattr_map.values())
+        pattrs.append(bgp.BGPPathAttributeNextHop(path.nexthop))
+        return bgp.BGPUpdate(path_attributes=pattrs, nlri=[path.nlri])
+    if path.is_withdraw:
+        return bgp.BGPUpdate(path_attributes=[
+            bgp.BGPPathAttributeMpUnreachNLRI(
+                path.route_family.afi, path.route_family.safi, [path.nlri])])
+    return bgp.BGPUpdate(path_attributes=[
+        bgp.BGPPathAttributeMpReachNLRI(
+            path.route_family.afi, path.route_family.safi, path.nexthop,
+            [path.nlri])] + list(path.pathattr_map.values()))
+
+
+def _prefixes(update):
+    advertised = [n.prefix for n in update.nlri]
+    withdrawn = [n.prefix for n in update.withdrawn_routes]
+    mp_reach = update.get_path_attr(bgp.BGP_ATTR_TYPE_MP_REACH_NLRI)
+    if mp_reach:
+        advertised += [n.prefix for n in mp_reach.nlri]
+    mp_unreach = update.get_path_attr(bgp.BGP_ATTR_TYPE_MP_UNREACH_NLRI)
+    if mp_unreach:
+        withdrawn += [n.prefix for n in mp_unreach.withdrawn_routes]
+    return advertised, withdrawn
+
+
+class Test_Peer_outgoing_routes(unittest.TestCase):
+    """ Test case for the batches of outgoing routes of peer.Peer
+    """
+
+    def setUp(self):
+        if peer is None:
+            raise SkipTest('peer is not importable')
+        # a peer with what sending the routes needs, and without the filters
+        # and Adj-RIB-out, which _prepare_outgoing_route() handles
+        self.peer = peer.Peer.__new__(peer.Peer)
+        self.peer._protocol = _Protocol()
+        self.peer.state = peer.PeerState(self.peer, BgpSignalBus())
+        self.peer.outgoing_msg_list = Sink.OutgoingMsgList()
+        self.peer._prepare_outgoing_route = _construct_update
+
+    def _send(self, paths):
+        self.peer._send_outgoing_routes([OutgoingRoute(p) for p in paths])
+        return [_prefixes(update) for update in self.peer._protocol.sent]
+
+    def _count(self, name):
+        return self.peer.state.get_count(name)
+
+    def test_group(self):
+        eq_([(['10.0.1.0/24', '10.0.3.0/24'], []),
+             ([], ['10.0.2.0/24']),
+             (['10.0.4.0/24'], []),
+             (['2001:db8:1::/48', '2001:db8:3::/48'], []),
+             ([], ['2001:db8:2::/48', '2001:db8:4::/48'])],
+            self._send([
+                _path('10.0.1.0/24'), _path('10.0.2.0/24', withdraw=True),
+                _path('10.0.3.0/24'), _path('10.0.4.0/24', as_path=(64497, )),
+                _path('2001:db8:1::/48'),
+                _path('2001:db8:2::/48', withdraw=True),
+                _path('2001:db8:3::/48'),
+                _path('2001:db8:4::/48', withdraw=True)]))
+        eq_(5, self._count(peer.PeerCounterNames.SENT_UPDATES))
+        eq_(8, self._count(peer.PeerCounterNames.SENT_PREFIXES))
+
+    def test_last_of_prefix(self):
+        # the withdraw after the advertise is sent, and the advertise
+        # after the withdraw, in the place of the last one
+        eq_([([], ['10.0.1.0/24']),
+             (['10.0.3.0/24', '10.0.2.0/24'], []),
+             ([], ['2001:db8:1::/48'])],
+            self._send([
+                _path('10.0.1.0/24'), _path('10.0.2.0/24', withdraw=True),
+                _path('2001:db8:1::/48'),
+                _path('10.0.1.0/24', withdraw=True),
+                _path('10.0.3.0/24'), _path('10.0.2.0/24'),
+                _path('2001:db8:1::/48', withdraw=True)]))
+        eq_(4, self._count(peer.PeerCounterNames.SENT_PREFIXES))
+
+    def test_split(self):
+        self._send([_path('10.%d.%d.0/24' % (i >> 8, i & 0xff))
+                    for i in range(2500)])
+        eq_([1013, 1013, 474],
+            [len(update.nlri) for update in self.peer._protocol.sent])
+        eq_(3, self._count(peer.PeerCounterNames.SENT_UPDATES))
+        eq_(2500, self._count(peer.PeerCounterNames.SENT_PREFIXES))
+
+    def test_filtered(self):
+        prepare = self.peer._prepare_outgoing_route
+        self.peer._prepare_outgoing_route = lambda route: (
+            None if route.path.nlri.prefix == '10.0.2.0/24'
+            else prepare(route))
+        eq_([(['10.0.1.0/24', '10.0.3.0/24'], [])],
+            self._send([_path('10.0.1.0/24'), _path('10.0.2.0/24'),
+                        _path('10.0.3.0/24')]))
+
+    def test_take(self):
+        self.peer.OUTGOING_ROUTE_BATCH_SIZE = 3
+        routes = [OutgoingRoute(_path('10.0.%d.0/24' % i)) for i in range(5)]
+        eor = bgp_utils.create_end_of_rib_update()
+        for msg in routes[:4] + [eor, routes[4]]:
+            self.peer.outgoing_msg_list.append(msg)
+
+        # up to the batch size, with the first one taken already
+        taken = [self.peer.outgoing_msg_list.pop_first()]
+        self.peer._take_outgoing_routes(taken)
+        eq_(routes[:3], taken)
+
+        # up to the next message which is not a route, which stays queued
+        taken = []
+        self.peer._take_outgoing_routes(taken)
+        eq_([routes[3]], taken)
+        eq_(eor, self.peer.outgoing_msg_list.pop_first())
+
+        taken = []
+        self.peer._take_outgoing_routes(taken)
+        eq_([routes[4]], taken)
+        eq_(None, self.peer.outgoing_msg_list.pop_first())
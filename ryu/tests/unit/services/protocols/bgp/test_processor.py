@@ -0,0 +1,214 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp import processor
+from ryu.services.protocols.bgp.base import OrderedDict
+from ryu.services.protocols.bgp.info_base.ipv4 import IPv4Dest
+from ryu.services.protocols.bgp.info_base.ipv4 import Ipv4Path
+
+LOCAL_AS = 65000
+LOCAL_BGP_ID = '10.0.0.100'
+
+
+class _OpenMsg(object):
+
+    def __init__(self, bgp_identifier):
+        self.bgp_identifier = bgp_identifier
+
+
+class _Protocol(object):
+
+    def __init__(self, router_id):
+        self.recv_open_msg = _OpenMsg(router_id)
+        self.sent_open_msg = _OpenMsg(LOCAL_BGP_ID)
+
+
+class _Peer(object):
+    version_num = 1
+
+    def __init__(self, remote_as, router_id, ip_address):
+        self.remote_as = remote_as
+        self.protocol = _Protocol(router_id)
+        self.ip_address = ip_address
+
+
+class _CoreService(object):
+    asn = LOCAL_AS
+    router_id = LOCAL_BGP_ID
+
+
+class _Table(object):
+    route_family = bgp.RF_IPv4_UC
+    core_service = _CoreService()
+
+
+def _ibgp(router_id='10.0.0.1', ip_address='192.0.2.1'):
+    return _Peer(LOCAL_AS, router_id, ip_address)
+
+
+def _ebgp(remote_as=65001, router_id='10.0.0.1', ip_address='192.0.2.1'):
+    return _Peer(remote_as, router_id, ip_address)
+
+
+def _path(source, local_pref=None, as_path=(65001, ), origin=0, med=None):
+    pattrs = OrderedDict()
+    pattrs[bgp.BGP_ATTR_TYPE_ORIGIN] = bgp.BGPPathAttributeOrigin(origin)
+    pattrs[bgp.BGP_ATTR_TYPE_AS_PATH] = bgp.BGPPathAttributeAsPath(
+        [list(as_path)])
+    pattrs[bgp.BGP_ATTR_TYPE_NEXT_HOP] = bgp.BGPPathAttributeNextHop(
+        '192.0.2.1')
+    if med is not None:
+        pattrs[bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC] = \
+            bgp.BGPPathAttributeMultiExitDisc(med)
+    if local_pref is not None:
+        pattrs[bgp.BGP_ATTR_TYPE_LOCAL_PREF] = \
+            bgp.BGPPathAttributeLocalPref(local_pref)
+    return Ipv4Path(source, bgp.IPAddrPrefix(24, '10.1.0.0'), 1,
+                    pattrs=pattrs, nexthop='192.0.2.1')
+
+
+# (description, path1, path2, index of the best path or None, reason)
+_CASES = [
+    ('higher LOCAL_PREF',
+     _path(_ibgp(), local_pref=200), _path(_ibgp('10.0.0.0'), local_pref=100),
+     0, processor.BPR_LOCAL_PREF),
+    ('no LOCAL_PREF is the default one',
+     _path(_ibgp('10.0.0.0')), _path(_ibgp(), local_pref=150),
+     1, processor.BPR_LOCAL_PREF),
+    ('default LOCAL_PREF against the same value',
+     _path(_ibgp(), as_path=()), _path(_ibgp(), local_pref=100,
+                                       as_path=(65001, 65002)),
+     0, processor.BPR_ASPATH),
+    ('locally originated',
+     _path(_ibgp('10.0.0.0')), _path(None, as_path=(65001, 65002)),
+     1, processor.BPR_LOCAL_ORIGIN),
+    ('shorter AS_PATH',
+     _path(_ebgp(), as_path=(65001, 65003, 65004)),
+     _path(_ebgp(65002), as_path=(65002, 65003)),
+     1, processor.BPR_ASPATH),
+    ('ORIGIN IGP over EGP',
+     _path(_ebgp(), origin=1), _path(_ebgp(65002), origin=0),
+     1, processor.BPR_ORIGIN),
+    ('ORIGIN EGP over INCOMPLETE',
+     _path(_ebgp(), origin=1), _path(_ebgp(65002), origin=2),
+     0, processor.BPR_ORIGIN),
+    ('lower MED from the same neighbor AS',
+     _path(_ebgp(), med=20), _path(_ebgp(ip_address='192.0.2.2'), med=10),
+     1, processor.BPR_MED),
+    ('lower MED from different neighbor ASes',
+     _path(_ebgp(), med=10), _path(_ebgp(65002), med=20),
+     0, processor.BPR_MED),
+    ('no MED is MED 0',
+     _path(_ebgp(), med=5), _path(_ebgp(65002)),
+     1, processor.BPR_MED),
+    ('eBGP over iBGP',
+     _path(_ibgp('10.0.0.0')), _path(_ebgp('10.0.0.9')),
+     1, processor.BPR_ASN),
+    ('lower router ID between iBGP paths',
+     _path(_ibgp('10.0.0.2')), _path(_ibgp('10.0.0.1', '192.0.2.2')),
+     1, processor.BPR_ROUTER_ID),
+    ('router ID compared as a number',
+     _path(_ibgp('9.0.0.1')), _path(_ibgp('10.0.0.1', '192.0.2.2')),
+     0, processor.BPR_ROUTER_ID),
+    ('LOCAL_PREF before local origin',
+     _path(_ibgp('10.0.0.200')), _path(None, as_path=(65001, ),
+                                       local_pref=50),
+     0, processor.BPR_LOCAL_PREF),
+    ('router ID not compared between eBGP paths',
+     _path(_ebgp(router_id='10.0.0.2')),
+     _path(_ebgp(65002, router_id='10.0.0.1')),
+     None, processor.BPR_UNKNOWN),
+    ('same router ID from other peer IPs',
+     _path(_ibgp('10.0.0.1', '192.0.2.1')),
+     _path(_ibgp('10.0.0.1', '192.0.2.2')),
+     None, processor.BPR_UNKNOWN),
+]
+
+
+class Test_compute_best_path_key(unittest.TestCase):
+    """ Test case for the selection of the best path by
+    compute_best_path_key, against compute_best_path
+    """
+
+    def _key(self, path):
+        return processor.compute_best_path_key(LOCAL_AS, LOCAL_BGP_ID, path)
+
+    def _dest(self, paths):
+        dest = IPv4Dest(_Table(), paths[0].nlri)
+        dest._known_path_list = list(paths)
+        return dest
+
+    def _check(self, desc, path1, path2, best, reason):
+        paths = (path1, path2)
+        best_path, best_reason = processor.compute_best_path(
+            LOCAL_AS, path1, path2)
+        eq_(None if best is None else paths[best], best_path, desc)
+        eq_(reason, best_reason, desc)
+
+        key1 = self._key(path1)
+        key2 = self._key(path2)
+        if best is None:
+            ok_(key1 == key2, desc)
+        elif best == 0:
+            ok_(key1 > key2, desc)
+        else:
+            ok_(key2 > key1, desc)
+        eq_(reason, processor.compute_best_path_key_reason(
+            max(key1, key2), min(key1, key2)), desc)
+
+        # whatever the order of the paths, the first one wins a tie
+        for order in (paths, paths[::-1]):
+            dest = self._dest(order)
+            best_path, _reason = dest._compute_best_known_path()
+            eq_(order[0] if best is None else paths[best], best_path, desc)
+            dest._best_path = best_path
+            eq_(reason, dest.best_path_reason, desc)
+
+    def test_cases(self):
+        for case in _CASES:
+            self._check(*case)
+
+    def test_many_paths(self):
+        # the best of all, as compute_best_path selects comparing in turn
+        paths = [path for case in _CASES for path in case[1:3]
+                 if path.source is not None]
+        best_path = paths[0]
+        for path in paths[1:]:
+            new_best_path, _reason = processor.compute_best_path(
+                LOCAL_AS, best_path, path)
+            if new_best_path is not None:
+                best_path = new_best_path
+        dest = self._dest(paths)
+        eq_(best_path, dest._compute_best_known_path()[0])
+
+    def test_peer_down(self):
+        # the peer of an iBGP path has lost its session, and so its OPEN
+        # message, which has the router ID
+        down = _ibgp('10.0.0.1')
+        down.protocol = None
+        path1 = _path(down)
+        path2 = _path(_ibgp('10.0.0.2', '192.0.2.2'))
+        key1 = self._key(path1)
+        key2 = self._key(path2)
+        ok_(key2 > key1)
+        eq_(processor.BPR_ROUTER_ID,
+            processor.compute_best_path_key_reason(key2, key1))
+        path3 = _path(down, local_pref=200)
+        ok_(self._key(path3) > key2)
@@ -0,0 +1,442 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+try:
+    import mock  # Python 2
+except ImportError:
+    from unittest import mock  # Python 3
+
+import os
+import pickle
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ryu.lib import hub
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp import update_decoder
+from ryu.services.protocols.bgp.speaker import BgpProtocol
+from ryu.services.protocols.bgp.update_decoder import DecodedUpdate
+from ryu.services.protocols.bgp.update_decoder import UpdateDecoder
+
+_CHECK_ARGS = (65001, True, '192.0.2.254')
+
+
+def _update(nlri=(), withdrawn=(), mp_reach=None, mp_unreach=None,
+            as_path=(65001, ), med=10):
+    attrs = [bgp.BGPPathAttributeOrigin(0),
+             bgp.BGPPathAttributeAsPath([list(as_path)]),
+             bgp.BGPPathAttributeMultiExitDisc(med)]
+    if nlri:
+        attrs.append(bgp.BGPPathAttributeNextHop('192.0.2.1'))
+    if mp_reach is not None:
+        attrs.insert(0, mp_reach)
+    if mp_unreach is not None:
+        attrs.append(mp_unreach)
+    return bgp.BGPUpdate(
+        withdrawn_routes=[bgp.BGPWithdrawnRoute(24, p) for p in withdrawn],
+        path_attributes=attrs,
+        nlri=[bgp.BGPNLRI(24, p) for p in nlri])
+
+
+def _ipv6_reach(*prefixes, **kwargs):
+    return bgp.BGPPathAttributeMpReachNLRI(
+        bgp.addr_family.IP6, bgp.subaddr_family.UNICAST,
+        kwargs.get('next_hop', '2001:db8::1'),
+        [bgp.IP6AddrPrefix(64, p) for p in prefixes])
+
+
+def _vpnv4_reach(*prefixes):
+    return bgp.BGPPathAttributeMpReachNLRI(
+        bgp.addr_family.IP, bgp.subaddr_family.MPLS_VPN, '192.0.2.1',
+        [bgp.LabelledVPNIPAddrPrefix(24, p, route_dist='65000:1',
+                                     labels=[100])
+         for p in prefixes])
+
+
+def _ipv6_unreach(*prefixes):
+    return bgp.BGPPathAttributeMpUnreachNLRI(
+        bgp.addr_family.IP6, bgp.subaddr_family.UNICAST,
+        [bgp.IP6AddrPrefix(64, p) for p in prefixes])
+
+
+class Test_get_pathattr_set(unittest.TestCase):
+    """ Test case for update_decoder.get_pathattr_set
+    """
+
+    def test_ipv4(self):
+        a = update_decoder.get_pathattr_set(
+            _update(nlri=['10.0.0.0', '10.0.1.0']))
+        b = update_decoder.get_pathattr_set(_update(nlri=['10.0.2.0']))
+        ok_(a is b)
+        eq_([bgp.BGP_ATTR_TYPE_ORIGIN, bgp.BGP_ATTR_TYPE_AS_PATH,
+             bgp.BGP_ATTR_TYPE_MULTI_EXIT_DISC, bgp.BGP_ATTR_TYPE_NEXT_HOP],
+            a.keys())
+        c = update_decoder.get_pathattr_set(
+            _update(nlri=['10.0.2.0'], med=20))
+        ok_(a is not c)
+
+    def _check_mp(self, reach):
+        # the UPDATEs with the same attributes share a set whatever
+        # their NLRIs, and whatever they withdraw
+        a = update_decoder.get_pathattr_set(_update(mp_reach=reach[0]))
+        b = update_decoder.get_pathattr_set(
+            _update(mp_reach=reach[1],
+                    mp_unreach=_ipv6_unreach('2001:db8:ff::')))
+        ok_(a is b)
+        ok_(bgp.BGP_ATTR_TYPE_MP_UNREACH_NLRI not in a)
+        mp_reach = a[bgp.BGP_ATTR_TYPE_MP_REACH_NLRI]
+        eq_([], mp_reach.nlri)
+        eq_((reach[0].afi, reach[0].safi, reach[0].next_hop),
+            (mp_reach.afi, mp_reach.safi, mp_reach.next_hop))
+        # the NLRIs are still in the messages
+        eq_(2, len(reach[0].nlri))
+
+    def test_ipv6(self):
+        self._check_mp([_ipv6_reach('2001:db8:1::', '2001:db8:2::'),
+                        _ipv6_reach('2001:db8:3::')])
+
+    def test_vpnv4(self):
+        self._check_mp([_vpnv4_reach('10.0.0.0', '10.0.1.0'),
+                        _vpnv4_reach('10.0.2.0')])
+
+    def test_next_hop(self):
+        a = update_decoder.get_pathattr_set(
+            _update(mp_reach=_ipv6_reach('2001:db8:1::')))
+        b = update_decoder.get_pathattr_set(
+            _update(mp_reach=_ipv6_reach('2001:db8:1::',
+                                         next_hop='2001:db8::2')))
+        ok_(a is not b)
+
+
+def _data(update):
+    return bytes(update.serialize())
+
+
+def _keepalive():
+    return _data(bgp.BGPKeepAlive())
+
+
+def _bad_data():
+    data = bytearray(_data(_update(nlri=['10.0.0.0'])))
+    # the length of ORIGIN, the first attribute, longer than its value
+    data[bgp.BGPMessage._HDR_LEN + 6] = 2
+    return bytes(data)
+
+
+class Test_decode_updates(unittest.TestCase):
+    """ Test case for update_decoder.decode_updates and DecodedUpdate
+    """
+
+    def _decode(self, update, check_args=_CHECK_ARGS):
+        data = _data(update)
+        (result, ) = update_decoder.decode_updates([data], check_args)
+        # as sent back by a worker
+        result = pickle.loads(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        if isinstance(result, Exception):
+            return result
+        msg = DecodedUpdate.from_result(result)
+        # the same message
+        eq_(data, _data(msg))
+        return msg
+
+    def test_ipv4(self):
+        update = _update(nlri=['10.0.0.0', '10.0.1.0'],
+                         withdrawn=['10.0.2.0'])
+        msg = self._decode(update)
+        ok_(msg.checked)
+        eq_(['10.0.0.0', '10.0.1.0'], [n.addr for n in msg.nlri])
+        eq_(['10.0.2.0'], [r.addr for r in msg.withdrawn_routes])
+        ok_(msg.pathattr_set is update_decoder.get_pathattr_set(update))
+        ok_(msg.pathattr_set.intern() is msg.pathattr_set)
+        ok_(update_decoder.get_pathattr_set(msg) is msg.pathattr_set)
+
+    def test_mp(self):
+        update = _update(mp_reach=_vpnv4_reach('10.0.0.0', '10.0.1.0'),
+                         mp_unreach=_ipv6_unreach('2001:db8:ff::'))
+        msg = self._decode(update)
+        ok_(msg.checked)
+        mp_reach = msg.get_path_attr(bgp.BGP_ATTR_TYPE_MP_REACH_NLRI)
+        eq_(['10.0.0.0', '10.0.1.0'], [n.prefix.split('/')[0]
+                                       for n in mp_reach.nlri])
+        mp_unreach = msg.get_path_attr(bgp.BGP_ATTR_TYPE_MP_UNREACH_NLRI)
+        eq_(1, len(mp_unreach.withdrawn_routes))
+        eq_([], msg.pathattr_set[bgp.BGP_ATTR_TYPE_MP_REACH_NLRI].nlri)
+
+    def test_not_checked(self):
+        # the first AS isn't the one of the peer
+        msg = self._decode(_update(nlri=['10.0.0.0'], as_path=(65002, )))
+        ok_(not msg.checked)
+        # not checked against the first AS
+        msg = self._decode(_update(nlri=['10.0.0.0'], as_path=(65002, )),
+                           (65001, False, '192.0.2.254'))
+        ok_(msg.checked)
+
+    def test_error(self):
+        results = update_decoder.decode_updates(
+            [_data(_update(nlri=['10.0.0.0'])), _bad_data()], _CHECK_ARGS)
+        eq_(2, len(results))
+        ok_(isinstance(results[0], tuple))
+        ok_(isinstance(results[1], Exception))
+        pickle.loads(pickle.dumps(results[1], pickle.HIGHEST_PROTOCOL))
+
+
+class _Worker(object):
+    # decodes in this process, answering the batches in reverse order of
+    # submission, or never if not alive
+    workers = []
+
+    def __init__(self):
+        self.alive = True
+        self.batches = []
+        self.stopped = False
+        _Worker.workers.append(self)
+
+    def submit(self, batch):
+        self.batches.append(batch)
+
+    def answer(self):
+        for batch in reversed(self.batches):
+            batch.results = update_decoder.decode_updates(batch.datas,
+                                                          batch.check_args)
+            batch.event.set()
+            hub.sleep(0)
+        self.batches = []
+
+    def exit(self):
+        # as _Worker._recv_loop() does on EOF
+        self.alive = False
+        for batch in self.batches:
+            batch.event.set()
+        self.batches = []
+
+    def stop(self):
+        self.stopped = True
+
+
+class Test_UpdateDecoder(unittest.TestCase):
+    """ Test case for update_decoder.UpdateDecoder, with workers which
+    decode in this process
+    """
+
+    def setUp(self):
+        _Worker.workers = []
+        patchers = [mock.patch.object(update_decoder, '_Worker', _Worker),
+                    mock.patch.object(hub, 'is_patched', lambda _m: True),
+                    mock.patch.object(update_decoder, 'BATCH_BYTES', 100)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.decoder = UpdateDecoder(2)
+
+    def _msgs(self):
+        # a KEEPALIVE between UPDATEs of several batches
+        msgs = []
+        for i in range(8):
+            msgs.append((bgp.BGP_MSG_UPDATE,
+                         _data(_update(nlri=['10.0.%d.0' % i]))))
+            if i == 3:
+                msgs.append((bgp.BGP_MSG_KEEPALIVE, _keepalive()))
+        return msgs
+
+    def _decode(self, msgs):
+        # decodes msgs in another thread, which has submitted the batches
+        # when this returns
+        decoded = []
+
+        def _decode():
+            decoded.extend(self.decoder.decode(msgs, _CHECK_ARGS))
+        thread = hub.spawn(_decode)
+        hub.sleep(0)
+        return thread, decoded
+
+    def _check(self, msgs, decoded):
+        eq_(len(msgs), len(decoded))
+        for (ptype, data), msg in zip(msgs, decoded):
+            eq_(ptype, msg.type)
+            eq_(data, _data(msg))
+            eq_(ptype == bgp.BGP_MSG_UPDATE, isinstance(msg, DecodedUpdate))
+
+    def test_decode(self):
+        msgs = self._msgs()
+        thread, decoded = self._decode(msgs)
+        # the batches are sent up front
+        eq_(2, len(_Worker.workers))
+        ok_(all(len(w.batches) > 1 for w in _Worker.workers))
+        for worker in reversed(_Worker.workers):
+            worker.answer()
+        thread.wait()
+        # in order, though answered out of order
+        self._check(msgs, decoded)
+
+    def test_decode_error(self):
+        msgs = self._msgs()
+        msgs.insert(3, (bgp.BGP_MSG_UPDATE, _bad_data()))
+        decoded = []
+        errors = []
+
+        def _decode():
+            try:
+                for msg in self.decoder.decode(msgs, _CHECK_ARGS):
+                    decoded.append(msg)
+            except Exception as e:
+                errors.append(e)
+        thread = hub.spawn(_decode)
+        hub.sleep(0)
+        for worker in _Worker.workers:
+            worker.answer()
+        thread.wait()
+        # the messages before the error are handled, and the error is
+        # raised in its place
+        self._check(msgs[:3], decoded)
+        eq_(1, len(errors))
+
+    def test_worker_exit(self):
+        msgs = self._msgs()
+        thread, decoded = self._decode(msgs)
+        (first, second) = _Worker.workers
+        first.exit()
+        second.answer()
+        thread.wait()
+        # the batches of the worker exited are decoded here
+        self._check(msgs, decoded)
+
+        # and another worker is started in its place
+        thread, decoded = self._decode(msgs)
+        ok_(first.stopped)
+        eq_(3, len(_Worker.workers))
+        for worker in _Worker.workers[1:]:
+            worker.answer()
+        thread.wait()
+        self._check(msgs, decoded)
+
+    def test_worker_start_error(self):
+        msgs = self._msgs()
+        _Worker.workers[0].exit()
+        with mock.patch.object(update_decoder, '_Worker',
+                               mock.Mock(side_effect=OSError('EMFILE'))):
+            thread, decoded = self._decode(msgs)
+            _Worker.workers[1].answer()
+            thread.wait()
+            self._check(msgs, decoded)
+
+    @raises(RuntimeError)
+    def test_not_patched(self):
+        with mock.patch.object(hub, 'is_patched', lambda _m: False):
+            UpdateDecoder(1)
+
+
+class Test_record(unittest.TestCase):
+    """ Test case for the records between the workers and the main process
+    """
+
+    def test_record(self):
+        (recv_fd, send_fd) = os.pipe()
+        self.addCleanup(os.close, recv_fd)
+        try:
+            records = [([b'\x01' * 10], _CHECK_ARGS), [], {'a': 1}]
+            for record in records:
+                update_decoder._write_record(send_fd, record)
+        finally:
+            os.close(send_fd)
+        for record in records:
+            eq_(record, update_decoder._read_record(recv_fd))
+        self.assertRaises(EOFError, update_decoder._read_record, recv_fd)
+
+
+class _Socket(object):
+
+    def getpeername(self):
+        return ('192.0.2.1', 179)
+
+    def getsockname(self):
+        return ('192.0.2.254', 10179)
+
+    def setsockopt(self, *_args):
+        pass
+
+
+class _Peer(object):
+
+    def get_update_check_args(self):
+        return _CHECK_ARGS
+
+
+class Test_BgpProtocol_data_received(unittest.TestCase):
+    """ Test case for the framing of BgpProtocol._data_received
+    """
+
+    def _protocol(self, update_decoder=None):
+        protocol = BgpProtocol(_Socket(), None,
+                               update_decoder=update_decoder)
+        protocol._peer = _Peer()
+        protocol.received = []
+        protocol._handle_msg = protocol.received.append
+        return protocol
+
+    def _stream(self):
+        datas = [_data(_update(nlri=['10.0.%d.0' % i])) for i in range(3)]
+        datas.insert(1, _keepalive())
+        return datas
+
+    def test_chunks(self):
+        datas = self._stream()
+        stream = b''.join(datas)
+        for size in (1, 7, 19, 30, len(stream)):
+            protocol = self._protocol()
+            for i in range(0, len(stream), size):
+                protocol._data_received(stream[i:i + size])
+            eq_(datas, [_data(msg) for msg in protocol.received])
+            eq_(b'', protocol._recv_buff)
+
+    def test_partial(self):
+        datas = self._stream()
+        protocol = self._protocol()
+        protocol._data_received(datas[0] + datas[1][:5])
+        eq_(datas[:1], [_data(msg) for msg in protocol.received])
+        eq_(datas[1][:5], protocol._recv_buff)
+
+    def test_bad_header(self):
+        datas = self._stream()
+        bad = b'\x00' * 16 + datas[1][16:]
+        protocol = self._protocol()
+        # the messages before the bad one are handled before the error
+        self.assertRaises(bgp.NotSync, protocol._data_received,
+                          datas[0] + bad)
+        eq_(datas[:1], [_data(msg) for msg in protocol.received])
+
+    def test_bad_length(self):
+        datas = self._stream()
+        bad = bytearray(datas[1])
+        bad[17] = 5
+        protocol = self._protocol()
+        self.assertRaises(bgp.BadLen, protocol._data_received,
+                          datas[0] + bytes(bad))
+        eq_(datas[:1], [_data(msg) for msg in protocol.received])
+
+    def test_update_decoder(self):
+        decoder = mock.Mock()
+        decoder.decode.side_effect = lambda msgs, check_args: [
+            bgp.BGPMessage.parser(data)[0] for _ptype, data in msgs]
+        datas = self._stream()
+        protocol = self._protocol(decoder)
+        protocol._data_received(b''.join(datas) + datas[0][:5])
+        eq_(datas, [_data(msg) for msg in protocol.received])
+        ((msgs, check_args), _kwargs) = decoder.decode.call_args
+        eq_([(bgp.BGP_MSG_UPDATE, datas[0]), (bgp.BGP_MSG_KEEPALIVE, datas[1]),
+             (bgp.BGP_MSG_UPDATE, datas[2]), (bgp.BGP_MSG_UPDATE, datas[3])],
+            msgs)
+        eq_(_CHECK_ARGS, check_args)
@@ -0,0 +1,242 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.lib.packet import bgp
+from ryu.services.protocols.bgp.speaker import BGP_MAX_MSG_LEN
+from ryu.services.protocols.bgp.utils import bgp as bgp_utils
+
+
+def _attrs(as_path=(64496, ), nexthop='198.51.100.1'):
+    return [bgp.BGPPathAttributeOrigin(0),
+            bgp.BGPPathAttributeAsPath([list(as_path)]),
+            bgp.BGPPathAttributeNextHop(nexthop)]
+
+
+def _mp_attrs():
+    return [bgp.BGPPathAttributeOrigin(0),
+            bgp.BGPPathAttributeAsPath([[64496]])]
+
+
+def _ipv4(i, length=24):
+    return bgp.IPAddrPrefix(length, '10.%d.%d.0' % (i >> 8 & 0xff, i & 0xff))
+
+
+def _ipv6(i):
+    return bgp.IP6AddrPrefix(64, '2001:db8:%x:%x::' % (i >> 16, i & 0xffff))
+
+
+def _advertise(nlri, attrs=None):
+    return bgp.BGPUpdate(path_attributes=attrs or _attrs(), nlri=[nlri])
+
+
+def _withdraw(nlri):
+    return bgp.BGPUpdate(withdrawn_routes=[nlri])
+
+
+def _mp_advertise(nlri, nexthop='2001:db8::1', attrs=None):
+    mp_reach = bgp.BGPPathAttributeMpReachNLRI(
+        bgp.addr_family.IP6, bgp.subaddr_family.UNICAST, nexthop, [nlri])
+    return bgp.BGPUpdate(path_attributes=[mp_reach] + (attrs or _mp_attrs()))
+
+
+def _mp_withdraw(nlri):
+    mp_unreach = bgp.BGPPathAttributeMpUnreachNLRI(
+        bgp.addr_family.IP6, bgp.subaddr_family.UNICAST, [nlri])
+    return bgp.BGPUpdate(path_attributes=[mp_unreach])
+
+
+def _prefixes(update):
+    # prefixes advertised and withdrawn by update, which is parsed again
+    update = bgp.BGPMessage.parser(update.serialize())[0]
+    advertised = [n.prefix for n in update.nlri]
+    withdrawn = [n.prefix for n in update.withdrawn_routes]
+    mp_reach = update.get_path_attr(bgp.BGP_ATTR_TYPE_MP_REACH_NLRI)
+    if mp_reach:
+        advertised += [n.prefix for n in mp_reach.nlri]
+    mp_unreach = update.get_path_attr(bgp.BGP_ATTR_TYPE_MP_UNREACH_NLRI)
+    if mp_unreach:
+        withdrawn += [n.prefix for n in mp_unreach.withdrawn_routes]
+    return advertised, withdrawn
+
+
+class Test_update_pack_key(unittest.TestCase):
+    """ Test case for utils.bgp._update_pack_key
+    """
+
+    def test_nlri(self):
+        key, nlri = bgp_utils._update_pack_key(_advertise(_ipv4(1)))
+        eq_('nlri', key[0])
+        eq_('10.0.1.0/24', nlri.prefix)
+        # the same attributes, even of other objects, have the same key
+        eq_(key, bgp_utils._update_pack_key(_advertise(_ipv4(2)))[0])
+        ok_(key != bgp_utils._update_pack_key(
+            _advertise(_ipv4(1), _attrs(as_path=(64497, ))))[0])
+        ok_(key != bgp_utils._update_pack_key(
+            _advertise(_ipv4(1), _attrs(nexthop='198.51.100.2')))[0])
+
+    def test_withdrawn(self):
+        key, nlri = bgp_utils._update_pack_key(_withdraw(_ipv4(1)))
+        eq_(('withdrawn', ), key)
+        eq_('10.0.1.0/24', nlri.prefix)
+
+    def test_mp_reach(self):
+        key, nlri = bgp_utils._update_pack_key(_mp_advertise(_ipv6(1)))
+        eq_(('mp_reach', bgp.addr_family.IP6, bgp.subaddr_family.UNICAST,
+             '2001:db8::1'), key[:4])
+        eq_('2001:db8:0:1::/64', nlri.prefix)
+        eq_(key, bgp_utils._update_pack_key(_mp_advertise(_ipv6(2)))[0])
+        # the next hop is not in the other attributes
+        ok_(key != bgp_utils._update_pack_key(
+            _mp_advertise(_ipv6(1), nexthop='2001:db8::2'))[0])
+
+    def test_mp_unreach(self):
+        key, nlri = bgp_utils._update_pack_key(_mp_withdraw(_ipv6(1)))
+        eq_(('mp_unreach', bgp.addr_family.IP6, bgp.subaddr_family.UNICAST),
+            key)
+        eq_('2001:db8:0:1::/64', nlri.prefix)
+
+    def test_not_packed(self):
+        for update in (
+                # more than an NLRI
+                bgp.BGPUpdate(path_attributes=_attrs(),
+                              nlri=[_ipv4(1), _ipv4(2)]),
+                bgp.BGPUpdate(withdrawn_routes=[_ipv4(1), _ipv4(2)]),
+                # a withdraw with an advertise
+                bgp.BGPUpdate(withdrawn_routes=[_ipv4(1)],
+                              path_attributes=_attrs(), nlri=[_ipv4(2)]),
+                # MP_UNREACH_NLRI with other attributes
+                bgp.BGPUpdate(path_attributes=(
+                    _mp_withdraw(_ipv6(1)).path_attributes + _mp_attrs())),
+                # End-of-RIB
+                bgp_utils.create_end_of_rib_update()):
+            eq_((None, None), bgp_utils._update_pack_key(update))
+
+
+class Test_packed_update(unittest.TestCase):
+    """ Test case for utils.bgp._packed_update
+    """
+
+    def _check(self, update, nlris, advertised, withdrawn):
+        key, _nlri = bgp_utils._update_pack_key(update)
+        packed = bgp_utils._packed_update(key, update, nlris)
+        eq_((advertised, withdrawn), _prefixes(packed))
+        return packed
+
+    def test_nlri(self):
+        update = _advertise(_ipv4(1))
+        packed = self._check(update, [_ipv4(1), _ipv4(2)],
+                             ['10.0.1.0/24', '10.0.2.0/24'], [])
+        eq_(update.path_attributes, packed.path_attributes)
+
+    def test_withdrawn(self):
+        self._check(_withdraw(_ipv4(1)), [_ipv4(1), _ipv4(2)],
+                    [], ['10.0.1.0/24', '10.0.2.0/24'])
+
+    def test_mp_reach(self):
+        update = _mp_advertise(_ipv6(1))
+        packed = self._check(update, [_ipv6(1), _ipv6(2)],
+                             ['2001:db8:0:1::/64', '2001:db8:0:2::/64'], [])
+        # the other attributes in their order
+        eq_([bgp.BGP_ATTR_TYPE_MP_REACH_NLRI, bgp.BGP_ATTR_TYPE_ORIGIN,
+             bgp.BGP_ATTR_TYPE_AS_PATH],
+            [attr.type for attr in packed.path_attributes])
+        eq_('2001:db8::1', packed.path_attributes[0].next_hop)
+
+    def test_mp_unreach(self):
+        self._check(_mp_withdraw(_ipv6(1)), [_ipv6(1), _ipv6(2)],
+                    [], ['2001:db8:0:1::/64', '2001:db8:0:2::/64'])
+
+
+class Test_pack_updates(unittest.TestCase):
+    """ Test case for utils.bgp.pack_updates
+    """
+
+    def _pack(self, updates, max_len=BGP_MAX_MSG_LEN):
+        packed = bgp_utils.pack_updates(updates, max_len)
+        for update, num_nlri in packed:
+            advertised, withdrawn = _prefixes(update)
+            eq_(num_nlri, len(advertised) + len(withdrawn))
+            ok_(len(update.serialize()) <= max_len)
+        return packed
+
+    def test_group(self):
+        other = _attrs(as_path=(64497, ))
+        packed = self._pack([
+            _advertise(_ipv4(1)), _withdraw(_ipv4(2)),
+            _advertise(_ipv4(3), other), _advertise(_ipv4(4)),
+            _withdraw(_ipv4(5)), _advertise(_ipv4(6), other),
+            _mp_advertise(_ipv6(1)), _mp_withdraw(_ipv6(2)),
+            _mp_advertise(_ipv6(3), nexthop='2001:db8::2'),
+            _mp_advertise(_ipv6(4)), _mp_withdraw(_ipv6(5))])
+        # in the order of the first update of each group
+        eq_([(['10.0.1.0/24', '10.0.4.0/24'], []),
+             ([], ['10.0.2.0/24', '10.0.5.0/24']),
+             (['10.0.3.0/24', '10.0.6.0/24'], []),
+             (['2001:db8:0:1::/64', '2001:db8:0:4::/64'], []),
+             ([], ['2001:db8:0:2::/64', '2001:db8:0:5::/64']),
+             (['2001:db8:0:3::/64'], [])],
+            [_prefixes(update) for update, _num_nlri in packed])
+        eq_([2, 2, 2, 2, 2, 1], [num_nlri for _update, num_nlri in packed])
+
+    def test_single(self):
+        # sent as it is
+        update = _advertise(_ipv4(1))
+        eq_([(update, 1)], bgp_utils.pack_updates([update], BGP_MAX_MSG_LEN))
+
+    def test_not_packed(self):
+        eor = bgp_utils.create_end_of_rib_update()
+        update = bgp.BGPUpdate(path_attributes=_attrs(),
+                               nlri=[_ipv4(1), _ipv4(2)])
+        packed = self._pack([eor, _advertise(_ipv4(3)), update,
+                             _advertise(_ipv4(4))])
+        eq_([(eor, 0), (update, 2)], packed[:2])
+        eq_((['10.0.3.0/24', '10.0.4.0/24'], []), _prefixes(packed[2][0]))
+
+    def _check_split(self, updates, num_nlri):
+        packed = self._pack(updates)
+        eq_(num_nlri, [n for _update, n in packed])
+        lens = [len(update.serialize()) for update, _n in packed]
+        # full but for less than an NLRI more
+        nlri_len = len(updates[0].serialize()) - len(
+            bgp_utils._packed_update(
+                bgp_utils._update_pack_key(updates[0])[0], updates[0],
+                []).serialize())
+        for msg_len in lens[:-1]:
+            ok_(BGP_MAX_MSG_LEN - nlri_len - 1 <= msg_len <= BGP_MAX_MSG_LEN)
+        prefixes = []
+        for update, _n in packed:
+            advertised, withdrawn = _prefixes(update)
+            prefixes += advertised + withdrawn
+        eq_([nlri.prefix for nlri in
+             (bgp_utils._update_pack_key(u)[1] for u in updates)], prefixes)
+
+    def test_split(self):
+        # 4 bytes per /24 after 23 bytes of the header and lengths, 20 of
+        # the attributes and a byte spared for an extended length
+        self._check_split([_advertise(_ipv4(i)) for i in range(2500)],
+                          [1013, 1013, 474])
+        self._check_split([_withdraw(_ipv4(i)) for i in range(2500)],
+                          [1018, 1018, 464])
+
+    def test_split_mp(self):
+        # 9 bytes per /64, after 37 bytes of the attributes
+        self._check_split([_mp_advertise(_ipv6(i)) for i in range(1000)],
+                          [448, 448, 104])
+        self._check_split([_mp_withdraw(_ipv6(i)) for i in range(1000)],
+                          [451, 451, 98])
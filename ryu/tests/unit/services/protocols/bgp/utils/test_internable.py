@@ -0,0 +1,75 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gc
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+
+from ryu.services.protocols.bgp.utils.internable import Internable
+
+
+class _Value(Internable):
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+class Test_Internable(unittest.TestCase):
+    """ Test case for utils.internable.Internable
+    """
+
+    def setUp(self):
+        # a class of its own for each test, for the stats
+        class Value(_Value):
+            pass
+        self.cls = Value
+
+    def test_intern(self):
+        a = self.cls(1)
+        # the first copy is the canonical one
+        ok_(a.intern() is a)
+        # an interned object returns itself
+        ok_(a.intern() is a)
+        # an identical copy returns the canonical one
+        b = self.cls(1)
+        ok_(b.intern() is a)
+        c = self.cls(2)
+        ok_(c.intern() is c)
+        eq_({'inserted': 2, 'self': 1, 'found': 1},
+            self.cls.intern_stats().d)
+
+    def test_find_interned(self):
+        a = self.cls(1)
+        eq_(None, a.find_interned())
+        a.intern()
+        ok_(a.find_interned() is a)
+        ok_(self.cls(1).find_interned() is a)
+        eq_(None, self.cls(2).find_interned())
+
+    def test_collected(self):
+        a = self.cls(1).intern()
+        del a
+        gc.collect()
+        eq_(1, self.cls.intern_stats().d['collected'])
+        eq_(None, self.cls(1).find_interned())
+        b = self.cls(1)
+        ok_(b.intern() is b)
@@ -0,0 +1,271 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import struct
+import unittest
+from nose.tools import eq_
+from nose.tools import ok_
+from nose.tools import raises
+
+from ryu.services.protocols.bgp.utils import radix
+from ryu.services.protocols.bgp.utils.radix import RadixTree
+
+
+def _key(prefix):
+    # '10.0.0.0/8' to the key of a tree of width 32
+    addr, length = prefix.split('/')
+    return (struct.pack('!4B', *[int(b) for b in addr.split('.')]),
+            int(length))
+
+
+def _prefix(key):
+    packed, length = key
+    return '%d.%d.%d.%d/%d' % (struct.unpack('!4B', packed) + (length, ))
+
+
+def _nodes(tree):
+    # (prefix, value) of all the nodes, with those which only branch
+    ret = []
+    stack = [tree._root] if tree._root is not None else []
+    while stack:
+        node = stack.pop()
+        ret.append((_prefix(tree._key(node)), node.value))
+        stack.extend(n for n in (node.right, node.left) if n is not None)
+    return ret
+
+
+class Test_bit_length(unittest.TestCase):
+    """ Test case for utils.radix._bit_length
+    """
+
+    def test_bit_length(self):
+        for value, length in ((0, 0), (1, 1), (2, 2), (255, 8), (256, 9),
+                              (1 << 127, 128)):
+            eq_(length, radix._bit_length(value))
+
+
+class Test_RadixTree(unittest.TestCase):
+    """ Test case for utils.radix.RadixTree
+    """
+
+    def setUp(self):
+        self.tree = RadixTree(32)
+
+    def _fill(self, *prefixes):
+        for prefix in prefixes:
+            self.tree[_key(prefix)] = prefix
+
+    def test_map(self):
+        self._fill('10.0.0.0/8', '10.1.0.0/16')
+        eq_(2, len(self.tree))
+        eq_('10.0.0.0/8', self.tree[_key('10.0.0.0/8')])
+        # the bits after the prefix length are ignored
+        eq_('10.0.0.0/8', self.tree[_key('10.1.2.3/8')])
+        eq_(None, self.tree.get(_key('10.0.0.0/16')))
+        eq_('x', self.tree.get(_key('11.0.0.0/8'), 'x'))
+        ok_(_key('10.1.0.0/16') in self.tree)
+        ok_(_key('10.0.0.0/9') not in self.tree)
+
+        self.tree[_key('10.0.0.0/8')] = 'new'
+        eq_(2, len(self.tree))
+        eq_('new', self.tree[_key('10.0.0.0/8')])
+
+        eq_('new', self.tree.pop(_key('10.0.0.0/8')))
+        eq_('x', self.tree.pop(_key('10.0.0.0/8'), 'x'))
+        eq_(1, len(self.tree))
+
+        self.tree.clear()
+        eq_(0, len(self.tree))
+        eq_([], self.tree.items())
+        eq_(None, self.tree.get(_key('10.1.0.0/16')))
+
+    @raises(KeyError)
+    def test_getitem_missing(self):
+        self._fill('10.0.0.0/8')
+        self.tree[_key('10.0.0.0/16')]
+
+    @raises(KeyError)
+    def test_delitem_missing(self):
+        self._fill('10.0.0.0/8', '10.128.0.0/16')
+        # a node which only branches
+        del self.tree[_key('10.0.0.0/8')]
+        del self.tree[_key('10.0.0.0/8')]
+
+    @raises(KeyError)
+    def test_wrong_width(self):
+        self.tree.get((b'\x0a\x00', 8))
+
+    @raises(KeyError)
+    def test_wrong_length(self):
+        self.tree.get((b'\x0a\x00\x00\x00', 33))
+
+    def test_branch(self):
+        # 10.0.0.0/16 and 10.128.0.0/16 branch at 10.0.0.0/8, which has a
+        # node without a value
+        self._fill('10.0.0.0/16', '10.128.0.0/16')
+        eq_([('10.0.0.0/8', radix._EMPTY), ('10.0.0.0/16', '10.0.0.0/16'),
+             ('10.128.0.0/16', '10.128.0.0/16')], _nodes(self.tree))
+        eq_(2, len(self.tree))
+        eq_(None, self.tree.get(_key('10.0.0.0/8')))
+
+        # the node of the branch gets the value
+        self._fill('10.0.0.0/8')
+        eq_([('10.0.0.0/8', '10.0.0.0/8'), ('10.0.0.0/16', '10.0.0.0/16'),
+             ('10.128.0.0/16', '10.128.0.0/16')], _nodes(self.tree))
+        eq_(3, len(self.tree))
+
+        # and keeps the node after the value is deleted
+        del self.tree[_key('10.0.0.0/8')]
+        eq_([('10.0.0.0/8', radix._EMPTY), ('10.0.0.0/16', '10.0.0.0/16'),
+             ('10.128.0.0/16', '10.128.0.0/16')], _nodes(self.tree))
+        eq_(2, len(self.tree))
+
+    def test_delete_collapse(self):
+        self._fill('10.0.0.0/16', '10.128.0.0/16', '10.128.1.0/24')
+        eq_([('10.0.0.0/8', radix._EMPTY), ('10.0.0.0/16', '10.0.0.0/16'),
+             ('10.128.0.0/16', '10.128.0.0/16'),
+             ('10.128.1.0/24', '10.128.1.0/24')], _nodes(self.tree))
+
+        # a node with a child is replaced by it
+        del self.tree[_key('10.128.0.0/16')]
+        eq_([('10.0.0.0/8', radix._EMPTY), ('10.0.0.0/16', '10.0.0.0/16'),
+             ('10.128.1.0/24', '10.128.1.0/24')], _nodes(self.tree))
+
+        # the node which only branched to a leaf is removed with it
+        del self.tree[_key('10.0.0.0/16')]
+        eq_([('10.128.1.0/24', '10.128.1.0/24')], _nodes(self.tree))
+
+        del self.tree[_key('10.128.1.0/24')]
+        eq_([], _nodes(self.tree))
+        eq_(0, len(self.tree))
+
+    def test_delete_leaf_under_value(self):
+        # the parent of a leaf keeps its node if it has a value
+        self._fill('10.0.0.0/8', '10.0.0.0/16', '10.128.0.0/16')
+        del self.tree[_key('10.0.0.0/16')]
+        eq_([('10.0.0.0/8', '10.0.0.0/8'),
+             ('10.128.0.0/16', '10.128.0.0/16')], _nodes(self.tree))
+
+    def test_default_route(self):
+        self._fill('0.0.0.0/0', '10.0.0.0/8')
+        eq_('0.0.0.0/0', self.tree[_key('0.0.0.0/0')])
+        eq_('0.0.0.0/0', self.tree.longest_match(_key('11.0.0.1/32')))
+        eq_('10.0.0.0/8', self.tree.longest_match(_key('10.0.0.1/32')))
+        del self.tree[_key('0.0.0.0/0')]
+        eq_(None, self.tree.longest_match(_key('11.0.0.1/32')))
+
+    def test_longest_match(self):
+        self._fill('10.0.0.0/8', '10.1.0.0/16', '10.1.1.0/24',
+                   '192.168.0.0/16')
+        for addr, prefix in (('10.1.1.1/32', '10.1.1.0/24'),
+                             ('10.1.2.1/32', '10.1.0.0/16'),
+                             ('10.2.0.0/16', '10.0.0.0/8'),
+                             ('10.1.0.0/16', '10.1.0.0/16'),
+                             ('10.0.0.0/7', None),
+                             ('192.168.1.1/32', '192.168.0.0/16'),
+                             ('192.169.0.0/32', None)):
+            eq_(prefix, self.tree.longest_match(_key(addr)))
+        eq_('x', self.tree.longest_match(_key('11.0.0.0/8'), 'x'))
+
+        # a node which only branches doesn't match
+        self._fill('10.128.0.0/16')
+        del self.tree[_key('10.0.0.0/8')]
+        eq_(None, self.tree.longest_match(_key('10.2.0.0/16')))
+
+    def test_itersubtree(self):
+        prefixes = ['10.0.0.0/8', '10.1.0.0/16', '10.1.1.0/24',
+                    '10.128.0.0/16', '192.168.0.0/16']
+        self._fill(*prefixes)
+
+        def subtree(prefix):
+            return [(_prefix(key), value)
+                    for key, value in self.tree.itersubtree(_key(prefix))]
+
+        eq_([(p, p) for p in prefixes[:4]], subtree('10.0.0.0/8'))
+        eq_([(p, p) for p in prefixes[1:3]], subtree('10.1.0.0/16'))
+        eq_([(p, p) for p in prefixes[1:3]], subtree('10.0.0.0/15'))
+        eq_([(p, p) for p in prefixes], subtree('0.0.0.0/0'))
+        eq_([('10.1.1.0/24', '10.1.1.0/24')], subtree('10.1.1.0/24'))
+        eq_([], subtree('10.1.1.1/32'))
+        eq_([], subtree('10.2.0.0/16'))
+        eq_([], subtree('11.0.0.0/8'))
+
+    def test_order(self):
+        prefixes = ['0.0.0.0/0', '10.0.0.0/8', '10.0.0.0/16', '10.0.1.0/24',
+                    '10.128.0.0/16', '128.0.0.0/1', '192.168.0.0/16',
+                    '192.168.0.1/32']
+        shuffled = list(prefixes)
+        random.Random(1).shuffle(shuffled)
+        self._fill(*shuffled)
+        eq_(prefixes, [_prefix(key) for key in self.tree])
+        eq_(prefixes, [_prefix(key) for key in self.tree.keys()])
+        eq_(prefixes, self.tree.values())
+        eq_(prefixes, list(self.tree.itervalues()))
+        eq_([(p, p) for p in prefixes],
+            [(_prefix(key), value) for key, value in self.tree.items()])
+
+    def test_random(self):
+        # compared with a dict, and a walk over it for the lookups
+        rnd = random.Random(1)
+        expected = {}
+
+        def key(bits, length):
+            return struct.pack('!I', bits << (32 - length)), length
+
+        def check():
+            eq_(len(expected), len(self.tree))
+            eq_(sorted(expected.items()), sorted(self.tree.items()))
+            # the bits after the prefix length of the keys are cleared
+            eq_(sorted(expected.items()),
+                [(k, expected[k]) for k in sorted(self.tree)])
+            for _i in range(50):
+                addr = rnd.getrandbits(8)
+                for length in range(8, -1, -1):
+                    value = expected.get(key(addr >> (8 - length), length))
+                    if value is not None:
+                        break
+                eq_(value, self.tree.longest_match(key(addr, 8)))
+
+        # prefixes up to /8 so that they overlap
+        for _i in range(300):
+            length = rnd.randint(0, 8)
+            k = key(rnd.getrandbits(length) if length else 0, length)
+            if rnd.random() < 0.6:
+                expected[k] = self.tree[k] = rnd.random()
+            elif k in expected:
+                eq_(expected.pop(k), self.tree.pop(k))
+            check()
+
+        for k in list(expected):
+            del expected[k]
+            del self.tree[k]
+            check()
+        eq_(None, self.tree._root)
+
+    def test_ipv6(self):
+        tree = RadixTree(128)
+        # 2001:db8::/32 and 2001:db8:0:1::/64
+        tree[(b'\x20\x01\x0d\xb8' + b'\x00' * 12, 32)] = 'a'
+        tree[(b'\x20\x01\x0d\xb8\x00\x00\x00\x01' + b'\x00' * 8, 64)] = 'b'
+        eq_('b', tree.longest_match(
+            (b'\x20\x01\x0d\xb8\x00\x00\x00\x01' + b'\x00' * 7 + b'\x01',
+             128)))
+        eq_('a', tree.longest_match(
+            (b'\x20\x01\x0d\xb8\x00\x00\x00\x02' + b'\x00' * 8, 128)))
+        eq_(['a', 'b'], tree.values())
+        eq_([(b'\x20\x01\x0d\xb8' + b'\x00' * 12, 32),
+             (b'\x20\x01\x0d\xb8\x00\x00\x00\x01' + b'\x00' * 8, 64)],
+            tree.keys())
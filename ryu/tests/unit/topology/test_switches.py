@@ -0,0 +1,182 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import unittest
+from nose.tools import eq_, ok_, raises
+
+from ryu.lib.packet import ethernet
+from ryu.lib.packet import ether_types
+from ryu.lib.packet import ipv4
+from ryu.lib.packet import lldp
+from ryu.lib.packet import packet
+from ryu.ofproto import ofproto_v1_3
+from ryu.ofproto import ofproto_v1_3_parser
+from ryu.topology import switches
+from ryu.topology.switches import LLDPPacket
+
+
+def _lldp_packet(chassis_id, port_id, tlvs=()):
+    pkt = packet.Packet()
+    pkt.add_protocol(ethernet.ethernet(
+        lldp.LLDP_MAC_NEAREST_BRIDGE, '00:00:00:00:00:01',
+        ether_types.ETH_TYPE_LLDP))
+    pkt.add_protocol(lldp.lldp(
+        (chassis_id, port_id, lldp.TTL(ttl=120)) + tuple(tlvs) +
+        (lldp.End(), )))
+    pkt.serialize()
+    return bytes(pkt.data)
+
+
+class TestLLDPPacket(unittest.TestCase):
+    """ Test case for switches.LLDPPacket
+    """
+
+    def test_template(self):
+        template = LLDPPacket.lldp_template(0x1234, 120)
+        for port_no, hw_addr in ((1, '00:00:00:00:00:01'),
+                                 (0xfffffffe, 'aa:bb:cc:dd:ee:ff')):
+            eq_(LLDPPacket.lldp_packet(0x1234, port_no, hw_addr, 120),
+                LLDPPacket.lldp_from_template(template, port_no, hw_addr))
+
+    def test_parse(self):
+        data = LLDPPacket.lldp_packet(0xfedcba9876543210, 0xfffffffe,
+                                      '00:00:00:00:00:01', 120)
+        eq_((0xfedcba9876543210, 0xfffffffe), LLDPPacket.lldp_parse(data))
+        eq_((0xfedcba9876543210, 0xfffffffe),
+            LLDPPacket.lldp_parse(bytes(data)))
+
+    def test_parse_decoded(self):
+        # not at the fixed offsets, e.g. the port id of another length
+        chassis_id = lldp.ChassisID(
+            subtype=lldp.ChassisID.SUB_LOCALLY_ASSIGNED,
+            chassis_id=b'dpid:0000000000000001')
+        port_id = lldp.PortID(subtype=lldp.PortID.SUB_PORT_COMPONENT,
+                              port_id=b'\x00\x02')
+        data = _lldp_packet(chassis_id, port_id)
+        self.assertRaises(LLDPPacket.LLDPUnknownFormat,
+                          LLDPPacket.lldp_parse, data)
+
+        port_id = lldp.PortID(subtype=lldp.PortID.SUB_PORT_COMPONENT,
+                              port_id=b'\x00\x00\x00\x02')
+        data = _lldp_packet(chassis_id, port_id,
+                            [lldp.SystemName(system_name=b'switch')])
+        eq_((1, 2), LLDPPacket.lldp_parse(data))
+
+        chassis_id = lldp.ChassisID(
+            subtype=lldp.ChassisID.SUB_MAC_ADDRESS,
+            chassis_id=b'\x00\x00\x00\x00\x00\x01')
+        self.assertRaises(LLDPPacket.LLDPUnknownFormat,
+                          LLDPPacket.lldp_parse,
+                          _lldp_packet(chassis_id, port_id))
+
+    @raises(LLDPPacket.LLDPUnknownFormat)
+    def test_parse_not_lldp(self):
+        pkt = packet.Packet()
+        pkt.add_protocol(ethernet.ethernet())
+        pkt.add_protocol(ipv4.ipv4())
+        pkt.serialize()
+        LLDPPacket.lldp_parse(pkt.data)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """ Test case for switches.TokenBucket
+    """
+
+    def test_take(self):
+        bucket = switches.TokenBucket(100, 10)
+        now = bucket.timestamp
+        eq_(10, bucket.take(20, now))
+        eq_(0, bucket.take(1, now))
+        ok_(0 < bucket.delay() <= 0.01)
+        eq_(5, bucket.take(20, now + 0.055))
+        # no more than the burst
+        eq_(10, bucket.take(20, now + 10))
+        eq_(3, bucket.take(3, now + 20))
+
+
+class TestTimerHeap(unittest.TestCase):
+    """ Test case for switches.TimerHeap
+    """
+
+    def test_pop_due(self):
+        timers = switches.TimerHeap()
+        for key, deadline in (('a', 3), ('b', 1), ('c', 2), ('d', 5)):
+            timers.schedule(key, deadline)
+        timers.schedule('a', 0)     # rescheduled
+        timers.cancel('c')
+        timers.cancel('x')
+        eq_(3, len(timers))
+        ok_('c' not in timers)
+        eq_(0, timers.next_deadline())
+        eq_(['a'], timers.pop_due(2, limit=1))
+        eq_(['b'], timers.pop_due(2))
+        eq_([], timers.pop_due(2))
+        eq_(5, timers.next_deadline())
+        eq_(['d'], timers.pop_due(5))
+        eq_(None, timers.next_deadline())
+
+    def test_compact(self):
+        timers = switches.TimerHeap()
+        for deadline in range(1000):
+            timers.schedule('a', deadline)
+        eq_(1, timers.stats()['timers'])
+        ok_(timers.stats()['heap'] < 100)
+        eq_(['a'], timers.pop_due(1000))
+
+
+class TestState(unittest.TestCase):
+    """ Test case for the timers of switches.PortDataState and LinkState
+    """
+
+    def _port(self, dpid, port_no):
+        ofpport = ofproto_v1_3_parser.OFPPort(
+            port_no=port_no, hw_addr='00:00:00:00:00:01', config=0,
+            state=0, curr=0, advertised=0, supported=0, peer=0,
+            curr_speed=0, max_speed=0, name=b'eth1')
+        return switches.Port(dpid, ofproto_v1_3, ofpport)
+
+    def test_port_data_state(self):
+        ports = switches.PortDataState(1.)
+        p1, p2, p3 = [self._port(1, i) for i in (1, 2, 3)]
+        for port in (p1, p2, p3):
+            ports.add_port(port, b'')
+        ports.lldp_sent(p2)
+        now = time.time()
+        eq_([p1, p3], ports.pop_due(now))
+        ports.lldp_sent(p1)
+        ok_(now < ports.next_deadline() <= now + 2)
+        ports.move_front(p1)
+        eq_([p1], ports.pop_due(now))
+        ports.del_port(p2)
+        eq_([], ports.pop_due(now + 2))
+        eq_(None, ports.next_deadline())
+
+    def test_link_state(self):
+        links = switches.LinkState(10.)
+        p1, p2, p3 = [self._port(i, 1) for i in (1, 2, 3)]
+        links.update_link(p1, p2)
+        ok_(links.update_link(p2, p1))
+        links.update_link(p3, p1)
+        now = time.time()
+        eq_([], links.pop_expired(now))
+        links.rev_link_set_timestamp(switches.Link(p2, p1), now - 10)
+        eq_([switches.Link(p2, p1)], links.pop_expired(now))
+        links.check_later(switches.Link(p2, p1), now + 5)
+        eq_(now + 5, links.next_deadline())
+
+        eq_((p2, p1), links.port_deleted(p1))
+        links.link_down(switches.Link(p3, p1))
+        eq_(0, len(links.timers))
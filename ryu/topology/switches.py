@@ -13,6 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import heapq
+import importlib
+import itertools
 import logging
 import six
 import struct
@@ -23,6 +26,7 @@ from ryu import cfg
 from ryu.topology import event
 from ryu.base import app_manager
 from ryu.controller import ofp_event
+from ryu.controller import shard
 from ryu.controller.handler import set_ev_cls
 from ryu.controller.handler import MAIN_DISPATCHER, DEAD_DISPATCHER
 from ryu.exception import RyuException
@@ -99,6 +103,16 @@ class Port(object):
     def __hash__(self):
         return hash((self.dpid, self.port_no))
 
+    # to pass to the other workers of a sharded controller
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_ofproto'] = self._ofproto.__name__
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._ofproto = importlib.import_module(state['_ofproto'])
+
     def __str__(self):
         LIVE_MSG = {False: 'DOWN', True: 'LIVE'}
         return 'Port<dpid=%s, port_no=%s, %s>' % \
@@ -126,6 +140,12 @@ class Switch(object):
              'ports': [port.to_dict() for port in self.ports]}
         return d
 
+    # to pass to the other workers of a sharded controller
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['dp'] = shard.RemoteDatapath(self.dp.id, self.dp.ofproto)
+        return state
+
     def __str__(self):
         msg = 'Switch<dpid=%s, ' % self.dp.id
         for port in self.ports:
@@ -268,56 +288,91 @@ class PortData(object):
             % (not self.is_down, self.timestamp, self.sent)
 
 
-class PortDataState(dict):
-    # dict: Port class -> PortData class
-    # slimed down version of OrderedDict as python 2.6 doesn't support it.
-    _PREV = 0
-    _NEXT = 1
-    _KEY = 2
-
+class TimerHeap(object):
+    # key -> deadline, in a heap from which the rescheduled and cancelled
+    # entries are removed lazily, so that finding the due keys touches
+    # only them.
     def __init__(self):
-        super(PortDataState, self).__init__()
-        self._root = root = []          # sentinel node
-        root[:] = [root, root, None]    # [_PREV, _NEXT, _KEY]
-                                        # doubly linked list
-        self._map = {}
+        super(TimerHeap, self).__init__()
+        self._entries = {}      # key -> [deadline, seq, key] in _heap
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._entries)
 
-    def _remove_key(self, key):
-        link_prev, link_next, key = self._map.pop(key)
-        link_prev[self._NEXT] = link_next
-        link_next[self._PREV] = link_prev
+    def __contains__(self, key):
+        return key in self._entries
 
-    def _append_key(self, key):
-        root = self._root
-        last = root[self._PREV]
-        last[self._NEXT] = root[self._PREV] = self._map[key] = [last, root,
-                                                                key]
+    def schedule(self, key, deadline):
+        entry = (deadline, next(self._seq), key)
+        self._entries[key] = entry
+        heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
 
-    def _prepend_key(self, key):
-        root = self._root
-        first = root[self._NEXT]
-        first[self._PREV] = root[self._NEXT] = self._map[key] = [root, first,
-                                                                 key]
+    def cancel(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        del self._heap[:]
+
+    def _top(self):
+        heap = self._heap
+        entries = self._entries
+        while heap and entries.get(heap[0][2]) is not heap[0]:
+            heapq.heappop(heap)
+        if heap:
+            return heap[0]
+        return None
+
+    def next_deadline(self):
+        entry = self._top()
+        if entry is None:
+            return None
+        return entry[0]
+
+    def pop_due(self, now, limit=None):
+        # removes and returns the keys whose deadline has come, the
+        # earliest first
+        keys = []
+        while limit is None or len(keys) < limit:
+            entry = self._top()
+            if entry is None or entry[0] > now:
+                break
+            heapq.heappop(self._heap)
+            del self._entries[entry[2]]
+            keys.append(entry[2])
+        return keys
 
-    def _move_last_key(self, key):
-        self._remove_key(key)
-        self._append_key(key)
+    def stats(self):
+        # the number of the timers, and of the entries in the heap
+        # including the ones to be removed
+        return {'timers': len(self._entries), 'heap': len(self._heap)}
 
-    def _move_front_key(self, key):
-        self._remove_key(key)
-        self._prepend_key(key)
+
+class PortDataState(dict):
+    # dict: Port class -> PortData class
+    # The ports are sent LLDP packets in the order of their deadlines,
+    # where a new port or one to be checked early is due at once.
+    def __init__(self, period):
+        super(PortDataState, self).__init__()
+        self.period = period
+        self.timers = TimerHeap()
 
     def add_port(self, port, lldp_data):
         if port not in self:
-            self._prepend_key(port)
             self[port] = PortData(port.is_down(), lldp_data)
+            self.timers.schedule(port, 0)
         else:
             self[port].is_down = port.is_down()
 
     def lldp_sent(self, port):
         port_data = self[port]
         port_data.lldp_sent()
-        self._move_last_key(port)
+        self.timers.schedule(port, port_data.timestamp + self.period)
         return port_data
 
     def lldp_received(self, port):
@@ -327,7 +382,7 @@ class PortDataState(dict):
         port_data = self.get(port, None)
         if port_data is not None:
             port_data.clear_timestamp()
-            self._move_front_key(port)
+            self.timers.schedule(port, 0)
 
     def set_down(self, port):
         is_down = port.is_down()
@@ -335,7 +390,7 @@ class PortDataState(dict):
         port_data.set_down(is_down)
         port_data.clear_timestamp()
         if not is_down:
-            self._move_front_key(port)
+            self.timers.schedule(port, 0)
         return is_down
 
     def get_port(self, port):
@@ -343,38 +398,30 @@ class PortDataState(dict):
 
     def del_port(self, port):
         del self[port]
-        self._remove_key(port)
+        self.timers.cancel(port)
+
+    def pop_due(self, now, limit=None):
+        # the ports to send LLDP packets to, which are scheduled again
+        # by lldp_sent()
+        return self.timers.pop_due(now, limit)
 
-    def __iter__(self):
-        root = self._root
-        curr = root[self._NEXT]
-        while curr is not root:
-            yield curr[self._KEY]
-            curr = curr[self._NEXT]
+    def next_deadline(self):
+        return self.timers.next_deadline()
 
     def clear(self):
-        for node in self._map.values():
-            del node[:]
-        root = self._root
-        root[:] = [root, root, None]
-        self._map.clear()
+        self.timers.clear()
         dict.clear(self)
 
-    def items(self):
-        'od.items() -> list of (key, value) pairs in od'
-        return [(key, self[key]) for key in self]
-
-    def iteritems(self):
-        'od.iteritems -> an iterator over the (key, value) pairs in od'
-        for k in self:
-            yield (k, self[k])
-
 
 class LinkState(dict):
     # dict: Link class -> timestamp
-    def __init__(self):
+    # Each link is checked when it times out, rather than all of them
+    # periodically.
+    def __init__(self, timeout):
         super(LinkState, self).__init__()
         self._map = {}
+        self.timeout = timeout
+        self.timers = TimerHeap()
 
     def get_peer(self, src):
         return self._map.get(src, None)
@@ -382,8 +429,10 @@ class LinkState(dict):
     def update_link(self, src, dst):
         link = Link(src, dst)
 
-        self[link] = time.time()
+        now = time.time()
+        self[link] = now
         self._map[src] = dst
+        self.timers.schedule(link, now + self.timeout)
 
         # return if the reverse link is also up or not
         rev_link = Link(dst, src)
@@ -392,11 +441,24 @@ class LinkState(dict):
     def link_down(self, link):
         del self[link]
         del self._map[link.src]
+        self.timers.cancel(link)
 
     def rev_link_set_timestamp(self, rev_link, timestamp):
         # rev_link may or may not in LinkSet
         if rev_link in self:
             self[rev_link] = timestamp
+            self.timers.schedule(rev_link, timestamp + self.timeout)
+
+    def check_later(self, link, deadline):
+        # a timed out link which is not down yet
+        if link in self:
+            self.timers.schedule(link, deadline)
+
+    def pop_expired(self, now):
+        return self.timers.pop_due(now)
+
+    def next_deadline(self):
+        return self.timers.next_deadline()
 
     def port_deleted(self, src):
         dst = self.get_peer(src)
@@ -407,13 +469,44 @@ class LinkState(dict):
         rev_link = Link(dst, src)
         del self[link]
         del self._map[src]
+        self.timers.cancel(link)
         # reverse link might not exist
         self.pop(rev_link, None)
+        self.timers.cancel(rev_link)
         rev_link_dst = self._map.pop(dst, None)
 
         return dst, rev_link_dst
 
 
+class TokenBucket(object):
+    # paces packets at rate per second, allowing a burst of burst packets
+    def __init__(self, rate, burst):
+        super(TokenBucket, self).__init__()
+        self.rate = float(rate)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.timestamp = time.time()
+
+    def fill(self, now=None):
+        # returns the number of the tokens available
+        if now is None:
+            now = time.time()
+        elapsed = max(now - self.timestamp, 0)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.timestamp = now
+        return int(self.tokens)
+
+    def take(self, count, now=None):
+        # takes up to count tokens, and returns the number taken
+        taken = min(count, self.fill(now))
+        self.tokens -= taken
+        return taken
+
+    def delay(self):
+        # seconds until the next token is available
+        return max(1 - self.tokens, 0) / self.rate
+
+
 class LLDPPacket(object):
     # make a LLDP packet for link discovery.
 
@@ -424,6 +517,27 @@ class LLDPPacket(object):
     PORT_ID_STR = '!I'      # uint32_t
     PORT_ID_SIZE = 4
 
+    # The frame lldp_packet() makes has the source mac address, dpid and
+    # port number at fixed offsets, as the TLVs are in this order:
+    # ethernet header, chassis id, port id, ttl, end.
+    _ETH_TYPE_OFFSET = 12
+    _ETH_TYPE_LLDP = struct.pack('!H', ETH_TYPE_LLDP)
+    _CHASSIS_ID_OFFSET = ethernet.ethernet._MIN_LEN
+    _CHASSIS_ID_LEN = 1 + CHASSIS_ID_PREFIX_LEN + len(dpid_to_str(0))
+    # TLV header, subtype and prefix of the chassis id
+    _CHASSIS_ID_HEAD = struct.pack(
+        '!HB', lldp.LLDP_TLV_CHASSIS_ID << lldp.LLDP_TLV_TYPE_SHIFT |
+        _CHASSIS_ID_LEN, lldp.ChassisID.SUB_LOCALLY_ASSIGNED) + \
+        CHASSIS_ID_PREFIX.encode('ascii')
+    _DPID_OFFSET = _CHASSIS_ID_OFFSET + len(_CHASSIS_ID_HEAD)
+    _PORT_ID_HEAD_OFFSET = _CHASSIS_ID_OFFSET + lldp.LLDP_TLV_SIZE + \
+        _CHASSIS_ID_LEN
+    # TLV header and subtype of the port id
+    _PORT_ID_HEAD = struct.pack(
+        '!HB', lldp.LLDP_TLV_PORT_ID << lldp.LLDP_TLV_TYPE_SHIFT |
+        (1 + PORT_ID_SIZE), lldp.PortID.SUB_PORT_COMPONENT)
+    _PORT_ID_OFFSET = _PORT_ID_HEAD_OFFSET + len(_PORT_ID_HEAD)
+
     class LLDPUnknownFormat(RyuException):
         message = '%(msg)s'
 
@@ -457,8 +571,41 @@ class LLDPPacket(object):
         pkt.serialize()
         return pkt.data
 
+    @staticmethod
+    def lldp_template(dpid, ttl):
+        """Makes the LLDP packet of a datapath, to which
+        lldp_from_template() patches in the port.
+        """
+        return bytes(LLDPPacket.lldp_packet(dpid, 0, DONTCARE_STR, ttl))
+
+    @staticmethod
+    def lldp_from_template(template, port_no, dl_addr):
+        # the same as lldp_packet(dpid, port_no, dl_addr, ttl)
+        data = bytearray(template)
+        data[6:12] = addrconv.mac.text_to_bin(dl_addr)
+        struct.pack_into(LLDPPacket.PORT_ID_STR, data,
+                         LLDPPacket._PORT_ID_OFFSET, port_no)
+        return data
+
     @staticmethod
     def lldp_parse(data):
+        cls = LLDPPacket
+        # Most of the packets are not LLDP, and the LLDP packets are the
+        # ones lldp_packet() made, which are looked into at the fixed
+        # offsets rather than decoded.
+        if (data[cls._ETH_TYPE_OFFSET:cls._CHASSIS_ID_OFFSET] !=
+                cls._ETH_TYPE_LLDP):
+            raise LLDPPacket.LLDPUnknownFormat(msg='not a LLDP packet')
+        if (data[cls._CHASSIS_ID_OFFSET:cls._DPID_OFFSET] ==
+                cls._CHASSIS_ID_HEAD and
+                data[cls._PORT_ID_HEAD_OFFSET:cls._PORT_ID_OFFSET] ==
+                cls._PORT_ID_HEAD):
+            src_dpid = str_to_dpid(
+                bytes(data[cls._DPID_OFFSET:cls._PORT_ID_HEAD_OFFSET]))
+            (src_port_no, ) = struct.unpack_from(
+                cls.PORT_ID_STR, data, cls._PORT_ID_OFFSET)
+            return src_dpid, src_port_no
+
         pkt = packet.Packet(data)
         i = iter(pkt)
         eth_pkt = six.next(i)
@@ -473,7 +620,8 @@ class LLDPPacket(object):
             raise LLDPPacket.LLDPUnknownFormat(
                 msg='unknown chassis id subtype %d' % tlv_chassis_id.subtype)
         chassis_id = tlv_chassis_id.chassis_id
-        if not chassis_id.startswith(LLDPPacket.CHASSIS_ID_PREFIX):
+        if not chassis_id.startswith(
+                LLDPPacket.CHASSIS_ID_PREFIX.encode('ascii')):
             raise LLDPPacket.LLDPUnknownFormat(
                 msg='unknown chassis id format %s' % chassis_id)
         src_dpid = str_to_dpid(chassis_id[LLDPPacket.CHASSIS_ID_PREFIX_LEN:])
@@ -485,7 +633,7 @@ class LLDPPacket(object):
         port_id = tlv_port_id.port_id
         if len(port_id) != LLDPPacket.PORT_ID_SIZE:
             raise LLDPPacket.LLDPUnknownFormat(
-                msg='unknown port id %d' % port_id)
+                msg='unknown port id %r' % port_id)
         (src_port_no, ) = struct.unpack(LLDPPacket.PORT_ID_STR, port_id)
 
         return src_dpid, src_port_no
@@ -503,7 +651,8 @@ class Switches(app_manager.RyuApp):
     DEFAULT_TTL = 120  # unused. ignored.
     LLDP_PACKET_LEN = len(LLDPPacket.lldp_packet(0, 0, DONTCARE_STR, 0))
 
-    LLDP_SEND_GUARD = .05
+    LLDP_SEND_RATE = 1000       # packets per second
+    LLDP_SEND_BURST = 100
     LLDP_SEND_PERIOD_PER_PORT = .9
     TIMEOUT_CHECK_PERIOD = 5.
     LINK_TIMEOUT = TIMEOUT_CHECK_PERIOD * 2
@@ -515,15 +664,20 @@ class Switches(app_manager.RyuApp):
         self.name = 'switches'
         self.dps = {}                 # datapath_id => Datapath class
         self.port_state = {}          # datapath_id => ports
-        self.ports = PortDataState()  # Port class -> PortData class
-        self.links = LinkState()      # Link class -> timestamp
+        # Port class -> PortData class
+        self.ports = PortDataState(self.LLDP_SEND_PERIOD_PER_PORT)
+        self.links = LinkState(self.LINK_TIMEOUT)  # Link class -> timestamp
         self.hosts = HostState()      # mac address -> Host class list
+        self.remote_switches = {}     # datapath_id => Switch class
+        self.lldp_templates = {}      # datapath_id => LLDP packet
         self.is_active = True
 
         self.link_discovery = self.CONF.observe_links
         if self.link_discovery:
             self.install_flow = self.CONF.install_lldp_flow
             self.explicit_drop = self.CONF.explicit_drop
+            self.lldp_bucket = TokenBucket(self.LLDP_SEND_RATE,
+                                           self.LLDP_SEND_BURST)
             self.lldp_event = hub.Event()
             self.link_event = hub.Event()
             self.threads.append(hub.spawn(self.lldp_loop))
@@ -536,6 +690,12 @@ class Switches(app_manager.RyuApp):
             self.link_event.set()
             hub.joinall(self.threads)
 
+    def send_event_to_observers(self, ev, state=None):
+        super(Switches, self).send_event_to_observers(ev, state)
+        # In sharded mode, the other workers don't see the switches
+        # served by this one.
+        shard.send_event(self.name, ev)
+
     def _register(self, dp):
         assert dp.id is not None
 
@@ -549,6 +709,7 @@ class Switches(app_manager.RyuApp):
         if dp.id in self.dps:
             del self.dps[dp.id]
             del self.port_state[dp.id]
+            self.lldp_templates.pop(dp.id, None)
 
     def _get_switch(self, dpid):
         if dpid in self.dps:
@@ -565,8 +726,12 @@ class Switches(app_manager.RyuApp):
                     return p
 
     def _port_added(self, port):
-        lldp_data = LLDPPacket.lldp_packet(
-            port.dpid, port.port_no, port.hw_addr, self.DEFAULT_TTL)
+        template = self.lldp_templates.get(port.dpid)
+        if template is None:
+            template = LLDPPacket.lldp_template(port.dpid, self.DEFAULT_TTL)
+            self.lldp_templates[port.dpid] = template
+        lldp_data = LLDPPacket.lldp_from_template(
+            template, port.port_no, port.hw_addr)
         self.ports.add_port(port, lldp_data)
         # LOG.debug('_port_added dpid=%s, port_no=%s, live=%s',
         #           port.dpid, port.port_no, port.is_live())
@@ -900,35 +1065,32 @@ class Switches(app_manager.RyuApp):
             LOG.error('cannot send lldp packet. unsupported version. %x',
                       dp.ofproto.OFP_VERSION)
 
+    def send_lldp_packets(self, ports):
+        # The packets to a datapath are queued back to back, so that
+        # they are written to the connection at once.
+        ports_by_dpid = {}
+        for port in ports:
+            ports_by_dpid.setdefault(port.dpid, []).append(port)
+        for dp_ports in ports_by_dpid.values():
+            for port in dp_ports:
+                self.send_lldp_packet(port)
+
     def lldp_loop(self):
         while self.is_active:
             self.lldp_event.clear()
 
             now = time.time()
-            timeout = None
-            ports_now = []
-            ports = []
-            for (key, data) in self.ports.items():
-                if data.timestamp is None:
-                    ports_now.append(key)
-                    continue
-
-                expire = data.timestamp + self.LLDP_SEND_PERIOD_PER_PORT
-                if expire <= now:
-                    ports.append(key)
-                    continue
-
-                timeout = expire - now
-                break
-
-            for port in ports_now:
-                self.send_lldp_packet(port)
-            for port in ports:
-                self.send_lldp_packet(port)
-                hub.sleep(self.LLDP_SEND_GUARD)      # don't burst
-
-            if timeout is not None and ports:
-                timeout = 0     # We have already slept
+            # don't burst. the rest is sent when the bucket is refilled.
+            ports = self.ports.pop_due(now, self.lldp_bucket.fill(now))
+            self.lldp_bucket.take(len(ports), now)
+            self.send_lldp_packets(ports)
+
+            timeout = self.ports.next_deadline()
+            if timeout is not None:
+                if timeout <= now:
+                    timeout = self.lldp_bucket.delay()
+                else:
+                    timeout -= now
             # LOG.debug('lldp sleep %s', timeout)
             self.lldp_event.wait(timeout=timeout)
 
@@ -938,15 +1100,15 @@ class Switches(app_manager.RyuApp):
 
             now = time.time()
             deleted = []
-            for (link, timestamp) in self.links.items():
-                # LOG.debug('%s timestamp %d (now %d)', link, timestamp, now)
-                if timestamp + self.LINK_TIMEOUT < now:
-                    src = link.src
-                    if src in self.ports:
-                        port_data = self.ports.get_port(src)
-                        # LOG.debug('port_data %s', port_data)
-                        if port_data.lldp_dropped() > self.LINK_LLDP_DROP:
-                            deleted.append(link)
+            for link in self.links.pop_expired(now):
+                src = link.src
+                if src in self.ports:
+                    port_data = self.ports.get_port(src)
+                    # LOG.debug('port_data %s', port_data)
+                    if port_data.lldp_dropped() > self.LINK_LLDP_DROP:
+                        deleted.append(link)
+                        continue
+                self.links.check_later(link, now + self.TIMEOUT_CHECK_PERIOD)
 
             for link in deleted:
                 self.links.link_down(link)
@@ -964,7 +1126,45 @@ class Switches(app_manager.RyuApp):
                         self.ports.move_front(dst)
                         self.lldp_event.set()
 
-            self.link_event.wait(timeout=self.TIMEOUT_CHECK_PERIOD)
+            # a link added meanwhile times out after LINK_TIMEOUT, which
+            # is longer than TIMEOUT_CHECK_PERIOD
+            timeout = self.TIMEOUT_CHECK_PERIOD
+            deadline = self.links.next_deadline()
+            if deadline is not None:
+                timeout = max(min(deadline - now, timeout), 0)
+            self.link_event.wait(timeout=timeout)
+
+    def timer_stats(self):
+        """Returns the occupancy of the timers of the LLDP packets to
+        send and of the links to time out.
+        """
+        return {'lldp': self.ports.timers.stats(),
+                'link': self.links.timers.stats()}
+
+    # In sharded mode, the switches served by the other workers are
+    # learned from the events forwarded by them, so that a request is
+    # answered with all of the switches.  Those of this worker come back
+    # here as well as this app observes its own events; they are ignored.
+    @set_ev_cls(event.EventSwitchEnter)
+    def remote_switch_enter_handler(self, ev):
+        dpid = ev.switch.dp.id
+        if not shard.is_local_datapath(dpid):
+            self.remote_switches[dpid] = ev.switch
+
+    @set_ev_cls(event.EventSwitchLeave)
+    def remote_switch_leave_handler(self, ev):
+        self.remote_switches.pop(ev.switch.dp.id, None)
+
+    @set_ev_cls([event.EventPortAdd, event.EventPortDelete,
+                 event.EventPortModify])
+    def remote_port_handler(self, ev):
+        switch = self.remote_switches.get(ev.port.dpid)
+        if switch is None:
+            return
+        ports = [port for port in switch.ports if port != ev.port]
+        if not isinstance(ev, event.EventPortDelete):
+            ports.append(ev.port)
+        switch.ports = sorted(ports, key=lambda port: port.port_no)
 
     @set_ev_cls(event.EventSwitchRequest)
     def switch_request_handler(self, req):
@@ -976,8 +1176,11 @@ class Switches(app_manager.RyuApp):
             # reply all list
             for dp in self.dps.values():
                 switches.append(self._get_switch(dp.id))
+            switches.extend(self.remote_switches.values())
         elif dpid in self.dps:
             switches.append(self._get_switch(dpid))
+        elif dpid in self.remote_switches:
+            switches.append(self.remote_switches[dpid])
 
         rep = event.EventSwitchReply(req.src, switches)
         self.reply_to_request(req, rep)